@@ -1,7 +1,9 @@
-use criterion::{criterion_group, criterion_main, BenchmarkId, Criterion};
+use criterion::{criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
+use piicleaner::allowlist::Allowlist;
 use piicleaner::core::{
-    clean_pii_with_cleaners_batch_core, detect_pii_with_cleaners_batch_core, Cleaning,
+    clean_pii_with_cleaners_batch_core, detect_pii_with_cleaners_batch_core, Cleaning, Overlap,
 };
+use piicleaner::patterns::get_patterns;
 use std::hint::black_box;
 
 #[derive(Clone)]
@@ -72,6 +74,7 @@ fn create_test_cases() -> Vec<TestCase> {
     let text_types = [
         ("individual", vec![samples[0].clone()]), // Single email string
         ("large_list", generate_large_list(100000, 0.2)), // 100,000 strings
+        ("low_pii_list", generate_large_list(100000, 0.01)), // 99% clean rows
     ];
 
     let operations = ["detect", "redact", "replace"];
@@ -111,6 +114,9 @@ fn benchmark_pii_matrix(c: &mut Criterion) {
                             black_box(&tc.text_data),
                             &["all"],
                             black_box(tc.ignore_case),
+                            Overlap::All,
+                            false,
+                            None,
                         );
                     }
                     "redact" => {
@@ -120,6 +126,9 @@ fn benchmark_pii_matrix(c: &mut Criterion) {
                             Cleaning::Redact,
                             black_box(tc.ignore_case),
                             None,
+                            Overlap::Longest,
+                            false,
+                            None,
                         );
                     }
                     "replace" => {
@@ -129,6 +138,9 @@ fn benchmark_pii_matrix(c: &mut Criterion) {
                             Cleaning::Replace,
                             black_box(tc.ignore_case),
                             None,
+                            Overlap::Longest,
+                            false,
+                            None,
                         );
                     }
                     _ => panic!("Unknown operation: {}", tc.operation),
@@ -139,5 +151,114 @@ fn benchmark_pii_matrix(c: &mut Criterion) {
     group.finish();
 }
 
-criterion_group!(benches, benchmark_pii_matrix);
+/// Compare the Unicode and ASCII-only compiled patterns on ASCII input
+fn benchmark_ascii_patterns(c: &mut Criterion) {
+    let mut group = c.benchmark_group("ascii_patterns");
+    let text_data = generate_large_list(100000, 0.2);
+
+    for ignore_case in [false, true] {
+        for ascii in [false, true] {
+            let (compiled_patterns, patterns_set) = get_patterns(ignore_case, ascii);
+            let name = format!("ascii_{}_ignore_case_{}", ascii, ignore_case);
+
+            group.bench_function(BenchmarkId::new("is_match", &name), |b| {
+                b.iter(|| {
+                    text_data
+                        .iter()
+                        .filter(|text| patterns_set.is_match(black_box(text)))
+                        .count()
+                })
+            });
+            group.bench_function(BenchmarkId::new("find_iter", &name), |b| {
+                b.iter(|| {
+                    let mut count = 0;
+                    for text in &text_data {
+                        for regexes in compiled_patterns.values() {
+                            for regex in regexes {
+                                count += regex.find_iter(black_box(text)).count();
+                            }
+                        }
+                    }
+                    count
+                })
+            });
+        }
+    }
+    group.finish();
+}
+
+/// Redact with allowlists of increasing size, which should not slow cleaning
+fn benchmark_allowlist(c: &mut Criterion) {
+    let mut group = c.benchmark_group("allowlist");
+    let text_data = generate_large_list(10000, 0.5);
+
+    for size in [0, 1000, 100000] {
+        for normalise in [false, true] {
+            let allowlist = Allowlist::new(
+                (0..size).map(|i| format!("person{}@example.org", i)),
+                normalise,
+            );
+            let name = format!("size_{}_normalise_{}", size, normalise);
+            group.bench_function(BenchmarkId::new("redact", &name), |b| {
+                b.iter(|| {
+                    clean_pii_with_cleaners_batch_core(
+                        black_box(&text_data),
+                        &["all"],
+                        Cleaning::Redact,
+                        false,
+                        None,
+                        Overlap::Longest,
+                        false,
+                        Some(&allowlist),
+                    )
+                })
+            });
+        }
+    }
+    group.finish();
+}
+
+/// Redact one batch in pools of 1 up to all available threads, which should
+/// scale close to linearly as workers don't share regex scratch space
+fn benchmark_thread_scaling(c: &mut Criterion) {
+    let mut group = c.benchmark_group("thread_scaling");
+    let text_data = generate_large_list(100000, 0.2);
+    let max_threads = std::thread::available_parallelism().map_or(1, |n| n.get());
+    let thread_counts = std::iter::successors(Some(1), |&n| Some(n * 2))
+        .take_while(|&n| n < max_threads)
+        .chain([max_threads]);
+
+    group.throughput(Throughput::Elements(text_data.len() as u64));
+    for threads in thread_counts {
+        let pool = rayon::ThreadPoolBuilder::new()
+            .num_threads(threads)
+            .build()
+            .unwrap();
+        group.bench_function(BenchmarkId::new("redact", threads), |b| {
+            b.iter(|| {
+                pool.install(|| {
+                    clean_pii_with_cleaners_batch_core(
+                        black_box(&text_data),
+                        &["all"],
+                        Cleaning::Redact,
+                        false,
+                        None,
+                        Overlap::Longest,
+                        false,
+                        None,
+                    )
+                })
+            })
+        });
+    }
+    group.finish();
+}
+
+criterion_group!(
+    benches,
+    benchmark_pii_matrix,
+    benchmark_ascii_patterns,
+    benchmark_allowlist,
+    benchmark_thread_scaling
+);
 criterion_main!(benches);
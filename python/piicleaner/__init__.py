@@ -8,8 +8,18 @@ numbers, email addresses, phone numbers, and more.
 
 # Import the Rust functions
 # Import the Cleaner class
+from ._batcher import MicroBatcher
 from ._cleaner import Cleaner
 from ._internal import (
+    CancelToken,
+    CleanCache,
+    HeavyHitters,
+    PiiIndex,
+    RowLimits,
+    StreamingCleaner,
+    clean_and_detect_batch,
+    clean_json,
+    clean_json_batch,
     clean_pii,
     clean_pii_batch,
     clean_pii_with_cleaners,
@@ -19,6 +29,12 @@ from ._internal import (
     detect_pii_with_cleaners,
     detect_pii_with_cleaners_batch,
     get_available_cleaners,
+    load_dictionary,
+    precompile_patterns,
+    register_dictionary,
+    register_dictionary_file,
+    remove_dictionary,
+    save_dictionary,
 )
 
 # Import Polars integration if available
@@ -46,8 +62,24 @@ __all__ = [
     "clean_pii_batch",
     "clean_pii_with_cleaners",
     "clean_pii_with_cleaners_batch",
+    "clean_and_detect_batch",
+    "clean_json",
+    "clean_json_batch",
     "detect_pii_with_cleaners",
     "detect_pii_with_cleaners_batch",
     "get_available_cleaners",
+    "precompile_patterns",
+    "register_dictionary",
+    "register_dictionary_file",
+    "save_dictionary",
+    "load_dictionary",
+    "remove_dictionary",
     "Cleaner",
+    "CancelToken",
+    "CleanCache",
+    "HeavyHitters",
+    "MicroBatcher",
+    "PiiIndex",
+    "RowLimits",
+    "StreamingCleaner",
 ]
@@ -0,0 +1,168 @@
+"""Micro-batching of single-text cleaning calls"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+# Sentinel put on the queue to stop the dispatch thread
+_CLOSE = object()
+
+
+class MicroBatcher:
+    """Collects concurrent single-text calls into batches.
+
+    Each call to `clean` or `submit` queues one text. A background thread
+    takes the first waiting text, then waits at most `max_delay_us`
+    microseconds for up to `max_batch_size - 1` more, and cleans them with one
+    call to the batch function, which runs in parallel with the GIL released.
+    Each caller gets back the result for its own text.
+
+    A longer delay or larger batch gives more throughput under load at the
+    cost of latency; with `max_delay_us=0` texts are only batched when they
+    are already waiting, so an idle batcher adds no delay.
+
+    Create one with `Cleaner.batcher`.
+
+    Args:
+        clean_batch (Callable[[list[str]], list[str]]): Batch function that
+            cleans a list of texts.
+        max_batch_size (int): Most texts cleaned in one batch.
+        max_delay_us (int): Longest time, in microseconds, the first text of a
+            batch waits for others to join it.
+    """
+
+    def __init__(
+        self,
+        clean_batch: Callable[[list[str]], list[str]],
+        max_batch_size: int = 256,
+        max_delay_us: int = 500,
+    ):
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError("`max_batch_size` must be a positive integer")
+        if not isinstance(max_delay_us, int) or max_delay_us < 0:
+            raise ValueError("`max_delay_us` must be a non-negative integer")
+
+        self._clean_batch = clean_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay_us = max_delay_us
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._batches = 0
+        self._texts = 0
+        self._thread = threading.Thread(
+            target=self._run, name="piicleaner-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text and return a future for its cleaned version."""
+        if not isinstance(text, str):
+            raise TypeError(f"`text` must be a str, not {type(text).__name__}")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue_depth += 1
+            self._max_queue_depth = max(
+                self._max_queue_depth, self._queue_depth
+            )
+            self._queue.put((text, future))
+        return future
+
+    def clean(self, text: str) -> str:
+        """Clean a text as part of the next batch, waiting for the result."""
+        return self.submit(text).result()
+
+    async def clean_async(self, text: str) -> str:
+        """Clean a text as part of the next batch without blocking the event
+        loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def stats(self) -> dict[str, int | float]:
+        """Queue depth and batch counts since the batcher started.
+
+        Returns:
+            dict[str, int | float]: "queue_depth" (texts waiting now),
+                "max_queue_depth", "batches", "texts" and
+                "mean_batch_size".
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "batches": self._batches,
+                "texts": self._texts,
+                "mean_batch_size": (
+                    self._texts / self._batches if self._batches else 0.0
+                ),
+            }
+
+    def close(self):
+        """Clean the texts already queued and stop the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def __enter__(self) -> MicroBatcher:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """Wait for a batch of queued items, and whether to stop after it."""
+        item = self._queue.get()
+        if item is _CLOSE:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.max_delay_us / 1e6
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _CLOSE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if not batch:
+                continue
+            with self._lock:
+                self._queue_depth -= len(batch)
+                self._batches += 1
+                self._texts += len(batch)
+
+            # Skip texts whose callers have given up
+            batch = [
+                (text, future)
+                for text, future in batch
+                if future.set_running_or_notify_cancel()
+            ]
+            try:
+                cleaned = self._clean_batch([text for text, _ in batch])
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+            else:
+                for (_, future), result in zip(batch, cleaned, strict=True):
+                    future.set_result(result)
@@ -1,21 +1,86 @@
 """Main Cleaner class for PII detection and cleaning"""
 
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from piicleaner._batcher import MicroBatcher
+from piicleaner._dataset import DatasetCleanerMixin
 from piicleaner._internal import (
+    Allowlist,
+    CancelToken,
+    CleanCache,
+    HeavyHitters,
+    PiiIndex,
+    RowLimits,
+    StreamingCleaner,
+    clean_and_detect_batch as _clean_and_detect_batch,
+    clean_and_detect_limited_batch as _clean_and_detect_limited_batch,
+    clean_json as _clean_json,
+    clean_json_batch as _clean_json_batch,
     clean_pii as _clean_pii,
     clean_pii_batch as _clean_pii_batch,
+    clean_pii_limited_batch as _clean_pii_limited_batch,
     clean_pii_with_cleaners as _clean_pii_with_cleaners,
     clean_pii_with_cleaners_batch as _clean_pii_with_cleaners_batch,
     detect_pii as _detect_pii,
     detect_pii_batch as _detect_pii_batch,
     detect_pii_with_cleaners as _detect_pii_with_cleaners,
     detect_pii_with_cleaners_batch as _detect_pii_with_cleaners_batch,
+    dictionary_to_bytes,
     get_available_cleaners,
+    register_dictionary_bytes,
 )
 from piicleaner._pandas import PandasCleanerMixin
 from piicleaner._polars import PolarsCleanerMixin
 
 
-class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
+def _iter_chunks(texts: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    """Lazily split an iterable into lists of at most `chunk_size` items."""
+    iterator = iter(texts)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _map_chunks(
+    func: Callable[[list[str]], list],
+    texts: Iterable[str],
+    chunk_size: int,
+    max_in_flight: int,
+) -> Iterator:
+    """Apply a batch function chunk by chunk and yield results in order.
+
+    Each chunk is handed to a single background thread, which runs the Rust
+    batch function (itself parallel, with the GIL released) while the caller's
+    thread reads the next chunk. At most `max_in_flight` chunks are submitted
+    and not yet consumed at any time.
+    """
+    # Validate eagerly so bad arguments fail at the call, not on first next()
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError("`chunk_size` must be a positive integer")
+    if not isinstance(max_in_flight, int) or max_in_flight < 1:
+        raise ValueError("`max_in_flight` must be a positive integer")
+
+    def _generate():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            in_flight = deque()
+            try:
+                for chunk in _iter_chunks(texts, chunk_size):
+                    in_flight.append(executor.submit(func, chunk))
+                    if len(in_flight) >= max_in_flight:
+                        yield from in_flight.popleft().result()
+                while in_flight:
+                    yield from in_flight.popleft().result()
+            finally:
+                # Don't process chunks nobody will consume if the caller stops
+                for future in in_flight:
+                    future.cancel()
+
+    return _generate()
+
+
+class Cleaner(PolarsCleanerMixin, PandasCleanerMixin, DatasetCleanerMixin):
     """A Cleaner object contains methods to detect and clean Personal
     Identifiable Information (PII) from text data using regex patterns.
 
@@ -23,16 +88,68 @@ class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
         cleaners (str | list[str]): The cleaners to use. Default "all" uses all
             available cleaners. Available cleaners include: "email", "postcode",
             "telephone", "nino", "address", "cash-amount", "case-id",
-            "tag", "ip_address". Defaults to "all".
+            "tag", "ip_address". Dictionaries registered with
+            `register_dictionary` can be used by name alongside these, but are
+            not included in "all". Defaults to "all". When resolving
+            overlapping matches with `overlap="priority"`, cleaners listed
+            first win.
         replace_string (str | None): Custom replacement string for "replace"
             cleaning method. If None, uses default "[PII detected, text
             redacted]". Defaults to None.
+        ascii_only (bool): Match with ASCII-only semantics for `\\w`, `\\d`,
+            `\\b` and case folding, even on non-ASCII text. Pure-ASCII text
+            always uses the faster ASCII patterns, since results are identical.
+            Defaults to False.
+        pseudonym_key (str | None): Secret key for the "pseudonymise" cleaning
+            method, which swaps each match for a keyed-hash token such as
+            "[email:3f9a1c07be42]". The same value always gets the same token
+            under the same key. Defaults to None.
+        allowlist (Iterable[str] | None): Values that are never reported or
+            cleaned, such as your own support email address or office phone
+            number. Matches are checked against the allowlist inside the
+            engine, so it applies to every detection and cleaning method, and
+            lookups take constant time however long the list is. Defaults to
+            None.
+        normalise_allowlist (bool): Also allow matches that equal an
+            allowlisted value after lowercasing and removing whitespace,
+            hyphens and brackets, so "020 7946 0000" allows "(020) 7946-0000".
+            Defaults to False.
+        cache (CleanCache | None): Cache of cleaned texts, so texts cleaned
+            before with the same patterns and settings are served from disk
+            rather than cleaned again. Used by `clean_pii_list` and the
+            methods built on it. Entries are keyed by a fingerprint of the
+            patterns, dictionaries, allowlist and options, so changing any of
+            them never serves stale results. The cache file holds cleaned
+            text and, with the secret key file saved beside it, can confirm
+            guessed values, so keep both private. Defaults to None.
+        limits (RowLimits | None): Per-row limits on the bytes scanned, the
+            matches found and the time spent, so one huge or match-dense text
+            can't stall a batch. A row that hits a limit is replaced whole, or
+            left as it is with `fallback="skip"`; use
+            `clean_pii_list_with_limits` to find out which rows did. Applied
+            by `clean_pii` and `clean_pii_list` and the methods built on
+            them, including `clean_dataframe`. Detection (`detect_pii`,
+            `detect_pii_list`, `detect_dataframe`) is not limited, as a
+            row that hit a limit would wrongly report no matches. The cache
+            is not used while limits are set, as results within a time
+            budget can vary between runs. Defaults to None.
+
+    A Cleaner can be pickled, so it can be sent to worker processes. The
+    dictionaries it uses are sent with it and registered in the receiving
+    process unless already registered there. A cache is not sent, as each
+    process should open its own.
     """
 
     def __init__(
         self,
         cleaners: str | list[str] = "all",
         replace_string: str | None = None,
+        ascii_only: bool = False,
+        pseudonym_key: str | None = None,
+        allowlist: Iterable[str] | None = None,
+        normalise_allowlist: bool = False,
+        cache: CleanCache | None = None,
+        limits: RowLimits | None = None,
     ):
         """Cleaner initialisation.
 
@@ -40,6 +157,13 @@ class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
             cleaners (str | list[str]): PII types to detect/clean.
             replace_string (str | None): Custom replacement text for
                 "replace" mode.
+            ascii_only (bool): Use ASCII-only matching for all text.
+            pseudonym_key (str | None): Secret key for "pseudonymise" mode.
+            allowlist (Iterable[str] | None): Values never to report or clean.
+            normalise_allowlist (bool): Match the allowlist ignoring case,
+                whitespace, hyphens and brackets.
+            cache (CleanCache | None): Cache of cleaned texts.
+            limits (RowLimits | None): Per-row limits on cleaning work.
         """
         if isinstance(cleaners, str):
             if cleaners == "all":
@@ -52,9 +176,42 @@ class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
             raise TypeError("`cleaners` must be a string or list of strings")
 
         self.replace_string = replace_string
+        self.ascii_only = ascii_only
+        self.pseudonym_key = pseudonym_key
+        # Built once in Rust so the hash set is shared by every call
+        self._allowlist = (
+            None
+            if allowlist is None
+            else Allowlist(allowlist, normalise_allowlist)
+        )
+        if cache is not None and not isinstance(cache, CleanCache):
+            raise TypeError("`cache` must be a CleanCache")
+        self.cache = cache
+        if limits is not None and not isinstance(limits, RowLimits):
+            raise TypeError("`limits` must be a RowLimits")
+        self.limits = limits
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["cache"] = None
+        dictionaries = {}
+        for name in self.cleaners:
+            try:
+                dictionaries[name] = dictionary_to_bytes(name)
+            except ValueError:
+                # "all" or a built-in cleaner
+                pass
+        state["_dictionaries"] = dictionaries
+        return state
+
+    def __setstate__(self, state: dict):
+        state = state.copy()
+        for name, data in state.pop("_dictionaries", {}).items():
+            register_dictionary_bytes(name, data)
+        self.__dict__.update(state)
 
     def detect_pii(
-        self, string: str, ignore_case: bool = True
+        self, string: str, ignore_case: bool = True, overlap: str = "all"
     ) -> list[dict[str, str | int]]:
         """Detect PII in a string and return match information.
 
@@ -62,16 +219,27 @@ class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
             string (str): Text to analyse for PII.
             ignore_case (bool): Whether to ignore case when matching patterns.
                 Defaults to True.
+            overlap (str): How overlapping matches are resolved. "all" reports
+                every match from every pattern, "longest" keeps the longest of
+                any overlapping matches and "priority" keeps the match from the
+                cleaner listed first (see `Cleaner`). Defaults to "all".
 
         Returns:
             list[dict[str, str | int]]: List of dictionaries with keys 'start',
                 'end', 'text', 'type'.
         """
         if self.cleaners == ["all"]:
-            matches = _detect_pii(string, ignore_case)
+            matches = _detect_pii(
+                string, ignore_case, overlap, self.ascii_only, self._allowlist
+            )
         else:
             matches = _detect_pii_with_cleaners(
-                string, self.cleaners, ignore_case
+                string,
+                self.cleaners,
+                ignore_case,
+                overlap,
+                self.ascii_only,
+                self._allowlist,
             )
 
         # Convert to the format your original API returns
@@ -81,24 +249,56 @@ class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
         ]
 
     def detect_pii_list(
-        self, texts: list[str], ignore_case: bool = True
+        self,
+        texts: Iterable[str],
+        ignore_case: bool = True,
+        overlap: str = "all",
+        progress: Callable[[int, int, int], object] | None = None,
+        cancel: CancelToken | None = None,
     ) -> list[list[dict[str, str | int]]]:
         """Detect PII in a list of strings and return match information.
 
         Args:
-            texts (list[str]): List of strings to analyse for PII.
+            texts (Iterable[str]): Strings to analyse for PII. Any iterable of
+                strings is accepted; the text is read without being copied.
             ignore_case (bool): Whether to ignore case when matching patterns.
                 Defaults to True.
+            overlap (str): How overlapping matches are resolved. "all" reports
+                every match from every pattern, "longest" keeps the longest of
+                any overlapping matches and "priority" keeps the match from the
+                cleaner listed first (see `Cleaner`). Defaults to "all".
+            progress (Callable[[int, int, int], object] | None): Called as
+                `progress(rows_done, rows_total, bytes_done)` while the batch
+                runs, at most every 0.1 seconds and once at the end.
+                Defaults to None.
+            cancel (CancelToken | None): Token that stops the batch with
+                `concurrent.futures.CancelledError` when cancelled from
+                another thread. Defaults to None.
 
         Returns:
             list[list[dict[str, str | int]]]: List of lists of dictionaries with
                 keys 'start', 'end', 'text', 'type'.
         """
         if self.cleaners == ["all"]:
-            matches = _detect_pii_batch(texts, ignore_case)
+            matches = _detect_pii_batch(
+                texts,
+                ignore_case,
+                overlap,
+                self.ascii_only,
+                self._allowlist,
+                progress=progress,
+                cancel=cancel,
+            )
         else:
             matches = _detect_pii_with_cleaners_batch(
-                texts, self.cleaners, ignore_case
+                texts,
+                self.cleaners,
+                ignore_case,
+                overlap,
+                self.ascii_only,
+                self._allowlist,
+                progress=progress,
+                cancel=cancel,
             )
 
         # Convert to the format your original API returns
@@ -115,46 +315,103 @@ class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
         text: str,
         cleaning: str,
         ignore_case: bool = True,
+        overlap: str = "longest",
     ) -> str:
         """Clean PII from a string.
 
         Args:
             text (str): Text to clean.
-            cleaning (str): Cleaning method - either "redact" or "replace".
+            cleaning (str): Cleaning method - "redact", "replace" or
+                "pseudonymise" (requires `pseudonym_key`, see `Cleaner`).
             ignore_case (bool): Whether to ignore case when matching patterns.
                 Defaults to True.
+            overlap (str): How overlapping matches are resolved before
+                redacting or pseudonymising, either "longest" or "priority".
+                Defaults to "longest".
 
         Returns:
             str: Cleaned text with PII removed or redacted.
         """
+        if self.limits is not None:
+            cleaned, _ = self.clean_pii_list_with_limits(
+                [text], cleaning, ignore_case, overlap
+            )
+            return cleaned[0]
         # Use cleaner-specific cleaning if not using all patterns
         if self.cleaners == ["all"]:
-            return _clean_pii(text, cleaning, ignore_case, self.replace_string)
+            return _clean_pii(
+                text,
+                cleaning,
+                ignore_case,
+                self.replace_string,
+                overlap,
+                self.ascii_only,
+                self.pseudonym_key,
+                self._allowlist,
+            )
         else:
             return _clean_pii_with_cleaners(
-                text, self.cleaners, cleaning, ignore_case, self.replace_string
+                text,
+                self.cleaners,
+                cleaning,
+                ignore_case,
+                self.replace_string,
+                overlap,
+                self.ascii_only,
+                self.pseudonym_key,
+                self._allowlist,
             )
 
     def clean_pii_list(
         self,
-        texts: list[str],
+        texts: Iterable[str],
         cleaning: str,
         ignore_case: bool = True,
+        overlap: str = "longest",
+        progress: Callable[[int, int, int], object] | None = None,
+        cancel: CancelToken | None = None,
     ) -> list[str]:
         """Clean PII from a list of strings.
 
         Args:
-            texts (list[str]): List of strings to clean.
-            cleaning (str): Cleaning method to use ("redact" or "replace").
+            texts (Iterable[str]): Strings to clean. Any iterable of strings is
+                accepted; the text is read without being copied.
+            cleaning (str): Cleaning method to use ("redact", "replace" or
+                "pseudonymise").
             ignore_case (bool): Whether to ignore case when detecting PII.
                 Defaults to True.
+            overlap (str): How overlapping matches are resolved before
+                redacting or pseudonymising, either "longest" or "priority".
+                Defaults to "longest".
+            progress (Callable[[int, int, int], object] | None): Called as
+                `progress(rows_done, rows_total, bytes_done)` while the batch
+                runs, at most every 0.1 seconds and once at the end.
+                Defaults to None.
+            cancel (CancelToken | None): Token that stops the batch with
+                `concurrent.futures.CancelledError` when cancelled from
+                another thread. Defaults to None.
 
         Returns:
             list[str]: List of cleaned strings.
         """
+        if self.limits is not None:
+            cleaned, _ = self.clean_pii_list_with_limits(
+                texts, cleaning, ignore_case, overlap, progress, cancel
+            )
+            return cleaned
         if self.cleaners == ["all"]:
             return _clean_pii_batch(
-                texts, cleaning, ignore_case, self.replace_string
+                texts,
+                cleaning,
+                ignore_case,
+                self.replace_string,
+                overlap,
+                self.ascii_only,
+                self.pseudonym_key,
+                self._allowlist,
+                self.cache,
+                progress=progress,
+                cancel=cancel,
             )
         else:
             return _clean_pii_with_cleaners_batch(
@@ -163,8 +420,551 @@ class Cleaner(PolarsCleanerMixin, PandasCleanerMixin):
                 cleaning,
                 ignore_case,
                 self.replace_string,
+                overlap,
+                self.ascii_only,
+                self.pseudonym_key,
+                self._allowlist,
+                self.cache,
+                progress=progress,
+                cancel=cancel,
             )
 
+    def clean_pii_list_with_limits(
+        self,
+        texts: Iterable[str],
+        cleaning: str,
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        progress: Callable[[int, int, int], object] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> tuple[list[str], dict[int, str]]:
+        """Clean PII from a list of strings within the Cleaner's `limits`,
+        reporting the rows that hit a limit.
+
+        Rows within the limits are cleaned as by `clean_pii_list`. A row that
+        hits a limit is cleaned to the limits' fallback: replaced whole with
+        "replace", or left as it is with "skip".
+
+        Args:
+            texts (Iterable[str]): Strings to clean. Any iterable of strings is
+                accepted; the text is read without being copied.
+            cleaning (str): Cleaning method to use ("redact", "replace" or
+                "pseudonymise").
+            ignore_case (bool): Whether to ignore case when detecting PII.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved before
+                redacting or pseudonymising, either "longest" or "priority".
+                Defaults to "longest".
+            progress (Callable[[int, int, int], object] | None): Called as
+                `progress(rows_done, rows_total, bytes_done)` while the batch
+                runs, at most every 0.1 seconds and once at the end.
+                Defaults to None.
+            cancel (CancelToken | None): Token that stops the batch with
+                `concurrent.futures.CancelledError` when cancelled from
+                another thread. Defaults to None.
+
+        Returns:
+            tuple[list[str], dict[int, str]]: The cleaned strings, and the
+                position of each row that hit a limit mapped to the limit:
+                "max_bytes", "max_matches" or "time_budget".
+        """
+        cleaned, hits = _clean_pii_limited_batch(
+            texts,
+            self.cleaners,
+            cleaning,
+            self.limits if self.limits is not None else RowLimits(),
+            ignore_case,
+            self.replace_string,
+            overlap,
+            self.ascii_only,
+            self.pseudonym_key,
+            self._allowlist,
+            progress=progress,
+            cancel=cancel,
+        )
+        return cleaned, dict(hits)
+
+    def clean_and_detect_list(
+        self,
+        texts: Iterable[str],
+        cleaning: str,
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        progress: Callable[[int, int, int], object] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> tuple[list[str], list[list[dict[str, str | int]]]]:
+        """Clean PII from a list of strings and report what was cleaned.
+
+        Gives the same cleaned strings as `clean_pii_list` and the matches
+        that were removed from each, as `detect_pii_list` would report them
+        with the same `overlap`, but scans each string once. Useful when an
+        audit of what was cleaned has to be kept alongside the cleaned text.
+        The cache is not used. With the Cleaner's `limits`, a row that hits a
+        limit is cleaned to the fallback and has no matches, as it wasn't
+        fully scanned; use `clean_and_detect_list_with_limits` to find out
+        which rows did.
+
+        Args:
+            texts (Iterable[str]): Strings to clean. Any iterable of strings is
+                accepted; the text is read without being copied.
+            cleaning (str): Cleaning method to use ("redact", "replace" or
+                "pseudonymise").
+            ignore_case (bool): Whether to ignore case when detecting PII.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved before
+                redacting or pseudonymising, either "longest" or "priority".
+                Defaults to "longest".
+            progress (Callable[[int, int, int], object] | None): Called as
+                `progress(rows_done, rows_total, bytes_done)` while the batch
+                runs, at most every 0.1 seconds and once at the end.
+                Defaults to None.
+            cancel (CancelToken | None): Token that stops the batch with
+                `concurrent.futures.CancelledError` when cancelled from
+                another thread. Defaults to None.
+
+        Returns:
+            tuple[list[str], list[list[dict[str, str | int]]]]: The cleaned
+                strings, and for each a list of dictionaries with keys
+                'start', 'end', 'text', 'type' giving the positions of the
+                cleaned matches in the original string.
+        """
+        if self.limits is not None:
+            cleaned, matches, _ = self.clean_and_detect_list_with_limits(
+                texts, cleaning, ignore_case, overlap, progress, cancel
+            )
+            return cleaned, matches
+        cleaned, matches = _clean_and_detect_batch(
+            texts,
+            self.cleaners,
+            cleaning,
+            ignore_case,
+            self.replace_string,
+            overlap,
+            self.ascii_only,
+            self.pseudonym_key,
+            self._allowlist,
+            progress=progress,
+            cancel=cancel,
+        )
+        return cleaned, [
+            [
+                {"start": start, "end": end, "text": text, "type": pii_type}
+                for start, end, text, pii_type in match
+            ]
+            for match in matches
+        ]
+
+    def clean_and_detect_list_with_limits(
+        self,
+        texts: Iterable[str],
+        cleaning: str,
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        progress: Callable[[int, int, int], object] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> tuple[list[str], list[list[dict[str, str | int]]], dict[int, str]]:
+        """Clean PII from a list of strings within the Cleaner's `limits`,
+        reporting what was cleaned and the rows that hit a limit.
+
+        Rows within the limits give the same results as
+        `clean_and_detect_list`. A row that hits a limit is cleaned to the
+        limits' fallback, as by `clean_pii_list_with_limits`, and has no
+        matches.
+
+        Args:
+            texts (Iterable[str]): Strings to clean. Any iterable of strings is
+                accepted; the text is read without being copied.
+            cleaning (str): Cleaning method to use ("redact", "replace" or
+                "pseudonymise").
+            ignore_case (bool): Whether to ignore case when detecting PII.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved before
+                redacting or pseudonymising, either "longest" or "priority".
+                Defaults to "longest".
+            progress (Callable[[int, int, int], object] | None): Called as
+                `progress(rows_done, rows_total, bytes_done)` while the batch
+                runs, at most every 0.1 seconds and once at the end.
+                Defaults to None.
+            cancel (CancelToken | None): Token that stops the batch with
+                `concurrent.futures.CancelledError` when cancelled from
+                another thread. Defaults to None.
+
+        Returns:
+            tuple[list[str], list[list[dict[str, str | int]]], dict[int, str]]:
+                The cleaned strings, the cleaned matches of each as in
+                `clean_and_detect_list`, and the position of each row that hit
+                a limit mapped to the limit: "max_bytes", "max_matches" or
+                "time_budget".
+        """
+        cleaned, matches, hits = _clean_and_detect_limited_batch(
+            texts,
+            self.cleaners,
+            cleaning,
+            self.limits if self.limits is not None else RowLimits(),
+            ignore_case,
+            self.replace_string,
+            overlap,
+            self.ascii_only,
+            self.pseudonym_key,
+            self._allowlist,
+            progress=progress,
+            cancel=cancel,
+        )
+        return (
+            cleaned,
+            [
+                [
+                    {"start": start, "end": end, "text": text, "type": pii_type}
+                    for start, end, text, pii_type in match
+                ]
+                for match in matches
+            ],
+            dict(hits),
+        )
+
+    def clean_json(
+        self,
+        text: str,
+        cleaning: str,
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        clean_keys: bool = False,
+    ) -> str:
+        """Clean PII from the string values of a JSON document.
+
+        The document is parsed and rewritten in Rust. Only strings that
+        change are re-encoded, so whitespace, key order and number formatting
+        are kept as they were.
+
+        Args:
+            text (str): JSON document to clean.
+            cleaning (str): Cleaning method to use ("redact", "replace" or
+                "pseudonymise"). "replace" replaces whole string values.
+            ignore_case (bool): Whether to ignore case when detecting PII.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved, either
+                "longest" or "priority". Defaults to "longest".
+            include (list[str] | None): Dotted key paths such as
+                "user.email" or "messages.*.body" to clean. Array elements
+                are matched by index or "*". If given, everything else is
+                left as it is without being scanned. Defaults to None.
+            exclude (list[str] | None): Dotted key paths never to clean,
+                taking precedence over `include`. Defaults to None.
+            clean_keys (bool): Whether to clean object keys as well as
+                values. Paths are matched against the original keys.
+                Defaults to False.
+
+        Returns:
+            str: The cleaned JSON document.
+
+        Raises:
+            ValueError: If the text is not valid JSON.
+        """
+        return _clean_json(
+            text,
+            self.cleaners,
+            cleaning,
+            ignore_case,
+            self.replace_string,
+            overlap,
+            self.ascii_only,
+            self.pseudonym_key,
+            self._allowlist,
+            include,
+            exclude,
+            clean_keys,
+        )
+
+    def clean_json_list(
+        self,
+        texts: Iterable[str],
+        cleaning: str,
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        clean_keys: bool = False,
+    ) -> list[str]:
+        """Clean PII from the string values of a list of JSON documents.
+
+        Documents are cleaned in parallel; see `clean_json` for the
+        arguments.
+
+        Returns:
+            list[str]: The cleaned JSON documents.
+
+        Raises:
+            ValueError: If any text is not valid JSON.
+        """
+        return _clean_json_batch(
+            texts,
+            self.cleaners,
+            cleaning,
+            ignore_case,
+            self.replace_string,
+            overlap,
+            self.ascii_only,
+            self.pseudonym_key,
+            self._allowlist,
+            include,
+            exclude,
+            clean_keys,
+        )
+
+    def detect_pii_iter(
+        self,
+        texts: Iterable[str],
+        ignore_case: bool = True,
+        overlap: str = "all",
+        chunk_size: int = 10_000,
+        max_in_flight: int = 2,
+    ) -> Iterator[list[dict[str, str | int]]]:
+        """Lazily detect PII in a stream of strings.
+
+        Input is pulled in chunks of `chunk_size` strings. Each chunk is
+        processed in parallel in Rust while the next one is being read, and
+        results are yielded one per input string, in order.
+
+        Args:
+            texts (Iterable[str]): Strings to analyse for PII. Can be any
+                iterable, including generators and file objects.
+            ignore_case (bool): Whether to ignore case when matching patterns.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved. "all" reports
+                every match from every pattern, "longest" keeps the longest of
+                any overlapping matches and "priority" keeps the match from the
+                cleaner listed first (see `Cleaner`). Defaults to "all".
+            chunk_size (int): Number of strings per batch. Defaults to 10,000.
+            max_in_flight (int): Maximum number of chunks held in memory at
+                once, bounding memory use. Defaults to 2.
+
+        Yields:
+            list[dict[str, str | int]]: Matches for each string, with keys
+                'start', 'end', 'text', 'type'.
+        """
+        return _map_chunks(
+            lambda chunk: self.detect_pii_list(chunk, ignore_case, overlap),
+            texts,
+            chunk_size,
+            max_in_flight,
+        )
+
+    def clean_pii_iter(
+        self,
+        texts: Iterable[str],
+        cleaning: str,
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        chunk_size: int = 10_000,
+        max_in_flight: int = 2,
+    ) -> Iterator[str]:
+        """Lazily clean PII from a stream of strings.
+
+        Input is pulled in chunks of `chunk_size` strings. Each chunk is
+        cleaned in parallel in Rust while the next one is being read, and
+        cleaned strings are yielded in the same order as the input.
+
+        Args:
+            texts (Iterable[str]): Strings to clean. Can be any iterable,
+                including generators and file objects.
+            cleaning (str): Cleaning method to use ("redact", "replace" or
+                "pseudonymise").
+            ignore_case (bool): Whether to ignore case when detecting PII.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved before
+                redacting or pseudonymising, either "longest" or "priority".
+                Defaults to "longest".
+            chunk_size (int): Number of strings per batch. Defaults to 10,000.
+            max_in_flight (int): Maximum number of chunks held in memory at
+                once, bounding memory use. Defaults to 2.
+
+        Yields:
+            str: Cleaned strings.
+        """
+        return _map_chunks(
+            lambda chunk: self.clean_pii_list(
+                chunk, cleaning, ignore_case, overlap
+            ),
+            texts,
+            chunk_size,
+            max_in_flight,
+        )
+
+    def stream(
+        self,
+        cleaning: str = "redact",
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        max_match_len: int = 256,
+    ) -> StreamingCleaner:
+        """Create a cleaner for text that arrives in pieces.
+
+        Calling `clean_pii` on each piece misses PII split across pieces.
+        The returned `StreamingCleaner` has `feed(chunk)`, which returns the
+        cleaned text that is safe to emit so far, and `finish()`, which
+        returns the rest. Only a short tail is held back between calls, so
+        memory use doesn't grow with the length of the stream.
+
+        Args:
+            cleaning (str): Cleaning method - "redact" or "pseudonymise".
+                "replace" swaps whole texts, so it can't be streamed.
+                Defaults to "redact".
+            ignore_case (bool): Whether to ignore case when matching patterns.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved, either
+                "longest" or "priority". Defaults to "longest".
+            max_match_len (int): Length in bytes of the longest match that
+                is guaranteed to be found when split across chunks. At least
+                this much text is held back. Defaults to 256.
+
+        Returns:
+            StreamingCleaner: Stateful cleaner for a single stream.
+        """
+        return StreamingCleaner(
+            self.cleaners,
+            cleaning,
+            ignore_case,
+            overlap,
+            self.ascii_only,
+            self.pseudonym_key,
+            self._allowlist,
+            max_match_len,
+        )
+
+    def batcher(
+        self,
+        cleaning: str = "redact",
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        max_batch_size: int = 256,
+        max_delay_us: int = 500,
+    ) -> MicroBatcher:
+        """Create a micro-batcher for many concurrent single-text calls.
+
+        Services that clean one text per request pay the cost of a call into
+        Rust each time and never use the parallel batch functions. A
+        `MicroBatcher` queues texts from any number of threads (`clean`) or
+        asyncio tasks (`clean_async`), cleans them together with
+        `clean_pii_list`, and hands each caller its own result. Call `close`,
+        or use it as a context manager, to stop its background thread.
+
+        Args:
+            cleaning (str): Cleaning method - "redact", "replace" or
+                "pseudonymise". Defaults to "redact".
+            ignore_case (bool): Whether to ignore case when matching patterns.
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved, either
+                "longest" or "priority". Defaults to "longest".
+            max_batch_size (int): Most texts cleaned in one batch. Defaults
+                to 256.
+            max_delay_us (int): Longest time, in microseconds, a text waits
+                for others to join its batch. Higher values give bigger
+                batches under load at the cost of latency. Defaults to 500.
+
+        Returns:
+            MicroBatcher: Batcher that cleans with this Cleaner's settings.
+        """
+        # Check the arguments now rather than failing every queued call
+        self.clean_pii("", cleaning, ignore_case, overlap)
+
+        def _clean_batch(texts: list[str]) -> list[str]:
+            return self.clean_pii_list(texts, cleaning, ignore_case, overlap)
+
+        return MicroBatcher(_clean_batch, max_batch_size, max_delay_us)
+
+    def build_index(
+        self,
+        texts: Iterable[str],
+        row_ids: Iterable[int] | None = None,
+        ignore_case: bool = True,
+    ) -> PiiIndex:
+        """Detect PII once and index every value by the rows it appears in.
+
+        The index maps a hash of each normalised value (lowercased, without
+        whitespace, hyphens or brackets) to the rows and spans where it was
+        found, so a subject access or erasure request can be answered with
+        `PiiIndex.rows` instead of re-running detection. New batches can be
+        added with `PiiIndex.append`, and the index saved with
+        `PiiIndex.save` and reloaded with `PiiIndex.load`. Allowlisted values
+        are left out, and the allowlist is saved with the index.
+
+        The hash is unkeyed, so it isn't anonymisation: values such as
+        National Insurance or phone numbers can be hashed one by one until a
+        key in the index matches. Protect a saved index like the data it was
+        built from.
+
+        Args:
+            texts (Iterable[str]): Strings to index.
+            row_ids (Iterable[int] | None): Non-negative ID for each text,
+                such as a primary key. If None, rows are numbered from 0.
+                Defaults to None.
+            ignore_case (bool): Whether to ignore case when matching patterns.
+                Defaults to True.
+
+        Returns:
+            PiiIndex: Index of the PII found in `texts`.
+        """
+        index = PiiIndex(
+            self.cleaners, ignore_case, self.ascii_only, self._allowlist
+        )
+        index.append(texts, None if row_ids is None else list(row_ids))
+        return index
+
+    def heavy_hitters(
+        self,
+        texts: Iterable[str],
+        k: int = 100,
+        epsilon: float = 1e-4,
+        delta: float = 1e-3,
+        hash_values: bool = False,
+        ignore_case: bool = True,
+    ) -> HeavyHitters:
+        """Count the PII values found in fixed memory and keep the most
+        frequent of each type.
+
+        Values are counted by their normalised form, as in `build_index`, in
+        a Count-Min sketch whose size depends only on `epsilon` and `delta`.
+        Values in the Cleaner's allowlist are not counted. More batches can
+        be counted with `HeavyHitters.update`, and sketches counted
+        separately, for example in other processes, combined with
+        `HeavyHitters.merge` if they share the same allowlist. A sketch
+        pickles as its bytes, also available from `HeavyHitters.to_bytes`.
+
+        Args:
+            texts (Iterable[str]): Strings to count PII values in.
+            k (int): Number of values kept for each PII type. Defaults to 100.
+            epsilon (float): Counts are overestimated by at most `epsilon`
+                times the number of matches counted, with probability
+                `1 - delta`. The sketch uses `8 * ceil(e / epsilon) *
+                ceil(ln(1 / delta))` bytes. Defaults to 1e-4.
+            delta (float): Probability that a count misses the `epsilon`
+                bound. Defaults to 1e-3.
+            hash_values (bool): Keep only a hash of each value, reported in
+                hex by `HeavyHitters.top`, rather than the value itself. The
+                hash is unkeyed, as in `build_index`, so values can be
+                recovered by hashing likely candidates until one matches;
+                treat a hashed sketch as sensitive. Defaults to False.
+            ignore_case (bool): Whether to ignore case when matching patterns.
+                Defaults to True.
+
+        Returns:
+            HeavyHitters: Sketch of the PII values found in `texts`.
+        """
+        sketch = HeavyHitters(
+            self.cleaners,
+            k,
+            epsilon,
+            delta,
+            hash_values,
+            ignore_case,
+            self.ascii_only,
+            self._allowlist,
+        )
+        sketch.update(texts)
+        return sketch
+
     @staticmethod
     def get_available_cleaners():
         """Get list of available cleaner names.
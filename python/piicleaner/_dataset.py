@@ -0,0 +1,293 @@
+"""Parquet dataset extensions for PII cleaning"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from piicleaner._internal import clean_pii_arrow, config_fingerprint
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+MANIFEST_NAME = "_piicleaner_manifest.json"
+
+
+def _source_state(path: Path) -> dict[str, int]:
+    """Size and modification time of a source file, to detect changes."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class _Manifest:
+    """Record of the files a `clean_dataset` run has completed.
+
+    Saved after every file, by writing a temporary file and renaming it over
+    the manifest, so an interrupted run always leaves a readable manifest.
+    """
+
+    def __init__(self, path: Path, settings: dict):
+        self.path = path
+        self.settings = settings
+        self.files = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, settings: dict) -> _Manifest:
+        """Load the manifest at `path`, ignoring runs with other settings."""
+        manifest = cls(path, settings)
+        if path.exists():
+            saved = json.loads(path.read_text())
+            if saved.get("settings") == settings:
+                manifest.files = saved.get("files", {})
+        return manifest
+
+    def is_done(self, relative: str, state: dict[str, int]) -> bool:
+        return self.files.get(relative, {}).get("source") == state
+
+    def mark_done(self, relative: str, state: dict[str, int], n_rows: int):
+        with self._lock:
+            self.files[relative] = {"source": state, "rows": n_rows}
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {"settings": self.settings, "files": self.files}, indent=2
+                )
+            )
+            os.replace(tmp_path, self.path)
+
+
+class DatasetCleanerMixin:
+    """Mixin class to add Parquet dataset functionality to Cleaner"""
+
+    def clean_dataset(
+        self,
+        src_dir: str | os.PathLike[str],
+        dst_dir: str | os.PathLike[str],
+        columns: str | list[str],
+        cleaning: str,
+        ignore_case: bool = True,
+        max_workers: int | None = None,
+    ) -> dict[str, list[str]]:
+        """Clean PII in text columns of a directory of Parquet files.
+
+        Every `.parquet` file under `src_dir` is cleaned into the same
+        relative path under `dst_dir`, so partition directories such as
+        `year=2024/` are kept. Files are processed in parallel, each one row
+        group at a time, so memory use is bounded by `max_workers` row groups
+        rather than the size of the dataset. Row groups and the schema,
+        including the other columns, are written unchanged.
+
+        Completed files are recorded in a manifest in `dst_dir`. If a run is
+        interrupted, running it again with the same settings skips files
+        that are done and whose source hasn't changed since. The settings
+        include the Cleaner's replacement string, pseudonym key, allowlist,
+        dictionaries and limits, through the fingerprint that keys a
+        `CleanCache`, so the manifest never holds the key itself.
+
+        Args:
+            src_dir (str | os.PathLike[str]): Directory of Parquet files.
+            dst_dir (str | os.PathLike[str]): Directory for the cleaned
+                files. Created if it doesn't exist.
+            columns (str | list[str]): String column or columns to clean.
+            cleaning (str): Cleaning method ("redact", "replace" or
+                "pseudonymise").
+            ignore_case (bool): Whether to ignore case when detecting PII.
+                Defaults to True.
+            max_workers (int | None): Number of files processed at once. If
+                None, uses the number of CPUs. Defaults to None.
+
+        Returns:
+            dict[str, list[str]]: Relative paths of the files "cleaned" by
+                this run and of those "skipped" as already done.
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for dataset operations")
+
+        src_dir = Path(src_dir)
+        dst_dir = Path(dst_dir)
+        if not src_dir.is_dir():
+            raise ValueError(f"Source directory '{src_dir}' not found")
+        if src_dir.resolve() == dst_dir.resolve():
+            raise ValueError("`dst_dir` must be different from `src_dir`")
+        if isinstance(columns, str):
+            columns = [columns]
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("`max_workers` must be a positive integer")
+
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        settings = {
+            "cleaners": self.cleaners,
+            "columns": columns,
+            "cleaning": cleaning,
+            "ignore_case": ignore_case,
+            "ascii_only": self.ascii_only,
+            "config": config_fingerprint(
+                self.cleaners,
+                cleaning,
+                ignore_case,
+                self.replace_string,
+                "longest",
+                self.ascii_only,
+                self.pseudonym_key,
+                self._allowlist,
+            ),
+            "limits": None
+            if self.limits is None
+            else {
+                "max_bytes": self.limits.max_bytes,
+                "max_matches": self.limits.max_matches,
+                "time_budget_ms": self.limits.time_budget_ms,
+                "fallback": self.limits.fallback,
+            },
+        }
+        manifest = _Manifest.load(dst_dir / MANIFEST_NAME, settings)
+
+        cleaned = []
+        skipped = []
+        pending = []
+        for src_path in sorted(src_dir.rglob("*.parquet")):
+            relative = src_path.relative_to(src_dir).as_posix()
+            state = _source_state(src_path)
+            if (
+                manifest.is_done(relative, state)
+                and (dst_dir / relative).exists()
+            ):
+                skipped.append(relative)
+            else:
+                pending.append((relative, state))
+
+        def _clean_one(relative: str, state: dict[str, int]):
+            n_rows = self._clean_parquet_file(
+                src_dir / relative,
+                dst_dir / relative,
+                columns,
+                cleaning,
+                ignore_case,
+            )
+            manifest.mark_done(relative, state, n_rows)
+            return relative
+
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_clean_one, relative, state)
+                for relative, state in pending
+            ]
+            for future in futures:
+                cleaned.append(future.result())
+
+        return {"cleaned": cleaned, "skipped": skipped}
+
+    def _clean_parquet_file(
+        self,
+        src_path: Path,
+        dst_path: Path,
+        columns: list[str],
+        cleaning: str,
+        ignore_case: bool,
+    ) -> int:
+        """Clean one Parquet file row group by row group, returning its rows.
+
+        The output is written to a temporary file and renamed into place when
+        complete, so a partly written file is never mistaken for a result.
+        """
+        source = pq.ParquetFile(src_path)
+        schema = source.schema_arrow
+        for column in columns:
+            if column not in schema.names:
+                raise ValueError(f"Column '{column}' not found in '{src_path}'")
+            if not (
+                pa.types.is_string(schema.field(column).type)
+                or pa.types.is_large_string(schema.field(column).type)
+            ):
+                raise TypeError(
+                    f"Column '{column}' in '{src_path}' is not a string column"
+                )
+
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dst_path.with_name(dst_path.name + ".tmp")
+        n_rows = 0
+        try:
+            with pq.ParquetWriter(tmp_path, schema) as writer:
+                for i in range(source.num_row_groups):
+                    table = source.read_row_group(i)
+                    for column in columns:
+                        index = table.schema.get_field_index(column)
+                        table = table.set_column(
+                            index,
+                            table.schema.field(index),
+                            self._clean_arrow_column(
+                                table.column(index), cleaning, ignore_case
+                            ),
+                        )
+                    # Keep the source's row groups
+                    writer.write_table(
+                        table, row_group_size=table.num_rows or None
+                    )
+                    n_rows += table.num_rows
+            os.replace(tmp_path, dst_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return n_rows
+
+    def _clean_arrow_column(
+        self, column: pa.ChunkedArray, cleaning: str, ignore_case: bool
+    ) -> pa.ChunkedArray:
+        """Clean an Arrow string column chunk by chunk from its buffers.
+
+        The text is read straight from each chunk's offsets and data buffers,
+        and the cleaned array rebuilt from the buffers returned, so no Python
+        string is made per row. Null rows are masked back afterwards.
+        """
+        chunks = []
+        for chunk in column.chunks:
+            if len(chunk) == 0:
+                chunks.append(chunk)
+                continue
+            _, offsets, data = chunk.buffers()
+            cleaned_offsets, cleaned_data = clean_pii_arrow(
+                offsets.to_pybytes(),
+                b"" if data is None else data.to_pybytes(),
+                pa.types.is_large_string(chunk.type),
+                chunk.offset,
+                len(chunk),
+                self.cleaners,
+                cleaning,
+                ignore_case,
+                self.replace_string,
+                "longest",
+                self.ascii_only,
+                self.pseudonym_key,
+                self._allowlist,
+                self.cache,
+                self.limits,
+            )
+            cleaned = pa.Array.from_buffers(
+                chunk.type,
+                len(chunk),
+                [
+                    None,
+                    pa.py_buffer(cleaned_offsets),
+                    pa.py_buffer(cleaned_data),
+                ],
+            )
+            if chunk.null_count:
+                cleaned = pc.if_else(
+                    chunk.is_valid(), cleaned, pa.scalar(None, chunk.type)
+                )
+            chunks.append(cleaned)
+        return pa.chunked_array(chunks, type=column.type)
@@ -1,7 +1,203 @@
 """Type stubs for the Rust _internal module"""
 
+import os
+from collections.abc import Callable, Iterable
+from types import TracebackType
+
+import polars as pl
+
+class Allowlist:
+    """Values that are never reported or cleaned, built once and passed to the
+    detection and cleaning functions as `allowlist`"""
+
+    def __init__(
+        self, values: Iterable[str], normalise: bool = False
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, value: str) -> bool: ...
+    def __reduce__(self) -> tuple[type[Allowlist], tuple[list[str], bool]]: ...
+
+class CancelToken:
+    """Token that stops a batch call between chunks when cancelled, from any
+    thread"""
+
+    def __init__(self) -> None: ...
+    def cancel(self) -> None:
+        """Ask batch calls using this token to stop"""
+        ...
+    @property
+    def cancelled(self) -> bool: ...
+
+class CleanCache:
+    """Cache of cleaned texts saved to a file, passed to the batch cleaning
+    functions as `cache`
+
+    Its keys mix in a random secret saved to `<path>.key`; both files are
+    sensitive."""
+
+    def __init__(
+        self, path: str | os.PathLike[str], max_bytes: int = 268435456
+    ) -> None: ...
+    def save(self) -> None:
+        """Write the cache to its file, and its secret to the key file"""
+        ...
+    def clear(self) -> None:
+        """Remove every entry and reset the hit counts"""
+        ...
+    def stats(self) -> dict[str, int | float]:
+        """Hits, misses and size of the cache, and the hit rate since it was
+        opened"""
+        ...
+    def __len__(self) -> int: ...
+    def __enter__(self) -> CleanCache: ...
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool: ...
+
+class RowLimits:
+    """Limits on the work spent cleaning one row, passed to
+    `clean_pii_limited_batch` as `limits`"""
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        max_matches: int | None = None,
+        time_budget_ms: float | None = None,
+        fallback: str = "replace",
+    ) -> None: ...
+    @property
+    def max_bytes(self) -> int | None: ...
+    @property
+    def max_matches(self) -> int | None: ...
+    @property
+    def time_budget_ms(self) -> float | None: ...
+    @property
+    def fallback(self) -> str: ...
+    def __reduce__(
+        self,
+    ) -> tuple[
+        type[RowLimits], tuple[int | None, int | None, float | None, str]
+    ]: ...
+
+class StreamingCleaner:
+    """Cleans text that arrives in pieces, finding PII split across chunks"""
+
+    def __init__(
+        self,
+        cleaners: list[str] = ...,
+        cleaning: str = "redact",
+        ignore_case: bool = True,
+        overlap: str = "longest",
+        ascii_only: bool = False,
+        pseudonym_key: str | None = None,
+        allowlist: Allowlist | None = None,
+        max_match_len: int = 256,
+    ) -> None: ...
+    def feed(self, chunk: str) -> str:
+        """Add a chunk and return the cleaned text that is now safe to emit"""
+        ...
+    def finish(self) -> str:
+        """Clean and return everything held back, ending the stream"""
+        ...
+    @property
+    def pending(self) -> int:
+        """Bytes received but held back"""
+        ...
+
+class HeavyHitters:
+    """Most frequent PII values of each type, counted in a fixed-size
+    Count-Min sketch"""
+
+    def __init__(
+        self,
+        cleaners: list[str] = ...,
+        k: int = 100,
+        epsilon: float = 1e-4,
+        delta: float = 1e-3,
+        hash_values: bool = False,
+        ignore_case: bool = True,
+        ascii_only: bool = False,
+        allowlist: Allowlist | None = None,
+    ) -> None: ...
+    def update(self, texts: Iterable[str]) -> None:
+        """Detect PII in a batch of texts and count every match"""
+        ...
+    def merge(self, other: HeavyHitters) -> None:
+        """Add the counts of another sketch with the same size, cleaners,
+        allowlist and options"""
+        ...
+    def top(self, pii_type: str | None = None) -> list[tuple[str, str, int]]:
+        """The heavy hitters as `(type, value, count)`, highest count first,
+        with the value's unkeyed hash in hex in place of the value if
+        `hash_values` was set"""
+        ...
+    def estimate(self, value: str, pii_type: str) -> int:
+        """Estimated number of times a value was found as the given type"""
+        ...
+    def to_bytes(self) -> bytes:
+        """The sketch as bytes, for `HeavyHitters.from_bytes`"""
+        ...
+    @staticmethod
+    def from_bytes(data: bytes) -> HeavyHitters:
+        """Load a sketch from the bytes of `to_bytes`"""
+        ...
+    def __reduce__(self) -> tuple[object, tuple[bytes]]: ...
+    @property
+    def cleaners(self) -> list[str]: ...
+    @property
+    def k(self) -> int: ...
+    @property
+    def width(self) -> int: ...
+    @property
+    def depth(self) -> int: ...
+    @property
+    def n_matches(self) -> int: ...
+    @property
+    def max_error(self) -> float: ...
+
+class PiiIndex:
+    """Inverted index from detected PII values to the rows that contain them"""
+
+    def __init__(
+        self,
+        cleaners: list[str] = ...,
+        ignore_case: bool = True,
+        ascii_only: bool = False,
+        allowlist: Allowlist | None = None,
+    ) -> None: ...
+    def append(
+        self, texts: Iterable[str], row_ids: list[int] | None = None
+    ) -> None:
+        """Detect PII in a batch of texts and add every match to the index"""
+        ...
+    def lookup(self, value: str) -> list[tuple[int, int, int, str]]:
+        """Every occurrence of a value as `(row, start, end, type)`"""
+        ...
+    def rows(self, value: str) -> list[int]:
+        """Distinct IDs of the rows containing a value, sorted"""
+        ...
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Save the index so it can be reloaded with `PiiIndex.load`"""
+        ...
+    @staticmethod
+    def load(path: str | os.PathLike[str]) -> PiiIndex:
+        """Load an index written by `save`"""
+        ...
+    @property
+    def cleaners(self) -> list[str]: ...
+    @property
+    def n_rows(self) -> int: ...
+    def __len__(self) -> int: ...
+
 def detect_pii(
-    text: str, ignore_case: bool = True
+    text: str,
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    allowlist: Allowlist | None = None,
 ) -> list[tuple[int, int, str, str]]:
     """Detect PII in a string and return match information"""
     ...
@@ -11,12 +207,21 @@ def clean_pii(
     cleaning: str,
     ignore_case: bool = True,
     replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
 ) -> str:
     """Clean PII from a string using the specified method"""
     ...
 
 def detect_pii_with_cleaners(
-    text: str, cleaners: list[str], ignore_case: bool = True
+    text: str,
+    cleaners: list[str],
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    allowlist: Allowlist | None = None,
 ) -> list[tuple[int, int, str, str]]:
     """Detect PII with specific cleaners"""
     ...
@@ -27,6 +232,10 @@ def clean_pii_with_cleaners(
     cleaning: str,
     ignore_case: bool = True,
     replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
 ) -> str:
     """Clean PII with specific cleaners"""
     ...
@@ -35,33 +244,318 @@ def get_available_cleaners() -> list[str]:
     """Get list of available cleaner names"""
     ...
 
+def config_fingerprint(
+    cleaners: list[str],
+    cleaning: str,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+) -> str:
+    """Hex fingerprint of everything that affects the result of cleaning, the
+    same one that keys a `CleanCache`"""
+    ...
+
+def register_dictionary(
+    name: str,
+    values: Iterable[str],
+    case_insensitive: bool = True,
+    word_boundary: bool = True,
+) -> None:
+    """Register a dictionary cleaner built from a list of literal values"""
+    ...
+
+def register_dictionary_file(
+    name: str,
+    path: str | os.PathLike[str],
+    case_insensitive: bool = True,
+    word_boundary: bool = True,
+) -> None:
+    """Register a dictionary cleaner from a file with one value per line"""
+    ...
+
+def save_dictionary(name: str, path: str | os.PathLike[str]) -> None:
+    """Save a registered dictionary so it can be reloaded quickly"""
+    ...
+
+def load_dictionary(name: str, path: str | os.PathLike[str]) -> None:
+    """Load a dictionary written by `save_dictionary` and register it"""
+    ...
+
+def remove_dictionary(name: str) -> bool:
+    """Remove a registered dictionary, returning whether it existed"""
+    ...
+
+def dictionary_to_bytes(name: str) -> bytes:
+    """A registered dictionary in the format written by `save_dictionary`"""
+    ...
+
+def register_dictionary_bytes(name: str, data: bytes) -> None:
+    """Register a dictionary from the bytes of `dictionary_to_bytes`, unless
+    the same dictionary is already registered under `name`"""
+    ...
+
+def precompile_patterns(ignore_case: bool | None = None) -> None:
+    """Compile the built-in patterns now rather than on first use"""
+    ...
+
 def detect_pii_batch(
-    texts: list[str], ignore_case: bool = True
+    texts: Iterable[str],
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    allowlist: Allowlist | None = None,
+    progress: Callable[[int, int, int], object] | None = None,
+    cancel: CancelToken | None = None,
 ) -> list[list[tuple[int, int, str, str]]]:
     """Vectorised detect PII for multiple texts"""
     ...
 
 def clean_pii_batch(
-    texts: list[str],
+    texts: Iterable[str],
     cleaning: str,
     ignore_case: bool = True,
     replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    cache: CleanCache | None = None,
+    progress: Callable[[int, int, int], object] | None = None,
+    cancel: CancelToken | None = None,
 ) -> list[str]:
     """Vectorised clean PII for multiple texts"""
     ...
 
 def detect_pii_with_cleaners_batch(
-    texts: list[str], cleaners: list[str], ignore_case: bool = True
+    texts: Iterable[str],
+    cleaners: list[str],
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    allowlist: Allowlist | None = None,
+    progress: Callable[[int, int, int], object] | None = None,
+    cancel: CancelToken | None = None,
 ) -> list[list[tuple[int, int, str, str]]]:
     """Vectorised detect PII with specific cleaners for multiple texts"""
     ...
 
+def detect_pii_series(
+    texts: pl.Series,
+    cleaners: list[str],
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    null_as_empty: bool = False,
+    allowlist: Allowlist | None = None,
+) -> pl.Series:
+    """Detect PII in a Polars Series, returning a list-of-struct Series"""
+    ...
+
+def detect_pii_arrow(
+    texts: Iterable[str],
+    cleaners: list[str],
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    allowlist: Allowlist | None = None,
+) -> tuple[bytes, bytes, bytes, bytes, bytes, bytes, list[str], int]:
+    """Vectorised detect PII with specific cleaners, returning the buffers of
+    an Arrow list-of-struct array"""
+    ...
+
 def clean_pii_with_cleaners_batch(
-    texts: list[str],
+    texts: Iterable[str],
     cleaners: list[str],
     cleaning: str,
     ignore_case: bool = True,
     replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    cache: CleanCache | None = None,
+    progress: Callable[[int, int, int], object] | None = None,
+    cancel: CancelToken | None = None,
 ) -> list[str]:
     """Vectorised clean PII with specific cleaners for multiple texts"""
     ...
+
+def clean_pii_series(
+    texts: pl.Series,
+    cleaners: list[str],
+    cleaning: str,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    cache: CleanCache | None = None,
+    limits: RowLimits | None = None,
+) -> pl.Series:
+    """Clean PII in a Polars Series, including strings nested in `List` and
+    `Struct` columns"""
+    ...
+
+def clean_pii_arrow(
+    offsets: bytes,
+    data: bytes,
+    large: bool,
+    offset: int,
+    length: int,
+    cleaners: list[str],
+    cleaning: str,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    cache: CleanCache | None = None,
+    limits: RowLimits | None = None,
+) -> tuple[bytes, bytes]:
+    """Clean PII in an Arrow string array given as its offsets and data
+    buffers, returning those of the cleaned array"""
+    ...
+
+def clean_pii_limited_batch(
+    texts: Iterable[str],
+    cleaners: list[str],
+    cleaning: str,
+    limits: RowLimits,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    progress: Callable[[int, int, int], object] | None = None,
+    cancel: CancelToken | None = None,
+) -> tuple[list[str], list[tuple[int, str]]]:
+    """Vectorised clean PII with specific cleaners within per-row limits, also
+    returning `(row, limit)` for each row that hit a limit"""
+    ...
+
+def clean_and_detect_batch(
+    texts: Iterable[str],
+    cleaners: list[str],
+    cleaning: str,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    progress: Callable[[int, int, int], object] | None = None,
+    cancel: CancelToken | None = None,
+) -> tuple[list[str], list[list[tuple[int, int, str, str]]]]:
+    """Vectorised clean PII with specific cleaners, also returning the matches
+    that were cleaned in each text, from one scan"""
+    ...
+
+def clean_and_detect_limited_batch(
+    texts: Iterable[str],
+    cleaners: list[str],
+    cleaning: str,
+    limits: RowLimits,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    progress: Callable[[int, int, int], object] | None = None,
+    cancel: CancelToken | None = None,
+) -> tuple[
+    list[str], list[list[tuple[int, int, str, str]]], list[tuple[int, str]]
+]:
+    """Vectorised clean PII with specific cleaners within per-row limits, also
+    returning the matches cleaned in each text and `(row, limit)` for each row
+    that hit a limit"""
+    ...
+
+def clean_and_detect_series(
+    texts: pl.Series,
+    detected_name: str,
+    cleaners: list[str],
+    cleaning: str,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    limits: RowLimits | None = None,
+    null_as_empty: bool = False,
+) -> tuple[pl.Series, pl.Series]:
+    """Clean PII in a Polars string Series, also returning a list-of-struct
+    Series of the matches that were cleaned, from one scan"""
+    ...
+
+def clean_json(
+    text: str,
+    cleaners: list[str],
+    cleaning: str,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    clean_keys: bool = False,
+) -> str:
+    """Clean PII in the string values of a JSON document"""
+    ...
+
+def clean_json_batch(
+    texts: Iterable[str],
+    cleaners: list[str],
+    cleaning: str,
+    ignore_case: bool = True,
+    replace_string: str | None = None,
+    overlap: str = "longest",
+    ascii_only: bool = False,
+    pseudonym_key: str | None = None,
+    allowlist: Allowlist | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    clean_keys: bool = False,
+) -> list[str]:
+    """Clean PII in the string values of a batch of JSON documents in
+    parallel"""
+    ...
+
+def profile_batch(
+    columns: Iterable[Iterable[str]],
+    cleaners: list[str],
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    allowlist: Allowlist | None = None,
+    sample_size: int | None = None,
+    tolerance: float | None = None,
+    seed: int = 0,
+) -> list[tuple[int, str, int, int, int]]:
+    """Profile the PII types found in several columns of texts, as rows of
+    (column position, type, rows scanned, rows matched, matches)"""
+    ...
+
+def profile_series(
+    columns: list[pl.Series],
+    cleaners: list[str],
+    ignore_case: bool = True,
+    overlap: str = "all",
+    ascii_only: bool = False,
+    allowlist: Allowlist | None = None,
+    sample_size: int | None = None,
+    tolerance: float | None = None,
+    seed: int = 0,
+) -> list[tuple[int, str, int, int, int]]:
+    """Profile the PII types found in several Polars Series, see
+    `profile_batch`"""
+    ...
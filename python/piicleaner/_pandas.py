@@ -4,9 +4,16 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from piicleaner._internal import (
+    detect_pii_arrow as _detect_pii_arrow,
+    profile_batch as _profile_batch,
+)
+
 if TYPE_CHECKING:
     import pandas as pd
 
+    from piicleaner._internal import Allowlist
+
 try:
     import pandas as pd
 
@@ -15,6 +22,83 @@ except ImportError:
     PANDAS_AVAILABLE = False
 
 
+def _check_dtype_backend(dtype_backend: str | None):
+    """Validate the `dtype_backend` argument of the detection methods."""
+    if dtype_backend not in (None, "pyarrow"):
+        raise ValueError("`dtype_backend` must be None or 'pyarrow'")
+    if dtype_backend == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for dtype_backend='pyarrow'"
+            ) from None
+
+
+def _detect_arrow_series(
+    texts: list[str],
+    cleaners: list[str],
+    ignore_case: bool,
+    overlap: str,
+    ascii_only: bool,
+    index: pd.Index,
+    name: str,
+    allowlist: Allowlist | None = None,
+) -> pd.Series:
+    """Detect PII and return the matches as an Arrow-backed Series.
+
+    The Series has dtype `list<struct<start: uint32, end: uint32, text:
+    string, type: dictionary<int32, string>>>`, wrapping buffers built in
+    Rust without creating a Python object per match.
+    """
+    import pyarrow as pa
+
+    (
+        offsets,
+        starts,
+        ends,
+        text_offsets,
+        text_data,
+        type_codes,
+        type_names,
+        n_matches,
+    ) = _detect_pii_arrow(
+        texts, cleaners, ignore_case, overlap, ascii_only, allowlist
+    )
+
+    matches = pa.StructArray.from_arrays(
+        [
+            pa.Array.from_buffers(
+                pa.uint32(), n_matches, [None, pa.py_buffer(starts)]
+            ),
+            pa.Array.from_buffers(
+                pa.uint32(), n_matches, [None, pa.py_buffer(ends)]
+            ),
+            pa.Array.from_buffers(
+                pa.string(),
+                n_matches,
+                [None, pa.py_buffer(text_offsets), pa.py_buffer(text_data)],
+            ),
+            pa.DictionaryArray.from_arrays(
+                pa.Array.from_buffers(
+                    pa.int32(), n_matches, [None, pa.py_buffer(type_codes)]
+                ),
+                pa.array(type_names, type=pa.string()),
+            ),
+        ],
+        names=["start", "end", "text", "type"],
+    )
+    rows = pa.ListArray.from_arrays(
+        pa.Array.from_buffers(
+            pa.int32(), len(texts) + 1, [None, pa.py_buffer(offsets)]
+        ),
+        matches,
+    )
+    return pd.Series(
+        pd.arrays.ArrowExtensionArray(rows), index=index, name=name
+    )
+
+
 class PandasCleanerMixin:
     """Mixin class to add Pandas functionality to Cleaner"""
 
@@ -31,7 +115,8 @@ class PandasCleanerMixin:
         Args:
             df (pd.DataFrame): Pandas DataFrame.
             column_name (str): Name of the column to clean.
-            cleaning (str): Cleaning method ("redact" or "replace").
+            cleaning (str): Cleaning method ("redact", "replace" or
+                "pseudonymise").
             ignore_case (bool): Should we ignore case when detecting PII?
                 Defaults to True.
             new_column_name (str | None): Name for the new cleaned column. If
@@ -64,8 +149,10 @@ class PandasCleanerMixin:
             if pd.isna(original_text):
                 cleaned_texts[i] = original_text
 
-        # Create new DataFrame with cleaned column
-        result_df = df.copy()
+        # Create new DataFrame with cleaned column. A shallow copy shares the
+        # other columns' data; setting a column replaces it rather than
+        # writing into the shared data, so `df` is left unchanged.
+        result_df = df.copy(deep=False)
         if new_column_name is None:
             new_column_name = column_name
 
@@ -79,6 +166,8 @@ class PandasCleanerMixin:
         column_name: str,
         ignore_case: bool = True,
         new_column_name: str = None,
+        overlap: str = "all",
+        dtype_backend: str | None = None,
     ):
         """Detect PII in a Pandas DataFrame column.
 
@@ -89,6 +178,12 @@ class PandasCleanerMixin:
                 Defaults to True.
             new_column_name (str | None): Name for the new detection column. If
                 None, uses "{column_name}_pii_detected". Defaults to None.
+            overlap (str): How overlapping matches are resolved: "all",
+                "longest" or "priority". Defaults to "all".
+            dtype_backend (str | None): With "pyarrow", the detection column
+                has a `pd.ArrowDtype` list of structs dtype, built from Arrow
+                buffers instead of Python objects; this needs pyarrow. With
+                None, each row holds a list of dicts. Defaults to None.
 
         Returns:
             pd.DataFrame: DataFrame with detection results added as a
@@ -103,25 +198,201 @@ class PandasCleanerMixin:
         if column_name not in df.columns:
             raise ValueError(f"Column '{column_name}' not found in DataFrame")
 
+        _check_dtype_backend(dtype_backend)
+
         # Set default column name
         if new_column_name is None:
             new_column_name = f"{column_name}_pii_detected"
 
-        # Get texts and use Cleaner's detect_pii_list method
         texts = df[column_name].tolist()
-        # Handle null values - replace with empty strings for processing
+        # Handle null values - replace with empty strings for processing, so
+        # they get no matches
+        processed_texts = [
+            str(text) if pd.notna(text) else "" for text in texts
+        ]
+        if dtype_backend == "pyarrow":
+            batch_results = _detect_arrow_series(
+                processed_texts,
+                self.cleaners,
+                ignore_case,
+                overlap,
+                self.ascii_only,
+                df.index,
+                new_column_name,
+                self._allowlist,
+            )
+        else:
+            batch_results = self.detect_pii_list(
+                processed_texts, ignore_case, overlap
+            )
+
+        # Add the detection results to a shallow copy, leaving `df` unchanged
+        result_df = df.copy(deep=False)
+        result_df[new_column_name] = batch_results
+
+        return result_df
+
+    def clean_and_detect_pandas_dataframe(
+        self,
+        df: pd.DataFrame,
+        column_name: str,
+        cleaning: str,
+        ignore_case: bool = True,
+        new_column_name: str = None,
+        detected_column_name: str = None,
+        overlap: str = "longest",
+    ):
+        """Clean PII in a Pandas DataFrame column and add a column of what was
+        cleaned.
+
+        Scans each row once, rather than once for `clean_pandas_dataframe`
+        and again for `detect_pandas_dataframe`. The detection column lists
+        the matches that were cleaned, with their positions in the original
+        text. With the Cleaner's `limits`, a row that hits a limit is cleaned
+        to the fallback and lists no matches.
+
+        Args:
+            df (pd.DataFrame): Pandas DataFrame.
+            column_name (str): Name of the column to clean.
+            cleaning (str): Cleaning method ("redact", "replace" or
+                "pseudonymise").
+            ignore_case (bool): Should we ignore case when detecting PII?
+                Defaults to True.
+            new_column_name (str | None): Name for the new cleaned column. If
+                None, overwrites original. Defaults to None.
+            detected_column_name (str | None): Name for the detection column.
+                If None, uses "{column_name}_pii_detected". Defaults to None.
+            overlap (str): How overlapping matches are resolved, either
+                "longest" or "priority". Defaults to "longest".
+
+        Returns:
+            pd.DataFrame: DataFrame with the cleaned column and the detection
+                column, where each row holds a list of dicts.
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required for DataFrame operations")
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("df must be a pandas DataFrame")
+
+        if column_name not in df.columns:
+            raise ValueError(f"Column '{column_name}' not found in DataFrame")
+
+        if new_column_name is None:
+            new_column_name = column_name
+        if detected_column_name is None:
+            detected_column_name = f"{column_name}_pii_detected"
+
+        texts = df[column_name].tolist()
+        # Handle null values - replace with empty strings for processing, so
+        # they get no matches
         processed_texts = [
             str(text) if pd.notna(text) else "" for text in texts
         ]
-        batch_results = self.detect_pii_list(processed_texts, ignore_case)
+        cleaned_texts, detected = self.clean_and_detect_list(
+            processed_texts, cleaning, ignore_case, overlap
+        )
 
-        # Set empty results for null values
+        # Restore null values in the results
         for i, original_text in enumerate(texts):
             if pd.isna(original_text):
-                batch_results[i] = []
+                cleaned_texts[i] = original_text
 
-        # Create new DataFrame with detection results
-        result_df = df.copy()
-        result_df[new_column_name] = batch_results
+        # Add the results to a shallow copy, leaving `df` unchanged
+        result_df = df.copy(deep=False)
+        result_df[new_column_name] = cleaned_texts
+        result_df[detected_column_name] = detected
 
         return result_df
+
+    def profile_pandas_dataframe(
+        self,
+        df: pd.DataFrame,
+        columns: list[str] | None = None,
+        ignore_case: bool = True,
+        overlap: str = "all",
+        sample_size: int | None = None,
+        tolerance: float | None = None,
+        seed: int = 0,
+    ) -> pd.DataFrame:
+        """Profile which PII types appear in the columns of a Pandas
+        DataFrame, and how often.
+
+        All the columns are scanned together in one parallel pass. Missing
+        values count as rows with no PII.
+
+        Args:
+            df (pd.DataFrame): Pandas DataFrame.
+            columns (list[str] | None): Names of the columns to profile. If
+                None, profiles every `object` and `string` column. Defaults
+                to None.
+            ignore_case (bool): Should we ignore case when detecting PII?
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved: "all",
+                "longest" or "priority". Defaults to "all".
+            sample_size (int | None): Scan at most this many rows of each
+                column, drawn at random. If None, every row can be scanned.
+                Defaults to None.
+            tolerance (float | None): Stop scanning a column, in a random
+                order, once the 95% confidence interval of each of its hit
+                rates is within this distance of the estimate, for example
+                0.01 for plus or minus one percentage point. If None, scans
+                every row, or `sample_size` rows. Defaults to None.
+            seed (int): Seed for the random order of rows when sampling.
+                Defaults to 0.
+
+        Returns:
+            pd.DataFrame: Profile with one row per column and PII type
+                found: "column", "type", "rows_scanned", "rows_matched"
+                (rows with at least one match), "matches" and "hit_rate"
+                (`rows_matched / rows_scanned`). Columns with no PII found
+                have no rows.
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required for DataFrame operations")
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("df must be a pandas DataFrame")
+
+        if columns is None:
+            columns = list(
+                df.select_dtypes(include=["object", "string"]).columns
+            )
+        for column_name in columns:
+            if column_name not in df.columns:
+                raise ValueError(
+                    f"Column '{column_name}' not found in DataFrame"
+                )
+
+        rows = _profile_batch(
+            [
+                [
+                    str(text) if pd.notna(text) else ""
+                    for text in df[column_name].tolist()
+                ]
+                for column_name in columns
+            ],
+            self.cleaners,
+            ignore_case,
+            overlap,
+            self.ascii_only,
+            self._allowlist,
+            sample_size,
+            tolerance,
+            seed,
+        )
+        profile = pd.DataFrame.from_records(
+            [
+                (columns[column], pii_type, scanned, matched, matches)
+                for column, pii_type, scanned, matched, matches in rows
+            ],
+            columns=[
+                "column",
+                "type",
+                "rows_scanned",
+                "rows_matched",
+                "matches",
+            ],
+        )
+        profile["hit_rate"] = profile["rows_matched"] / profile["rows_scanned"]
+        return profile
@@ -13,6 +13,7 @@ except ImportError:
     PANDAS_AVAILABLE = False
 
 import piicleaner
+from piicleaner._pandas import _check_dtype_backend, _detect_arrow_series
 
 if PANDAS_AVAILABLE:
 
@@ -24,18 +25,42 @@ if PANDAS_AVAILABLE:
             self._obj = pandas_obj
 
         def detect_pii(
-            self, cleaners: str | list[str] = "all", ignore_case: bool = True
+            self,
+            cleaners: str | list[str] = "all",
+            ignore_case: bool = True,
+            overlap: str = "all",
+            dtype_backend: str | None = None,
         ) -> pd.Series:
-            """Detect PII in text and return matches as list of dicts."""
+            """Detect PII in text and return matches as list of dicts.
+
+            With `dtype_backend="pyarrow"` the matches are returned as a
+            `pd.ArrowDtype` list of structs column instead, built from Arrow
+            buffers without creating a Python object per match.
+            """
 
             if isinstance(cleaners, str):
                 cleaners = [cleaners]
 
+            _check_dtype_backend(dtype_backend)
+            if dtype_backend == "pyarrow":
+                return _detect_arrow_series(
+                    [
+                        str(text) if pd.notna(text) else ""
+                        for text in self._obj.tolist()
+                    ],
+                    cleaners,
+                    ignore_case,
+                    overlap,
+                    False,
+                    self._obj.index,
+                    self._obj.name,
+                )
+
             def _convert_matches(text_val):
                 if pd.isna(text_val):
                     return []
                 matches = piicleaner.detect_pii_with_cleaners(
-                    text_val, cleaners, ignore_case
+                    text_val, cleaners, ignore_case, overlap
                 )
                 # Convert tuples to dictionaries
                 return [
@@ -56,17 +81,27 @@ if PANDAS_AVAILABLE:
             cleaners: str | list[str] = "all",
             ignore_case: bool = True,
             replace_string: str | None = None,
+            pseudonym_key: str | None = None,
         ) -> pd.Series:
-            """Clean PII from text."""
+            """Clean PII from text.
+
+            The Series is cleaned as one batch, so with "pseudonymise" each
+            distinct value is hashed once however many rows it appears in.
+            """
 
             if isinstance(cleaners, str):
                 cleaners = [cleaners]
 
-            def _clean_text(text_val):
-                if pd.isna(text_val):
-                    return text_val
-                return piicleaner.clean_pii_with_cleaners(
-                    text_val, cleaners, cleaning, ignore_case, replace_string
-                )
-
-            return self._obj.apply(_clean_text)
+            not_null = self._obj.notna()
+            cleaned = piicleaner.clean_pii_with_cleaners_batch(
+                self._obj[not_null].tolist(),
+                cleaners,
+                cleaning,
+                ignore_case,
+                replace_string,
+                pseudonym_key=pseudonym_key,
+            )
+            # Null values are passed through unchanged
+            result = self._obj.astype(object)
+            result[not_null] = cleaned
+            return result
@@ -4,6 +4,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from piicleaner._internal import (
+    clean_and_detect_series as _clean_and_detect_series,
+    clean_pii_series as _clean_pii_series,
+    detect_pii_series as _detect_pii_series,
+    profile_series as _profile_series,
+)
+
 if TYPE_CHECKING:
     import polars as pl
 
@@ -28,10 +35,17 @@ class PolarsCleanerMixin:
     ):
         """Clean PII in a Polars DataFrame column.
 
+        String columns are cleaned natively, as are strings nested at any
+        depth in `List` and `Struct` columns: structure, field names and
+        nulls are kept, and all the strings in the column are cleaned in one
+        parallel pass. Columns of other types are cleaned on their string
+        representation. The Cleaner's `limits` apply to every column.
+
         Args:
             df (pl.DataFrame): Polars DataFrame.
             column_name (str): Name of the column to clean.
-            cleaning (str): Cleaning method ("redact" or "replace").
+            cleaning (str): Cleaning method ("redact", "replace" or
+                "pseudonymise").
             ignore_case (bool): Should we ignore case when detecting PII?
                 Defaults to True.
             new_column_name (str | None): Name for the new cleaned column. If
@@ -49,28 +63,44 @@ class PolarsCleanerMixin:
         if column_name not in df.columns:
             raise ValueError(f"Column '{column_name}' not found in DataFrame")
 
-        # Use the clean_pii_list method which respects specific cleaners
-        texts = df.get_column(column_name).to_list()
-        # Handle null values - replace with empty strings for processing
-        processed_texts = [
-            str(text) if text is not None else "" for text in texts
-        ]
-        cleaned_texts = self.clean_pii_list(
-            processed_texts, cleaning, ignore_case
-        )
+        column = df.get_column(column_name)
+        if column.dtype == pl.String or isinstance(
+            column.dtype, (pl.List, pl.Struct)
+        ):
+            cleaned = _clean_pii_series(
+                column,
+                self.cleaners,
+                cleaning,
+                ignore_case,
+                self.replace_string,
+                "longest",
+                self.ascii_only,
+                self.pseudonym_key,
+                self._allowlist,
+                self.cache,
+                self.limits,
+            )
+        else:
+            texts = column.to_list()
+            # Handle null values - replace with empty strings for processing
+            processed_texts = [
+                str(text) if text is not None else "" for text in texts
+            ]
+            cleaned_texts = self.clean_pii_list(
+                processed_texts, cleaning, ignore_case
+            )
 
-        # Restore null values in the results
-        for i, original_text in enumerate(texts):
-            if original_text is None:
-                cleaned_texts[i] = None
+            # Restore null values in the results
+            for i, original_text in enumerate(texts):
+                if original_text is None:
+                    cleaned_texts[i] = None
+            cleaned = pl.Series(values=cleaned_texts)
 
         # Create new DataFrame with cleaned column
         if new_column_name is None:
             new_column_name = column_name
 
-        result_df = df.with_columns(
-            pl.Series(name=new_column_name, values=cleaned_texts)
-        )
+        result_df = df.with_columns(cleaned.alias(new_column_name))
 
         return result_df
 
@@ -80,6 +110,7 @@ class PolarsCleanerMixin:
         column_name: str,
         ignore_case: bool = True,
         new_column_name: str = None,
+        overlap: str = "all",
     ):
         """Detect PII in a Polars DataFrame column.
 
@@ -90,10 +121,13 @@ class PolarsCleanerMixin:
                 Defaults to True.
             new_column_name (str | None): Name for the new detection column. If
                 None, uses "{column_name}_pii_detected". Defaults to None.
+            overlap (str): How overlapping matches are resolved: "all",
+                "longest" or "priority". Defaults to "all".
 
         Returns:
-            pl.DataFrame: DataFrame with detection results added as a
-                list column.
+            pl.DataFrame: DataFrame with detection results added as a list
+                column of structs with fields "start" and "end" (UInt32),
+                "text" (String) and "type" (Categorical).
         """
         if not POLARS_AVAILABLE:
             raise ImportError("polars is required for DataFrame operations")
@@ -108,50 +142,171 @@ class PolarsCleanerMixin:
         if new_column_name is None:
             new_column_name = f"{column_name}_pii_detected"
 
-        # Get texts and use Cleaner's detect_pii_list method
-        texts = df.get_column(column_name).to_list()
-        # Handle null values - replace with empty strings for processing
-        processed_texts = [
-            str(text) if text is not None else "" for text in texts
-        ]
-        batch_results = self.detect_pii_list(processed_texts, ignore_case)
-
-        # Set empty results for null values
-        for i, original_text in enumerate(texts):
-            if original_text is None:
-                batch_results[i] = []
-
-        # Convert to Polars list of structs format
-        detection_results = []
-        for matches in batch_results:
-            # Convert each row's matches to list of dicts for Polars
-            row_matches = [
-                {
-                    "start": match["start"],
-                    "end": match["end"],
-                    "text": match["text"],
-                    "type": match["type"],
-                }
-                for match in matches
-            ]
-            detection_results.append(row_matches)
+        # Detection results are built as a Polars column in Rust; null values
+        # get an empty list of matches
+        detection_results = _detect_pii_series(
+            df.get_column(column_name),
+            self.cleaners,
+            ignore_case,
+            overlap,
+            self.ascii_only,
+            null_as_empty=True,
+            allowlist=self._allowlist,
+        )
 
         # Add detection results as new column
-        result_df = df.with_columns(
-            pl.Series(
-                name=new_column_name,
-                values=detection_results,
-                dtype=pl.List(
-                    pl.Struct(
-                        [
-                            pl.Field("start", pl.Int64),
-                            pl.Field("end", pl.Int64),
-                            pl.Field("text", pl.String),
-                            pl.Field("type", pl.String),
-                        ]
-                    )
-                ),
-            )
-        )
+        result_df = df.with_columns(detection_results.alias(new_column_name))
 
         return result_df
+
+    def clean_and_detect_dataframe(
+        self,
+        df: pl.DataFrame,
+        column_name: str,
+        cleaning: str,
+        ignore_case: bool = True,
+        new_column_name: str = None,
+        detected_column_name: str = None,
+        overlap: str = "longest",
+    ):
+        """Clean PII in a Polars DataFrame column and add a column of what was
+        cleaned.
+
+        Scans each row once, rather than once for `clean_dataframe` and again
+        for `detect_dataframe`. The detection column lists the matches that
+        were cleaned, with their positions in the original text. With the
+        Cleaner's `limits`, a row that hits a limit is cleaned to the fallback
+        and lists no matches.
+
+        Args:
+            df (pl.DataFrame): Polars DataFrame.
+            column_name (str): Name of the column to clean.
+            cleaning (str): Cleaning method ("redact", "replace" or
+                "pseudonymise").
+            ignore_case (bool): Should we ignore case when detecting PII?
+                Defaults to True.
+            new_column_name (str | None): Name for the new cleaned column. If
+                None, overwrites original. Defaults to None.
+            detected_column_name (str | None): Name for the detection column.
+                If None, uses "{column_name}_pii_detected". Defaults to None.
+            overlap (str): How overlapping matches are resolved, either
+                "longest" or "priority". Defaults to "longest".
+
+        Returns:
+            pl.DataFrame: DataFrame with the cleaned column and the detection
+                column, a list column of structs as in `detect_dataframe`.
+        """
+        if not POLARS_AVAILABLE:
+            raise ImportError("polars is required for DataFrame operations")
+
+        if not isinstance(df, pl.DataFrame):
+            raise TypeError("df must be a polars DataFrame")
+
+        if column_name not in df.columns:
+            raise ValueError(f"Column '{column_name}' not found in DataFrame")
+
+        if new_column_name is None:
+            new_column_name = column_name
+        if detected_column_name is None:
+            detected_column_name = f"{column_name}_pii_detected"
+
+        cleaned, detected = _clean_and_detect_series(
+            df.get_column(column_name),
+            detected_column_name,
+            self.cleaners,
+            cleaning,
+            ignore_case,
+            self.replace_string,
+            overlap,
+            self.ascii_only,
+            self.pseudonym_key,
+            self._allowlist,
+            self.limits,
+            null_as_empty=True,
+        )
+
+        return df.with_columns(cleaned.alias(new_column_name), detected)
+
+    def profile_dataframe(
+        self,
+        df: pl.DataFrame,
+        columns: list[str] | None = None,
+        ignore_case: bool = True,
+        overlap: str = "all",
+        sample_size: int | None = None,
+        tolerance: float | None = None,
+        seed: int = 0,
+    ) -> pl.DataFrame:
+        """Profile which PII types appear in the columns of a Polars
+        DataFrame, and how often.
+
+        All the columns are scanned together in one parallel pass. Null
+        values count as rows with no PII.
+
+        Args:
+            df (pl.DataFrame): Polars DataFrame.
+            columns (list[str] | None): Names of the columns to profile. If
+                None, profiles every String column. Defaults to None.
+            ignore_case (bool): Should we ignore case when detecting PII?
+                Defaults to True.
+            overlap (str): How overlapping matches are resolved: "all",
+                "longest" or "priority". Defaults to "all".
+            sample_size (int | None): Scan at most this many rows of each
+                column, drawn at random. If None, every row can be scanned.
+                Defaults to None.
+            tolerance (float | None): Stop scanning a column, in a random
+                order, once the 95% confidence interval of each of its hit
+                rates is within this distance of the estimate, for example
+                0.01 for plus or minus one percentage point. If None, scans
+                every row, or `sample_size` rows. Defaults to None.
+            seed (int): Seed for the random order of rows when sampling.
+                Defaults to 0.
+
+        Returns:
+            pl.DataFrame: Profile with one row per column and PII type
+                found: "column", "type", "rows_scanned", "rows_matched"
+                (rows with at least one match), "matches" and "hit_rate"
+                (`rows_matched / rows_scanned`). Columns with no PII found
+                have no rows.
+        """
+        if not POLARS_AVAILABLE:
+            raise ImportError("polars is required for DataFrame operations")
+
+        if not isinstance(df, pl.DataFrame):
+            raise TypeError("df must be a polars DataFrame")
+
+        if columns is None:
+            columns = [
+                name for name, dtype in df.schema.items() if dtype == pl.String
+            ]
+        for column_name in columns:
+            if column_name not in df.columns:
+                raise ValueError(
+                    f"Column '{column_name}' not found in DataFrame"
+                )
+
+        rows = _profile_series(
+            [df.get_column(column_name) for column_name in columns],
+            self.cleaners,
+            ignore_case,
+            overlap,
+            self.ascii_only,
+            self._allowlist,
+            sample_size,
+            tolerance,
+            seed,
+        )
+        return pl.DataFrame(
+            [
+                (columns[column], pii_type, scanned, matched, matches)
+                for column, pii_type, scanned, matched, matches in rows
+            ],
+            schema={
+                "column": pl.String,
+                "type": pl.String,
+                "rows_scanned": pl.UInt64,
+                "rows_matched": pl.UInt64,
+                "matches": pl.UInt64,
+            },
+            orient="row",
+        ).with_columns(hit_rate=pl.col("rows_matched") / pl.col("rows_scanned"))
@@ -15,6 +15,7 @@ except ImportError:
     POLARS_AVAILABLE = False
 
 import piicleaner
+from piicleaner._internal import detect_pii_series as _detect_pii_series
 
 if POLARS_AVAILABLE:
 
@@ -26,39 +27,32 @@ if POLARS_AVAILABLE:
             self._expr = expr
 
         def detect_pii(
-            self, cleaners: str | list[str] = "all", ignore_case: bool = True
+            self,
+            cleaners: str | list[str] = "all",
+            ignore_case: bool = True,
+            overlap: str = "all",
         ) -> Expr:
-            """Detect PII in text and return matches as list of structs."""
+            """Detect PII in text and return matches as list of structs.
+
+            Matches are built as a native Polars column in Rust, with fields
+            "start" and "end" (UInt32), "text" (String) and "type"
+            (Categorical).
+            """
 
             if isinstance(cleaners, str):
                 cleaners = [cleaners]
 
-            def _convert_matches(text_val):
-                if text_val is None:
-                    return []
-                matches = piicleaner.detect_pii_with_cleaners(
-                    text_val, cleaners, ignore_case
-                )
-                # Convert tuples to dictionaries for Polars struct format
-                return [
-                    {
-                        "start": start,
-                        "end": end,
-                        "text": text,
-                        "type": pii_type,
-                    }
-                    for start, end, text, pii_type in matches
-                ]
-
-            return self._expr.map_elements(
-                _convert_matches,
+            return self._expr.map_batches(
+                lambda series: _detect_pii_series(
+                    series, cleaners, ignore_case, overlap
+                ),
                 return_dtype=pl.List(
                     pl.Struct(
                         [
                             pl.Field("start", pl.UInt32),
                             pl.Field("end", pl.UInt32),
                             pl.Field("text", pl.String),
-                            pl.Field("type", pl.String),
+                            pl.Field("type", pl.Categorical),
                         ]
                     )
                 ),
@@ -70,17 +64,33 @@ if POLARS_AVAILABLE:
             cleaners: str | list[str] = "all",
             ignore_case: bool = True,
             replace_string: str | None = None,
+            pseudonym_key: str | None = None,
         ) -> Expr:
-            """Clean PII from text."""
+            """Clean PII from text.
+
+            The column is cleaned as one batch, so with "pseudonymise" each
+            distinct value is hashed once however many rows it appears in.
+            """
 
             if isinstance(cleaners, str):
                 cleaners = [cleaners]
 
-            def _clean_text(text_val):
-                if text_val is None:
-                    return None
-                return piicleaner.clean_pii_with_cleaners(
-                    text_val, cleaners, cleaning, ignore_case, replace_string
+            def _clean_batch(series: pl.Series) -> pl.Series:
+                texts = series.to_list()
+                cleaned = iter(
+                    piicleaner.clean_pii_with_cleaners_batch(
+                        [text for text in texts if text is not None],
+                        cleaners,
+                        cleaning,
+                        ignore_case,
+                        replace_string,
+                        pseudonym_key=pseudonym_key,
+                    )
+                )
+                return pl.Series(
+                    series.name,
+                    [None if text is None else next(cleaned) for text in texts],
+                    dtype=pl.String,
                 )
 
-            return self._expr.map_elements(_clean_text, return_dtype=pl.String)
+            return self._expr.map_batches(_clean_batch, return_dtype=pl.String)
@@ -0,0 +1,130 @@
+//! Allowlists: exact values that are never reported or cleaned
+
+use siphasher::sip::SipHasher24;
+use std::collections::HashSet;
+use std::hash::Hasher;
+
+#[derive(Clone, Debug)]
+pub struct Allowlist {
+    values: HashSet<String>,
+    /// Normalised forms of `values`, when matching ignores formatting
+    normalised: Option<HashSet<String>>,
+    /// Hash of the values and options, see `fingerprint`
+    fingerprint: u64,
+}
+
+impl Allowlist {
+    /// Build an allowlist of exact values
+    ///
+    /// With `normalise`, a match is also allowed when its normalised form
+    /// (see `normalise`) equals that of an allowlisted value, so
+    /// "Support@Example.com" or "0800 123-4567" are allowed by
+    /// "support@example.com" or "08001234567".
+    pub fn new<I, S>(values: I, normalise: bool) -> Self
+    where
+        I: IntoIterator<Item = S>,
+        S: AsRef<str>,
+    {
+        let values: HashSet<String> = values
+            .into_iter()
+            .map(|value| value.as_ref().to_string())
+            .collect();
+        let normalised =
+            normalise.then(|| values.iter().map(|value| self::normalise(value)).collect());
+        // Combined with XOR so the fingerprint doesn't depend on set order
+        let fingerprint = values.iter().fold(normalise as u64, |fingerprint, value| {
+            let mut hasher = SipHasher24::new();
+            hasher.write(value.as_bytes());
+            fingerprint ^ hasher.finish()
+        });
+        Allowlist {
+            values,
+            normalised,
+            fingerprint,
+        }
+    }
+
+    pub fn len(&self) -> usize {
+        self.values.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.values.is_empty()
+    }
+
+    /// The allowlisted values, in no particular order
+    pub fn values(&self) -> impl Iterator<Item = &str> {
+        self.values.iter().map(String::as_str)
+    }
+
+    /// Whether matching ignores formatting, see `new`
+    pub fn is_normalised(&self) -> bool {
+        self.normalised.is_some()
+    }
+
+    /// Hash identifying the values and options, which differs whenever the
+    /// allowlist would allow different matches
+    pub fn fingerprint(&self) -> u64 {
+        self.fingerprint
+    }
+
+    /// Whether the matched text `value` is allowed
+    ///
+    /// An exact lookup is tried first, so only values that miss it pay for
+    /// normalisation.
+    #[inline]
+    pub fn contains(&self, value: &str) -> bool {
+        self.values.contains(value)
+            || self
+                .normalised
+                .as_ref()
+                .is_some_and(|normalised| normalised.contains(&normalise(value)))
+    }
+}
+
+/// Lowercase `value` and drop whitespace, hyphens and brackets
+pub fn normalise(value: &str) -> String {
+    value
+        .chars()
+        .filter(|&c| !(c.is_whitespace() || matches!(c, '-' | '(' | ')')))
+        .flat_map(char::to_lowercase)
+        .collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_allowlist_exact() {
+        let allowlist = Allowlist::new(["support@example.com", "020 7946 0000"], false);
+        assert_eq!(allowlist.len(), 2);
+        assert!(allowlist.contains("support@example.com"));
+        assert!(!allowlist.contains("Support@example.com"));
+        assert!(!allowlist.contains("02079460000"));
+    }
+
+    #[test]
+    fn test_allowlist_normalised() {
+        let allowlist = Allowlist::new(["support@example.com", "020 7946 0000"], true);
+        assert!(allowlist.contains("SUPPORT@example.com"));
+        assert!(allowlist.contains("(020) 7946-0000"));
+        assert!(!allowlist.contains("sales@example.com"));
+    }
+
+    #[test]
+    fn test_allowlist_values() {
+        let allowlist = Allowlist::new(["b", "a", "a"], true);
+        let mut values: Vec<&str> = allowlist.values().collect();
+        values.sort_unstable();
+        assert_eq!(values, ["a", "b"]);
+        assert!(allowlist.is_normalised());
+        assert!(!Allowlist::new(["a"], false).is_normalised());
+    }
+
+    #[test]
+    fn test_normalise() {
+        assert_eq!(normalise(" (020) 7946-0000\t"), "02079460000");
+        assert_eq!(normalise("SC 123456"), "sc123456");
+    }
+}
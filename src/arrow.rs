@@ -0,0 +1,241 @@
+//! PII detection results, and string arrays, as raw Arrow buffers
+
+use crate::core::Span;
+use std::num::TryFromIntError;
+
+/// Detection results for a batch of texts, laid out as the buffers of an
+/// Arrow `list<struct<start: uint32, end: uint32, text: string,
+/// type: dictionary<int32, string>>>` array
+///
+/// Buffers hold native-endian values, as Arrow expects, so they can be
+/// wrapped by pyarrow without conversion.
+pub struct ArrowDetections<'c> {
+    /// `int32` list offsets, one per text plus one
+    pub offsets: Vec<u8>,
+    /// `uint32` match start offsets
+    pub starts: Vec<u8>,
+    /// `uint32` match end offsets
+    pub ends: Vec<u8>,
+    /// `int32` offsets into `text_data`, one per match plus one
+    pub text_offsets: Vec<u8>,
+    /// UTF-8 matched text, concatenated
+    pub text_data: Vec<u8>,
+    /// `int32` indices into `type_names`
+    pub type_codes: Vec<u8>,
+    /// Dictionary of cleaner names, in order of first appearance
+    pub type_names: Vec<&'c str>,
+    /// Total number of matches
+    pub n_matches: usize,
+}
+
+impl<'c> ArrowDetections<'c> {
+    /// Lay out `spans[i]`, the matches found in `texts[i]`, as Arrow buffers
+    ///
+    /// Fails if the offsets don't fit in Arrow's 32-bit offset types.
+    pub fn from_spans<T: AsRef<str>>(
+        texts: &[T],
+        spans: &[Vec<Span<'c>>],
+    ) -> Result<Self, TryFromIntError> {
+        let n_matches = spans.iter().map(Vec::len).sum();
+        let mut detections = ArrowDetections {
+            offsets: Vec::with_capacity((texts.len() + 1) * 4),
+            starts: Vec::with_capacity(n_matches * 4),
+            ends: Vec::with_capacity(n_matches * 4),
+            text_offsets: Vec::with_capacity((n_matches + 1) * 4),
+            text_data: Vec::new(),
+            type_codes: Vec::with_capacity(n_matches * 4),
+            type_names: Vec::new(),
+            n_matches,
+        };
+        detections.offsets.extend_from_slice(&0i32.to_ne_bytes());
+        detections
+            .text_offsets
+            .extend_from_slice(&0i32.to_ne_bytes());
+
+        let mut n_seen = 0;
+        for (text, row_spans) in texts.iter().zip(spans) {
+            let text = text.as_ref();
+            for span in row_spans {
+                detections
+                    .starts
+                    .extend_from_slice(&u32::try_from(span.start)?.to_ne_bytes());
+                detections
+                    .ends
+                    .extend_from_slice(&u32::try_from(span.end)?.to_ne_bytes());
+                detections
+                    .text_data
+                    .extend_from_slice(text[span.start..span.end].as_bytes());
+                detections
+                    .text_offsets
+                    .extend_from_slice(&i32::try_from(detections.text_data.len())?.to_ne_bytes());
+
+                // Only a handful of cleaners exist, so a linear scan is fastest
+                let code = match detections
+                    .type_names
+                    .iter()
+                    .position(|&name| name == span.cleaner)
+                {
+                    Some(code) => code,
+                    None => {
+                        detections.type_names.push(span.cleaner);
+                        detections.type_names.len() - 1
+                    }
+                };
+                detections
+                    .type_codes
+                    .extend_from_slice(&i32::try_from(code)?.to_ne_bytes());
+            }
+            n_seen += row_spans.len();
+            detections
+                .offsets
+                .extend_from_slice(&i32::try_from(n_seen)?.to_ne_bytes());
+        }
+        Ok(detections)
+    }
+}
+
+/// Read `len` native-endian offsets, `int64` if `large` else `int32`,
+/// starting at the `offset`th
+fn read_offsets(buffer: &[u8], large: bool, offset: usize, len: usize) -> Option<Vec<usize>> {
+    let width = if large { 8 } else { 4 };
+    buffer
+        .get(offset * width..(offset + len) * width)?
+        .chunks_exact(width)
+        .map(|chunk| {
+            let value = if large {
+                i64::from_ne_bytes(chunk.try_into().unwrap())
+            } else {
+                i32::from_ne_bytes(chunk.try_into().unwrap()) as i64
+            };
+            usize::try_from(value).ok()
+        })
+        .collect()
+}
+
+/// The texts of an Arrow `string` (or `large_string` if `large`) array of
+/// `len` rows from its offsets and data buffers, starting at row `offset`
+///
+/// Fails if the buffers are too short, or a text isn't valid UTF-8.
+pub fn read_strings<'a>(
+    offsets: &[u8],
+    data: &'a [u8],
+    large: bool,
+    offset: usize,
+    len: usize,
+) -> Result<Vec<&'a str>, &'static str> {
+    let offsets = read_offsets(offsets, large, offset, len + 1).ok_or("Invalid string offsets")?;
+    offsets
+        .windows(2)
+        .map(|bounds| {
+            let bytes = data
+                .get(bounds[0]..bounds[1])
+                .ok_or("Invalid string offsets")?;
+            std::str::from_utf8(bytes).map_err(|_| "String is not valid UTF-8")
+        })
+        .collect()
+}
+
+/// The offsets and data buffers of an Arrow `string` (or `large_string` if
+/// `large`) array of `texts`
+///
+/// Fails if the data doesn't fit in `int32` offsets.
+pub fn write_strings<T: AsRef<str>>(
+    texts: &[T],
+    large: bool,
+) -> Result<(Vec<u8>, Vec<u8>), TryFromIntError> {
+    let width = if large { 8 } else { 4 };
+    let mut offsets = Vec::with_capacity((texts.len() + 1) * width);
+    let mut data = Vec::with_capacity(texts.iter().map(|text| text.as_ref().len()).sum());
+    let push_offset = |offsets: &mut Vec<u8>, value: usize| -> Result<(), TryFromIntError> {
+        if large {
+            offsets.extend_from_slice(&i64::try_from(value)?.to_ne_bytes());
+        } else {
+            offsets.extend_from_slice(&i32::try_from(value)?.to_ne_bytes());
+        }
+        Ok(())
+    };
+    push_offset(&mut offsets, 0)?;
+    for text in texts {
+        data.extend_from_slice(text.as_ref().as_bytes());
+        push_offset(&mut offsets, data.len())?;
+    }
+    Ok((offsets, data))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::core::{detect_spans_batch_core, Overlap};
+
+    fn decode_i32(buffer: &[u8]) -> Vec<i32> {
+        buffer
+            .chunks_exact(4)
+            .map(|chunk| i32::from_ne_bytes(chunk.try_into().unwrap()))
+            .collect()
+    }
+
+    fn decode_u32(buffer: &[u8]) -> Vec<u32> {
+        buffer
+            .chunks_exact(4)
+            .map(|chunk| u32::from_ne_bytes(chunk.try_into().unwrap()))
+            .collect()
+    }
+
+    #[test]
+    fn test_arrow_detections_layout() {
+        let texts = [
+            "Email test@example.com or AB123456C",
+            "No PII here",
+            "NINO JK987654D",
+        ];
+        let spans =
+            detect_spans_batch_core(&texts, &["email", "nino"], true, Overlap::All, false, None);
+        let detections = ArrowDetections::from_spans(&texts, &spans).unwrap();
+
+        assert_eq!(detections.n_matches, 3);
+        assert_eq!(decode_i32(&detections.offsets), vec![0, 2, 2, 3]);
+        assert_eq!(decode_u32(&detections.starts), vec![6, 26, 5]);
+        assert_eq!(decode_u32(&detections.ends), vec![22, 35, 14]);
+        assert_eq!(decode_i32(&detections.text_offsets), vec![0, 16, 25, 34]);
+        assert_eq!(
+            std::str::from_utf8(&detections.text_data).unwrap(),
+            "test@example.comAB123456CJK987654D"
+        );
+        assert_eq!(decode_i32(&detections.type_codes), vec![0, 1, 1]);
+        assert_eq!(detections.type_names, vec!["email", "nino"]);
+    }
+
+    #[test]
+    fn test_string_buffers_round_trip() {
+        let texts = ["a@example.com", "", "héllo"];
+        for large in [false, true] {
+            let (offsets, data) = write_strings(&texts, large).unwrap();
+            assert_eq!(read_strings(&offsets, &data, large, 0, 3).unwrap(), texts);
+            // A slice of the array starts part way through the offsets
+            assert_eq!(
+                read_strings(&offsets, &data, large, 1, 2).unwrap(),
+                ["", "héllo"]
+            );
+            assert!(read_strings(&offsets, &data, large, 1, 3).is_err());
+        }
+        assert!(read_strings(&encode_offsets(&[0, 2]), &[0xff, 0xfe], false, 0, 1).is_err());
+    }
+
+    fn encode_offsets(offsets: &[i32]) -> Vec<u8> {
+        offsets
+            .iter()
+            .flat_map(|offset| offset.to_ne_bytes())
+            .collect()
+    }
+
+    #[test]
+    fn test_arrow_detections_empty() {
+        let texts: [&str; 0] = [];
+        let detections = ArrowDetections::from_spans(&texts, &[]).unwrap();
+
+        assert_eq!(detections.n_matches, 0);
+        assert_eq!(decode_i32(&detections.offsets), vec![0]);
+        assert_eq!(decode_i32(&detections.text_offsets), vec![0]);
+        assert!(detections.type_names.is_empty());
+    }
+}
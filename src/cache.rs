@@ -0,0 +1,537 @@
+//! Persistent cache of cleaned texts, for data that changes little between runs
+//!
+//! Entries are keyed by a 128-bit hash of the text, keyed in turn by a
+//! fingerprint of everything that affects cleaning: the patterns, dictionaries
+//! and allowlist in use and the cleaning options. Changing any of them gives
+//! new keys, so stale results are never served; they are evicted as the cache
+//! fills up.
+//!
+//! The fingerprint is made from public settings, so on its own anyone with
+//! the cache file could hash guessed text and confirm it was cleaned. Each
+//! cache therefore also mixes in a random secret, kept in a key file next to
+//! the cache (`<path>.key`). Without the key file the keys reveal nothing, but
+//! the cache file still holds the cleaned text of every row and should be
+//! protected like the data it was made from; the key file more so.
+
+use crate::allowlist::Allowlist;
+use crate::core::{self, Cleaning, Overlap};
+use crate::dictionary;
+use crate::patterns;
+use crate::pool;
+use rayon::prelude::*;
+use siphasher::sip128::{Hasher128, SipHasher24 as SipHasher128};
+use std::borrow::Cow;
+use std::collections::hash_map::RandomState;
+use std::collections::HashMap;
+use std::fs::{File, OpenOptions};
+use std::hash::{BuildHasher, Hash, Hasher};
+use std::io::{self, BufReader, BufWriter, Read, Write};
+use std::path::{Path, PathBuf};
+use std::sync::{Mutex, MutexGuard, PoisonError};
+
+/// Default size budget of a cache, in bytes
+pub const DEFAULT_MAX_BYTES: usize = 256 * 1024 * 1024;
+
+/// First bytes of a saved cache file, including the format version
+const MAGIC: &[u8; 8] = b"PIICACH2";
+
+/// Files of the first format, whose keys didn't include a secret, so their
+/// entries are dropped rather than read
+const MAGIC_V1: &[u8; 8] = b"PIICACH1";
+
+/// Bytes counted per entry on top of the cleaned text: the key, the last use
+/// and the flag, as stored on disk
+const ENTRY_OVERHEAD: usize = 16 + 8 + 1 + 4;
+
+/// Fraction of `max_bytes` to evict down to, so eviction doesn't run on every
+/// batch once the cache is full
+const EVICT_TO: f64 = 0.9;
+
+struct Entry {
+    /// The cleaned text, or `None` if cleaning left the text unchanged
+    cleaned: Option<Box<str>>,
+    /// Generation in which the entry was last read or written
+    last_used: u64,
+}
+
+impl Entry {
+    fn size(&self) -> usize {
+        ENTRY_OVERHEAD + self.cleaned.as_ref().map_or(0, |cleaned| cleaned.len())
+    }
+}
+
+#[derive(Default)]
+struct CacheState {
+    entries: HashMap<u128, Entry>,
+    bytes: usize,
+    /// Incremented for every batch, to find the least recently used entries
+    generation: u64,
+    hits: u64,
+    misses: u64,
+}
+
+/// Hit and size counts of a cache
+pub struct CacheStats {
+    pub hits: u64,
+    pub misses: u64,
+    pub entries: usize,
+    pub bytes: usize,
+}
+
+pub struct CleanCache {
+    path: PathBuf,
+    max_bytes: usize,
+    /// Mixed into every key, see the module documentation
+    secret: (u64, u64),
+    state: Mutex<CacheState>,
+}
+
+impl CleanCache {
+    /// Open the cache saved at `path`, or start an empty one if there is none
+    ///
+    /// A cache whose key file is missing can't be read, so it starts empty
+    /// under a new secret.
+    pub fn open(path: &Path, max_bytes: usize) -> io::Result<Self> {
+        let key_path = key_path(path);
+        let secret = if key_path.exists() {
+            Some(read_secret(&key_path)?)
+        } else {
+            None
+        };
+        let cache = CleanCache {
+            path: path.to_path_buf(),
+            max_bytes,
+            secret: secret.unwrap_or_else(random_secret),
+            state: Mutex::new(CacheState::default()),
+        };
+        if secret.is_some() && path.exists() {
+            let mut state = cache.lock();
+            *state = read_state(path)?;
+            cache.evict(&mut state);
+        }
+        Ok(cache)
+    }
+
+    fn lock(&self) -> MutexGuard<'_, CacheState> {
+        self.state.lock().unwrap_or_else(PoisonError::into_inner)
+    }
+
+    pub fn stats(&self) -> CacheStats {
+        let state = self.lock();
+        CacheStats {
+            hits: state.hits,
+            misses: state.misses,
+            entries: state.entries.len(),
+            bytes: state.bytes,
+        }
+    }
+
+    /// Remove every entry and reset the hit counts
+    pub fn clear(&self) {
+        *self.lock() = CacheState::default();
+    }
+
+    /// Write the cache to its path, replacing the saved copy atomically, and
+    /// its secret to the key file
+    pub fn save(&self) -> io::Result<()> {
+        let state = self.lock();
+        write_secret(&key_path(&self.path), self.secret)?;
+        let tmp_path = self.path.with_extension("tmp");
+        {
+            let mut writer = BufWriter::new(File::create(&tmp_path)?);
+            writer.write_all(MAGIC)?;
+            writer.write_all(&state.generation.to_le_bytes())?;
+            writer.write_all(&(state.entries.len() as u64).to_le_bytes())?;
+            for (key, entry) in &state.entries {
+                writer.write_all(&key.to_le_bytes())?;
+                writer.write_all(&entry.last_used.to_le_bytes())?;
+                match &entry.cleaned {
+                    None => writer.write_all(&[0])?,
+                    Some(cleaned) => {
+                        writer.write_all(&[1])?;
+                        writer.write_all(&(cleaned.len() as u32).to_le_bytes())?;
+                        writer.write_all(cleaned.as_bytes())?;
+                    }
+                }
+            }
+            writer.flush()?;
+        }
+        std::fs::rename(&tmp_path, &self.path)
+    }
+
+    /// Drop the least recently used entries until the cache fits its budget
+    fn evict(&self, state: &mut CacheState) {
+        if state.bytes <= self.max_bytes {
+            return;
+        }
+        let target = (self.max_bytes as f64 * EVICT_TO) as usize;
+        let mut by_age: Vec<(u64, u128)> = state
+            .entries
+            .iter()
+            .map(|(&key, entry)| (entry.last_used, key))
+            .collect();
+        by_age.sort_unstable();
+        for (_, key) in by_age {
+            if state.bytes <= target {
+                break;
+            }
+            if let Some(entry) = state.entries.remove(&key) {
+                state.bytes -= entry.size();
+            }
+        }
+    }
+
+    /// `core::clean_pii_with_cleaners_batch_core`, serving texts cleaned
+    /// before with the same configuration from the cache
+    ///
+    /// Only the misses are cleaned, in one parallel batch, and then added.
+    #[allow(clippy::too_many_arguments)]
+    pub fn clean_batch<'a, T: AsRef<str> + Sync>(
+        &self,
+        texts: &'a [T],
+        cleaners: &[&str],
+        cleaning: Cleaning,
+        ignore_case: bool,
+        replace_string: Option<&str>,
+        overlap: Overlap,
+        ascii_only: bool,
+        allowlist: Option<&Allowlist>,
+    ) -> Vec<Cow<'a, str>> {
+        let (k0, k1) = config_fingerprint(
+            cleaners,
+            cleaning,
+            ignore_case,
+            replace_string,
+            overlap,
+            ascii_only,
+            allowlist,
+        );
+        let (k0, k1) = (k0 ^ self.secret.0, k1 ^ self.secret.1);
+        let keys: Vec<u128> = pool::install(|| {
+            texts
+                .par_iter()
+                .map(|text| text_key(k0, k1, text.as_ref()))
+                .collect()
+        });
+
+        let mut results: Vec<Option<Cow<'a, str>>> = Vec::with_capacity(texts.len());
+        let mut misses = Vec::new();
+        {
+            let mut state = self.lock();
+            state.generation += 1;
+            let generation = state.generation;
+            for (i, key) in keys.iter().enumerate() {
+                match state.entries.get_mut(key) {
+                    Some(entry) => {
+                        entry.last_used = generation;
+                        results.push(Some(match &entry.cleaned {
+                            None => Cow::Borrowed(texts[i].as_ref()),
+                            Some(cleaned) => Cow::Owned(cleaned.to_string()),
+                        }));
+                    }
+                    None => {
+                        results.push(None);
+                        misses.push(i);
+                    }
+                }
+            }
+            state.hits += (texts.len() - misses.len()) as u64;
+            state.misses += misses.len() as u64;
+        }
+        if misses.is_empty() {
+            return results.into_iter().flatten().collect();
+        }
+
+        // Cleaning runs without the lock, so other batches can use the cache
+        let miss_texts: Vec<&'a str> = misses.iter().map(|&i| texts[i].as_ref()).collect();
+        let cleaned = core::clean_pii_with_cleaners_batch_core(
+            &miss_texts,
+            cleaners,
+            cleaning,
+            ignore_case,
+            replace_string,
+            overlap,
+            ascii_only,
+            allowlist,
+        );
+
+        let mut state = self.lock();
+        let generation = state.generation;
+        for (&i, cleaned) in misses.iter().zip(cleaned) {
+            let entry = Entry {
+                cleaned: match &cleaned {
+                    Cow::Borrowed(_) => None,
+                    Cow::Owned(cleaned) => Some(cleaned.as_str().into()),
+                },
+                last_used: generation,
+            };
+            state.bytes += entry.size();
+            if let Some(old) = state.entries.insert(keys[i], entry) {
+                state.bytes -= old.size();
+            }
+            results[i] = Some(match cleaned {
+                Cow::Borrowed(_) => Cow::Borrowed(texts[i].as_ref()),
+                Cow::Owned(cleaned) => Cow::Owned(cleaned),
+            });
+        }
+        self.evict(&mut state);
+        results.into_iter().flatten().collect()
+    }
+}
+
+/// Hash everything that affects the result of cleaning, as a 128-bit key
+pub fn config_fingerprint(
+    cleaners: &[&str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+) -> (u64, u64) {
+    let mut hasher = SipHasher128::new();
+    // New releases may change how text is cleaned
+    env!("CARGO_PKG_VERSION").hash(&mut hasher);
+    let registry = patterns::get_registry();
+    for cleaner in core::cleaners_by_priority(cleaners) {
+        cleaner.hash(&mut hasher);
+        let patterns = registry.get_patterns_by_name(&[cleaner]);
+        if !patterns.is_empty() {
+            patterns.hash(&mut hasher);
+        } else if let Some(dictionary) = dictionary::get(cleaner) {
+            dictionary.fingerprint().hash(&mut hasher);
+        }
+    }
+    cleaning.hash(&mut hasher);
+    ignore_case.hash(&mut hasher);
+    replace_string.hash(&mut hasher);
+    overlap.hash(&mut hasher);
+    ascii_only.hash(&mut hasher);
+    allowlist.map(Allowlist::fingerprint).hash(&mut hasher);
+    let hash = hasher.finish128();
+    (hash.h1, hash.h2)
+}
+
+fn text_key(k0: u64, k1: u64, text: &str) -> u128 {
+    let mut hasher = SipHasher128::new_with_keys(k0, k1);
+    hasher.write(text.as_bytes());
+    let hash = hasher.finish128();
+    (hash.h1 as u128) << 64 | hash.h2 as u128
+}
+
+/// The key file of the cache at `path`
+fn key_path(path: &Path) -> PathBuf {
+    let mut name = path.as_os_str().to_owned();
+    name.push(".key");
+    PathBuf::from(name)
+}
+
+/// A new random secret
+fn random_secret() -> (u64, u64) {
+    // Each `RandomState` is seeded from the operating system's random source
+    let word = |salt: u64| {
+        let mut hasher = RandomState::new().build_hasher();
+        hasher.write_u64(salt);
+        hasher.finish()
+    };
+    (word(0), word(1))
+}
+
+fn read_secret(path: &Path) -> io::Result<(u64, u64)> {
+    let mut reader = File::open(path)?;
+    let secret = (
+        u64::from_le_bytes(read_array(&mut reader)?),
+        u64::from_le_bytes(read_array(&mut reader)?),
+    );
+    if reader.read(&mut [0])? != 0 {
+        return Err(io::Error::new(
+            io::ErrorKind::InvalidData,
+            "Not a piicleaner cache key file",
+        ));
+    }
+    Ok(secret)
+}
+
+/// Write `secret` to `path`, readable only by its owner where supported
+fn write_secret(path: &Path, secret: (u64, u64)) -> io::Result<()> {
+    if path.exists() && read_secret(path).ok() == Some(secret) {
+        return Ok(());
+    }
+    let mut options = OpenOptions::new();
+    options.write(true).create(true).truncate(true);
+    #[cfg(unix)]
+    std::os::unix::fs::OpenOptionsExt::mode(&mut options, 0o600);
+    let mut file = options.open(path)?;
+    file.write_all(&secret.0.to_le_bytes())?;
+    file.write_all(&secret.1.to_le_bytes())?;
+    file.sync_all()
+}
+
+fn read_array<const N: usize>(reader: &mut impl Read) -> io::Result<[u8; N]> {
+    let mut bytes = [0; N];
+    reader.read_exact(&mut bytes)?;
+    Ok(bytes)
+}
+
+fn read_state(path: &Path) -> io::Result<CacheState> {
+    let mut reader = BufReader::new(File::open(path)?);
+    let magic = read_array::<8>(&mut reader)?;
+    if &magic == MAGIC_V1 {
+        return Ok(CacheState::default());
+    }
+    if &magic != MAGIC {
+        return Err(io::Error::new(
+            io::ErrorKind::InvalidData,
+            "Not a piicleaner cache file",
+        ));
+    }
+    let mut state = CacheState {
+        generation: u64::from_le_bytes(read_array(&mut reader)?),
+        ..CacheState::default()
+    };
+    let n_entries = u64::from_le_bytes(read_array(&mut reader)?) as usize;
+    state.entries.reserve(n_entries.min(1 << 20));
+    for _ in 0..n_entries {
+        let key = u128::from_le_bytes(read_array(&mut reader)?);
+        let last_used = u64::from_le_bytes(read_array(&mut reader)?);
+        let cleaned = match read_array::<1>(&mut reader)?[0] {
+            0 => None,
+            _ => {
+                let len = u32::from_le_bytes(read_array(&mut reader)?) as usize;
+                let mut bytes = vec![0; len];
+                reader.read_exact(&mut bytes)?;
+                let cleaned = String::from_utf8(bytes).map_err(|_| {
+                    io::Error::new(io::ErrorKind::InvalidData, "Cached text is not valid UTF-8")
+                })?;
+                Some(cleaned.into_boxed_str())
+            }
+        };
+        let entry = Entry { cleaned, last_used };
+        state.bytes += entry.size();
+        state.entries.insert(key, entry);
+    }
+    Ok(state)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn temp_path(name: &str) -> PathBuf {
+        std::env::temp_dir().join(format!("piicleaner-{}-{}", name, std::process::id()))
+    }
+
+    fn clean(cache: &CleanCache, texts: &[&str], cleaning: Cleaning) -> Vec<String> {
+        cache
+            .clean_batch(
+                texts,
+                &["all"],
+                cleaning,
+                true,
+                None,
+                Overlap::Longest,
+                false,
+                None,
+            )
+            .into_iter()
+            .map(Cow::into_owned)
+            .collect()
+    }
+
+    #[test]
+    fn test_cache_hits_and_persistence() {
+        let path = temp_path("cache");
+        let texts = ["Email jane@example.com", "No PII here"];
+        let expected = vec!["Email [email-redacted]", "No PII here"];
+
+        let cache = CleanCache::open(&path, 1 << 20).unwrap();
+        assert_eq!(clean(&cache, &texts, Cleaning::Redact), expected);
+        assert_eq!(clean(&cache, &texts, Cleaning::Redact), expected);
+        let stats = cache.stats();
+        assert_eq!((stats.hits, stats.misses, stats.entries), (2, 2, 2));
+        cache.save().unwrap();
+
+        let reopened = CleanCache::open(&path, 1 << 20).unwrap();
+        std::fs::remove_file(&path).unwrap();
+        std::fs::remove_file(key_path(&path)).unwrap();
+        assert_eq!(reopened.stats().entries, 2);
+        assert_eq!(clean(&reopened, &texts, Cleaning::Redact), expected);
+        assert_eq!(reopened.stats().hits, 2);
+    }
+
+    #[test]
+    fn test_cache_secret() {
+        let path = temp_path("secret");
+        let texts = ["Email jane@example.com"];
+        let cache = CleanCache::open(&path, 1 << 20).unwrap();
+        clean(&cache, &texts, Cleaning::Redact);
+        cache.save().unwrap();
+        assert_eq!(read_secret(&key_path(&path)).unwrap(), cache.secret);
+        #[cfg(unix)]
+        {
+            use std::os::unix::fs::PermissionsExt;
+            let mode = std::fs::metadata(key_path(&path))
+                .unwrap()
+                .permissions()
+                .mode();
+            assert_eq!(mode & 0o777, 0o600);
+        }
+
+        // Each cache has its own secret, so the same text gets another key
+        let other = CleanCache::open(&temp_path("secret-other"), 1 << 20).unwrap();
+        assert_ne!(other.secret, cache.secret);
+
+        // Without its key file, a saved cache can't be read
+        std::fs::remove_file(key_path(&path)).unwrap();
+        let reopened = CleanCache::open(&path, 1 << 20).unwrap();
+        std::fs::remove_file(&path).unwrap();
+        assert_eq!(reopened.stats().entries, 0);
+        assert_ne!(reopened.secret, cache.secret);
+    }
+
+    #[test]
+    fn test_cache_keyed_by_config() {
+        let cache = CleanCache::open(&temp_path("config"), 1 << 20).unwrap();
+        let texts = ["Email jane@example.com"];
+        clean(&cache, &texts, Cleaning::Redact);
+        assert_eq!(
+            clean(&cache, &texts, Cleaning::Replace),
+            vec!["[PII detected, text redacted]"]
+        );
+        assert_eq!(cache.stats().misses, 2);
+    }
+
+    #[test]
+    fn test_cache_eviction() {
+        let cache = CleanCache::open(&temp_path("evict"), 10 * ENTRY_OVERHEAD).unwrap();
+        let texts: Vec<String> = (0..100).map(|i| format!("row {}", i)).collect();
+        for chunk in texts.chunks(5) {
+            cache.clean_batch(
+                chunk,
+                &["all"],
+                Cleaning::Redact,
+                true,
+                None,
+                Overlap::Longest,
+                false,
+                None,
+            );
+        }
+        let stats = cache.stats();
+        assert!(stats.bytes <= 10 * ENTRY_OVERHEAD);
+        assert!(stats.entries > 0);
+
+        // The most recent batch survives eviction
+        cache.clean_batch(
+            &texts[95..],
+            &["all"],
+            Cleaning::Redact,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
+        assert_eq!(cache.stats().hits, 5);
+    }
+}
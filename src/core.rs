@@ -1,163 +1,806 @@
 //! Core PII detection and cleaning logic without Python bindings
 
+use crate::allowlist::Allowlist;
+use crate::dictionary;
 use crate::patterns;
+use crate::pool;
 use rayon::prelude::*;
+use siphasher::sip::SipHasher24;
+use siphasher::sip128::{Hasher128, SipHasher24 as SipHasher128};
+use std::borrow::Cow;
+use std::collections::{BTreeMap, HashMap};
+use std::fmt::Write;
+use std::hash::Hasher;
+use std::time::{Duration, Instant};
+
+/// How overlapping matches from different patterns are resolved
+#[derive(Copy, Clone, Debug, PartialEq, Hash)]
+pub enum Overlap {
+    /// Report every match from every pattern, only dropping exact duplicates
+    All,
+    /// Keep the longest match; ties go to the higher-priority cleaner
+    Longest,
+    /// Keep the match from the highest-priority cleaner; ties go to the longer
+    /// match
+    Priority,
+}
 
-/// Core function to detect PII with specific cleaners
-pub fn detect_pii_with_cleaners_core(
-    text: &str,
-    cleaners: &[&str],
-    ignore_case: bool,
-) -> Vec<(usize, usize, String, String)> {
-    let (compiled_patterns, patterns_set) = patterns::get_patterns(ignore_case);
+/// A single pattern match within a text
+#[derive(Copy, Clone, Debug, PartialEq, Eq)]
+pub struct Span<'c> {
+    pub start: usize,
+    pub end: usize,
+    pub cleaner: &'c str,
+    /// Position of the cleaner in the priority order, lower is higher priority
+    pub rank: usize,
+}
 
-    // Early exit when using "all" cleaners
-    if cleaners.len() == 1 && cleaners[0] == "all" && !patterns_set.is_match(text) {
-        return Vec::new();
+/// Resolve `cleaners` into the names to run, in priority order
+///
+/// The caller's order is the priority order, with "all" expanding to every
+/// regex cleaner in the registry's default priority order.
+pub(crate) fn cleaners_by_priority<'c>(cleaners: &[&'c str]) -> Vec<&'c str> {
+    let mut resolved = Vec::with_capacity(cleaners.len());
+    for &cleaner in cleaners {
+        if cleaner == "all" {
+            resolved.extend_from_slice(patterns::get_registry().get_cleaners_by_priority());
+        } else {
+            resolved.push(cleaner);
+        }
     }
+    resolved
+}
 
-    let mut all_matches = Vec::new();
+/// Whether `cleaners` is exactly "all", so the regex set can pre-filter texts
+#[inline]
+fn is_all(cleaners: &[&str]) -> bool {
+    cleaners.len() == 1 && cleaners[0] == "all"
+}
 
-    // Determine which patterns to use
-    let cleaners_to_process = if cleaners.len() == 1 && cleaners[0] == "all" {
-        compiled_patterns.keys().collect::<Vec<_>>()
-    } else {
-        cleaners.iter().collect::<Vec<_>>()
-    };
+/// Find every match of the selected cleaners, unresolved and unsorted
+fn find_spans<'c>(
+    text: &str,
+    cleaners: &[&'c str],
+    ignore_case: bool,
+    ascii: bool,
+) -> Vec<Span<'c>> {
+    let local = patterns::get_local_patterns(ignore_case, ascii);
+    let compiled_patterns = &local.compiled;
+    let mut spans = Vec::new();
 
-    // Process each cleaner
-    for &cleaner_name in cleaners_to_process {
+    for (rank, cleaner_name) in cleaners_by_priority(cleaners).into_iter().enumerate() {
         if let Some(regexes) = compiled_patterns.get(cleaner_name) {
             for regex in regexes {
-                for m in regex.find_iter(text) {
-                    all_matches.push((
-                        m.start(),
-                        m.end(),
-                        m.as_str().to_string(),
-                        cleaner_name.to_string(),
-                    ));
-                }
+                spans.extend(regex.find_iter(text).map(|m| Span {
+                    start: m.start(),
+                    end: m.end(),
+                    cleaner: cleaner_name,
+                    rank,
+                }));
             }
+        } else if let Some(dictionary) = dictionary::get(cleaner_name) {
+            spans.extend(dictionary.find_iter(text).map(|(start, end)| Span {
+                start,
+                end,
+                cleaner: cleaner_name,
+                rank,
+            }));
         }
     }
+    spans
+}
+
+/// Resolve overlapping spans and return them sorted by start position
+///
+/// With `Overlap::All` spans are only sorted and exact duplicates dropped.
+/// Otherwise candidates are ranked by the strategy and accepted in one sweep,
+/// skipping any that overlap a span already accepted.
+pub fn resolve_overlaps<'c>(mut spans: Vec<Span<'c>>, overlap: Overlap) -> Vec<Span<'c>> {
+    match overlap {
+        Overlap::All => {
+            spans.sort_by_key(|span| span.start);
+            spans.dedup_by(|a, b| a.start == b.start && a.end == b.end && a.cleaner == b.cleaner);
+            return spans;
+        }
+        Overlap::Longest => spans.sort_by_key(|span| {
+            (
+                std::cmp::Reverse(span.end - span.start),
+                span.start,
+                span.rank,
+            )
+        }),
+        Overlap::Priority => spans.sort_by_key(|span| {
+            (
+                span.rank,
+                std::cmp::Reverse(span.end - span.start),
+                span.start,
+            )
+        }),
+    }
+
+    // Accepted spans keyed by start. They never overlap, so the accepted span
+    // with the greatest start before a candidate's end is the only one that
+    // can overlap it.
+    let mut accepted: BTreeMap<usize, Span<'c>> = BTreeMap::new();
+    for span in spans {
+        let overlaps = accepted
+            .range(..span.end.max(span.start + 1))
+            .next_back()
+            .is_some_and(|(_, prev)| prev.end > span.start);
+        if !overlaps {
+            accepted.insert(span.start, span);
+        }
+    }
+    accepted.into_values().collect()
+}
+
+/// Drop spans whose matched text is on the allowlist
+///
+/// Applied after overlap resolution, so an allowlisted value also suppresses
+/// shorter matches inside it rather than leaving them to be reported.
+fn drop_allowed<'c>(
+    text: &str,
+    mut spans: Vec<Span<'c>>,
+    allowlist: Option<&Allowlist>,
+) -> Vec<Span<'c>> {
+    if let Some(allowlist) = allowlist.filter(|allowlist| !allowlist.is_empty()) {
+        spans.retain(|span| !allowlist.contains(&text[span.start..span.end]));
+    }
+    spans
+}
+
+/// Use the ASCII-only patterns when forced, or when the text is pure ASCII
+/// and they are guaranteed to give the same matches
+#[inline]
+fn use_ascii(text: &str, ascii_only: bool) -> bool {
+    ascii_only || text.is_ascii()
+}
+
+/// Core function to detect PII spans with specific cleaners
+///
+/// `ascii_only` applies ASCII semantics (`\w`, `\d`, `\b`, case folding) to
+/// every text. Pure-ASCII texts always take the ASCII fast path regardless.
+pub fn detect_spans<'c>(
+    text: &str,
+    cleaners: &[&'c str],
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+) -> Vec<Span<'c>> {
+    let ascii = use_ascii(text, ascii_only);
+    // Early exit when using "all" cleaners
+    if is_all(cleaners)
+        && !patterns::get_local_patterns(ignore_case, ascii)
+            .set
+            .is_match(text)
+    {
+        return Vec::new();
+    }
+
+    let spans = resolve_overlaps(find_spans(text, cleaners, ignore_case, ascii), overlap);
+    drop_allowed(text, spans, allowlist)
+}
 
-    all_matches.sort_by_key(|&(start, _, _, _)| start);
-    all_matches.dedup();
-    all_matches
+/// Vectorised function to detect PII spans with specific cleaners for
+/// multiple texts
+pub fn detect_spans_batch_core<'c, T: AsRef<str> + Sync>(
+    texts: &[T],
+    cleaners: &[&'c str],
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+) -> Vec<Vec<Span<'c>>> {
+    pool::install(|| {
+        texts
+            .par_iter()
+            .map(|text| {
+                detect_spans(
+                    text.as_ref(),
+                    cleaners,
+                    ignore_case,
+                    overlap,
+                    ascii_only,
+                    allowlist,
+                )
+            })
+            .collect()
+    })
+}
+
+/// Core function to detect PII with specific cleaners
+///
+/// Returns `(start, end, matched text, cleaner name)` for each match found by
+/// `detect_spans`.
+pub fn detect_pii_with_cleaners_core(
+    text: &str,
+    cleaners: &[&str],
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+) -> Vec<(usize, usize, String, String)> {
+    detect_spans(text, cleaners, ignore_case, overlap, ascii_only, allowlist)
+        .into_iter()
+        .map(|span| {
+            (
+                span.start,
+                span.end,
+                text[span.start..span.end].to_string(),
+                span.cleaner.to_string(),
+            )
+        })
+        .collect()
 }
 
 /// Vectorised function to detect PII with specific cleaners for multiple texts
-pub fn detect_pii_with_cleaners_batch_core(
-    texts: &[String],
+pub fn detect_pii_with_cleaners_batch_core<T: AsRef<str> + Sync>(
+    texts: &[T],
     cleaners: &[&str],
     ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
 ) -> Vec<Vec<(usize, usize, String, String)>> {
-    texts
-        .par_iter()
-        .map(|text| detect_pii_with_cleaners_core(text, cleaners, ignore_case))
-        .collect()
+    pool::install(|| {
+        texts
+            .par_iter()
+            .map(|text| {
+                detect_pii_with_cleaners_core(
+                    text.as_ref(),
+                    cleaners,
+                    ignore_case,
+                    overlap,
+                    ascii_only,
+                    allowlist,
+                )
+            })
+            .collect()
+    })
 }
 
 /// Wrapper function where cleaners == "all" to keep Python API unchanged
 #[inline]
 pub fn detect_pii_core(text: &str, ignore_case: bool) -> Vec<(usize, usize, String, String)> {
-    detect_pii_with_cleaners_core(text, &["all"], ignore_case)
+    detect_pii_with_cleaners_core(text, &["all"], ignore_case, Overlap::All, false, None)
 }
 
-#[derive(Copy, Clone, PartialEq)]
+#[derive(Copy, Clone, PartialEq, Hash)]
 pub enum Cleaning {
     Replace,
     Redact,
+    /// Swap each match for a keyed-hash token such as `[email:3f9a1c07be42]`
+    Pseudonymise(PseudonymKey),
+}
+
+/// Number of bits of the keyed hash kept in a pseudonym token
+const PSEUDONYM_BITS: u32 = 48;
+
+/// Secret key for `Cleaning::Pseudonymise`
+///
+/// Tokens are SipHash-2-4 of the matched text under this key, so the same
+/// value always maps to the same token for a given key, but tokens can't be
+/// reversed or recomputed without it.
+#[derive(Copy, Clone, PartialEq, Eq, Hash)]
+pub struct PseudonymKey {
+    k0: u64,
+    k1: u64,
 }
 
+impl PseudonymKey {
+    /// Derive a 128-bit SipHash key from a secret of any length
+    pub fn new(secret: &[u8]) -> Self {
+        let mut hasher = SipHasher128::new();
+        hasher.write(secret);
+        let hash = hasher.finish128();
+        PseudonymKey {
+            k0: hash.h1,
+            k1: hash.h2,
+        }
+    }
+
+    /// Keyed hash of `value`, truncated to `PSEUDONYM_BITS`
+    pub fn hash(&self, value: &str) -> u64 {
+        let mut hasher = SipHasher24::new_with_keys(self.k0, self.k1);
+        hasher.write(value.as_bytes());
+        hasher.finish() >> (64 - PSEUDONYM_BITS)
+    }
+}
+
+/// What "replace" cleaning swaps a text for when no `replace_string` is given
+const DEFAULT_REPLACE_STRING: &str = "[PII detected, text redacted]";
+
+/// Pseudonym hashes already computed, keyed by matched text
+///
+/// Shared across the texts of a batch so repeated identifiers are hashed once.
+pub(crate) type PseudonymMemo<'a> = HashMap<&'a str, u64>;
+
 /// Core function to clean PII with specific cleaners
-pub fn clean_pii_with_cleaners_core(
-    text: &str,
+///
+/// Returns `Cow::Borrowed(text)` when nothing was cleaned, so callers can hand
+/// back the original string without copying it. Redaction and pseudonymisation
+/// resolve overlapping matches with `overlap` so every character is replaced at
+/// most once; `Overlap::All` is treated as `Overlap::Longest` here.
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_with_cleaners_core<'a>(
+    text: &'a str,
     cleaners: &[&str],
     cleaning: Cleaning,
     ignore_case: bool,
     replace_string: Option<&str>,
-) -> String {
-    let (compiled_patterns, patterns_set) = patterns::get_patterns(ignore_case);
-    let replace_str = replace_string.unwrap_or("[PII detected, text redacted]");
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+) -> Cow<'a, str> {
+    clean_text(
+        text,
+        cleaners,
+        cleaning,
+        ignore_case,
+        replace_string,
+        overlap,
+        ascii_only,
+        allowlist,
+        &mut PseudonymMemo::new(),
+    )
+}
+
+/// `clean_pii_with_cleaners_core` with a caller-provided pseudonym memo
+#[allow(clippy::too_many_arguments)]
+fn clean_text<'a>(
+    text: &'a str,
+    cleaners: &[&str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    memo: &mut PseudonymMemo<'a>,
+) -> Cow<'a, str> {
+    let ascii = use_ascii(text, ascii_only);
+    let local = patterns::get_local_patterns(ignore_case, ascii);
+    let (compiled_patterns, patterns_set) = (&local.compiled, &local.set);
+    let replace_str = replace_string.unwrap_or(DEFAULT_REPLACE_STRING);
+    let overlap = match overlap {
+        Overlap::All => Overlap::Longest,
+        other => other,
+    };
 
     match cleaning {
+        Cleaning::Replace if allowlist.is_some_and(|allowlist| !allowlist.is_empty()) => {
+            // Every match has to be checked against the allowlist, so the
+            // short-circuiting searches below can't be used
+            if is_all(cleaners) && !patterns_set.is_match(text) {
+                return Cow::Borrowed(text);
+            }
+            let spans = resolve_overlaps(find_spans(text, cleaners, ignore_case, ascii), overlap);
+            if drop_allowed(text, spans, allowlist).is_empty() {
+                Cow::Borrowed(text)
+            } else {
+                Cow::Owned(replace_str.to_string())
+            }
+        }
         Cleaning::Replace => {
             // If cleaners is "all" then we can use the regex set, otherwise
-            // need to use the compiled patterns
-            if cleaners.len() == 1 && cleaners[0] == "all" {
+            // need to use the compiled patterns and dictionaries
+            if is_all(cleaners) {
                 // Replace: if ANY PII found, replace entire text with message
                 if patterns_set.is_match(text) {
-                    return replace_str.to_string();
+                    return Cow::Owned(replace_str.to_string());
                 } else {
-                    return text.to_string();
+                    return Cow::Borrowed(text);
                 }
             } else {
-                for &cleaner_name in cleaners {
-                    if let Some(regexes) = compiled_patterns.get(cleaner_name) {
-                        for regex in regexes {
-                            if regex.is_match(text) {
-                                return replace_str.to_string();
-                            }
-                        }
+                for cleaner_name in cleaners_by_priority(cleaners) {
+                    let found = match compiled_patterns.get(cleaner_name) {
+                        Some(regexes) => regexes.iter().any(|regex| regex.is_match(text)),
+                        None => dictionary::get(cleaner_name)
+                            .is_some_and(|dictionary| dictionary.is_match(text)),
+                    };
+                    if found {
+                        return Cow::Owned(replace_str.to_string());
                     }
                 }
             }
-            text.to_string()
+            Cow::Borrowed(text)
         }
-        Cleaning::Redact => {
+        Cleaning::Redact | Cleaning::Pseudonymise(_) => {
             // Early exit optimization: if using "all" cleaners and no PII found, return original text
-            if cleaners.len() == 1 && cleaners[0] == "all" && !patterns_set.is_match(text) {
-                return text.to_string();
+            if is_all(cleaners) && !patterns_set.is_match(text) {
+                return Cow::Borrowed(text);
             }
 
-            // Determine which patterns to use
-            let cleaners_to_process = if cleaners.len() == 1 && cleaners[0] == "all" {
-                compiled_patterns.keys().collect::<Vec<_>>()
-            } else {
-                cleaners.iter().collect::<Vec<_>>()
-            };
-
-            // Redact: replace each PII match with semantic labels, keep rest of text
-            let mut result = text.to_string();
-            for &cleaner_name in cleaners_to_process {
-                let replacement = &patterns::REPLACEMENT_STRINGS[cleaner_name];
-                if let Some(regexes) = compiled_patterns.get(cleaner_name) {
-                    for regex in regexes {
-                        result = regex.replace_all(&result, replacement).into_owned();
-                    }
-                }
+            let spans = resolve_overlaps(find_spans(text, cleaners, ignore_case, ascii), overlap);
+            let spans = drop_allowed(text, spans, allowlist);
+            if spans.is_empty() {
+                return Cow::Borrowed(text);
             }
-            result
+
+            Cow::Owned(clean_spans(text, &spans, cleaning, memo))
+        }
+    }
+}
+
+/// Replace each of the resolved, sorted `spans` of `text` and keep the rest
+///
+/// Redact swaps each match for its cleaner's label and pseudonymise for its
+/// label and keyed hash. Replace isn't span-based, so it is treated as redact.
+pub(crate) fn clean_spans<'a>(
+    text: &'a str,
+    spans: &[Span],
+    cleaning: Cleaning,
+    memo: &mut PseudonymMemo<'a>,
+) -> String {
+    let mut result = String::with_capacity(text.len());
+    let mut last_end = 0;
+    for span in spans {
+        result.push_str(&text[last_end..span.start]);
+        if let Cleaning::Pseudonymise(key) = cleaning {
+            let value = &text[span.start..span.end];
+            let hash = *memo.entry(value).or_insert_with(|| key.hash(value));
+            // Writing to a String can't fail
+            let _ = write!(result, "[{}:{:012x}]", span.cleaner, hash);
+        } else if let Some(replacement) = patterns::REPLACEMENT_STRINGS.get(span.cleaner) {
+            result.push_str(replacement);
+        } else {
+            // Dictionary cleaners are labelled the same way
+            let _ = write!(result, "[{}-redacted]", span.cleaner);
         }
+        last_end = span.end;
     }
+    result.push_str(&text[last_end..]);
+    result
 }
 
 /// Vectorised function to clean PII with specific cleaners for multiple texts
-pub fn clean_pii_with_cleaners_batch_core(
-    texts: &[String],
+///
+/// Rows without PII come back as `Cow::Borrowed` slices of the input. When
+/// pseudonymising, each worker keeps a memo of the values it has hashed so
+/// identifiers repeated across the batch are only hashed once per worker.
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_with_cleaners_batch_core<'a, T: AsRef<str> + Sync>(
+    texts: &'a [T],
     cleaners: &[&str],
     cleaning: Cleaning,
     ignore_case: bool,
     replace_string: Option<&str>,
-) -> Vec<String> {
-    texts
-        .par_iter()
-        .map(|text| {
-            clean_pii_with_cleaners_core(text, cleaners, cleaning, ignore_case, replace_string)
-        })
-        .collect()
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+) -> Vec<Cow<'a, str>> {
+    pool::install(|| {
+        texts
+            .par_iter()
+            .map_init(PseudonymMemo::new, |memo, text| {
+                clean_text(
+                    text.as_ref(),
+                    cleaners,
+                    cleaning,
+                    ignore_case,
+                    replace_string,
+                    overlap,
+                    ascii_only,
+                    allowlist,
+                    memo,
+                )
+            })
+            .collect()
+    })
+}
+
+/// Clean a text and report the spans that were cleaned, from one scan
+///
+/// The spans are resolved with `overlap`, treating `Overlap::All` as
+/// `Overlap::Longest` as cleaning does, so they are exactly what was removed.
+/// Their offsets refer to the original text.
+#[allow(clippy::too_many_arguments)]
+fn clean_and_detect_text<'a, 'c>(
+    text: &'a str,
+    cleaners: &[&'c str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    memo: &mut PseudonymMemo<'a>,
+) -> (Cow<'a, str>, Vec<Span<'c>>) {
+    let overlap = match overlap {
+        Overlap::All => Overlap::Longest,
+        other => other,
+    };
+    let spans = detect_spans(text, cleaners, ignore_case, overlap, ascii_only, allowlist);
+    let cleaned = clean_from_spans(text, &spans, cleaning, replace_string, memo);
+    (cleaned, spans)
+}
+
+/// Clean `text` given its resolved, sorted `spans`, borrowing it when there
+/// are none
+fn clean_from_spans<'a>(
+    text: &'a str,
+    spans: &[Span],
+    cleaning: Cleaning,
+    replace_string: Option<&str>,
+    memo: &mut PseudonymMemo<'a>,
+) -> Cow<'a, str> {
+    if spans.is_empty() {
+        Cow::Borrowed(text)
+    } else if let Cleaning::Replace = cleaning {
+        Cow::Owned(replace_string.unwrap_or(DEFAULT_REPLACE_STRING).to_string())
+    } else {
+        Cow::Owned(clean_spans(text, spans, cleaning, memo))
+    }
+}
+
+/// Vectorised function to clean texts and report what was cleaned, see
+/// `clean_and_detect_text`
+///
+/// Gives the same cleaned texts as `clean_pii_with_cleaners_batch_core` and
+/// the same spans as `detect_spans_batch_core` with the cleaning overlap, but
+/// scans each text once.
+#[allow(clippy::too_many_arguments)]
+pub fn clean_and_detect_batch_core<'a, 'c, T: AsRef<str> + Sync>(
+    texts: &'a [T],
+    cleaners: &[&'c str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+) -> Vec<(Cow<'a, str>, Vec<Span<'c>>)> {
+    pool::install(|| {
+        texts
+            .par_iter()
+            .map_init(PseudonymMemo::new, |memo, text| {
+                clean_and_detect_text(
+                    text.as_ref(),
+                    cleaners,
+                    cleaning,
+                    ignore_case,
+                    replace_string,
+                    overlap,
+                    ascii_only,
+                    allowlist,
+                    memo,
+                )
+            })
+            .collect()
+    })
+}
+
+/// What a row that hits one of its `RowLimits` is cleaned to
+#[derive(Copy, Clone, Debug, PartialEq, Eq)]
+pub enum Fallback {
+    /// Replace the whole text, as "replace" cleaning does, so no PII can
+    /// remain in it
+    Replace,
+    /// Leave the text as it is; the caller is told which rows were skipped
+    Skip,
+}
+
+/// The limit a row hit, see `RowLimits`
+#[derive(Copy, Clone, Debug, PartialEq, Eq)]
+pub enum LimitHit {
+    Bytes,
+    Matches,
+    Time,
+}
+
+impl LimitHit {
+    /// The name of the limit, as used for the `RowLimits` option
+    pub fn as_str(self) -> &'static str {
+        match self {
+            LimitHit::Bytes => "max_bytes",
+            LimitHit::Matches => "max_matches",
+            LimitHit::Time => "time_budget",
+        }
+    }
+}
+
+/// Limits on the work spent cleaning one row, so a single huge or
+/// match-dense text can't stall a batch
+#[derive(Copy, Clone, Debug, PartialEq)]
+pub struct RowLimits {
+    /// Longest text, in bytes, that is scanned at all
+    pub max_bytes: Option<usize>,
+    /// Most pattern matches found in a text, counted before overlaps are
+    /// resolved
+    pub max_matches: Option<usize>,
+    /// Longest time spent scanning a text. It is checked before each pattern
+    /// and after each match, so one search can overrun it; `max_bytes` bounds
+    /// how long a single search takes.
+    pub time_budget: Option<Duration>,
+    pub fallback: Fallback,
+}
+
+/// `find_spans` that gives up once a limit is hit
+fn find_spans_limited<'c>(
+    text: &str,
+    cleaners: &[&'c str],
+    ignore_case: bool,
+    ascii: bool,
+    limits: &RowLimits,
+    started: Instant,
+) -> Result<Vec<Span<'c>>, LimitHit> {
+    let local = patterns::get_local_patterns(ignore_case, ascii);
+    let max_matches = limits.max_matches.unwrap_or(usize::MAX);
+    let check_time = || match limits.time_budget {
+        Some(budget) if started.elapsed() >= budget => Err(LimitHit::Time),
+        _ => Ok(()),
+    };
+    let mut spans = Vec::new();
+    let mut add = |start, end, cleaner, rank| {
+        if spans.len() == max_matches {
+            return Err(LimitHit::Matches);
+        }
+        spans.push(Span {
+            start,
+            end,
+            cleaner,
+            rank,
+        });
+        check_time()
+    };
+
+    for (rank, cleaner_name) in cleaners_by_priority(cleaners).into_iter().enumerate() {
+        check_time()?;
+        if let Some(regexes) = local.compiled.get(cleaner_name) {
+            for regex in regexes {
+                for m in regex.find_iter(text) {
+                    add(m.start(), m.end(), cleaner_name, rank)?;
+                }
+            }
+        } else if let Some(dictionary) = dictionary::get(cleaner_name) {
+            for (start, end) in dictionary.find_iter(text) {
+                add(start, end, cleaner_name, rank)?;
+            }
+        }
+    }
+    Ok(spans)
+}
+
+/// `detect_spans` within `limits`, or the limit that was hit
+pub fn detect_spans_limited<'c>(
+    text: &str,
+    cleaners: &[&'c str],
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    limits: &RowLimits,
+) -> Result<Vec<Span<'c>>, LimitHit> {
+    if limits
+        .max_bytes
+        .is_some_and(|max_bytes| text.len() > max_bytes)
+    {
+        return Err(LimitHit::Bytes);
+    }
+    let started = Instant::now();
+    let ascii = use_ascii(text, ascii_only);
+    if is_all(cleaners)
+        && !patterns::get_local_patterns(ignore_case, ascii)
+            .set
+            .is_match(text)
+    {
+        return Ok(Vec::new());
+    }
+    let spans = find_spans_limited(text, cleaners, ignore_case, ascii, limits, started)?;
+    Ok(drop_allowed(
+        text,
+        resolve_overlaps(spans, overlap),
+        allowlist,
+    ))
+}
+
+/// Vectorised function to clean PII within per-row `limits`
+///
+/// Rows within the limits are cleaned exactly as by
+/// `clean_pii_with_cleaners_batch_core`. A row that hits a limit is cleaned
+/// to its `Fallback` and reported with the limit it hit.
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_limited_batch_core<'a, T: AsRef<str> + Sync>(
+    texts: &'a [T],
+    cleaners: &[&str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    limits: &RowLimits,
+) -> Vec<(Cow<'a, str>, Option<LimitHit>)> {
+    clean_and_detect_limited_batch_core(
+        texts,
+        cleaners,
+        cleaning,
+        ignore_case,
+        replace_string,
+        overlap,
+        ascii_only,
+        allowlist,
+        limits,
+    )
+    .into_iter()
+    .map(|(cleaned, _, hit)| (cleaned, hit))
+    .collect()
+}
+
+/// `clean_and_detect_batch_core` within per-row `limits`
+///
+/// Rows within the limits give exactly what `clean_and_detect_batch_core`
+/// does. A row that hits a limit is cleaned to its `Fallback`, has no spans,
+/// as it wasn't fully scanned, and is reported with the limit it hit.
+#[allow(clippy::too_many_arguments)]
+pub fn clean_and_detect_limited_batch_core<'a, 'c, T: AsRef<str> + Sync>(
+    texts: &'a [T],
+    cleaners: &[&'c str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    limits: &RowLimits,
+) -> Vec<(Cow<'a, str>, Vec<Span<'c>>, Option<LimitHit>)> {
+    let overlap = match overlap {
+        Overlap::All => Overlap::Longest,
+        other => other,
+    };
+    pool::install(|| {
+        texts
+            .par_iter()
+            .map_init(PseudonymMemo::new, |memo, text| {
+                let text = text.as_ref();
+                match detect_spans_limited(
+                    text,
+                    cleaners,
+                    ignore_case,
+                    overlap,
+                    ascii_only,
+                    allowlist,
+                    limits,
+                ) {
+                    Ok(spans) => (
+                        clean_from_spans(text, &spans, cleaning, replace_string, memo),
+                        spans,
+                        None,
+                    ),
+                    Err(hit) => {
+                        let fallback = match limits.fallback {
+                            Fallback::Replace => Cow::Owned(
+                                replace_string.unwrap_or(DEFAULT_REPLACE_STRING).to_string(),
+                            ),
+                            Fallback::Skip => Cow::Borrowed(text),
+                        };
+                        (fallback, Vec::new(), Some(hit))
+                    }
+                }
+            })
+            .collect()
+    })
 }
 
 /// Wrapper function where cleaners == "all" to keep Python API unchanged
 #[inline]
-pub fn clean_pii_core(
-    text: &str,
+pub fn clean_pii_core<'a>(
+    text: &'a str,
     cleaning: Cleaning,
     ignore_case: bool,
     replace_string: Option<&str>,
-) -> String {
-    clean_pii_with_cleaners_core(text, &["all"], cleaning, ignore_case, replace_string)
+) -> Cow<'a, str> {
+    clean_pii_with_cleaners_core(
+        text,
+        &["all"],
+        cleaning,
+        ignore_case,
+        replace_string,
+        Overlap::Longest,
+        false,
+        None,
+    )
 }
 
 #[cfg(test)]
@@ -287,6 +930,42 @@ mod tests {
         assert_eq!(replaced, text);
     }
 
+    #[test]
+    fn test_clean_pii_borrows_unchanged_text() {
+        let texts = vec![
+            "No PII here".to_string(),
+            "Email: test@example.com".to_string(),
+        ];
+
+        for method in [Cleaning::Redact, Cleaning::Replace] {
+            let cleaned = clean_pii_with_cleaners_batch_core(
+                &texts,
+                &["all"],
+                method,
+                false,
+                None,
+                Overlap::Longest,
+                false,
+                None,
+            );
+            assert!(matches!(cleaned[0], Cow::Borrowed(_)));
+            assert!(matches!(cleaned[1], Cow::Owned(_)));
+
+            let email_only = clean_pii_with_cleaners_batch_core(
+                &texts,
+                &["email"],
+                method,
+                false,
+                None,
+                Overlap::Longest,
+                false,
+                None,
+            );
+            assert!(matches!(email_only[0], Cow::Borrowed(_)));
+            assert!(matches!(email_only[1], Cow::Owned(_)));
+        }
+    }
+
     #[test]
     fn test_multiple_pii_types() {
         let text = "NINO AB123456C, email test@example.com, amount £1,500";
@@ -302,7 +981,8 @@ mod tests {
         let text = "NINO AB123456C, email test@example.com";
 
         // Test with only email cleaner
-        let email_only = detect_pii_with_cleaners_core(text, &["email"], false);
+        let email_only =
+            detect_pii_with_cleaners_core(text, &["email"], false, Overlap::All, false, None);
 
         // Should find email (may be duplicated by multiple email patterns)
         assert!(!email_only.is_empty());
@@ -315,11 +995,112 @@ mod tests {
         );
 
         // Test with only nino cleaner
-        let nino_only = detect_pii_with_cleaners_core(text, &["nino"], false);
+        let nino_only =
+            detect_pii_with_cleaners_core(text, &["nino"], false, Overlap::All, false, None);
         assert_eq!(nino_only.len(), 1);
         assert_eq!(nino_only[0].2, "AB123456C");
     }
 
+    #[test]
+    fn test_overlap_resolution_longest() {
+        // Both email patterns match the same span, and case-id's
+        // `[a-f0-9]{8,}` matches inside the address
+        let text = "Email deadbeef42@example.com now";
+        let all = detect_pii_with_cleaners_core(text, &["all"], false, Overlap::All, false, None);
+        assert!(all.len() > 1);
+
+        let resolved =
+            detect_pii_with_cleaners_core(text, &["all"], false, Overlap::Longest, false, None);
+        assert_eq!(resolved.len(), 1);
+        assert_eq!(resolved[0].2, "deadbeef42@example.com");
+        assert_eq!(resolved[0].3, "email");
+    }
+
+    #[test]
+    fn test_overlap_resolution_priority() {
+        // `\d{6,}` (case-id) covers more of the text than the NINO, so only
+        // priority resolution keeps the NINO
+        let text = "Ref AB1234567890";
+        let by_priority = detect_pii_with_cleaners_core(
+            text,
+            &["nino", "case-id"],
+            false,
+            Overlap::Priority,
+            false,
+            None,
+        );
+        assert_eq!(by_priority[0].3, "nino");
+
+        let by_length = detect_pii_with_cleaners_core(
+            text,
+            &["nino", "case-id"],
+            false,
+            Overlap::Longest,
+            false,
+            None,
+        );
+        assert!(by_length.iter().all(|m| m.3 == "case-id"));
+    }
+
+    #[test]
+    fn test_resolved_spans_do_not_overlap() {
+        let text = "Contact john@test.com or call +44 20 1234 5678 ref AB123456C at SW1A 1AA";
+        for overlap in [Overlap::Longest, Overlap::Priority] {
+            let resolved =
+                detect_pii_with_cleaners_core(text, &["all"], false, overlap, false, None);
+            for pair in resolved.windows(2) {
+                assert!(
+                    pair[0].1 <= pair[1].0,
+                    "{:?} overlaps {:?}",
+                    pair[0],
+                    pair[1]
+                );
+            }
+        }
+    }
+
+    #[test]
+    fn test_redact_uses_resolved_spans() {
+        let text = "Email deadbeef42@example.com now";
+        let redacted = clean_pii_core(text, Cleaning::Redact, false, None);
+        assert_eq!(redacted, "Email [email-redacted] now");
+    }
+
+    #[test]
+    fn test_ascii_only_mode() {
+        // Non-ASCII text: Unicode `\w` matches "Café", ASCII `\w` does not
+        let text = "Lives at 12 Café street";
+        let unicode =
+            detect_pii_with_cleaners_core(text, &["address"], false, Overlap::All, false, None);
+        assert_eq!(unicode.len(), 1);
+        let ascii =
+            detect_pii_with_cleaners_core(text, &["address"], false, Overlap::All, true, None);
+        assert!(ascii.is_empty());
+
+        // Pure-ASCII text gives the same results either way
+        let text = "Email test@example.com, NINO AB123456C, 12 high street, £1,500";
+        for ignore_case in [false, true] {
+            assert_eq!(
+                detect_pii_with_cleaners_core(
+                    text,
+                    &["all"],
+                    ignore_case,
+                    Overlap::All,
+                    false,
+                    None
+                ),
+                detect_pii_with_cleaners_core(
+                    text,
+                    &["all"],
+                    ignore_case,
+                    Overlap::All,
+                    true,
+                    None
+                ),
+            );
+        }
+    }
+
     #[test]
     fn test_get_available_cleaners() {
         let registry = patterns::get_registry();
@@ -362,29 +1143,53 @@ mod tests {
         ];
 
         // Test batch detection
-        let batch_results = detect_pii_with_cleaners_batch_core(&texts, &["all"], false);
+        let batch_results =
+            detect_pii_with_cleaners_batch_core(&texts, &["all"], false, Overlap::All, false, None);
         assert_eq!(batch_results.len(), 3);
         assert!(!batch_results[0].is_empty()); // Email
         assert_eq!(batch_results[1].len(), 0); // No PII
         assert!(!batch_results[2].is_empty()); // NINO
 
         // Test batch cleaning
-        let batch_cleaned =
-            clean_pii_with_cleaners_batch_core(&texts, &["all"], Cleaning::Redact, false, None);
+        let batch_cleaned = clean_pii_with_cleaners_batch_core(
+            &texts,
+            &["all"],
+            Cleaning::Redact,
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
         assert_eq!(batch_cleaned.len(), 3);
         assert!(!batch_cleaned[0].contains("test1@example.com"));
         assert_eq!(batch_cleaned[1], "No PII here");
         assert!(!batch_cleaned[2].contains("AB123456C"));
 
         // Test batch with specific cleaners
-        let email_only = detect_pii_with_cleaners_batch_core(&texts, &["email"], false);
+        let email_only = detect_pii_with_cleaners_batch_core(
+            &texts,
+            &["email"],
+            false,
+            Overlap::All,
+            false,
+            None,
+        );
         assert!(!email_only[0].is_empty()); // Should find email
         assert_eq!(email_only[1].len(), 0); // No PII
         assert_eq!(email_only[2].len(), 0); // Should not find NINO with email cleaner
 
         // Test batch cleaning with specific cleaners
-        let email_cleaned =
-            clean_pii_with_cleaners_batch_core(&texts, &["email"], Cleaning::Redact, false, None);
+        let email_cleaned = clean_pii_with_cleaners_batch_core(
+            &texts,
+            &["email"],
+            Cleaning::Redact,
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
         assert_eq!(email_cleaned.len(), 3);
         assert!(!email_cleaned[0].contains("test1@example.com")); // Email should be cleaned
         assert_eq!(email_cleaned[1], "No PII here"); // No change
@@ -509,6 +1314,251 @@ mod tests {
         }
     }
 
+    #[test]
+    fn test_concurrent_first_use_and_registry() {
+        use std::sync::Barrier;
+        use std::thread;
+
+        // Threads released together race to compile every pattern variant
+        // while another thread registers and removes a dictionary they use
+        let barrier = Barrier::new(9);
+        thread::scope(|scope| {
+            for i in 0..8 {
+                let barrier = &barrier;
+                scope.spawn(move || {
+                    barrier.wait();
+                    let ignore_case = i % 2 == 0;
+                    let ascii_only = i % 4 < 2;
+                    for _ in 0..50 {
+                        let results = detect_pii_with_cleaners_core(
+                            "Café: test@example.com, ask Jane Doe",
+                            &["email", "concurrent-staff"],
+                            ignore_case,
+                            Overlap::All,
+                            ascii_only,
+                            None,
+                        );
+                        assert_eq!(results[0].2, "test@example.com");
+                        assert!(results.len() <= 2);
+                    }
+                });
+            }
+            scope.spawn(|| {
+                barrier.wait();
+                for _ in 0..50 {
+                    dictionary::register(
+                        "concurrent-staff",
+                        dictionary::Dictionary::new(["Jane Doe"], true, true).unwrap(),
+                    );
+                    dictionary::remove("concurrent-staff");
+                }
+            });
+        });
+    }
+
+    #[test]
+    fn test_local_patterns_per_thread() {
+        let local = patterns::get_local_patterns(true, true);
+        assert!(std::rc::Rc::ptr_eq(
+            &local,
+            &patterns::get_local_patterns(true, true)
+        ));
+        assert!(!std::rc::Rc::ptr_eq(
+            &local,
+            &patterns::get_local_patterns(false, true)
+        ));
+        assert_eq!(
+            local.compiled.len(),
+            patterns::get_patterns(true, true).0.len()
+        );
+
+        // Another thread gets its own copies that match the same way
+        let address = std::rc::Rc::as_ptr(&local) as usize;
+        std::thread::spawn(move || {
+            let other = patterns::get_local_patterns(true, true);
+            assert_ne!(std::rc::Rc::as_ptr(&other) as usize, address);
+            assert!(other.set.is_match("TEST@EXAMPLE.COM"));
+        })
+        .join()
+        .unwrap();
+    }
+
+    #[test]
+    fn test_clean_and_detect_matches_separate_calls() {
+        let texts = [
+            "Email jane@example.com or call 07700 900123",
+            "No PII here",
+            "NINO AB123456C, ref 1234567890",
+        ];
+        let key = PseudonymKey::new(b"secret");
+        let allowlist = Allowlist::new(["07700 900123"], false);
+        for cleaning in [
+            Cleaning::Redact,
+            Cleaning::Replace,
+            Cleaning::Pseudonymise(key),
+        ] {
+            for cleaners in [&["all"][..], &["email", "telephone"][..]] {
+                let combined = clean_and_detect_batch_core(
+                    &texts,
+                    cleaners,
+                    cleaning,
+                    true,
+                    None,
+                    Overlap::All,
+                    false,
+                    Some(&allowlist),
+                );
+                let cleaned = clean_pii_with_cleaners_batch_core(
+                    &texts,
+                    cleaners,
+                    cleaning,
+                    true,
+                    None,
+                    Overlap::All,
+                    false,
+                    Some(&allowlist),
+                );
+                let detected = detect_spans_batch_core(
+                    &texts,
+                    cleaners,
+                    true,
+                    Overlap::Longest,
+                    false,
+                    Some(&allowlist),
+                );
+                let (combined_cleaned, combined_spans): (Vec<_>, Vec<_>) =
+                    combined.into_iter().unzip();
+                assert_eq!(combined_cleaned, cleaned);
+                assert_eq!(combined_spans, detected);
+                assert!(matches!(combined_cleaned[1], Cow::Borrowed(_)));
+            }
+        }
+    }
+
+    #[test]
+    fn test_row_limits() {
+        let texts = [
+            "Email jane@example.com".to_string(),
+            format!("Blob {}", "ab12".repeat(100)),
+            "a@example.com b@example.com c@example.com".to_string(),
+            "No PII here".to_string(),
+        ];
+        let limits = RowLimits {
+            max_bytes: Some(100),
+            max_matches: Some(2),
+            time_budget: Some(Duration::from_secs(60)),
+            fallback: Fallback::Replace,
+        };
+        let clean = |limits: &RowLimits| {
+            clean_pii_limited_batch_core(
+                &texts,
+                &["email", "case-id"],
+                Cleaning::Redact,
+                true,
+                None,
+                Overlap::Longest,
+                false,
+                None,
+                limits,
+            )
+        };
+
+        let results = clean(&limits);
+        assert_eq!(results[0], (Cow::Borrowed("Email [email-redacted]"), None));
+        assert_eq!(
+            results[1],
+            (
+                Cow::Borrowed("[PII detected, text redacted]"),
+                Some(LimitHit::Bytes)
+            )
+        );
+        assert_eq!(results[2].1, Some(LimitHit::Matches));
+        assert!(matches!(results[3], (Cow::Borrowed("No PII here"), None)));
+
+        let skipped = clean(&RowLimits {
+            time_budget: Some(Duration::ZERO),
+            fallback: Fallback::Skip,
+            ..limits
+        });
+        assert_eq!(
+            skipped[2],
+            (Cow::Borrowed(texts[2].as_str()), Some(LimitHit::Time))
+        );
+
+        // Without limits, rows are cleaned as by the unlimited batch
+        let unlimited = clean(&RowLimits {
+            max_bytes: None,
+            max_matches: None,
+            time_budget: None,
+            fallback: Fallback::Skip,
+        });
+        let expected = clean_pii_with_cleaners_batch_core(
+            &texts,
+            &["email", "case-id"],
+            Cleaning::Redact,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
+        assert_eq!(
+            unlimited
+                .into_iter()
+                .map(|(cleaned, _)| cleaned)
+                .collect::<Vec<_>>(),
+            expected
+        );
+    }
+
+    #[test]
+    fn test_clean_and_detect_limited() {
+        let texts = [
+            "Email jane@example.com",
+            "a@example.com b@example.com c@example.com",
+        ];
+        let limits = RowLimits {
+            max_bytes: None,
+            max_matches: Some(2),
+            time_budget: None,
+            fallback: Fallback::Replace,
+        };
+        let results = clean_and_detect_limited_batch_core(
+            &texts,
+            &["email"],
+            Cleaning::Redact,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+            &limits,
+        );
+        let expected = clean_and_detect_batch_core(
+            &texts[..1],
+            &["email"],
+            Cleaning::Redact,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
+        assert_eq!(
+            (&results[0].0, &results[0].1),
+            (&expected[0].0, &expected[0].1)
+        );
+        assert_eq!(results[0].2, None);
+        assert_eq!(
+            results[1],
+            (
+                Cow::Borrowed("[PII detected, text redacted]"),
+                vec![],
+                Some(LimitHit::Matches)
+            )
+        );
+    }
+
     #[test]
     fn test_regex_pattern_validity() {
         // Ensure all patterns compile successfully
@@ -520,4 +1570,182 @@ mod tests {
             assert!(regex_result.is_ok(), "Invalid regex pattern: {}", pattern);
         }
     }
+
+    #[test]
+    fn test_pseudonymise_tokens() {
+        let key = PseudonymKey::new(b"secret");
+        let text = "Email alice@example.com or alice@example.com, not bob@example.com";
+        let cleaned = clean_pii_with_cleaners_core(
+            text,
+            &["email"],
+            Cleaning::Pseudonymise(key),
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
+
+        let alice = format!("[email:{:012x}]", key.hash("alice@example.com"));
+        let bob = format!("[email:{:012x}]", key.hash("bob@example.com"));
+        assert_eq!(
+            cleaned,
+            format!("Email {} or {}, not {}", alice, alice, bob)
+        );
+        assert_ne!(alice, bob);
+    }
+
+    #[test]
+    fn test_pseudonymise_depends_on_key() {
+        let value = "alice@example.com";
+        let key = PseudonymKey::new(b"secret");
+        assert_eq!(key.hash(value), PseudonymKey::new(b"secret").hash(value));
+        assert_ne!(key.hash(value), PseudonymKey::new(b"other").hash(value));
+        assert!(key.hash(value) < 1 << PSEUDONYM_BITS);
+    }
+
+    #[test]
+    fn test_pseudonymise_batch_matches_single() {
+        let key = PseudonymKey::new(b"secret");
+        let texts: Vec<String> = (0..50)
+            .map(|i| format!("User {} is user{}@example.com", i, i % 5))
+            .chain(std::iter::once("No PII here".to_string()))
+            .collect();
+
+        let batch = clean_pii_with_cleaners_batch_core(
+            &texts,
+            &["all"],
+            Cleaning::Pseudonymise(key),
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
+        for (text, cleaned) in texts.iter().zip(&batch) {
+            let single = clean_pii_with_cleaners_core(
+                text,
+                &["all"],
+                Cleaning::Pseudonymise(key),
+                false,
+                None,
+                Overlap::Longest,
+                false,
+                None,
+            );
+            assert_eq!(cleaned, &single);
+        }
+        assert!(matches!(batch.last(), Some(Cow::Borrowed(_))));
+    }
+
+    #[test]
+    fn test_dictionary_cleaner_with_regex_cleaners() {
+        let name = "test-core-names";
+        dictionary::register(
+            name,
+            dictionary::Dictionary::new(["Jane Doe"], true, true).unwrap(),
+        );
+        let text = "Jane Doe <jane@example.com>";
+        let cleaners = ["email", name];
+
+        let detected =
+            detect_pii_with_cleaners_core(text, &cleaners, true, Overlap::All, false, None);
+        assert_eq!(
+            detected,
+            vec![
+                (0, 8, "Jane Doe".to_string(), name.to_string()),
+                (10, 26, "jane@example.com".to_string(), "email".to_string()),
+            ]
+        );
+
+        let redacted = clean_pii_with_cleaners_core(
+            text,
+            &cleaners,
+            Cleaning::Redact,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
+        assert_eq!(redacted, "[test-core-names-redacted] <[email-redacted]>");
+
+        // "all" can be combined with dictionary cleaners
+        let replaced = clean_pii_with_cleaners_core(
+            "Signed, JANE DOE",
+            &["all", name],
+            Cleaning::Replace,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        );
+        assert_eq!(replaced, "[PII detected, text redacted]");
+
+        dictionary::remove(name);
+    }
+
+    #[test]
+    fn test_allowlist() {
+        let text = "Contact support@example.com or jane@example.com";
+        let allowlist = Allowlist::new(["support@example.com"], false);
+
+        let detected = detect_pii_with_cleaners_core(
+            text,
+            &["all"],
+            false,
+            Overlap::All,
+            false,
+            Some(&allowlist),
+        );
+        assert!(detected.iter().all(|m| m.2 != "support@example.com"));
+        assert!(detected.iter().any(|m| m.2 == "jane@example.com"));
+
+        let redacted = clean_pii_with_cleaners_core(
+            text,
+            &["email"],
+            Cleaning::Redact,
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            Some(&allowlist),
+        );
+        assert_eq!(redacted, "Contact support@example.com or [email-redacted]");
+
+        // Replace mode only replaces texts with PII that isn't allowlisted
+        let texts = ["Contact support@example.com", text];
+        let replaced = clean_pii_with_cleaners_batch_core(
+            &texts,
+            &["all"],
+            Cleaning::Replace,
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            Some(&allowlist),
+        );
+        assert!(matches!(replaced[0], Cow::Borrowed(_)));
+        assert_eq!(replaced[1], "[PII detected, text redacted]");
+    }
+
+    #[test]
+    fn test_allowlist_suppresses_overlapping_matches() {
+        // case-id matches inside the address, but the allowlisted email wins
+        // overlap resolution and takes its sub-match with it
+        let text = "Email deadbeef42@example.com now";
+        let allowlist = Allowlist::new(["DEADBEEF42@example.com"], true);
+        let cleaned = clean_pii_with_cleaners_core(
+            text,
+            &["all"],
+            Cleaning::Redact,
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            Some(&allowlist),
+        );
+        assert_eq!(cleaned, text);
+    }
 }
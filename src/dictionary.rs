@@ -0,0 +1,410 @@
+//! Dictionary cleaners: lists of literal values matched with Aho-Corasick
+//!
+//! Dictionaries are registered by name and can then be used in `cleaners`
+//! alongside the regex cleaners in `patterns`.
+
+use aho_corasick::{AhoCorasick, AhoCorasickBuilder, BuildError, MatchKind};
+use siphasher::sip::SipHasher24;
+use std::collections::HashMap;
+use std::fs::File;
+use std::hash::Hasher;
+use std::io::{self, BufRead, BufReader, BufWriter, Read, Write};
+use std::path::Path;
+use std::sync::{Arc, LazyLock, PoisonError, RwLock};
+
+/// First bytes of a saved dictionary file, including the format version
+const MAGIC: &[u8; 8] = b"PIIDICT1";
+
+const FLAG_CASE_INSENSITIVE: u8 = 1;
+const FLAG_WORD_BOUNDARY: u8 = 2;
+
+pub struct Dictionary {
+    /// Distinct values, sorted, so saved files are reproducible
+    values: Vec<String>,
+    /// Leftmost-longest, or reporting every overlapping match when
+    /// `word_boundary` is set, see `find_iter`
+    automaton: AhoCorasick,
+    case_insensitive: bool,
+    word_boundary: bool,
+    /// Hash of the values and options, see `fingerprint`
+    fingerprint: u64,
+}
+
+impl Dictionary {
+    /// Build a dictionary from literal values
+    ///
+    /// Empty values are ignored. `case_insensitive` folds ASCII letters only,
+    /// and `word_boundary` only reports matches that start and end on a word
+    /// boundary, as `\b` would in a regex.
+    pub fn new<I, S>(
+        values: I,
+        case_insensitive: bool,
+        word_boundary: bool,
+    ) -> Result<Self, BuildError>
+    where
+        I: IntoIterator<Item = S>,
+        S: AsRef<str>,
+    {
+        let mut values: Vec<String> = values
+            .into_iter()
+            .map(|value| value.as_ref().to_string())
+            .filter(|value| !value.is_empty())
+            .collect();
+        values.sort_unstable();
+        values.dedup();
+
+        let automaton = AhoCorasickBuilder::new()
+            .match_kind(if word_boundary {
+                MatchKind::Standard
+            } else {
+                MatchKind::LeftmostLongest
+            })
+            .ascii_case_insensitive(case_insensitive)
+            .build(&values)?;
+
+        Ok(Dictionary {
+            fingerprint: fingerprint(&values, case_insensitive, word_boundary),
+            values,
+            automaton,
+            case_insensitive,
+            word_boundary,
+        })
+    }
+
+    /// Build a dictionary from a text file with one value per line
+    ///
+    /// Leading and trailing whitespace is stripped and blank lines are skipped.
+    pub fn from_file(path: &Path, case_insensitive: bool, word_boundary: bool) -> io::Result<Self> {
+        let mut values = Vec::new();
+        for line in BufReader::new(File::open(path)?).lines() {
+            let line = line?;
+            let value = line.trim();
+            if !value.is_empty() {
+                values.push(value.to_string());
+            }
+        }
+        Self::new(values, case_insensitive, word_boundary)
+            .map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e))
+    }
+
+    /// Number of distinct values in the dictionary
+    pub fn len(&self) -> usize {
+        self.values.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.values.is_empty()
+    }
+
+    /// Hash identifying the values and options, which differs whenever the
+    /// dictionary would match differently
+    pub fn fingerprint(&self) -> u64 {
+        self.fingerprint
+    }
+
+    /// Find non-overlapping matches, leftmost-longest first, as `(start, end)`
+    ///
+    /// With `word_boundary`, the boundary check has to come before the
+    /// leftmost-longest choice: a longer value that fails it mustn't hide a
+    /// shorter one that passes, as "Jane D" would hide "Jane" in "Jane Doe".
+    /// So every overlapping match is found, those off a boundary dropped, and
+    /// the leftmost-longest of the rest chosen.
+    pub fn find_iter<'a>(&'a self, text: &'a str) -> Box<dyn Iterator<Item = (usize, usize)> + 'a> {
+        if !self.word_boundary {
+            return Box::new(self.automaton.find_iter(text).map(|m| (m.start(), m.end())));
+        }
+        let mut candidates: Vec<(usize, usize)> = self
+            .automaton
+            .find_overlapping_iter(text)
+            .map(|m| (m.start(), m.end()))
+            .filter(|&(start, end)| is_word_boundary(text, start) && is_word_boundary(text, end))
+            .collect();
+        candidates.sort_unstable_by(|a, b| a.0.cmp(&b.0).then(b.1.cmp(&a.1)));
+        let mut last_end = 0;
+        Box::new(candidates.into_iter().filter(move |&(start, end)| {
+            let keep = start >= last_end;
+            if keep {
+                last_end = end;
+            }
+            keep
+        }))
+    }
+
+    pub fn is_match(&self, text: &str) -> bool {
+        if self.word_boundary {
+            self.automaton
+                .find_overlapping_iter(text)
+                .any(|m| is_word_boundary(text, m.start()) && is_word_boundary(text, m.end()))
+        } else {
+            self.automaton.is_match(text)
+        }
+    }
+
+    /// Save the dictionary's values and options in a compact binary format
+    ///
+    /// Loading a saved file skips reading, trimming and deduplicating the
+    /// source values; the automaton itself is rebuilt on load.
+    pub fn save(&self, path: &Path) -> io::Result<()> {
+        let mut writer = BufWriter::new(File::create(path)?);
+        self.write_to(&mut writer)?;
+        writer.flush()
+    }
+
+    /// Load a dictionary written by `save`
+    pub fn load(path: &Path) -> io::Result<Self> {
+        let (values, case_insensitive, word_boundary) =
+            read_parts(&mut BufReader::new(File::open(path)?))?;
+        Self::new(values, case_insensitive, word_boundary)
+            .map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e))
+    }
+
+    /// The dictionary in the format written by `save`
+    pub fn to_bytes(&self) -> Vec<u8> {
+        let mut bytes = Vec::new();
+        // Writing to a Vec can't fail
+        let _ = self.write_to(&mut bytes);
+        bytes
+    }
+
+    fn write_to(&self, writer: &mut impl Write) -> io::Result<()> {
+        let mut flags = 0;
+        if self.case_insensitive {
+            flags |= FLAG_CASE_INSENSITIVE;
+        }
+        if self.word_boundary {
+            flags |= FLAG_WORD_BOUNDARY;
+        }
+
+        writer.write_all(MAGIC)?;
+        writer.write_all(&[flags])?;
+        writer.write_all(&(self.values.len() as u64).to_le_bytes())?;
+        for value in &self.values {
+            writer.write_all(&(value.len() as u32).to_le_bytes())?;
+            writer.write_all(value.as_bytes())?;
+        }
+        Ok(())
+    }
+}
+
+/// Hash of a dictionary's sorted, distinct values and its options
+fn fingerprint(values: &[String], case_insensitive: bool, word_boundary: bool) -> u64 {
+    let mut hasher = SipHasher24::new();
+    hasher.write_u8(case_insensitive as u8 | (word_boundary as u8) << 1);
+    for value in values {
+        hasher.write_usize(value.len());
+        hasher.write(value.as_bytes());
+    }
+    hasher.finish()
+}
+
+/// Read the values and options of a dictionary written by `Dictionary::save`
+fn read_parts(reader: &mut impl Read) -> io::Result<(Vec<String>, bool, bool)> {
+    let invalid = |message: &str| io::Error::new(io::ErrorKind::InvalidData, message);
+
+    let mut magic = [0; 8];
+    reader.read_exact(&mut magic)?;
+    if &magic != MAGIC {
+        return Err(invalid("Not a piicleaner dictionary file"));
+    }
+    let mut flags = [0; 1];
+    reader.read_exact(&mut flags)?;
+    let mut count = [0; 8];
+    reader.read_exact(&mut count)?;
+
+    let count = u64::from_le_bytes(count) as usize;
+    let mut values = Vec::with_capacity(count.min(1 << 20));
+    let mut len = [0; 4];
+    for _ in 0..count {
+        reader.read_exact(&mut len)?;
+        let mut value = vec![0; u32::from_le_bytes(len) as usize];
+        reader.read_exact(&mut value)?;
+        values.push(
+            String::from_utf8(value).map_err(|_| invalid("Dictionary value is not valid UTF-8"))?,
+        );
+    }
+    Ok((
+        values,
+        flags[0] & FLAG_CASE_INSENSITIVE != 0,
+        flags[0] & FLAG_WORD_BOUNDARY != 0,
+    ))
+}
+
+#[inline]
+fn is_word_char(c: char) -> bool {
+    c.is_alphanumeric() || c == '_'
+}
+
+/// Whether `pos` is a word boundary in `text`, with the same meaning as `\b`
+fn is_word_boundary(text: &str, pos: usize) -> bool {
+    let before = text[..pos].chars().next_back().is_some_and(is_word_char);
+    let after = text[pos..].chars().next().is_some_and(is_word_char);
+    before != after
+}
+
+static DICTIONARIES: LazyLock<RwLock<HashMap<String, Arc<Dictionary>>>> =
+    LazyLock::new(|| RwLock::new(HashMap::new()));
+
+/// Register a dictionary under `name`, replacing any existing one
+pub fn register(name: &str, dictionary: Dictionary) {
+    DICTIONARIES
+        .write()
+        .unwrap_or_else(PoisonError::into_inner)
+        .insert(name.to_string(), Arc::new(dictionary));
+}
+
+/// Register a dictionary from the bytes of `Dictionary::to_bytes` under
+/// `name`, unless the same dictionary is already registered there
+///
+/// Used to send dictionaries to other processes along with a cleaner, where
+/// most receivers already have them.
+pub fn register_bytes(name: &str, mut bytes: &[u8]) -> io::Result<()> {
+    let (values, case_insensitive, word_boundary) = read_parts(&mut bytes)?;
+    if get(name).is_some_and(|registered| {
+        registered.fingerprint == fingerprint(&values, case_insensitive, word_boundary)
+    }) {
+        return Ok(());
+    }
+    let dictionary = Dictionary::new(values, case_insensitive, word_boundary)
+        .map_err(|e| io::Error::new(io::ErrorKind::InvalidData, e))?;
+    register(name, dictionary);
+    Ok(())
+}
+
+/// Remove the dictionary registered under `name`, returning whether it existed
+pub fn remove(name: &str) -> bool {
+    DICTIONARIES
+        .write()
+        .unwrap_or_else(PoisonError::into_inner)
+        .remove(name)
+        .is_some()
+}
+
+/// Get the dictionary registered under `name`
+pub fn get(name: &str) -> Option<Arc<Dictionary>> {
+    DICTIONARIES
+        .read()
+        .unwrap_or_else(PoisonError::into_inner)
+        .get(name)
+        .cloned()
+}
+
+/// Names of all registered dictionaries
+pub fn get_dictionary_names() -> Vec<String> {
+    DICTIONARIES
+        .read()
+        .unwrap_or_else(PoisonError::into_inner)
+        .keys()
+        .cloned()
+        .collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn matches(dictionary: &Dictionary, text: &str) -> Vec<String> {
+        dictionary
+            .find_iter(text)
+            .map(|(start, end)| text[start..end].to_string())
+            .collect()
+    }
+
+    #[test]
+    fn test_dictionary_matching() {
+        let dictionary = Dictionary::new(["John Smith", "John", "Jane"], false, false).unwrap();
+        assert_eq!(dictionary.len(), 3);
+        assert_eq!(
+            matches(&dictionary, "John Smith met Jane and John"),
+            vec!["John Smith", "Jane", "John"]
+        );
+        assert!(!dictionary.is_match("john smith"));
+    }
+
+    #[test]
+    fn test_dictionary_case_folding() {
+        let dictionary = Dictionary::new(["John Smith"], true, false).unwrap();
+        assert_eq!(matches(&dictionary, "JOHN SMITH and john smith").len(), 2);
+    }
+
+    #[test]
+    fn test_dictionary_word_boundaries() {
+        let dictionary = Dictionary::new(["Ann", "E123"], false, true).unwrap();
+        assert_eq!(matches(&dictionary, "Ann, Anne and Joanna"), vec!["Ann"]);
+        assert_eq!(matches(&dictionary, "ID E123 not E1234"), vec!["E123"]);
+        assert!(!dictionary.is_match("Annabel"));
+
+        let dictionary = Dictionary::new(["Ann"], false, false).unwrap();
+        assert_eq!(matches(&dictionary, "Annabel"), vec!["Ann"]);
+    }
+
+    #[test]
+    fn test_dictionary_word_boundaries_before_longest() {
+        // A longer value off a word boundary doesn't hide a shorter one on it
+        let dictionary = Dictionary::new(["Lee", "Ann Lee"], false, true).unwrap();
+        assert_eq!(matches(&dictionary, "Suzann Lee"), vec!["Lee"]);
+        assert!(dictionary.is_match("Suzann Lee"));
+        assert_eq!(matches(&dictionary, "Ann Lee"), vec!["Ann Lee"]);
+
+        let dictionary = Dictionary::new(["Jane", "Jane D"], false, true).unwrap();
+        assert_eq!(matches(&dictionary, "Jane Doe"), vec!["Jane"]);
+        assert_eq!(matches(&dictionary, "Jane D. Doe"), vec!["Jane D"]);
+        assert!(!dictionary.is_match("Janet"));
+    }
+
+    #[test]
+    fn test_dictionary_ignores_empty_and_duplicate_values() {
+        let dictionary = Dictionary::new(["", "a", "a"], false, false).unwrap();
+        assert_eq!(dictionary.len(), 1);
+        assert!(!Dictionary::new([""; 0], false, false)
+            .unwrap()
+            .is_match("text"));
+    }
+
+    #[test]
+    fn test_dictionary_save_and_load() {
+        let dir = std::env::temp_dir().join(format!("piicleaner-dict-{}", std::process::id()));
+        std::fs::create_dir_all(&dir).unwrap();
+
+        let source = dir.join("names.txt");
+        std::fs::write(&source, "Jane Doe\n\n  John Smith \nJane Doe\n").unwrap();
+        let dictionary = Dictionary::from_file(&source, true, true).unwrap();
+        assert_eq!(dictionary.len(), 2);
+
+        let saved = dir.join("names.dict");
+        dictionary.save(&saved).unwrap();
+        let loaded = Dictionary::load(&saved).unwrap();
+        assert_eq!(loaded.values, dictionary.values);
+        assert!(loaded.case_insensitive && loaded.word_boundary);
+        assert_eq!(matches(&loaded, "Met JANE DOE"), vec!["JANE DOE"]);
+
+        assert!(Dictionary::load(&source).is_err());
+        std::fs::remove_dir_all(&dir).unwrap();
+    }
+
+    #[test]
+    fn test_dictionary_registry() {
+        let name = "test-registry-dictionary";
+        register(name, Dictionary::new(["x"], false, false).unwrap());
+        assert!(get(name).is_some());
+        assert!(get_dictionary_names().contains(&name.to_string()));
+        assert!(remove(name));
+        assert!(get(name).is_none());
+        assert!(!remove(name));
+    }
+
+    #[test]
+    fn test_dictionary_register_bytes() {
+        let dictionary = Dictionary::new(["Jane Doe", "Ann"], true, false).unwrap();
+        let bytes = dictionary.to_bytes();
+        register_bytes("bytes-test", &bytes).unwrap();
+        let registered = get("bytes-test").unwrap();
+        assert_eq!(registered.values, dictionary.values);
+        assert_eq!(registered.fingerprint(), dictionary.fingerprint());
+
+        // The same dictionary isn't rebuilt
+        register_bytes("bytes-test", &bytes).unwrap();
+        assert!(Arc::ptr_eq(&registered, &get("bytes-test").unwrap()));
+        assert!(register_bytes("bytes-test", b"PIIDICT").is_err());
+        assert!(remove("bytes-test"));
+    }
+}
@@ -0,0 +1,378 @@
+//! Inverted index from detected PII values to the rows that contain them
+//!
+//! Built once by running detection over a table, then used to answer subject
+//! access and erasure requests without re-scanning the text. Values are keyed
+//! by an unkeyed hash of their normalised form rather than stored. That keeps
+//! the values out of casual view, but it isn't anonymisation: PII values such
+//! as National Insurance or phone numbers are few enough to be hashed one by
+//! one until a key matches, so an index file must be protected like the data
+//! it was built from.
+
+use crate::allowlist::{normalise, Allowlist};
+use crate::core::{self, Overlap};
+use siphasher::sip::SipHasher24;
+use std::collections::HashMap;
+use std::fs::File;
+use std::hash::Hasher;
+use std::io::{self, BufReader, BufWriter, Read, Write};
+use std::num::TryFromIntError;
+use std::path::Path;
+
+/// First bytes of a saved index file, including the format version
+const MAGIC: &[u8; 8] = b"PIIINDX2";
+/// First bytes of an index file saved before allowlists were stored
+const MAGIC_V1: &[u8; 8] = b"PIIINDX1";
+
+const FLAG_IGNORE_CASE: u8 = 1;
+const FLAG_ASCII_ONLY: u8 = 2;
+const FLAG_ALLOWLIST: u8 = 4;
+const FLAG_NORMALISE_ALLOWLIST: u8 = 8;
+
+/// One occurrence of a value: the row it was found in and where
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub struct Posting {
+    pub row: u64,
+    pub start: u32,
+    pub end: u32,
+    /// Index into the index's PII type names
+    pub type_code: u16,
+}
+
+pub struct PiiIndex {
+    cleaners: Vec<String>,
+    ignore_case: bool,
+    ascii_only: bool,
+    allowlist: Option<Allowlist>,
+    /// Names of the cleaners that produced matches, in order of first match
+    types: Vec<String>,
+    postings: HashMap<u64, Vec<Posting>>,
+    /// Rows appended so far, used to number rows without explicit IDs
+    n_rows: u64,
+}
+
+/// Hash identifying a value, taken over its normalised form so formatting
+/// differences such as "AB 12 34 56 C" and "ab123456c" share an entry
+pub fn value_hash(value: &str) -> u64 {
+    let mut hasher = SipHasher24::new();
+    hasher.write(normalise(value).as_bytes());
+    hasher.finish()
+}
+
+impl PiiIndex {
+    /// An empty index that detects with `cleaners` and the given options,
+    /// leaving out values in `allowlist`
+    pub fn new(
+        cleaners: Vec<String>,
+        ignore_case: bool,
+        ascii_only: bool,
+        allowlist: Option<Allowlist>,
+    ) -> Self {
+        PiiIndex {
+            cleaners,
+            ignore_case,
+            ascii_only,
+            allowlist,
+            types: Vec::new(),
+            postings: HashMap::new(),
+            n_rows: 0,
+        }
+    }
+
+    /// Number of distinct values indexed
+    pub fn len(&self) -> usize {
+        self.postings.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.postings.is_empty()
+    }
+
+    /// Number of rows appended so far
+    pub fn n_rows(&self) -> u64 {
+        self.n_rows
+    }
+
+    pub fn cleaners(&self) -> &[String] {
+        &self.cleaners
+    }
+
+    /// Detect PII in a batch of texts and add every match to the index
+    ///
+    /// Rows are identified by `row_ids`, which must have one ID per text, or
+    /// else numbered on from the rows already appended. Overlapping matches
+    /// are resolved with `Overlap::Longest` so each value is indexed once.
+    ///
+    /// Match offsets are stored as `u32`, so a batch with a text of 4 GiB or
+    /// more is refused, leaving the index as it was.
+    pub fn append<T: AsRef<str> + Sync>(
+        &mut self,
+        texts: &[T],
+        row_ids: Option<&[u64]>,
+    ) -> Result<(), TryFromIntError> {
+        for text in texts {
+            u32::try_from(text.as_ref().len())?;
+        }
+        let cleaners: Vec<&str> = self.cleaners.iter().map(String::as_str).collect();
+        let spans = core::detect_spans_batch_core(
+            texts,
+            &cleaners,
+            self.ignore_case,
+            Overlap::Longest,
+            self.ascii_only,
+            self.allowlist.as_ref(),
+        );
+
+        for (i, (text, row_spans)) in texts.iter().zip(&spans).enumerate() {
+            let text = text.as_ref();
+            let row = row_ids.map_or(self.n_rows + i as u64, |ids| ids[i]);
+            for span in row_spans {
+                let type_code = match self.types.iter().position(|name| name == span.cleaner) {
+                    Some(code) => code,
+                    None => {
+                        self.types.push(span.cleaner.to_string());
+                        self.types.len() - 1
+                    }
+                };
+                self.postings
+                    .entry(value_hash(&text[span.start..span.end]))
+                    .or_default()
+                    .push(Posting {
+                        row,
+                        start: u32::try_from(span.start)?,
+                        end: u32::try_from(span.end)?,
+                        type_code: type_code as u16,
+                    });
+            }
+        }
+        self.n_rows += texts.len() as u64;
+        Ok(())
+    }
+
+    /// Every occurrence of `value`, in the order they were appended
+    pub fn lookup(&self, value: &str) -> &[Posting] {
+        self.postings
+            .get(&value_hash(value))
+            .map_or(&[], Vec::as_slice)
+    }
+
+    /// Distinct IDs of the rows containing `value`, sorted
+    pub fn rows(&self, value: &str) -> Vec<u64> {
+        let mut rows: Vec<u64> = self.lookup(value).iter().map(|p| p.row).collect();
+        rows.sort_unstable();
+        rows.dedup();
+        rows
+    }
+
+    /// Name of the PII type with the given code
+    pub fn type_name(&self, type_code: u16) -> &str {
+        &self.types[type_code as usize]
+    }
+
+    /// Save the index in a compact binary format
+    pub fn save(&self, path: &Path) -> io::Result<()> {
+        let mut writer = BufWriter::new(File::create(path)?);
+        let mut flags = 0;
+        if self.ignore_case {
+            flags |= FLAG_IGNORE_CASE;
+        }
+        if self.ascii_only {
+            flags |= FLAG_ASCII_ONLY;
+        }
+        if let Some(allowlist) = &self.allowlist {
+            flags |= FLAG_ALLOWLIST;
+            if allowlist.is_normalised() {
+                flags |= FLAG_NORMALISE_ALLOWLIST;
+            }
+        }
+
+        writer.write_all(MAGIC)?;
+        writer.write_all(&[flags])?;
+        write_strings(&mut writer, &self.cleaners)?;
+        if let Some(allowlist) = &self.allowlist {
+            let mut values: Vec<String> = allowlist.values().map(str::to_string).collect();
+            values.sort_unstable();
+            write_strings(&mut writer, &values)?;
+        }
+        write_strings(&mut writer, &self.types)?;
+        writer.write_all(&self.n_rows.to_le_bytes())?;
+        writer.write_all(&(self.postings.len() as u64).to_le_bytes())?;
+        for (key, postings) in &self.postings {
+            writer.write_all(&key.to_le_bytes())?;
+            writer.write_all(&(postings.len() as u32).to_le_bytes())?;
+            for posting in postings {
+                writer.write_all(&posting.row.to_le_bytes())?;
+                writer.write_all(&posting.start.to_le_bytes())?;
+                writer.write_all(&posting.end.to_le_bytes())?;
+                writer.write_all(&posting.type_code.to_le_bytes())?;
+            }
+        }
+        writer.flush()
+    }
+
+    /// Load an index written by `save`
+    pub fn load(path: &Path) -> io::Result<Self> {
+        let mut reader = BufReader::new(File::open(path)?);
+
+        let mut magic = [0; 8];
+        reader.read_exact(&mut magic)?;
+        if &magic != MAGIC && &magic != MAGIC_V1 {
+            return Err(invalid("Not a piicleaner index file"));
+        }
+        let flags = read_array::<1>(&mut reader)?[0];
+        let cleaners = read_strings(&mut reader)?;
+        let allowlist = if &magic == MAGIC && flags & FLAG_ALLOWLIST != 0 {
+            let values = read_strings(&mut reader)?;
+            Some(Allowlist::new(
+                values,
+                flags & FLAG_NORMALISE_ALLOWLIST != 0,
+            ))
+        } else {
+            None
+        };
+        let types = read_strings(&mut reader)?;
+        let n_rows = u64::from_le_bytes(read_array(&mut reader)?);
+
+        let n_keys = u64::from_le_bytes(read_array(&mut reader)?) as usize;
+        let mut postings = HashMap::with_capacity(n_keys.min(1 << 20));
+        for _ in 0..n_keys {
+            let key = u64::from_le_bytes(read_array(&mut reader)?);
+            let n_postings = u32::from_le_bytes(read_array(&mut reader)?) as usize;
+            let mut entry = Vec::with_capacity(n_postings.min(1 << 20));
+            for _ in 0..n_postings {
+                let posting = Posting {
+                    row: u64::from_le_bytes(read_array(&mut reader)?),
+                    start: u32::from_le_bytes(read_array(&mut reader)?),
+                    end: u32::from_le_bytes(read_array(&mut reader)?),
+                    type_code: u16::from_le_bytes(read_array(&mut reader)?),
+                };
+                if posting.type_code as usize >= types.len() {
+                    return Err(invalid("Index entry has an unknown PII type"));
+                }
+                entry.push(posting);
+            }
+            postings.insert(key, entry);
+        }
+
+        Ok(PiiIndex {
+            cleaners,
+            ignore_case: flags & FLAG_IGNORE_CASE != 0,
+            ascii_only: flags & FLAG_ASCII_ONLY != 0,
+            allowlist,
+            types,
+            postings,
+            n_rows,
+        })
+    }
+}
+
+fn invalid(message: &str) -> io::Error {
+    io::Error::new(io::ErrorKind::InvalidData, message)
+}
+
+fn read_array<const N: usize>(reader: &mut impl Read) -> io::Result<[u8; N]> {
+    let mut bytes = [0; N];
+    reader.read_exact(&mut bytes)?;
+    Ok(bytes)
+}
+
+fn write_strings(writer: &mut impl Write, strings: &[String]) -> io::Result<()> {
+    writer.write_all(&(strings.len() as u32).to_le_bytes())?;
+    for string in strings {
+        writer.write_all(&(string.len() as u32).to_le_bytes())?;
+        writer.write_all(string.as_bytes())?;
+    }
+    Ok(())
+}
+
+fn read_strings(reader: &mut impl Read) -> io::Result<Vec<String>> {
+    let count = u32::from_le_bytes(read_array(reader)?);
+    (0..count)
+        .map(|_| {
+            let len = u32::from_le_bytes(read_array(reader)?) as usize;
+            let mut bytes = vec![0; len];
+            reader.read_exact(&mut bytes)?;
+            String::from_utf8(bytes).map_err(|_| invalid("Index string is not valid UTF-8"))
+        })
+        .collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn sample_index() -> PiiIndex {
+        let mut index = PiiIndex::new(vec!["all".to_string()], true, false, None);
+        index
+            .append(
+                &[
+                    "Email jane@example.com",
+                    "No PII here",
+                    "NINO AB123456C, cc JANE@example.com",
+                ],
+                None,
+            )
+            .unwrap();
+        index
+    }
+
+    #[test]
+    fn test_index_lookup() {
+        let index = sample_index();
+        assert_eq!(index.n_rows(), 3);
+        assert_eq!(index.rows("jane@example.com"), vec![0, 2]);
+        assert_eq!(index.rows("AB 12 34 56 C"), vec![2]);
+        assert!(index.rows("bob@example.com").is_empty());
+
+        let postings = index.lookup("ab123456c");
+        assert_eq!(postings.len(), 1);
+        assert_eq!((postings[0].start, postings[0].end), (5, 14));
+        assert_eq!(index.type_name(postings[0].type_code), "nino");
+    }
+
+    #[test]
+    fn test_index_append() {
+        let mut index = sample_index();
+        index.append(&["Reply to jane@example.com"], None).unwrap();
+        index.append(&["jane@example.com"], Some(&[100])).unwrap();
+        assert_eq!(index.n_rows(), 5);
+        assert_eq!(index.rows("jane@example.com"), vec![0, 2, 3, 100]);
+    }
+
+    #[test]
+    fn test_index_save_and_load() {
+        let path = std::env::temp_dir().join(format!("piicleaner-index-{}", std::process::id()));
+        let index = sample_index();
+        index.save(&path).unwrap();
+        let loaded = PiiIndex::load(&path).unwrap();
+        std::fs::remove_file(&path).unwrap();
+
+        assert_eq!(loaded.cleaners(), index.cleaners());
+        assert_eq!(loaded.n_rows(), index.n_rows());
+        assert_eq!(loaded.len(), index.len());
+        assert_eq!(
+            loaded.lookup("jane@example.com"),
+            index.lookup("jane@example.com")
+        );
+        assert!(loaded.ignore_case && !loaded.ascii_only);
+    }
+
+    #[test]
+    fn test_index_allowlist() {
+        let allowlist = Allowlist::new(["support@example.com"], true);
+        let mut index = PiiIndex::new(vec!["email".to_string()], true, false, Some(allowlist));
+        index
+            .append(&["Ask Support@Example.com or jane@example.com"], None)
+            .unwrap();
+        assert!(index.rows("support@example.com").is_empty());
+        assert_eq!(index.rows("jane@example.com"), vec![0]);
+
+        // The allowlist is saved with the index and applies to later appends
+        let path =
+            std::env::temp_dir().join(format!("piicleaner-index-allowlist-{}", std::process::id()));
+        index.save(&path).unwrap();
+        let mut loaded = PiiIndex::load(&path).unwrap();
+        std::fs::remove_file(&path).unwrap();
+        loaded.append(&["support@example.com"], None).unwrap();
+        assert!(loaded.rows("support@example.com").is_empty());
+    }
+}
@@ -0,0 +1,575 @@
+//! Cleaning the string values inside JSON documents
+//!
+//! Documents are rewritten in a single pass: only string tokens whose value
+//! changes are re-encoded, and everything else, including whitespace, number
+//! formatting, key order and escapes in unchanged strings, is copied from the
+//! input as it is.
+
+use crate::allowlist::Allowlist;
+use crate::core::{self, Cleaning, Overlap};
+use crate::pool;
+use rayon::prelude::*;
+use std::borrow::Cow;
+use std::fmt;
+
+/// Deepest nesting of arrays and objects accepted, to bound recursion
+const MAX_DEPTH: usize = 128;
+
+/// A JSON syntax error and the byte offset where it was found
+#[derive(Debug, PartialEq)]
+pub struct JsonError {
+    pub position: usize,
+    pub message: &'static str,
+}
+
+impl fmt::Display for JsonError {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        write!(f, "{} at byte {}", self.message, self.position)
+    }
+}
+
+#[derive(Clone, Debug, PartialEq)]
+enum PathPart {
+    /// `*`, matching any key or array index
+    Any,
+    Name(String),
+}
+
+/// A dotted path to a subtree of a document, such as `user.email` or
+/// `messages.*.body`
+///
+/// Each part matches an object key, or an array index written in decimal,
+/// and `*` matches any key or index.
+#[derive(Clone, Debug, PartialEq)]
+pub struct KeyPath(Vec<PathPart>);
+
+impl KeyPath {
+    /// Parse a dotted path, returning `None` if any part is empty
+    pub fn parse(path: &str) -> Option<Self> {
+        path.split('.')
+            .map(|part| match part {
+                "" => None,
+                "*" => Some(PathPart::Any),
+                name => Some(PathPart::Name(name.to_string())),
+            })
+            .collect::<Option<Vec<_>>>()
+            .map(KeyPath)
+    }
+
+    /// How many leading parts of `path` this path matches, stopping at the
+    /// first mismatch
+    fn matched(&self, path: &[Segment]) -> usize {
+        self.0
+            .iter()
+            .zip(path)
+            .take_while(|(part, segment)| match part {
+                PathPart::Any => true,
+                PathPart::Name(name) => match segment {
+                    Segment::Key(key) => name == key,
+                    Segment::Index(index) => name.parse() == Ok(*index),
+                },
+            })
+            .count()
+    }
+
+    /// Whether `path` is this path or inside the subtree it names
+    fn covers(&self, path: &[Segment]) -> bool {
+        path.len() >= self.0.len() && self.matched(path) == self.0.len()
+    }
+
+    /// Whether the subtree at `path` contains this path
+    fn leads_to(&self, path: &[Segment]) -> bool {
+        path.len() < self.0.len() && self.matched(path) == path.len()
+    }
+}
+
+/// One step of the path from the root to a value
+enum Segment<'d> {
+    Key(Cow<'d, str>),
+    Index(usize),
+}
+
+/// What to do with the values in a subtree
+#[derive(Clone, Copy, PartialEq)]
+enum Scope {
+    /// Clean every string
+    Clean,
+    /// Clean nothing here, but an included path lies further down
+    Search,
+    /// Clean nothing in the whole subtree
+    Skip,
+}
+
+/// Settings for cleaning JSON documents
+///
+/// Strings are cleaned with `core::clean_pii_with_cleaners_core`, so a
+/// document gives the same strings as cleaning each of its values one by one.
+/// If `include` is not empty, only the subtrees it names are cleaned; subtrees
+/// named by `exclude` are never cleaned, and win over `include`. Object keys
+/// are matched against the paths before cleaning, and are only cleaned
+/// themselves if `clean_keys` is set.
+pub struct JsonCleaner<'c> {
+    pub cleaners: &'c [&'c str],
+    pub cleaning: Cleaning,
+    pub ignore_case: bool,
+    pub replace_string: Option<&'c str>,
+    pub overlap: Overlap,
+    pub ascii_only: bool,
+    pub allowlist: Option<&'c Allowlist>,
+    pub clean_keys: bool,
+    pub include: Vec<KeyPath>,
+    pub exclude: Vec<KeyPath>,
+}
+
+impl JsonCleaner<'_> {
+    /// Clean one document, returning it unchanged if no string was cleaned
+    pub fn clean<'d>(&self, doc: &'d str) -> Result<Cow<'d, str>, JsonError> {
+        let mut rewriter = Rewriter {
+            settings: self,
+            doc,
+            pos: 0,
+            out: String::new(),
+            copied_to: 0,
+            path: Vec::new(),
+            track_path: !(self.include.is_empty() && self.exclude.is_empty()),
+        };
+        let scope = if self.include.is_empty() {
+            Scope::Clean
+        } else {
+            Scope::Search
+        };
+        rewriter.skip_whitespace();
+        rewriter.value(scope, 0)?;
+        rewriter.skip_whitespace();
+        if rewriter.pos != doc.len() {
+            return Err(rewriter.error("Trailing characters"));
+        }
+
+        if rewriter.copied_to == 0 {
+            return Ok(Cow::Borrowed(doc));
+        }
+        let mut out = rewriter.out;
+        out.push_str(&doc[rewriter.copied_to..]);
+        Ok(Cow::Owned(out))
+    }
+
+    /// Clean a batch of documents in parallel
+    pub fn clean_batch<'d, T: AsRef<str> + Sync>(
+        &self,
+        docs: &'d [T],
+    ) -> Vec<Result<Cow<'d, str>, JsonError>> {
+        pool::install(|| {
+            docs.par_iter()
+                .map(|doc| self.clean(doc.as_ref()))
+                .collect()
+        })
+    }
+
+    fn clean_string<'a>(&self, value: &'a str) -> Cow<'a, str> {
+        core::clean_pii_with_cleaners_core(
+            value,
+            self.cleaners,
+            self.cleaning,
+            self.ignore_case,
+            self.replace_string,
+            self.overlap,
+            self.ascii_only,
+            self.allowlist,
+        )
+    }
+}
+
+struct Rewriter<'s, 'c, 'd> {
+    settings: &'s JsonCleaner<'c>,
+    doc: &'d str,
+    pos: usize,
+    /// The input up to `copied_to`, with changed strings re-encoded
+    out: String,
+    copied_to: usize,
+    path: Vec<Segment<'d>>,
+    /// Whether `path` is needed to apply `include` and `exclude`
+    track_path: bool,
+}
+
+impl<'d> Rewriter<'_, '_, 'd> {
+    fn error(&self, message: &'static str) -> JsonError {
+        JsonError {
+            position: self.pos,
+            message,
+        }
+    }
+
+    fn peek(&self) -> Option<u8> {
+        self.doc.as_bytes().get(self.pos).copied()
+    }
+
+    fn skip_whitespace(&mut self) {
+        while matches!(self.peek(), Some(b' ' | b'\t' | b'\n' | b'\r')) {
+            self.pos += 1;
+        }
+    }
+
+    fn expect(&mut self, byte: u8, message: &'static str) -> Result<(), JsonError> {
+        self.skip_whitespace();
+        if self.peek() != Some(byte) {
+            return Err(self.error(message));
+        }
+        self.pos += 1;
+        Ok(())
+    }
+
+    /// The scope of the value at the current path, inside a `parent` scope
+    fn scope(&self, parent: Scope) -> Scope {
+        if parent == Scope::Skip || !self.track_path {
+            return parent;
+        }
+        let settings = self.settings;
+        if settings.exclude.iter().any(|path| path.covers(&self.path)) {
+            Scope::Skip
+        } else if parent == Scope::Clean || settings.include.iter().any(|p| p.covers(&self.path)) {
+            Scope::Clean
+        } else if settings.include.iter().any(|p| p.leads_to(&self.path)) {
+            Scope::Search
+        } else {
+            Scope::Skip
+        }
+    }
+
+    fn value(&mut self, scope: Scope, depth: usize) -> Result<(), JsonError> {
+        match self.peek() {
+            Some(b'{') => self.object(scope, depth + 1),
+            Some(b'[') => self.array(scope, depth + 1),
+            Some(b'"') => self.string(scope == Scope::Clean).map(|_| ()),
+            Some(b'-' | b'0'..=b'9') => self.number(),
+            Some(b't') => self.literal("true"),
+            Some(b'f') => self.literal("false"),
+            Some(b'n') => self.literal("null"),
+            Some(_) => Err(self.error("Expected a value")),
+            None => Err(self.error("Unexpected end of document")),
+        }
+    }
+
+    fn object(&mut self, scope: Scope, depth: usize) -> Result<(), JsonError> {
+        if depth > MAX_DEPTH {
+            return Err(self.error("Nesting too deep"));
+        }
+        self.pos += 1;
+        self.skip_whitespace();
+        if self.peek() == Some(b'}') {
+            self.pos += 1;
+            return Ok(());
+        }
+        loop {
+            self.skip_whitespace();
+            if self.peek() != Some(b'"') {
+                return Err(self.error("Expected a key"));
+            }
+            let key = self.string(scope == Scope::Clean && self.settings.clean_keys)?;
+            self.expect(b':', "Expected ':'")?;
+            self.skip_whitespace();
+            if self.track_path {
+                self.path.push(Segment::Key(key));
+            }
+            self.value(self.scope(scope), depth)?;
+            if self.track_path {
+                self.path.pop();
+            }
+            self.skip_whitespace();
+            match self.peek() {
+                Some(b',') => self.pos += 1,
+                Some(b'}') => {
+                    self.pos += 1;
+                    return Ok(());
+                }
+                _ => return Err(self.error("Expected ',' or '}'")),
+            }
+        }
+    }
+
+    fn array(&mut self, scope: Scope, depth: usize) -> Result<(), JsonError> {
+        if depth > MAX_DEPTH {
+            return Err(self.error("Nesting too deep"));
+        }
+        self.pos += 1;
+        self.skip_whitespace();
+        if self.peek() == Some(b']') {
+            self.pos += 1;
+            return Ok(());
+        }
+        for index in 0.. {
+            self.skip_whitespace();
+            if self.track_path {
+                self.path.push(Segment::Index(index));
+            }
+            self.value(self.scope(scope), depth)?;
+            if self.track_path {
+                self.path.pop();
+            }
+            self.skip_whitespace();
+            match self.peek() {
+                Some(b',') => self.pos += 1,
+                Some(b']') => break,
+                _ => return Err(self.error("Expected ',' or ']'")),
+            }
+        }
+        self.pos += 1;
+        Ok(())
+    }
+
+    /// Read a string token, cleaning it if `clean`, and return its value
+    fn string(&mut self, clean: bool) -> Result<Cow<'d, str>, JsonError> {
+        let doc = self.doc;
+        let bytes = doc.as_bytes();
+        let start = self.pos;
+        self.pos += 1;
+        // Only strings with escapes need decoding into a new buffer
+        let mut decoded: Option<String> = None;
+        let mut run_start = self.pos;
+        loop {
+            match bytes.get(self.pos) {
+                None => return Err(self.error("Unterminated string")),
+                Some(b'"') => break,
+                Some(b'\\') => {
+                    let decoded = decoded.get_or_insert_with(String::new);
+                    decoded.push_str(&doc[run_start..self.pos]);
+                    let c = match bytes.get(self.pos + 1) {
+                        Some(b'u') => self.unicode_escape()?,
+                        Some(&escape) => {
+                            self.pos += 2;
+                            match escape {
+                                b'"' => '"',
+                                b'\\' => '\\',
+                                b'/' => '/',
+                                b'b' => '\u{8}',
+                                b'f' => '\u{c}',
+                                b'n' => '\n',
+                                b'r' => '\r',
+                                b't' => '\t',
+                                _ => {
+                                    self.pos -= 2;
+                                    return Err(self.error("Invalid escape"));
+                                }
+                            }
+                        }
+                        None => return Err(self.error("Unterminated string")),
+                    };
+                    decoded.push(c);
+                    run_start = self.pos;
+                }
+                Some(&byte) if byte < 0x20 => {
+                    return Err(self.error("Control character in string"));
+                }
+                Some(_) => self.pos += 1,
+            }
+        }
+        let value = match decoded {
+            None => Cow::Borrowed(&doc[run_start..self.pos]),
+            Some(mut decoded) => {
+                decoded.push_str(&doc[run_start..self.pos]);
+                Cow::Owned(decoded)
+            }
+        };
+        self.pos += 1;
+
+        if clean {
+            if let Cow::Owned(cleaned) = self.settings.clean_string(&value) {
+                self.out.push_str(&self.doc[self.copied_to..start]);
+                write_string(&mut self.out, &cleaned);
+                self.copied_to = self.pos;
+            }
+        }
+        Ok(value)
+    }
+
+    /// Read a `\uXXXX` escape, or a surrogate pair of them, at `pos`
+    fn unicode_escape(&mut self) -> Result<char, JsonError> {
+        let high = self.hex4()?;
+        let code = if (0xD800..0xDC00).contains(&high) {
+            if !self.doc[self.pos..].starts_with("\\u") {
+                return Err(self.error("Unpaired surrogate"));
+            }
+            let low = self.hex4()?;
+            if !(0xDC00..0xE000).contains(&low) {
+                return Err(self.error("Unpaired surrogate"));
+            }
+            0x10000 + ((high - 0xD800) << 10) + (low - 0xDC00)
+        } else {
+            high
+        };
+        char::from_u32(code).ok_or_else(|| self.error("Unpaired surrogate"))
+    }
+
+    /// Read `\u` and four hex digits
+    fn hex4(&mut self) -> Result<u32, JsonError> {
+        let digits = self
+            .doc
+            .get(self.pos + 2..self.pos + 6)
+            .filter(|digits| digits.bytes().all(|b| b.is_ascii_hexdigit()))
+            .ok_or_else(|| self.error("Invalid unicode escape"))?;
+        let code = u32::from_str_radix(digits, 16).expect("checked hex digits");
+        self.pos += 6;
+        Ok(code)
+    }
+
+    fn number(&mut self) -> Result<(), JsonError> {
+        let bytes = self.doc.as_bytes();
+        if bytes[self.pos] == b'-' {
+            self.pos += 1;
+        }
+        match bytes.get(self.pos) {
+            // No leading zeros
+            Some(b'0') => self.pos += 1,
+            Some(b'1'..=b'9') => self.digits(),
+            _ => return Err(self.error("Invalid number")),
+        }
+        if self.peek() == Some(b'.') {
+            self.pos += 1;
+            if !self.peek().is_some_and(|b| b.is_ascii_digit()) {
+                return Err(self.error("Invalid number"));
+            }
+            self.digits();
+        }
+        if matches!(self.peek(), Some(b'e' | b'E')) {
+            self.pos += 1;
+            if matches!(self.peek(), Some(b'+' | b'-')) {
+                self.pos += 1;
+            }
+            if !self.peek().is_some_and(|b| b.is_ascii_digit()) {
+                return Err(self.error("Invalid number"));
+            }
+            self.digits();
+        }
+        Ok(())
+    }
+
+    fn digits(&mut self) {
+        while self.peek().is_some_and(|b| b.is_ascii_digit()) {
+            self.pos += 1;
+        }
+    }
+
+    fn literal(&mut self, literal: &'static str) -> Result<(), JsonError> {
+        if !self.doc[self.pos..].starts_with(literal) {
+            return Err(self.error("Expected a value"));
+        }
+        self.pos += literal.len();
+        Ok(())
+    }
+}
+
+/// Append `value` to `out` as a JSON string token
+fn write_string(out: &mut String, value: &str) {
+    out.push('"');
+    for c in value.chars() {
+        match c {
+            '"' => out.push_str("\\\""),
+            '\\' => out.push_str("\\\\"),
+            '\n' => out.push_str("\\n"),
+            '\r' => out.push_str("\\r"),
+            '\t' => out.push_str("\\t"),
+            c if (c as u32) < 0x20 => {
+                out.push_str(&format!("\\u{:04x}", c as u32));
+            }
+            c => out.push(c),
+        }
+    }
+    out.push('"');
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn cleaner(include: &[&str], exclude: &[&str], clean_keys: bool) -> JsonCleaner<'static> {
+        JsonCleaner {
+            cleaners: &["all"],
+            cleaning: Cleaning::Redact,
+            ignore_case: true,
+            replace_string: None,
+            overlap: Overlap::Longest,
+            ascii_only: false,
+            allowlist: None,
+            clean_keys,
+            include: include.iter().map(|p| KeyPath::parse(p).unwrap()).collect(),
+            exclude: exclude.iter().map(|p| KeyPath::parse(p).unwrap()).collect(),
+        }
+    }
+
+    const DOC: &str = r#"{"id": 12, "user": {"email": "jane@example.com", "note": "call 07700 900123"},
+        "messages": [{"body": "mail jane\u0040example.com"}, {"body": "hi", "to": ["bob@example.com"]}],
+        "flags": [true, false, null, -1.5e3]}"#;
+
+    #[test]
+    fn test_clean_json_leaves() {
+        let cleaned = cleaner(&[], &[], false).clean(DOC).unwrap();
+        assert_eq!(
+            cleaned,
+            r#"{"id": 12, "user": {"email": "[email-redacted]", "note": "call [telephone-redacted]"},
+        "messages": [{"body": "mail [email-redacted]"}, {"body": "hi", "to": ["[email-redacted]"]}],
+        "flags": [true, false, null, -1.5e3]}"#
+        );
+
+        let doc = r#"["no pii", {"a": "esc\"aped\n"}]"#;
+        assert!(matches!(
+            cleaner(&[], &[], false).clean(doc).unwrap(),
+            Cow::Borrowed(_)
+        ));
+    }
+
+    #[test]
+    fn test_clean_json_paths() {
+        let cleaned = cleaner(&["messages.*.body"], &[], false)
+            .clean(DOC)
+            .unwrap();
+        assert!(cleaned.contains(r#""email": "jane@example.com""#));
+        assert!(cleaned.contains(r#""mail [email-redacted]""#));
+        assert!(cleaned.contains(r#"["bob@example.com"]"#));
+
+        let cleaned = cleaner(&["user", "messages.1"], &["user.note"], false)
+            .clean(DOC)
+            .unwrap();
+        assert!(cleaned.contains(r#""email": "[email-redacted]""#));
+        assert!(cleaned.contains("07700 900123"));
+        assert!(cleaned.contains(r#""mail jane\u0040example.com""#));
+        assert!(cleaned.contains(r#"["[email-redacted]"]"#));
+    }
+
+    #[test]
+    fn test_clean_json_keys() {
+        let doc = r#"{"07700 900123": {"07700 900123": "x"}}"#;
+        assert_eq!(cleaner(&[], &[], false).clean(doc).unwrap(), doc);
+        assert_eq!(
+            cleaner(&[], &[], true).clean(doc).unwrap(),
+            r#"{"[telephone-redacted]": {"[telephone-redacted]": "x"}}"#
+        );
+        // Paths match the original keys
+        assert_eq!(
+            cleaner(&[], &["07700 900123"], true).clean(doc).unwrap(),
+            r#"{"[telephone-redacted]": {"07700 900123": "x"}}"#
+        );
+    }
+
+    #[test]
+    fn test_clean_json_errors() {
+        let cleaner = cleaner(&[], &[], false);
+        for (doc, position) in [
+            ("", 0),
+            ("{\"a\" 1}", 5),
+            ("[1, 2", 5),
+            ("\"abc", 4),
+            ("[01]", 2),
+            ("[1.]", 3),
+            ("{} x", 3),
+            ("\"\\ud800\"", 7),
+        ] {
+            assert_eq!(
+                cleaner.clean(doc).unwrap_err().position,
+                position,
+                "{}",
+                doc
+            );
+        }
+        assert!(cleaner.clean(&"[".repeat(200)).is_err());
+        assert!(KeyPath::parse("a..b").is_none());
+    }
+}
@@ -1,19 +1,77 @@
+use polars::prelude::{DataType, IdxCa, IdxSize, PlSmallStr, PolarsError, PolarsResult, Series};
+use pyo3::exceptions::{PyOverflowError, PyTypeError};
 use pyo3::prelude::*;
+use pyo3::pybacked::PyBackedStr;
+use pyo3::types::{PyBytes, PyDict, PyString, PyType};
+use pyo3_polars::error::PyPolarsErr;
+use pyo3_polars::PySeries;
+use std::borrow::Cow;
+use std::path::PathBuf;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::time::{Duration, Instant};
 
+pub mod allowlist;
+pub mod arrow;
+pub mod cache;
 pub mod core;
+pub mod dictionary;
+pub mod index;
+pub mod json;
 pub mod patterns;
-use core::Cleaning;
+pub mod pool;
+pub mod profile;
+pub mod series;
+pub mod sketch;
+pub mod stream;
+use allowlist::Allowlist;
+use arrow::ArrowDetections;
+use cache::CleanCache;
+use core::{Cleaning, Fallback, Overlap, PseudonymKey, RowLimits};
+use dictionary::Dictionary;
+use index::PiiIndex;
+use json::{JsonCleaner, KeyPath};
+use profile::{ColumnProfile, Sample};
+use sketch::HeavyHitters;
+use stream::StreamCleaner;
+
+pyo3::import_exception!(concurrent.futures, CancelledError);
 
 // Type aliases to simplify complex return types
 type DetectionMatch = (usize, usize, String, String);
 type DetectionResult = PyResult<Vec<DetectionMatch>>;
 type BatchDetectionResult = PyResult<Vec<Vec<DetectionMatch>>>;
+/// Cleaned texts, the matches cleaned in each and the rows that hit a limit
+type CleanedLimitedBatch<'py> = (
+    Vec<Bound<'py, PyString>>,
+    Vec<Vec<DetectionMatch>>,
+    Vec<(usize, &'static str)>,
+);
+/// Arrow buffers `(offsets, starts, ends, text_offsets, text_data, type_codes,
+/// type_names, n_matches)`, see `ArrowDetections`
+type ArrowBuffers<'py> = (
+    Bound<'py, PyBytes>,
+    Bound<'py, PyBytes>,
+    Bound<'py, PyBytes>,
+    Bound<'py, PyBytes>,
+    Bound<'py, PyBytes>,
+    Bound<'py, PyBytes>,
+    Vec<String>,
+    usize,
+);
 
 impl Cleaning {
-    fn from_str(s: &str) -> PyResult<Self> {
+    fn from_str(s: &str, pseudonym_key: Option<&str>) -> PyResult<Self> {
         match s {
             "replace" => Ok(Cleaning::Replace),
             "redact" => Ok(Cleaning::Redact),
+            "pseudonymise" => match pseudonym_key {
+                Some(key) if !key.is_empty() => {
+                    Ok(Cleaning::Pseudonymise(PseudonymKey::new(key.as_bytes())))
+                }
+                _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                    "Cleaning method pseudonymise requires a non-empty pseudonym_key",
+                )),
+            },
             _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
                 "Invalid cleaning method: {}",
                 s
@@ -22,57 +80,612 @@ impl Cleaning {
     }
 }
 
+impl Overlap {
+    fn from_str(s: &str) -> PyResult<Self> {
+        match s {
+            "all" => Ok(Overlap::All),
+            "longest" => Ok(Overlap::Longest),
+            "priority" => Ok(Overlap::Priority),
+            _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Invalid overlap resolution: {}",
+                s
+            ))),
+        }
+    }
+
+    /// As `from_str`, for cleaning, where every character is replaced at most
+    /// once so "all" can't apply
+    fn for_cleaning(s: &str) -> PyResult<Self> {
+        match Self::from_str(s)? {
+            Overlap::All => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Invalid overlap resolution for cleaning: all (use \"longest\" or \"priority\")",
+            )),
+            other => Ok(other),
+        }
+    }
+}
+
+/// Borrow the UTF-8 data of every string in a Python iterable
+///
+/// Accepts any iterable of `str` (list, tuple, generator, ...). The returned
+/// `PyBackedStr`s keep the original objects alive and point straight at their
+/// UTF-8 buffers, so no text is copied and the GIL can be released while the
+/// batch is processed.
+fn extract_texts(texts: &Bound<'_, PyAny>) -> PyResult<Vec<PyBackedStr>> {
+    // A `str` is itself iterable, but treating it as a batch of characters is
+    // never what the caller meant
+    if texts.is_instance_of::<PyString>() {
+        return Err(PyTypeError::new_err(
+            "Expected an iterable of strings, not a single `str`",
+        ));
+    }
+    let mut extracted = Vec::with_capacity(texts.len().unwrap_or(0));
+    for item in texts.try_iter()? {
+        extracted.push(item?.extract::<PyBackedStr>()?);
+    }
+    Ok(extracted)
+}
+
+/// Build the Python result list for a batch clean, handing back the original
+/// string object for every row the core left untouched
+fn into_py_strings<'py>(
+    py: Python<'py>,
+    originals: &[PyBackedStr],
+    cleaned: Vec<Cow<'_, str>>,
+) -> PyResult<Vec<Bound<'py, PyString>>> {
+    originals
+        .iter()
+        .zip(cleaned)
+        .map(|(original, result)| match result {
+            Cow::Borrowed(_) => Ok(original.into_pyobject(py)?),
+            Cow::Owned(s) => Ok(PyString::new(py, &s)),
+        })
+        .collect()
+}
+
+/// Most rows processed between checks for signals, cancellation and progress
+const CHUNK_ROWS: usize = 1 << 16;
+/// Most bytes of text processed between checks, see `CHUNK_ROWS`
+const CHUNK_BYTES: usize = 1 << 24;
+/// Shortest time between calls to a progress callback
+const PROGRESS_INTERVAL: Duration = Duration::from_millis(100);
+
+/// Run `process` over `texts` in chunks, releasing the GIL for each chunk
+///
+/// Between chunks, pending Python signals are handled, so Ctrl-C raises
+/// `KeyboardInterrupt` within one chunk, `cancel` is checked and `progress`
+/// is called as `progress(rows_done, rows_total, bytes_done)`, at most once
+/// every `PROGRESS_INTERVAL` and always after the last chunk. Each chunk is
+/// still processed in parallel.
+fn run_in_chunks<'t, T, R>(
+    py: Python<'_>,
+    texts: &'t [T],
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
+    process: impl Fn(&'t [T]) -> Vec<R> + Sync,
+) -> PyResult<Vec<R>>
+where
+    T: AsRef<str> + Sync,
+    R: Send,
+{
+    let mut results = Vec::with_capacity(texts.len());
+    let mut bytes_done = 0;
+    let mut last_report = Instant::now();
+    let mut start = 0;
+    while start < texts.len() {
+        let mut end = start;
+        let mut chunk_bytes = 0;
+        while end < texts.len() && end - start < CHUNK_ROWS && chunk_bytes < CHUNK_BYTES {
+            chunk_bytes += texts[end].as_ref().len();
+            end += 1;
+        }
+        let chunk = &texts[start..end];
+        results.extend(py.allow_threads(|| process(chunk)));
+        start = end;
+        bytes_done += chunk_bytes;
+
+        py.check_signals()?;
+        if cancel.is_some_and(|cancel| cancel.get().is_cancelled()) {
+            return Err(CancelledError::new_err("Batch cancelled"));
+        }
+        if let Some(progress) = progress {
+            if start == texts.len() || last_report.elapsed() >= PROGRESS_INTERVAL {
+                progress.call1((start, texts.len(), bytes_done))?;
+                last_report = Instant::now();
+            }
+        }
+    }
+    Ok(results)
+}
+
+// ============================================================================
+// Cancellation
+// ============================================================================
+
+/// Token that stops a batch call between chunks when cancelled, from any
+/// thread
+#[pyclass(name = "CancelToken", module = "piicleaner._internal", frozen)]
+#[derive(Default)]
+pub struct PyCancelToken(AtomicBool);
+
+impl PyCancelToken {
+    fn is_cancelled(&self) -> bool {
+        self.0.load(Ordering::Relaxed)
+    }
+}
+
+#[pymethods]
+impl PyCancelToken {
+    #[new]
+    fn new() -> Self {
+        Self::default()
+    }
+
+    /// Ask batch calls using this token to stop
+    fn cancel(&self) {
+        self.0.store(true, Ordering::Relaxed);
+    }
+
+    #[getter]
+    fn cancelled(&self) -> bool {
+        self.is_cancelled()
+    }
+}
+
+// ============================================================================
+// Allowlists
+// ============================================================================
+
+/// Values that are never reported or cleaned, built once and passed to the
+/// detection and cleaning functions as `allowlist`
+#[pyclass(name = "Allowlist", module = "piicleaner._internal", frozen)]
+pub struct PyAllowlist(Allowlist);
+
+#[pymethods]
+impl PyAllowlist {
+    #[new]
+    #[pyo3(signature = (values, normalise = false))]
+    fn new(py: Python<'_>, values: &Bound<'_, PyAny>, normalise: bool) -> PyResult<Self> {
+        let values = extract_texts(values)?;
+        Ok(PyAllowlist(
+            py.allow_threads(|| Allowlist::new(&values, normalise)),
+        ))
+    }
+
+    fn __len__(&self) -> usize {
+        self.0.len()
+    }
+
+    fn __contains__(&self, value: &str) -> bool {
+        self.0.contains(value)
+    }
+
+    /// Pickle as the values and options, so the allowlist is rebuilt in the
+    /// receiving process
+    fn __reduce__<'py>(slf: &Bound<'py, Self>) -> (Bound<'py, PyType>, (Vec<String>, bool)) {
+        let allowlist = &slf.get().0;
+        let mut values: Vec<String> = allowlist.values().map(str::to_string).collect();
+        values.sort_unstable();
+        (slf.get_type(), (values, allowlist.is_normalised()))
+    }
+}
+
+// ============================================================================
+// Row limits
+// ============================================================================
+
+impl Fallback {
+    fn from_str(s: &str) -> PyResult<Self> {
+        match s {
+            "replace" => Ok(Fallback::Replace),
+            "skip" => Ok(Fallback::Skip),
+            _ => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Invalid fallback: {}",
+                s
+            ))),
+        }
+    }
+
+    fn as_str(self) -> &'static str {
+        match self {
+            Fallback::Replace => "replace",
+            Fallback::Skip => "skip",
+        }
+    }
+}
+
+/// Limits on the work spent cleaning one row, passed to
+/// `clean_pii_limited_batch` as `limits`
+#[pyclass(name = "RowLimits", module = "piicleaner._internal", frozen)]
+pub struct PyRowLimits(RowLimits);
+
+#[pymethods]
+impl PyRowLimits {
+    #[new]
+    #[pyo3(signature = (max_bytes = None, max_matches = None, time_budget_ms = None, fallback = "replace"))]
+    fn new(
+        max_bytes: Option<usize>,
+        max_matches: Option<usize>,
+        time_budget_ms: Option<f64>,
+        fallback: &str,
+    ) -> PyResult<Self> {
+        let time_budget = time_budget_ms
+            .map(|ms| {
+                Duration::try_from_secs_f64(ms / 1000.0).map_err(|_| {
+                    PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                        "`time_budget_ms` must be a non-negative number",
+                    )
+                })
+            })
+            .transpose()?;
+        Ok(PyRowLimits(RowLimits {
+            max_bytes,
+            max_matches,
+            time_budget,
+            fallback: Fallback::from_str(fallback)?,
+        }))
+    }
+
+    #[getter]
+    fn max_bytes(&self) -> Option<usize> {
+        self.0.max_bytes
+    }
+
+    #[getter]
+    fn max_matches(&self) -> Option<usize> {
+        self.0.max_matches
+    }
+
+    #[getter]
+    fn time_budget_ms(&self) -> Option<f64> {
+        self.0
+            .time_budget
+            .map(|time_budget| time_budget.as_secs_f64() * 1000.0)
+    }
+
+    #[getter]
+    fn fallback(&self) -> &'static str {
+        self.0.fallback.as_str()
+    }
+
+    /// Pickle as the constructor arguments
+    #[allow(clippy::type_complexity)]
+    fn __reduce__<'py>(
+        slf: &Bound<'py, Self>,
+    ) -> (
+        Bound<'py, PyType>,
+        (Option<usize>, Option<usize>, Option<f64>, &'static str),
+    ) {
+        let limits = slf.get();
+        (
+            slf.get_type(),
+            (
+                limits.max_bytes(),
+                limits.max_matches(),
+                limits.time_budget_ms(),
+                limits.fallback(),
+            ),
+        )
+    }
+}
+
+// ============================================================================
+// Cache
+// ============================================================================
+
+/// Cache of cleaned texts saved to a file, passed to the batch cleaning
+/// functions as `cache`
+///
+/// Its keys mix in a random secret saved to `<path>.key`; both files are
+/// sensitive.
+#[pyclass(name = "CleanCache", module = "piicleaner._internal", frozen)]
+pub struct PyCleanCache(CleanCache);
+
+#[pymethods]
+impl PyCleanCache {
+    #[new]
+    #[pyo3(signature = (path, max_bytes = cache::DEFAULT_MAX_BYTES))]
+    fn new(py: Python<'_>, path: PathBuf, max_bytes: usize) -> PyResult<Self> {
+        Ok(PyCleanCache(
+            py.allow_threads(|| CleanCache::open(&path, max_bytes))?,
+        ))
+    }
+
+    /// Write the cache to its file, and its secret to the key file
+    fn save(&self, py: Python<'_>) -> PyResult<()> {
+        let cache = &self.0;
+        py.allow_threads(|| cache.save())?;
+        Ok(())
+    }
+
+    /// Remove every entry and reset the hit counts
+    fn clear(&self) {
+        self.0.clear()
+    }
+
+    /// Hits, misses and size of the cache, and the hit rate since it was
+    /// opened
+    fn stats<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let stats = self.0.stats();
+        let lookups = stats.hits + stats.misses;
+        let dict = PyDict::new(py);
+        dict.set_item("hits", stats.hits)?;
+        dict.set_item("misses", stats.misses)?;
+        dict.set_item("entries", stats.entries)?;
+        dict.set_item("bytes", stats.bytes)?;
+        dict.set_item(
+            "hit_rate",
+            if lookups == 0 {
+                0.0
+            } else {
+                stats.hits as f64 / lookups as f64
+            },
+        )?;
+        Ok(dict)
+    }
+
+    fn __len__(&self) -> usize {
+        self.0.stats().entries
+    }
+
+    fn __enter__(slf: Py<Self>) -> Py<Self> {
+        slf
+    }
+
+    /// Save the cache on leaving a `with` block, unless it raised
+    #[pyo3(signature = (exc_type, _exc_value, _traceback))]
+    fn __exit__(
+        &self,
+        py: Python<'_>,
+        exc_type: Option<&Bound<'_, PyAny>>,
+        _exc_value: Option<&Bound<'_, PyAny>>,
+        _traceback: Option<&Bound<'_, PyAny>>,
+    ) -> PyResult<bool> {
+        if exc_type.is_none() {
+            self.save(py)?;
+        }
+        Ok(false)
+    }
+}
+
+/// Hex fingerprint of everything that affects the result of cleaning, the
+/// same one that keys a `CleanCache`
+///
+/// The pseudonym key only enters it through a hash, so the fingerprint can be
+/// stored without revealing the key.
+#[pyfunction]
+#[pyo3(signature = (cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn config_fingerprint(
+    cleaners: Vec<String>,
+    cleaning: &str,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+) -> PyResult<String> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let (h1, h2) = cache::config_fingerprint(
+        &cleaner_refs,
+        cleaning_enum,
+        ignore_case,
+        replace_string.as_deref(),
+        overlap_enum,
+        ascii_only,
+        allowlist,
+    );
+    Ok(format!("{h1:016x}{h2:016x}"))
+}
+
 // ============================================================================
 // Detection functions
 // ============================================================================
 
 /// Detect PII in a string and return match information
 #[pyfunction]
-#[pyo3(signature = (text, ignore_case = true))]
-pub fn detect_pii(text: &str, ignore_case: bool) -> DetectionResult {
-    Ok(core::detect_pii_core(text, ignore_case))
+#[pyo3(signature = (text, ignore_case = true, overlap = "all", ascii_only = false, allowlist = None))]
+pub fn detect_pii(
+    text: &str,
+    ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+) -> DetectionResult {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
+    Ok(core::detect_pii_with_cleaners_core(
+        text,
+        &["all"],
+        ignore_case,
+        overlap_enum,
+        ascii_only,
+        allowlist,
+    ))
 }
 
 /// Detect PII with specific cleaners
 #[pyfunction]
-#[pyo3(signature = (text, cleaners, ignore_case = true))]
+#[pyo3(signature = (text, cleaners, ignore_case = true, overlap = "all", ascii_only = false, allowlist = None))]
 pub fn detect_pii_with_cleaners(
     text: &str,
     cleaners: Vec<String>,
     ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
 ) -> DetectionResult {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
     let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
     Ok(core::detect_pii_with_cleaners_core(
         text,
         &cleaner_refs,
         ignore_case,
+        overlap_enum,
+        ascii_only,
+        allowlist,
     ))
 }
 
 /// Vectorised detect PII for multiple texts
 #[pyfunction]
-#[pyo3(signature = (texts, ignore_case = true))]
-pub fn detect_pii_batch(texts: Vec<String>, ignore_case: bool) -> BatchDetectionResult {
-    Ok(core::detect_pii_with_cleaners_batch_core(
-        &texts,
-        &["all"],
-        ignore_case,
-    ))
+#[pyo3(signature = (texts, ignore_case = true, overlap = "all", ascii_only = false, allowlist = None, progress = None, cancel = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn detect_pii_batch(
+    py: Python<'_>,
+    texts: &Bound<'_, PyAny>,
+    ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
+) -> BatchDetectionResult {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
+    let texts = extract_texts(texts)?;
+    run_in_chunks(py, &texts, progress, cancel, |texts| {
+        core::detect_pii_with_cleaners_batch_core(
+            texts,
+            &["all"],
+            ignore_case,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+        )
+    })
 }
 
 /// Vectorised detect PII with specific cleaners for multiple texts
 #[pyfunction]
-#[pyo3(signature = (texts, cleaners, ignore_case = true))]
+#[pyo3(signature = (texts, cleaners, ignore_case = true, overlap = "all", ascii_only = false, allowlist = None, progress = None, cancel = None))]
+#[allow(clippy::too_many_arguments)]
 pub fn detect_pii_with_cleaners_batch(
-    texts: Vec<String>,
+    py: Python<'_>,
+    texts: &Bound<'_, PyAny>,
     cleaners: Vec<String>,
     ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
 ) -> BatchDetectionResult {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
+    let texts = extract_texts(texts)?;
     let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
-    Ok(core::detect_pii_with_cleaners_batch_core(
-        &texts,
-        &cleaner_refs,
-        ignore_case,
+    run_in_chunks(py, &texts, progress, cancel, |texts| {
+        core::detect_pii_with_cleaners_batch_core(
+            texts,
+            &cleaner_refs,
+            ignore_case,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+        )
+    })
+}
+
+/// Convert an error from building a Polars column of matches, raising
+/// `OverflowError` for offsets too large for UInt32 as the Arrow functions do
+fn series_error(err: PolarsError) -> PyErr {
+    match err {
+        PolarsError::ComputeError(ref message)
+            if message.to_string().starts_with(series::OFFSET_OVERFLOW) =>
+        {
+            PyOverflowError::new_err(series::OFFSET_OVERFLOW)
+        }
+        err => PyPolarsErr::from(err).into(),
+    }
+}
+
+/// Detect PII in a Polars string Series, returning a list-of-struct Series
+#[pyfunction]
+#[pyo3(signature = (texts, cleaners, ignore_case = true, overlap = "all", ascii_only = false, null_as_empty = false, allowlist = None))]
+pub fn detect_pii_series(
+    py: Python<'_>,
+    texts: PySeries,
+    cleaners: Vec<String>,
+    ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    null_as_empty: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+) -> PyResult<PySeries> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
+    let texts: Series = texts.into();
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let detected = py
+        .allow_threads(|| {
+            // Non-string columns are detected on their string representation
+            let strings = texts.cast(&DataType::String)?;
+            series::detect_pii_series(
+                texts.name().clone(),
+                strings.str()?,
+                &cleaner_refs,
+                ignore_case,
+                overlap_enum,
+                ascii_only,
+                allowlist,
+                null_as_empty,
+            )
+        })
+        .map_err(series_error)?;
+    Ok(PySeries(detected))
+}
+
+/// Vectorised detect PII with specific cleaners, returning the buffers of an
+/// Arrow list-of-struct array
+#[pyfunction]
+#[pyo3(signature = (texts, cleaners, ignore_case = true, overlap = "all", ascii_only = false, allowlist = None))]
+pub fn detect_pii_arrow<'py>(
+    py: Python<'py>,
+    texts: &Bound<'py, PyAny>,
+    cleaners: Vec<String>,
+    ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+) -> PyResult<ArrowBuffers<'py>> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
+    let texts = extract_texts(texts)?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let detections = py
+        .allow_threads(|| {
+            let spans = core::detect_spans_batch_core(
+                &texts,
+                &cleaner_refs,
+                ignore_case,
+                overlap_enum,
+                ascii_only,
+                allowlist,
+            );
+            ArrowDetections::from_spans(&texts, &spans)
+        })
+        .map_err(|_| {
+            PyOverflowError::new_err("Detection results are too large for 32-bit Arrow offsets")
+        })?;
+    Ok((
+        PyBytes::new(py, &detections.offsets),
+        PyBytes::new(py, &detections.starts),
+        PyBytes::new(py, &detections.ends),
+        PyBytes::new(py, &detections.text_offsets),
+        PyBytes::new(py, &detections.text_data),
+        PyBytes::new(py, &detections.type_codes),
+        detections
+            .type_names
+            .iter()
+            .map(|&name| name.to_string())
+            .collect(),
+        detections.n_matches,
     ))
 }
 
@@ -82,34 +695,51 @@ pub fn detect_pii_with_cleaners_batch(
 
 /// Clean PII from a string using the specified method
 #[pyfunction]
-#[pyo3(signature = (text, cleaning, ignore_case = true, replace_string = None))]
+#[pyo3(signature = (text, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None))]
 pub fn clean_pii(
     text: &str,
     cleaning: &str,
     ignore_case: bool,
     replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
 ) -> PyResult<String> {
-    let cleaning_enum = Cleaning::from_str(cleaning)?;
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
     let replace_str = replace_string.as_deref();
-    Ok(core::clean_pii_core(
+    Ok(core::clean_pii_with_cleaners_core(
         text,
+        &["all"],
         cleaning_enum,
         ignore_case,
         replace_str,
-    ))
+        overlap_enum,
+        ascii_only,
+        allowlist,
+    )
+    .into_owned())
 }
 
 /// Clean PII with specific cleaners
 #[pyfunction]
-#[pyo3(signature = (text, cleaners, cleaning, ignore_case = true, replace_string = None))]
+#[pyo3(signature = (text, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None))]
 pub fn clean_pii_with_cleaners(
     text: &str,
     cleaners: Vec<String>,
     cleaning: &str,
     ignore_case: bool,
     replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
 ) -> PyResult<String> {
-    let cleaning_enum = Cleaning::from_str(cleaning)?;
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
     let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
     let replace_str = replace_string.as_deref();
     Ok(core::clean_pii_with_cleaners_core(
@@ -118,49 +748,1135 @@ pub fn clean_pii_with_cleaners(
         cleaning_enum,
         ignore_case,
         replace_str,
-    ))
+        overlap_enum,
+        ascii_only,
+        allowlist,
+    )
+    .into_owned())
 }
 
 /// Vectorised clean PII for multiple texts
 #[pyfunction]
-#[pyo3(signature = (texts, cleaning, ignore_case = true, replace_string = None))]
-pub fn clean_pii_batch(
-    texts: Vec<String>,
+#[pyo3(signature = (texts, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, cache = None, progress = None, cancel = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_batch<'py>(
+    py: Python<'py>,
+    texts: &Bound<'py, PyAny>,
     cleaning: &str,
     ignore_case: bool,
     replace_string: Option<String>,
-) -> PyResult<Vec<String>> {
-    let cleaning_enum = Cleaning::from_str(cleaning)?;
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    cache: Option<&Bound<'_, PyCleanCache>>,
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
+) -> PyResult<Vec<Bound<'py, PyString>>> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cache = cache.map(|cache| &cache.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
     let replace_str = replace_string.as_deref();
-    Ok(core::clean_pii_with_cleaners_batch_core(
-        &texts,
-        &["all"],
-        cleaning_enum,
-        ignore_case,
-        replace_str,
-    ))
+    let texts = extract_texts(texts)?;
+    let cleaned = run_in_chunks(py, &texts, progress, cancel, |texts| match cache {
+        Some(cache) => cache.clean_batch(
+            texts,
+            &["all"],
+            cleaning_enum,
+            ignore_case,
+            replace_str,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+        ),
+        None => core::clean_pii_with_cleaners_batch_core(
+            texts,
+            &["all"],
+            cleaning_enum,
+            ignore_case,
+            replace_str,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+        ),
+    })?;
+    into_py_strings(py, &texts, cleaned)
 }
 
 /// Vectorised clean PII with specific cleaners for multiple texts
 #[pyfunction]
-#[pyo3(signature = (texts, cleaners, cleaning, ignore_case = true, replace_string = None))]
-pub fn clean_pii_with_cleaners_batch(
-    texts: Vec<String>,
+#[pyo3(signature = (texts, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, cache = None, progress = None, cancel = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_with_cleaners_batch<'py>(
+    py: Python<'py>,
+    texts: &Bound<'py, PyAny>,
     cleaners: Vec<String>,
     cleaning: &str,
     ignore_case: bool,
     replace_string: Option<String>,
-) -> PyResult<Vec<String>> {
-    let cleaning_enum = Cleaning::from_str(cleaning)?;
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    cache: Option<&Bound<'_, PyCleanCache>>,
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
+) -> PyResult<Vec<Bound<'py, PyString>>> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cache = cache.map(|cache| &cache.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
     let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
     let replace_str = replace_string.as_deref();
-    Ok(core::clean_pii_with_cleaners_batch_core(
-        &texts,
-        &cleaner_refs,
-        cleaning_enum,
+    let texts = extract_texts(texts)?;
+    let cleaned = run_in_chunks(py, &texts, progress, cancel, |texts| match cache {
+        Some(cache) => cache.clean_batch(
+            texts,
+            &cleaner_refs,
+            cleaning_enum,
+            ignore_case,
+            replace_str,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+        ),
+        None => core::clean_pii_with_cleaners_batch_core(
+            texts,
+            &cleaner_refs,
+            cleaning_enum,
+            ignore_case,
+            replace_str,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+        ),
+    })?;
+    into_py_strings(py, &texts, cleaned)
+}
+
+/// Clean PII in a Polars Series, including strings nested in `List` and
+/// `Struct` columns
+#[pyfunction]
+#[pyo3(signature = (texts, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, cache = None, limits = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_series(
+    py: Python<'_>,
+    texts: PySeries,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    cache: Option<&Bound<'_, PyCleanCache>>,
+    limits: Option<&Bound<'_, PyRowLimits>>,
+) -> PyResult<PySeries> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cache = cache.map(|cache| &cache.get().0);
+    let limits = limits.map(|limits| &limits.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
+    let texts: Series = texts.into();
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let replace_str = replace_string.as_deref();
+    let cleaned = py
+        .allow_threads(|| {
+            series::clean_pii_series(
+                &texts,
+                &cleaner_refs,
+                cleaning_enum,
+                ignore_case,
+                replace_str,
+                overlap_enum,
+                ascii_only,
+                allowlist,
+                cache,
+                limits,
+            )
+        })
+        .map_err(PyPolarsErr::from)?;
+    Ok(PySeries(cleaned))
+}
+
+/// Clean PII in an Arrow `string` (or `large_string` if `large`) array given
+/// as its offsets and data buffers, returning those of the cleaned array
+///
+/// `offset` and `length` are the array's slice of the offsets. Null rows are
+/// cleaned as whatever text their offsets give, usually empty, and are for
+/// the caller to mask.
+#[pyfunction]
+#[pyo3(signature = (offsets, data, large, offset, length, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, cache = None, limits = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_arrow<'py>(
+    py: Python<'py>,
+    offsets: &[u8],
+    data: &[u8],
+    large: bool,
+    offset: usize,
+    length: usize,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    cache: Option<&Bound<'_, PyCleanCache>>,
+    limits: Option<&Bound<'_, PyRowLimits>>,
+) -> PyResult<(Bound<'py, PyBytes>, Bound<'py, PyBytes>)> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cache = cache.map(|cache| &cache.get().0);
+    let limits = limits.map(|limits| &limits.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let replace_str = replace_string.as_deref();
+    let texts = arrow::read_strings(offsets, data, large, offset, length)
+        .map_err(PyErr::new::<pyo3::exceptions::PyValueError, _>)?;
+    let (offsets, data) = py
+        .allow_threads(|| {
+            // As `clean_pii_list`, the cache isn't used while limits are set
+            let cleaned: Vec<_> = match (limits, cache) {
+                (Some(limits), _) => core::clean_pii_limited_batch_core(
+                    &texts,
+                    &cleaner_refs,
+                    cleaning_enum,
+                    ignore_case,
+                    replace_str,
+                    overlap_enum,
+                    ascii_only,
+                    allowlist,
+                    limits,
+                )
+                .into_iter()
+                .map(|(cleaned, _)| cleaned)
+                .collect(),
+                (None, Some(cache)) => cache.clean_batch(
+                    &texts,
+                    &cleaner_refs,
+                    cleaning_enum,
+                    ignore_case,
+                    replace_str,
+                    overlap_enum,
+                    ascii_only,
+                    allowlist,
+                ),
+                (None, None) => core::clean_pii_with_cleaners_batch_core(
+                    &texts,
+                    &cleaner_refs,
+                    cleaning_enum,
+                    ignore_case,
+                    replace_str,
+                    overlap_enum,
+                    ascii_only,
+                    allowlist,
+                ),
+            };
+            arrow::write_strings(&cleaned, large)
+        })
+        .map_err(|_| {
+            PyOverflowError::new_err("Cleaned text is too large for 32-bit Arrow offsets")
+        })?;
+    Ok((PyBytes::new(py, &offsets), PyBytes::new(py, &data)))
+}
+
+/// Vectorised clean PII with specific cleaners within per-row limits, also
+/// returning `(row, limit)` for each row that hit a limit
+#[pyfunction]
+#[pyo3(signature = (texts, cleaners, cleaning, limits, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, progress = None, cancel = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_limited_batch<'py>(
+    py: Python<'py>,
+    texts: &Bound<'py, PyAny>,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    limits: &Bound<'_, PyRowLimits>,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
+) -> PyResult<(Vec<Bound<'py, PyString>>, Vec<(usize, &'static str)>)> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let limits = &limits.get().0;
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let replace_str = replace_string.as_deref();
+    let texts = extract_texts(texts)?;
+    let (cleaned, hits): (Vec<_>, Vec<_>) = run_in_chunks(py, &texts, progress, cancel, |texts| {
+        core::clean_pii_limited_batch_core(
+            texts,
+            &cleaner_refs,
+            cleaning_enum,
+            ignore_case,
+            replace_str,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+            limits,
+        )
+    })?
+    .into_iter()
+    .unzip();
+    let hits = hits
+        .into_iter()
+        .enumerate()
+        .filter_map(|(row, hit)| hit.map(|hit| (row, hit.as_str())))
+        .collect();
+    Ok((into_py_strings(py, &texts, cleaned)?, hits))
+}
+
+/// `(start, end, text, type)` for each of the `spans` found in `text`
+fn span_matches(text: &str, spans: Vec<core::Span>) -> Vec<DetectionMatch> {
+    spans
+        .into_iter()
+        .map(|span| {
+            (
+                span.start,
+                span.end,
+                text[span.start..span.end].to_string(),
+                span.cleaner.to_string(),
+            )
+        })
+        .collect()
+}
+
+/// Vectorised clean PII with specific cleaners, also returning the matches
+/// that were cleaned in each text, from one scan
+#[pyfunction]
+#[pyo3(signature = (texts, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, progress = None, cancel = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_and_detect_batch<'py>(
+    py: Python<'py>,
+    texts: &Bound<'py, PyAny>,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
+) -> PyResult<(Vec<Bound<'py, PyString>>, Vec<Vec<DetectionMatch>>)> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let replace_str = replace_string.as_deref();
+    let texts = extract_texts(texts)?;
+    let (cleaned, detected): (Vec<_>, Vec<_>) =
+        run_in_chunks(py, &texts, progress, cancel, |texts| {
+            core::clean_and_detect_batch_core(
+                texts,
+                &cleaner_refs,
+                cleaning_enum,
+                ignore_case,
+                replace_str,
+                overlap_enum,
+                ascii_only,
+                allowlist,
+            )
+            .into_iter()
+            .zip(texts)
+            .map(|((cleaned, spans), text)| (cleaned, span_matches(text, spans)))
+            .collect()
+        })?
+        .into_iter()
+        .unzip();
+    Ok((into_py_strings(py, &texts, cleaned)?, detected))
+}
+
+/// Vectorised clean PII with specific cleaners within per-row limits, also
+/// returning the matches cleaned in each text and `(row, limit)` for each row
+/// that hit a limit
+#[pyfunction]
+#[pyo3(signature = (texts, cleaners, cleaning, limits, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, progress = None, cancel = None))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_and_detect_limited_batch<'py>(
+    py: Python<'py>,
+    texts: &Bound<'py, PyAny>,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    limits: &Bound<'_, PyRowLimits>,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    progress: Option<&Bound<'_, PyAny>>,
+    cancel: Option<&Bound<'_, PyCancelToken>>,
+) -> PyResult<CleanedLimitedBatch<'py>> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let limits = &limits.get().0;
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let replace_str = replace_string.as_deref();
+    let texts = extract_texts(texts)?;
+    let results = run_in_chunks(py, &texts, progress, cancel, |texts| {
+        core::clean_and_detect_limited_batch_core(
+            texts,
+            &cleaner_refs,
+            cleaning_enum,
+            ignore_case,
+            replace_str,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+            limits,
+        )
+        .into_iter()
+        .zip(texts)
+        .map(|((cleaned, spans, hit), text)| (cleaned, span_matches(text, spans), hit))
+        .collect()
+    })?;
+    let mut cleaned = Vec::with_capacity(results.len());
+    let mut detected = Vec::with_capacity(results.len());
+    let mut hits = Vec::new();
+    for (row, (row_cleaned, matches, hit)) in results.into_iter().enumerate() {
+        cleaned.push(row_cleaned);
+        detected.push(matches);
+        if let Some(hit) = hit {
+            hits.push((row, hit.as_str()));
+        }
+    }
+    Ok((into_py_strings(py, &texts, cleaned)?, detected, hits))
+}
+
+/// Clean PII in a Polars string Series, also returning a list-of-struct
+/// Series of the matches that were cleaned, from one scan
+#[pyfunction]
+#[pyo3(signature = (texts, detected_name, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, limits = None, null_as_empty = false))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_and_detect_series(
+    py: Python<'_>,
+    texts: PySeries,
+    detected_name: &str,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    limits: Option<&Bound<'_, PyRowLimits>>,
+    null_as_empty: bool,
+) -> PyResult<(PySeries, PySeries)> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let limits = limits.map(|limits| &limits.get().0);
+    let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+    let overlap_enum = Overlap::for_cleaning(overlap)?;
+    let texts: Series = texts.into();
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let replace_str = replace_string.as_deref();
+    let (cleaned, detected) = py
+        .allow_threads(|| {
+            // Non-string columns are cleaned on their string representation
+            let strings = texts.cast(&DataType::String)?;
+            series::clean_and_detect_series(
+                strings.str()?,
+                detected_name.into(),
+                &cleaner_refs,
+                cleaning_enum,
+                ignore_case,
+                replace_str,
+                overlap_enum,
+                ascii_only,
+                allowlist,
+                limits,
+                null_as_empty,
+            )
+        })
+        .map_err(series_error)?;
+    Ok((PySeries(cleaned), PySeries(detected)))
+}
+
+// ============================================================================
+// JSON cleaning
+// ============================================================================
+
+/// Parse dotted key paths for `include` and `exclude`
+fn parse_key_paths(paths: Option<Vec<String>>) -> PyResult<Vec<KeyPath>> {
+    paths
+        .unwrap_or_default()
+        .iter()
+        .map(|path| {
+            KeyPath::parse(path).ok_or_else(|| {
+                PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                    "Invalid key path: {}",
+                    path
+                ))
+            })
+        })
+        .collect()
+}
+
+/// Clean PII in the string values of a JSON document
+#[pyfunction]
+#[pyo3(signature = (text, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, include = None, exclude = None, clean_keys = false))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_json(
+    py: Python<'_>,
+    text: &str,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    include: Option<Vec<String>>,
+    exclude: Option<Vec<String>>,
+    clean_keys: bool,
+) -> PyResult<String> {
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let json_cleaner = JsonCleaner {
+        cleaners: &cleaner_refs,
+        cleaning: Cleaning::from_str(cleaning, pseudonym_key)?,
         ignore_case,
-        replace_str,
-    ))
+        replace_string: replace_string.as_deref(),
+        overlap: Overlap::for_cleaning(overlap)?,
+        ascii_only,
+        allowlist: allowlist.map(|allowlist| &allowlist.get().0),
+        clean_keys,
+        include: parse_key_paths(include)?,
+        exclude: parse_key_paths(exclude)?,
+    };
+    py.allow_threads(|| json_cleaner.clean(text))
+        .map(Cow::into_owned)
+        .map_err(|error| {
+            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("Invalid JSON: {}", error))
+        })
+}
+
+/// Clean PII in the string values of a batch of JSON documents in parallel
+#[pyfunction]
+#[pyo3(signature = (texts, cleaners, cleaning, ignore_case = true, replace_string = None, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, include = None, exclude = None, clean_keys = false))]
+#[allow(clippy::too_many_arguments)]
+pub fn clean_json_batch<'py>(
+    py: Python<'py>,
+    texts: &Bound<'py, PyAny>,
+    cleaners: Vec<String>,
+    cleaning: &str,
+    ignore_case: bool,
+    replace_string: Option<String>,
+    overlap: &str,
+    ascii_only: bool,
+    pseudonym_key: Option<&str>,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    include: Option<Vec<String>>,
+    exclude: Option<Vec<String>>,
+    clean_keys: bool,
+) -> PyResult<Vec<Bound<'py, PyString>>> {
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let json_cleaner = JsonCleaner {
+        cleaners: &cleaner_refs,
+        cleaning: Cleaning::from_str(cleaning, pseudonym_key)?,
+        ignore_case,
+        replace_string: replace_string.as_deref(),
+        overlap: Overlap::for_cleaning(overlap)?,
+        ascii_only,
+        allowlist: allowlist.map(|allowlist| &allowlist.get().0),
+        clean_keys,
+        include: parse_key_paths(include)?,
+        exclude: parse_key_paths(exclude)?,
+    };
+    let texts = extract_texts(texts)?;
+    let results = py.allow_threads(|| json_cleaner.clean_batch(&texts));
+    let mut cleaned = Vec::with_capacity(results.len());
+    for (i, result) in results.into_iter().enumerate() {
+        cleaned.push(result.map_err(|error| {
+            PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Invalid JSON in document {}: {}",
+                i, error
+            ))
+        })?);
+    }
+    into_py_strings(py, &texts, cleaned)
+}
+
+// ============================================================================
+// Dictionary cleaners
+// ============================================================================
+
+/// Check that `name` can be used for a dictionary without shadowing "all" or
+/// a built-in cleaner
+fn check_dictionary_name(name: &str) -> PyResult<()> {
+    if name.is_empty()
+        || name == "all"
+        || patterns::get_registry()
+            .get_available_cleaners()
+            .contains(&name)
+    {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+            "Invalid dictionary name: {}",
+            name
+        )));
+    }
+    Ok(())
+}
+
+/// Register a dictionary cleaner built from a list of literal values
+#[pyfunction]
+#[pyo3(signature = (name, values, case_insensitive = true, word_boundary = true))]
+pub fn register_dictionary(
+    py: Python<'_>,
+    name: &str,
+    values: &Bound<'_, PyAny>,
+    case_insensitive: bool,
+    word_boundary: bool,
+) -> PyResult<()> {
+    check_dictionary_name(name)?;
+    let values = extract_texts(values)?;
+    let built = py.allow_threads(|| Dictionary::new(&values, case_insensitive, word_boundary));
+    let built =
+        built.map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    dictionary::register(name, built);
+    Ok(())
+}
+
+/// Register a dictionary cleaner from a text file with one value per line
+#[pyfunction]
+#[pyo3(signature = (name, path, case_insensitive = true, word_boundary = true))]
+pub fn register_dictionary_file(
+    py: Python<'_>,
+    name: &str,
+    path: PathBuf,
+    case_insensitive: bool,
+    word_boundary: bool,
+) -> PyResult<()> {
+    check_dictionary_name(name)?;
+    let built =
+        py.allow_threads(|| Dictionary::from_file(&path, case_insensitive, word_boundary))?;
+    dictionary::register(name, built);
+    Ok(())
+}
+
+/// Save a registered dictionary so it can be reloaded with `load_dictionary`
+#[pyfunction]
+pub fn save_dictionary(py: Python<'_>, name: &str, path: PathBuf) -> PyResult<()> {
+    let saved = dictionary::get(name).ok_or_else(|| {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("Unknown dictionary: {}", name))
+    })?;
+    py.allow_threads(|| saved.save(&path))?;
+    Ok(())
+}
+
+/// Load a dictionary written by `save_dictionary` and register it as `name`
+#[pyfunction]
+pub fn load_dictionary(py: Python<'_>, name: &str, path: PathBuf) -> PyResult<()> {
+    check_dictionary_name(name)?;
+    let loaded = py.allow_threads(|| Dictionary::load(&path))?;
+    dictionary::register(name, loaded);
+    Ok(())
+}
+
+/// A registered dictionary in the format written by `save_dictionary`
+#[pyfunction]
+pub fn dictionary_to_bytes<'py>(py: Python<'py>, name: &str) -> PyResult<Bound<'py, PyBytes>> {
+    let saved = dictionary::get(name).ok_or_else(|| {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("Unknown dictionary: {}", name))
+    })?;
+    Ok(PyBytes::new(py, &saved.to_bytes()))
+}
+
+/// Register a dictionary from the bytes of `dictionary_to_bytes` as `name`,
+/// unless the same dictionary is already registered under that name
+#[pyfunction]
+pub fn register_dictionary_bytes(py: Python<'_>, name: &str, data: &[u8]) -> PyResult<()> {
+    check_dictionary_name(name)?;
+    py.allow_threads(|| dictionary::register_bytes(name, data))
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))
+}
+
+/// Remove a registered dictionary, returning whether it existed
+#[pyfunction]
+pub fn remove_dictionary(name: &str) -> bool {
+    dictionary::remove(name)
+}
+
+// ============================================================================
+// Streaming
+// ============================================================================
+
+/// Cleans text that arrives in pieces, finding PII split across chunks
+///
+/// Not for sharing between threads: a concurrent call raises `RuntimeError`
+/// through PyO3's borrow checking rather than racing.
+#[pyclass(name = "StreamingCleaner", module = "piicleaner._internal")]
+pub struct PyStreamingCleaner {
+    stream: StreamCleaner,
+    allowlist: Option<Py<PyAllowlist>>,
+}
+
+#[pymethods]
+impl PyStreamingCleaner {
+    #[new]
+    #[pyo3(signature = (cleaners = vec!["all".to_string()], cleaning = "redact", ignore_case = true, overlap = "longest", ascii_only = false, pseudonym_key = None, allowlist = None, max_match_len = stream::DEFAULT_MAX_MATCH_LEN))]
+    #[allow(clippy::too_many_arguments)]
+    fn new(
+        cleaners: Vec<String>,
+        cleaning: &str,
+        ignore_case: bool,
+        overlap: &str,
+        ascii_only: bool,
+        pseudonym_key: Option<&str>,
+        allowlist: Option<Py<PyAllowlist>>,
+        max_match_len: usize,
+    ) -> PyResult<Self> {
+        let cleaning_enum = Cleaning::from_str(cleaning, pseudonym_key)?;
+        if matches!(cleaning_enum, Cleaning::Replace) {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Streaming supports the redact and pseudonymise cleaning methods",
+            ));
+        }
+        let overlap_enum = Overlap::for_cleaning(overlap)?;
+        Ok(PyStreamingCleaner {
+            stream: StreamCleaner::new(
+                cleaners,
+                cleaning_enum,
+                ignore_case,
+                overlap_enum,
+                ascii_only,
+                max_match_len,
+            ),
+            allowlist,
+        })
+    }
+
+    /// Add a chunk and return the cleaned text that is now safe to emit
+    fn feed(&mut self, py: Python<'_>, chunk: &str) -> String {
+        let allowlist = self.allowlist.as_ref().map(|allowlist| &allowlist.get().0);
+        let stream = &mut self.stream;
+        py.allow_threads(|| stream.feed(chunk, allowlist))
+    }
+
+    /// Clean and return everything held back, ending the stream
+    fn finish(&mut self, py: Python<'_>) -> String {
+        let allowlist = self.allowlist.as_ref().map(|allowlist| &allowlist.get().0);
+        let stream = &mut self.stream;
+        py.allow_threads(|| stream.finish(allowlist))
+    }
+
+    /// Bytes received but held back
+    #[getter]
+    fn pending(&self) -> usize {
+        self.stream.pending_len()
+    }
+}
+
+// ============================================================================
+// Profiling
+// ============================================================================
+
+/// A profile as rows of (column position, PII type, rows scanned, rows
+/// matched, matches), see `profile::profile_columns`
+type ProfileRows = Vec<(usize, String, u64, u64, u64)>;
+
+/// Check the sampling options of a profile
+fn profile_sample(
+    sample_size: Option<usize>,
+    tolerance: Option<f64>,
+    seed: u64,
+) -> PyResult<Sample> {
+    if sample_size == Some(0) {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+            "`sample_size` must be a positive integer",
+        ));
+    }
+    if tolerance.is_some_and(|tolerance| !(tolerance > 0.0 && tolerance < 1.0)) {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+            "`tolerance` must be between 0 and 1",
+        ));
+    }
+    Ok(Sample {
+        size: sample_size,
+        tolerance,
+        seed,
+    })
+}
+
+fn profile_rows(profiles: Vec<ColumnProfile<'_>>) -> ProfileRows {
+    profiles
+        .into_iter()
+        .enumerate()
+        .flat_map(|(column, profile)| {
+            profile.types.into_iter().map(move |counts| {
+                (
+                    column,
+                    counts.cleaner.to_string(),
+                    profile.rows_scanned,
+                    counts.rows,
+                    counts.matches,
+                )
+            })
+        })
+        .collect()
+}
+
+/// Profile the PII types found in several columns of texts, scanning them
+/// together in one parallel pass
+#[pyfunction]
+#[pyo3(signature = (columns, cleaners, ignore_case = true, overlap = "all", ascii_only = false, allowlist = None, sample_size = None, tolerance = None, seed = 0))]
+#[allow(clippy::too_many_arguments)]
+pub fn profile_batch(
+    py: Python<'_>,
+    columns: &Bound<'_, PyAny>,
+    cleaners: Vec<String>,
+    ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    sample_size: Option<usize>,
+    tolerance: Option<f64>,
+    seed: u64,
+) -> PyResult<ProfileRows> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
+    let sample = profile_sample(sample_size, tolerance, seed)?;
+    let columns = columns
+        .try_iter()?
+        .map(|column| extract_texts(&column?))
+        .collect::<PyResult<Vec<_>>>()?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    Ok(py.allow_threads(|| {
+        profile_rows(profile::profile_columns(
+            &columns,
+            &cleaner_refs,
+            ignore_case,
+            overlap_enum,
+            ascii_only,
+            allowlist,
+            sample,
+        ))
+    }))
+}
+
+/// Profile the PII types found in several Polars Series, see
+/// `profile_batch`
+#[pyfunction]
+#[pyo3(signature = (columns, cleaners, ignore_case = true, overlap = "all", ascii_only = false, allowlist = None, sample_size = None, tolerance = None, seed = 0))]
+#[allow(clippy::too_many_arguments)]
+pub fn profile_series(
+    py: Python<'_>,
+    columns: Vec<PySeries>,
+    cleaners: Vec<String>,
+    ignore_case: bool,
+    overlap: &str,
+    ascii_only: bool,
+    allowlist: Option<&Bound<'_, PyAllowlist>>,
+    sample_size: Option<usize>,
+    tolerance: Option<f64>,
+    seed: u64,
+) -> PyResult<ProfileRows> {
+    let allowlist = allowlist.map(|allowlist| &allowlist.get().0);
+    let overlap_enum = Overlap::from_str(overlap)?;
+    let sample = profile_sample(sample_size, tolerance, seed)?;
+    let cleaner_refs: Vec<&str> = cleaners.iter().map(|s| s.as_str()).collect();
+    let columns: Vec<Series> = columns.into_iter().map(Series::from).collect();
+    let rows = py
+        .allow_threads(|| {
+            let n_rows: Vec<usize> = columns.iter().map(|column| column.len()).collect();
+            // Only the rows sampled are read. String columns are read in
+            // place; other columns are profiled on the string representation
+            // of the rows taken. Nulls are profiled as empty strings.
+            let gather = |column: usize, rows: &[usize]| -> PolarsResult<Vec<Cow<str>>> {
+                let column = &columns[column];
+                if column.dtype() == &DataType::String {
+                    let strings = column.str()?;
+                    return Ok(rows
+                        .iter()
+                        .map(|&row| Cow::Borrowed(strings.get(row).unwrap_or("")))
+                        .collect());
+                }
+                let indices = IdxCa::from_vec(
+                    PlSmallStr::EMPTY,
+                    rows.iter().map(|&row| row as IdxSize).collect(),
+                );
+                let taken = column.take(&indices)?.cast(&DataType::String)?;
+                Ok(taken
+                    .str()?
+                    .iter()
+                    .map(|text| Cow::Owned(text.unwrap_or("").to_string()))
+                    .collect())
+            };
+            PolarsResult::Ok(profile_rows(profile::profile_gathered(
+                &n_rows,
+                gather,
+                &cleaner_refs,
+                ignore_case,
+                overlap_enum,
+                ascii_only,
+                allowlist,
+                sample,
+            )?))
+        })
+        .map_err(PyPolarsErr::from)?;
+    Ok(rows)
+}
+
+// ============================================================================
+// PII index
+// ============================================================================
+
+/// Inverted index from detected PII values to the rows that contain them
+///
+/// Concurrent `append` calls on one index raise `RuntimeError`, see
+/// `PyStreamingCleaner`.
+#[pyclass(name = "PiiIndex", module = "piicleaner._internal")]
+pub struct PyPiiIndex(PiiIndex);
+
+#[pymethods]
+impl PyPiiIndex {
+    #[new]
+    #[pyo3(signature = (cleaners = vec!["all".to_string()], ignore_case = true, ascii_only = false, allowlist = None))]
+    fn new(
+        cleaners: Vec<String>,
+        ignore_case: bool,
+        ascii_only: bool,
+        allowlist: Option<&Bound<'_, PyAllowlist>>,
+    ) -> Self {
+        let allowlist = allowlist.map(|allowlist| allowlist.get().0.clone());
+        PyPiiIndex(PiiIndex::new(cleaners, ignore_case, ascii_only, allowlist))
+    }
+
+    /// Detect PII in a batch of texts and add every match to the index
+    #[pyo3(signature = (texts, row_ids = None))]
+    fn append(
+        &mut self,
+        py: Python<'_>,
+        texts: &Bound<'_, PyAny>,
+        row_ids: Option<Vec<u64>>,
+    ) -> PyResult<()> {
+        let texts = extract_texts(texts)?;
+        if row_ids.as_ref().is_some_and(|ids| ids.len() != texts.len()) {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "`row_ids` must have one ID per text",
+            ));
+        }
+        let index = &mut self.0;
+        py.allow_threads(|| index.append(&texts, row_ids.as_deref()))
+            .map_err(|_| PyOverflowError::new_err("Text is too large for 32-bit index offsets"))
+    }
+
+    /// Every occurrence of a value as `(row, start, end, type)`
+    fn lookup(&self, value: &str) -> Vec<(u64, u32, u32, String)> {
+        self.0
+            .lookup(value)
+            .iter()
+            .map(|posting| {
+                (
+                    posting.row,
+                    posting.start,
+                    posting.end,
+                    self.0.type_name(posting.type_code).to_string(),
+                )
+            })
+            .collect()
+    }
+
+    /// Distinct IDs of the rows containing a value, sorted
+    fn rows(&self, value: &str) -> Vec<u64> {
+        self.0.rows(value)
+    }
+
+    /// Save the index so it can be reloaded with `PiiIndex.load`
+    fn save(&self, py: Python<'_>, path: PathBuf) -> PyResult<()> {
+        let index = &self.0;
+        py.allow_threads(|| index.save(&path))?;
+        Ok(())
+    }
+
+    /// Load an index written by `save`
+    #[staticmethod]
+    fn load(py: Python<'_>, path: PathBuf) -> PyResult<Self> {
+        Ok(PyPiiIndex(py.allow_threads(|| PiiIndex::load(&path))?))
+    }
+
+    #[getter]
+    fn cleaners(&self) -> Vec<String> {
+        self.0.cleaners().to_vec()
+    }
+
+    #[getter]
+    fn n_rows(&self) -> u64 {
+        self.0.n_rows()
+    }
+
+    fn __len__(&self) -> usize {
+        self.0.len()
+    }
+}
+
+// ============================================================================
+// Heavy hitters
+// ============================================================================
+
+/// Most frequent PII values of each type, counted in a fixed-size Count-Min
+/// sketch
+///
+/// Concurrent `update` or `merge` calls on one sketch raise `RuntimeError`,
+/// see `PyStreamingCleaner`.
+#[pyclass(name = "HeavyHitters", module = "piicleaner._internal")]
+pub struct PyHeavyHitters(HeavyHitters);
+
+#[pymethods]
+impl PyHeavyHitters {
+    #[new]
+    #[pyo3(signature = (cleaners = vec!["all".to_string()], k = 100, epsilon = 1e-4, delta = 1e-3, hash_values = false, ignore_case = true, ascii_only = false, allowlist = None))]
+    #[allow(clippy::too_many_arguments)]
+    fn new(
+        cleaners: Vec<String>,
+        k: usize,
+        epsilon: f64,
+        delta: f64,
+        hash_values: bool,
+        ignore_case: bool,
+        ascii_only: bool,
+        allowlist: Option<&Bound<'_, PyAllowlist>>,
+    ) -> PyResult<Self> {
+        if k == 0 {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "`k` must be a positive integer",
+            ));
+        }
+        if !(epsilon > 0.0 && epsilon < 1.0) {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "`epsilon` must be between 0 and 1",
+            ));
+        }
+        if !(delta > 0.0 && delta < 1.0) {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "`delta` must be between 0 and 1",
+            ));
+        }
+        let allowlist = allowlist.map(|allowlist| allowlist.get().0.clone());
+        Ok(PyHeavyHitters(HeavyHitters::new(
+            cleaners,
+            k,
+            epsilon,
+            delta,
+            hash_values,
+            ignore_case,
+            ascii_only,
+            allowlist,
+        )))
+    }
+
+    /// Detect PII in a batch of texts and count every match
+    fn update(&mut self, py: Python<'_>, texts: &Bound<'_, PyAny>) -> PyResult<()> {
+        let texts = extract_texts(texts)?;
+        let sketch = &mut self.0;
+        py.allow_threads(|| sketch.update(&texts));
+        Ok(())
+    }
+
+    /// Add the counts of another sketch with the same size, cleaners,
+    /// allowlist and options
+    fn merge(slf: &Bound<'_, Self>, other: &Bound<'_, Self>) -> PyResult<()> {
+        if !slf.borrow().0.is_compatible(&other.borrow().0) {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Sketches must have the same size, cleaners, allowlist and options to be merged",
+            ));
+        }
+        if slf.is(other) {
+            let copy = other.borrow().0.clone();
+            slf.borrow_mut().0.merge(&copy);
+        } else {
+            slf.borrow_mut().0.merge(&other.borrow().0);
+        }
+        Ok(())
+    }
+
+    /// The heavy hitters as `(type, value, count)`, highest count first,
+    /// with the value's unkeyed hash in hex in place of the value if
+    /// `hash_values` was set
+    #[pyo3(signature = (pii_type = None))]
+    fn top(&self, pii_type: Option<&str>) -> Vec<(String, String, u64)> {
+        self.0
+            .top(pii_type)
+            .into_iter()
+            .map(|hitter| {
+                let value = hitter
+                    .value
+                    .unwrap_or_else(|| format!("{:016x}", hitter.hash));
+                (hitter.pii_type, value, hitter.count)
+            })
+            .collect()
+    }
+
+    /// Estimated number of times a value was found as the given type
+    fn estimate(&self, value: &str, pii_type: &str) -> u64 {
+        self.0.estimate(value, pii_type)
+    }
+
+    /// The sketch as bytes, for `HeavyHitters.from_bytes`
+    fn to_bytes<'py>(&self, py: Python<'py>) -> Bound<'py, PyBytes> {
+        PyBytes::new(py, &self.0.to_bytes())
+    }
+
+    /// Load a sketch from the bytes of `to_bytes`
+    #[staticmethod]
+    fn from_bytes(py: Python<'_>, data: &[u8]) -> PyResult<Self> {
+        py.allow_threads(|| HeavyHitters::from_bytes(data))
+            .map(PyHeavyHitters)
+            .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))
+    }
+
+    /// Pickle as the bytes of `to_bytes`
+    fn __reduce__<'py>(
+        slf: &Bound<'py, Self>,
+    ) -> PyResult<(Bound<'py, PyAny>, (Bound<'py, PyBytes>,))> {
+        Ok((
+            slf.get_type().getattr("from_bytes")?,
+            (slf.borrow().to_bytes(slf.py()),),
+        ))
+    }
+
+    #[getter]
+    fn cleaners(&self) -> Vec<String> {
+        self.0.cleaners().to_vec()
+    }
+
+    #[getter]
+    fn k(&self) -> usize {
+        self.0.k()
+    }
+
+    #[getter]
+    fn width(&self) -> usize {
+        self.0.width()
+    }
+
+    #[getter]
+    fn depth(&self) -> usize {
+        self.0.depth()
+    }
+
+    /// Number of matches counted so far
+    #[getter]
+    fn n_matches(&self) -> u64 {
+        self.0.n_matches()
+    }
+
+    /// Most any count overcounts by, with probability `1 - delta`
+    #[getter]
+    fn max_error(&self) -> f64 {
+        self.0.max_error()
+    }
 }
 
 // ============================================================================
@@ -175,26 +1891,69 @@ pub fn get_available_cleaners() -> PyResult<Vec<String>> {
         .get_available_cleaners()
         .iter()
         .map(|&s| s.to_string())
+        .chain(dictionary::get_dictionary_names())
         .collect();
     Ok(cleaners)
 }
 
-#[pymodule]
+/// Compile the built-in patterns now rather than on first use
+#[pyfunction]
+#[pyo3(signature = (ignore_case = None))]
+pub fn precompile_patterns(py: Python<'_>, ignore_case: Option<bool>) {
+    py.allow_threads(|| patterns::precompile(ignore_case));
+}
+
+// Every static is a `LazyLock`, `OnceLock`, `Mutex` or `RwLock`, and the
+// pyclasses are either frozen or guarded by PyO3's borrow checking, so the
+// module is safe to use without the GIL on free-threaded builds
+#[pymodule(gil_used = false)]
 fn _internal(_py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
+    // Classes
+    m.add_class::<PyAllowlist>()?;
+    m.add_class::<PyCancelToken>()?;
+    m.add_class::<PyCleanCache>()?;
+    m.add_class::<PyHeavyHitters>()?;
+    m.add_class::<PyPiiIndex>()?;
+    m.add_class::<PyRowLimits>()?;
+    m.add_class::<PyStreamingCleaner>()?;
+
     // Detection functions
     m.add_function(wrap_pyfunction!(detect_pii, m)?)?;
     m.add_function(wrap_pyfunction!(detect_pii_with_cleaners, m)?)?;
     m.add_function(wrap_pyfunction!(detect_pii_batch, m)?)?;
     m.add_function(wrap_pyfunction!(detect_pii_with_cleaners_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(detect_pii_series, m)?)?;
+    m.add_function(wrap_pyfunction!(detect_pii_arrow, m)?)?;
 
     // Cleaning functions
     m.add_function(wrap_pyfunction!(clean_pii, m)?)?;
     m.add_function(wrap_pyfunction!(clean_pii_with_cleaners, m)?)?;
     m.add_function(wrap_pyfunction!(clean_pii_batch, m)?)?;
     m.add_function(wrap_pyfunction!(clean_pii_with_cleaners_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_pii_series, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_pii_arrow, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_pii_limited_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_and_detect_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_and_detect_limited_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_and_detect_series, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_json, m)?)?;
+    m.add_function(wrap_pyfunction!(clean_json_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(profile_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(profile_series, m)?)?;
+
+    // Dictionary cleaners
+    m.add_function(wrap_pyfunction!(register_dictionary, m)?)?;
+    m.add_function(wrap_pyfunction!(register_dictionary_file, m)?)?;
+    m.add_function(wrap_pyfunction!(save_dictionary, m)?)?;
+    m.add_function(wrap_pyfunction!(load_dictionary, m)?)?;
+    m.add_function(wrap_pyfunction!(remove_dictionary, m)?)?;
+    m.add_function(wrap_pyfunction!(dictionary_to_bytes, m)?)?;
+    m.add_function(wrap_pyfunction!(register_dictionary_bytes, m)?)?;
 
     // Utility functions
     m.add_function(wrap_pyfunction!(get_available_cleaners, m)?)?;
+    m.add_function(wrap_pyfunction!(config_fingerprint, m)?)?;
+    m.add_function(wrap_pyfunction!(precompile_patterns, m)?)?;
 
     Ok(())
 }
@@ -1,11 +1,14 @@
 //! PII regex patterns
 
 use regex::{Regex, RegexBuilder, RegexSet, RegexSetBuilder};
+use std::cell::OnceCell;
 use std::collections::HashMap;
+use std::rc::Rc;
 use std::sync::LazyLock;
 
 pub struct PatternRegistry {
     patterns: HashMap<&'static str, Vec<&'static str>>,
+    priority: Vec<&'static str>,
 }
 
 impl PatternRegistry {
@@ -58,7 +61,22 @@ impl PatternRegistry {
             r"\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b",
         ]);
 
-        Self { patterns }
+        // Default priority for resolving overlapping matches: the most specific
+        // cleaners first, the broad catch-all patterns last
+        let priority = vec![
+            "email",
+            "nino",
+            "telephone",
+            "postcode",
+            "ip_address",
+            "address",
+            "cash-amount",
+            "case-id",
+            "tag",
+        ];
+        debug_assert_eq!(priority.len(), patterns.len());
+
+        Self { patterns, priority }
     }
 
     pub fn get_all_patterns(&self) -> Vec<&'static str> {
@@ -77,6 +95,11 @@ impl PatternRegistry {
     pub fn get_available_cleaners(&self) -> Vec<&'static str> {
         self.patterns.keys().copied().collect()
     }
+
+    /// All cleaner names, highest priority first
+    pub fn get_cleaners_by_priority(&self) -> &[&'static str] {
+        &self.priority
+    }
 }
 
 // Create a static instance
@@ -94,6 +117,91 @@ pub fn get_patterns_by_name(cleaners: &[&str]) -> Vec<&'static str> {
     get_registry().get_patterns_by_name(cleaners)
 }
 
+/// Rewrite a pattern for compilation with Unicode mode disabled
+///
+/// With Unicode disabled `\w`, `\d`, `\s`, `\b` and case folding are ASCII
+/// only, which gives much smaller automata. The constructs that cannot be
+/// compiled that way for `&str` haystacks (`.` and classes with non-ASCII
+/// members, such as `[£€$]`) are wrapped in `(?u:...)`. On pure-ASCII text the
+/// rewritten pattern finds exactly the same matches as the original.
+fn ascii_only(pattern: &str) -> String {
+    let chars: Vec<char> = pattern.chars().collect();
+    let mut out = String::with_capacity(pattern.len() + 16);
+    let mut i = 0;
+
+    while i < chars.len() {
+        match chars[i] {
+            '\\' => {
+                out.extend(&chars[i..(i + 2).min(chars.len())]);
+                i += 2;
+            }
+            '.' => {
+                out.push_str("(?u:.)");
+                i += 1;
+            }
+            '[' => {
+                // Find the closing bracket, allowing for escapes and a leading
+                // `]` or `^]`
+                let mut j = i + 1;
+                if chars.get(j) == Some(&'^') {
+                    j += 1;
+                }
+                if chars.get(j) == Some(&']') {
+                    j += 1;
+                }
+                while j < chars.len() && chars[j] != ']' {
+                    j += if chars[j] == '\\' { 2 } else { 1 };
+                }
+                let end = (j + 1).min(chars.len());
+                let class: String = chars[i..end].iter().collect();
+                if class.is_ascii() {
+                    out.push_str(&class);
+                } else {
+                    out.push_str("(?u:");
+                    out.push_str(&class);
+                    out.push(')');
+                }
+                i = end;
+            }
+            c => {
+                out.push(c);
+                i += 1;
+            }
+        }
+    }
+    out
+}
+
+fn compile_ascii_patterns(ignore_case: bool) -> HashMap<&'static str, Vec<Regex>> {
+    let registry = get_registry();
+    let mut map = HashMap::new();
+
+    for cleaner_name in registry.get_available_cleaners() {
+        let patterns = registry.get_patterns_by_name(&[cleaner_name]);
+        let compiled: Vec<Regex> = patterns
+            .into_iter()
+            .map(|p| {
+                RegexBuilder::new(&ascii_only(p))
+                    .unicode(false)
+                    .case_insensitive(ignore_case)
+                    .build()
+                    .expect("Invalid regex")
+            })
+            .collect();
+        map.insert(cleaner_name, compiled);
+    }
+    map
+}
+
+fn compile_ascii_set(ignore_case: bool) -> RegexSet {
+    let pattern_strings = get_all_patterns().into_iter().map(ascii_only);
+    RegexSetBuilder::new(pattern_strings)
+        .unicode(false)
+        .case_insensitive(ignore_case)
+        .build()
+        .expect("Failed to create ASCII regex set")
+}
+
 pub static PATTERNS_COMPILED_CASE_SENSITIVE: LazyLock<HashMap<&str, Vec<Regex>>> =
     LazyLock::new(|| {
         let registry = get_registry();
@@ -144,6 +252,18 @@ pub static PATTERNS_SET_CASE_INSENSITIVE: LazyLock<RegexSet> = LazyLock::new(||
         .expect("Failed to create case-insensitive regex set")
 });
 
+pub static PATTERNS_COMPILED_ASCII_CASE_SENSITIVE: LazyLock<HashMap<&str, Vec<Regex>>> =
+    LazyLock::new(|| compile_ascii_patterns(false));
+
+pub static PATTERNS_COMPILED_ASCII_CASE_INSENSITIVE: LazyLock<HashMap<&str, Vec<Regex>>> =
+    LazyLock::new(|| compile_ascii_patterns(true));
+
+pub static PATTERNS_SET_ASCII_CASE_SENSITIVE: LazyLock<RegexSet> =
+    LazyLock::new(|| compile_ascii_set(false));
+
+pub static PATTERNS_SET_ASCII_CASE_INSENSITIVE: LazyLock<RegexSet> =
+    LazyLock::new(|| compile_ascii_set(true));
+
 /// Pre-computed replacement strings for semantic redaction
 pub static REPLACEMENT_STRINGS: LazyLock<HashMap<&str, String>> = LazyLock::new(|| {
     let registry = get_registry();
@@ -156,22 +276,88 @@ pub static REPLACEMENT_STRINGS: LazyLock<HashMap<&str, String>> = LazyLock::new(
     map
 });
 
+/// Get the compiled patterns and regex set
+///
+/// `ascii` selects the ASCII-only variants, which are always safe to use on
+/// pure-ASCII text and give ASCII semantics on anything else.
 #[inline]
 pub fn get_patterns(
     ignore_case: bool,
+    ascii: bool,
 ) -> (
     &'static HashMap<&'static str, Vec<Regex>>,
     &'static RegexSet,
 ) {
-    if ignore_case {
-        (
+    match (ignore_case, ascii) {
+        (true, false) => (
             &*PATTERNS_COMPILED_CASE_INSENSITIVE,
             &*PATTERNS_SET_CASE_INSENSITIVE,
-        )
-    } else {
-        (
+        ),
+        (false, false) => (
             &*PATTERNS_COMPILED_CASE_SENSITIVE,
             &*PATTERNS_SET_CASE_SENSITIVE,
-        )
+        ),
+        (true, true) => (
+            &*PATTERNS_COMPILED_ASCII_CASE_INSENSITIVE,
+            &*PATTERNS_SET_ASCII_CASE_INSENSITIVE,
+        ),
+        (false, true) => (
+            &*PATTERNS_COMPILED_ASCII_CASE_SENSITIVE,
+            &*PATTERNS_SET_ASCII_CASE_SENSITIVE,
+        ),
+    }
+}
+
+/// One thread's copies of a variant of the compiled patterns, see
+/// `get_local_patterns`
+pub struct LocalPatterns {
+    pub compiled: HashMap<&'static str, Vec<Regex>>,
+    pub set: RegexSet,
+}
+
+thread_local! {
+    /// Indexed by `ignore_case as usize | (ascii as usize) << 1`
+    static LOCAL_PATTERNS: [OnceCell<Rc<LocalPatterns>>; 4] = const {
+        [OnceCell::new(), OnceCell::new(), OnceCell::new(), OnceCell::new()]
+    };
+}
+
+/// Get this thread's copies of the compiled patterns and regex set
+///
+/// Each search borrows scratch space from a pool owned by the `Regex`. Only
+/// the thread that first used a pool gets it without synchronisation, so on
+/// many cores threads sharing the statics contend for scratch space. A clone
+/// shares the compiled program but has its own pool, so each thread clones
+/// the statics once and then searches without touching shared state.
+#[inline]
+pub fn get_local_patterns(ignore_case: bool, ascii: bool) -> Rc<LocalPatterns> {
+    LOCAL_PATTERNS.with(|cells| {
+        cells[ignore_case as usize | (ascii as usize) << 1]
+            .get_or_init(|| {
+                let (compiled, set) = get_patterns(ignore_case, ascii);
+                Rc::new(LocalPatterns {
+                    compiled: compiled.clone(),
+                    set: set.clone(),
+                })
+            })
+            .clone()
+    })
+}
+
+/// Compile the patterns now rather than on first use
+///
+/// With `ignore_case` set, only the variants for that case mode are compiled.
+/// Compiling before `fork` lets child processes share the parent's compiled
+/// patterns instead of each compiling their own.
+pub fn precompile(ignore_case: Option<bool>) {
+    let modes = match ignore_case {
+        Some(ignore_case) => vec![ignore_case],
+        None => vec![true, false],
+    };
+    for ignore_case in modes {
+        for ascii in [false, true] {
+            get_patterns(ignore_case, ascii);
+        }
     }
+    LazyLock::force(&REPLACEMENT_STRINGS);
 }
@@ -0,0 +1,83 @@
+//! The thread pool that runs batch work, rebuilt after a `fork`
+//!
+//! rayon's global pool isn't fork-safe: a forked child inherits the pool's
+//! state but none of its worker threads, so the first parallel call in the
+//! child waits forever. Batch functions run in this pool instead, which is
+//! tagged with the ID of the process that built it and replaced on first use
+//! in a child process.
+
+use rayon::{ThreadPool, ThreadPoolBuilder};
+use std::sync::{Arc, Mutex, PoisonError};
+
+static POOL: Mutex<Option<(u32, Arc<ThreadPool>)>> = Mutex::new(None);
+
+/// The pool for this process, built on first use
+///
+/// The lock is only held to read or swap the pool, never while it is built:
+/// building spawns threads, and a process forked while another thread holds
+/// the lock would have it locked forever.
+pub fn get_pool() -> Arc<ThreadPool> {
+    let pid = std::process::id();
+    if let Some(pool) = current_pool(pid) {
+        return pool;
+    }
+
+    let new_pool = Arc::new(
+        ThreadPoolBuilder::new()
+            .thread_name(|i| format!("piicleaner-{}", i))
+            .build()
+            .expect("Failed to build thread pool"),
+    );
+    let mut pool = POOL.lock().unwrap_or_else(PoisonError::into_inner);
+    match pool.take() {
+        // Another thread installed one while this one was building: use it,
+        // and drop the spare, whose threads belong to this process
+        Some((owner, installed)) if owner == pid => {
+            *pool = Some((owner, installed.clone()));
+            return installed;
+        }
+        // The inherited pool's threads only exist in the parent, so shutting
+        // it down here could block: leak it instead
+        Some((_, inherited)) => std::mem::forget(inherited),
+        None => {}
+    }
+    *pool = Some((pid, new_pool.clone()));
+    new_pool
+}
+
+/// The pool, if the process with ID `pid` built it
+fn current_pool(pid: u32) -> Option<Arc<ThreadPool>> {
+    match &*POOL.lock().unwrap_or_else(PoisonError::into_inner) {
+        Some((owner, pool)) if *owner == pid => Some(pool.clone()),
+        _ => None,
+    }
+}
+
+/// Run `op` in this process's pool, so rayon parallel iterators inside it
+/// use the pool's threads
+///
+/// Calls already on a rayon worker, such as from inside another batch or a
+/// caller's own pool, run `op` in place in that pool.
+pub fn install<R: Send>(op: impl FnOnce() -> R + Send) -> R {
+    if rayon::current_thread_index().is_some() {
+        return op();
+    }
+    get_pool().install(op)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_pool_is_reused_in_process() {
+        let pool = get_pool();
+        assert!(Arc::ptr_eq(&pool, &get_pool()));
+        assert_eq!(install(|| 1 + 1), 2);
+
+        // A pool built by another process is replaced
+        POOL.lock().unwrap().as_mut().unwrap().0 = std::process::id().wrapping_add(1);
+        assert!(!Arc::ptr_eq(&pool, &get_pool()));
+        assert!(Arc::ptr_eq(&get_pool(), &get_pool()));
+    }
+}
@@ -0,0 +1,449 @@
+//! Profiles of which PII types appear in which columns of a table, and how
+//! often
+//!
+//! All the columns are scanned together: each round takes the next block of
+//! rows from every column still being profiled and detects PII in them in one
+//! parallel batch. With sampling, rows are visited in a random order fixed by
+//! a seed, so a column can stop early once its hit rates are known closely
+//! enough. Only the rows a round needs are read, so sampling a few rows of a
+//! long column costs little more than the rows themselves.
+
+use crate::allowlist::Allowlist;
+use crate::core::{self, Overlap};
+use std::borrow::Cow;
+use std::collections::HashMap;
+use std::convert::Infallible;
+
+/// Rows taken from each column in a round
+const BLOCK_ROWS: usize = 1 << 14;
+
+/// z-score for the 95% confidence intervals used by `tolerance`
+const Z_95: f64 = 1.96;
+
+/// Which rows of each column to scan
+#[derive(Clone, Copy, Debug, Default)]
+pub struct Sample {
+    /// Most rows scanned per column, drawn at random without replacement
+    pub size: Option<usize>,
+    /// Stop a column once the 95% confidence interval of every hit rate is
+    /// within this distance of the estimate
+    pub tolerance: Option<f64>,
+    /// Seed for the order in which sampled rows are visited
+    pub seed: u64,
+}
+
+impl Sample {
+    /// Whether rows are visited in a random order rather than from the top
+    fn is_random(&self) -> bool {
+        self.size.is_some() || self.tolerance.is_some()
+    }
+}
+
+/// How often one PII type was found in a column
+#[derive(Clone, Debug, PartialEq)]
+pub struct TypeCounts<'c> {
+    pub cleaner: &'c str,
+    /// Rows with at least one match
+    pub rows: u64,
+    pub matches: u64,
+}
+
+#[derive(Clone, Debug, PartialEq)]
+pub struct ColumnProfile<'c> {
+    pub rows_scanned: u64,
+    /// Counts for each type found, most rows first
+    pub types: Vec<TypeCounts<'c>>,
+}
+
+/// The progress of one column through the profile
+struct ColumnState<'c> {
+    /// Draws the rows to scan when sampling, otherwise rows are scanned in
+    /// order
+    shuffle: Option<Shuffle>,
+    limit: usize,
+    scanned: usize,
+    types: Vec<TypeCounts<'c>>,
+    done: bool,
+}
+
+impl<'c> ColumnState<'c> {
+    fn new(n_rows: usize, sample: Sample, column: usize) -> Self {
+        let limit = sample.size.map_or(n_rows, |size| size.min(n_rows));
+        let shuffle = sample.is_random().then(|| {
+            // Each column gets its own stream, so adding a column doesn't
+            // change the rows sampled from the others
+            Shuffle::new(
+                n_rows,
+                SplitMix64(sample.seed ^ (column as u64).wrapping_mul(GOLDEN_GAMMA)),
+            )
+        });
+        ColumnState {
+            shuffle,
+            limit,
+            scanned: 0,
+            types: Vec::new(),
+            done: limit == 0,
+        }
+    }
+
+    /// The next `count` rows to scan
+    fn next_rows(&mut self, count: usize) -> Vec<usize> {
+        match &mut self.shuffle {
+            Some(shuffle) => (0..count).map(|_| shuffle.next_row()).collect(),
+            None => (self.scanned..self.scanned + count).collect(),
+        }
+    }
+
+    fn count(&mut self, spans: &[core::Span<'c>]) {
+        let mut seen: Vec<&str> = Vec::new();
+        for span in spans {
+            let index = match self
+                .types
+                .iter()
+                .position(|counts| counts.cleaner == span.cleaner)
+            {
+                Some(index) => index,
+                None => {
+                    self.types.push(TypeCounts {
+                        cleaner: span.cleaner,
+                        rows: 0,
+                        matches: 0,
+                    });
+                    self.types.len() - 1
+                }
+            };
+            self.types[index].matches += 1;
+            if !seen.contains(&span.cleaner) {
+                seen.push(span.cleaner);
+                self.types[index].rows += 1;
+            }
+        }
+    }
+
+    /// Whether every hit rate, including those of types not yet seen, is
+    /// known to within `tolerance`
+    fn is_precise(&self, tolerance: f64) -> bool {
+        let n = self.scanned as f64;
+        std::iter::once(0)
+            .chain(self.types.iter().map(|counts| counts.rows))
+            .all(|rows| wilson_half_width(rows as f64 / n, n) <= tolerance)
+    }
+}
+
+/// Half the width of the 95% Wilson score interval for a proportion `p`
+/// observed in `n` trials, which unlike the normal interval isn't zero when
+/// `p` is zero
+fn wilson_half_width(p: f64, n: f64) -> f64 {
+    let z2 = Z_95 * Z_95;
+    Z_95 / (1.0 + z2 / n) * (p * (1.0 - p) / n + z2 / (4.0 * n * n)).sqrt()
+}
+
+const GOLDEN_GAMMA: u64 = 0x9e37_79b9_7f4a_7c15;
+
+/// Small seeded generator for sampling, see Steele et al. (2014)
+struct SplitMix64(u64);
+
+impl SplitMix64 {
+    fn next_u64(&mut self) -> u64 {
+        self.0 = self.0.wrapping_add(GOLDEN_GAMMA);
+        let mut z = self.0;
+        z = (z ^ (z >> 30)).wrapping_mul(0xbf58_476d_1ce4_e5b9);
+        z = (z ^ (z >> 27)).wrapping_mul(0x94d0_49bb_1331_11eb);
+        z ^ (z >> 31)
+    }
+
+    /// A number in `0..bound`
+    fn below(&mut self, bound: usize) -> usize {
+        ((self.next_u64() as u128 * bound as u128) >> 64) as usize
+    }
+}
+
+/// The rows of `0..n` in a random order, drawn one at a time
+///
+/// A Fisher–Yates shuffle that stores only the positions it has swapped
+/// rather than the whole permutation, so drawing `k` rows takes O(k) time and
+/// memory however large `n` is.
+struct Shuffle {
+    n: usize,
+    drawn: usize,
+    swapped: HashMap<usize, usize>,
+    rng: SplitMix64,
+}
+
+impl Shuffle {
+    fn new(n: usize, rng: SplitMix64) -> Self {
+        Shuffle {
+            n,
+            drawn: 0,
+            swapped: HashMap::new(),
+            rng,
+        }
+    }
+
+    /// The next row; at most `n` can be drawn
+    fn next_row(&mut self) -> usize {
+        let i = self.drawn;
+        let j = i + self.rng.below(self.n - i);
+        let row = self.swapped.get(&j).copied().unwrap_or(j);
+        // Position `i` is never drawn again, so its entry can go
+        let displaced = self.swapped.remove(&i).unwrap_or(i);
+        if j != i {
+            self.swapped.insert(j, displaced);
+        }
+        self.drawn += 1;
+        row
+    }
+}
+
+/// Count the rows and matches of each PII type in each of `columns`
+#[allow(clippy::too_many_arguments)]
+pub fn profile_columns<'c, T: AsRef<str> + Sync>(
+    columns: &[Vec<T>],
+    cleaners: &[&'c str],
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    sample: Sample,
+) -> Vec<ColumnProfile<'c>> {
+    let n_rows: Vec<usize> = columns.iter().map(Vec::len).collect();
+    let gathered = profile_gathered(
+        &n_rows,
+        |column, rows| {
+            Ok::<_, Infallible>(
+                rows.iter()
+                    .map(|&row| Cow::Borrowed(columns[column][row].as_ref()))
+                    .collect(),
+            )
+        },
+        cleaners,
+        ignore_case,
+        overlap,
+        ascii_only,
+        allowlist,
+        sample,
+    );
+    match gathered {
+        Ok(profiles) => profiles,
+        Err(never) => match never {},
+    }
+}
+
+/// `profile_columns` for columns of `n_rows` rows that are read with
+/// `gather(column, rows)`, which gives the texts of those rows of a column
+///
+/// Only the rows to be scanned are gathered, a block at a time.
+#[allow(clippy::too_many_arguments)]
+pub fn profile_gathered<'t, 'c, E>(
+    n_rows: &[usize],
+    gather: impl Fn(usize, &[usize]) -> Result<Vec<Cow<'t, str>>, E>,
+    cleaners: &[&'c str],
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    sample: Sample,
+) -> Result<Vec<ColumnProfile<'c>>, E> {
+    let mut states: Vec<ColumnState> = n_rows
+        .iter()
+        .enumerate()
+        .map(|(i, &n)| ColumnState::new(n, sample, i))
+        .collect();
+
+    while states.iter().any(|state| !state.done) {
+        let mut batch: Vec<Cow<str>> = Vec::new();
+        let mut blocks = Vec::new();
+        for (i, state) in states
+            .iter_mut()
+            .enumerate()
+            .filter(|(_, state)| !state.done)
+        {
+            let len = BLOCK_ROWS.min(state.limit - state.scanned);
+            batch.extend(gather(i, &state.next_rows(len))?);
+            blocks.push((i, len));
+        }
+
+        let spans = core::detect_spans_batch_core(
+            &batch,
+            cleaners,
+            ignore_case,
+            overlap,
+            ascii_only,
+            allowlist,
+        );
+        let mut spans = spans.iter();
+        for (i, len) in blocks {
+            let state = &mut states[i];
+            for row_spans in spans.by_ref().take(len) {
+                state.count(row_spans);
+            }
+            state.scanned += len;
+            state.done = state.scanned == state.limit
+                || sample
+                    .tolerance
+                    .is_some_and(|tolerance| state.is_precise(tolerance));
+        }
+    }
+
+    Ok(states
+        .into_iter()
+        .map(|mut state| {
+            state
+                .types
+                .sort_by(|a, b| (b.rows, b.matches).cmp(&(a.rows, a.matches)));
+            ColumnProfile {
+                rows_scanned: state.scanned as u64,
+                types: state.types,
+            }
+        })
+        .collect())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_profile_counts_rows_and_matches() {
+        let columns = vec![
+            vec![
+                "a@example.com and b@example.com",
+                "",
+                "NINO AB123456C, c@example.com",
+            ],
+            vec!["nothing", "here"],
+        ];
+        let profiles = profile_columns(
+            &columns,
+            &["all"],
+            true,
+            Overlap::All,
+            false,
+            None,
+            Sample::default(),
+        );
+        assert_eq!(profiles[0].rows_scanned, 3);
+        assert_eq!(
+            profiles[0].types[0],
+            TypeCounts {
+                cleaner: "email",
+                rows: 2,
+                matches: 3,
+            }
+        );
+        assert!(profiles[0]
+            .types
+            .iter()
+            .any(|counts| counts.cleaner == "nino" && counts.rows == 1));
+        assert_eq!(
+            profiles[1],
+            ColumnProfile {
+                rows_scanned: 2,
+                types: vec![],
+            }
+        );
+    }
+
+    #[test]
+    fn test_profile_sampling() {
+        let column: Vec<String> = (0..50_000)
+            .map(|i| {
+                if i % 4 == 0 {
+                    format!("user{}@example.com", i)
+                } else {
+                    "no pii".to_string()
+                }
+            })
+            .collect();
+        let columns = vec![column];
+        let profile = |sample| {
+            profile_columns(
+                &columns,
+                &["email"],
+                true,
+                Overlap::All,
+                false,
+                None,
+                sample,
+            )
+        };
+
+        let sampled = profile(Sample {
+            size: Some(1000),
+            tolerance: None,
+            seed: 1,
+        });
+        assert_eq!(sampled[0].rows_scanned, 1000);
+        let rate = sampled[0].types[0].rows as f64 / 1000.0;
+        assert!((rate - 0.25).abs() < 0.05);
+        // The same seed gives the same sample
+        assert_eq!(
+            sampled,
+            profile(Sample {
+                size: Some(1000),
+                tolerance: None,
+                seed: 1,
+            })
+        );
+
+        // A loose tolerance is met after the first block
+        let early = profile(Sample {
+            size: None,
+            tolerance: Some(0.01),
+            seed: 1,
+        });
+        assert_eq!(early[0].rows_scanned, BLOCK_ROWS as u64);
+        let full = profile(Sample::default());
+        assert_eq!(full[0].rows_scanned, 50_000);
+        assert_eq!(full[0].types[0].rows, 12_500);
+    }
+
+    #[test]
+    fn test_shuffle_is_a_sample() {
+        let mut shuffle = Shuffle::new(100, SplitMix64(7));
+        let mut rows: Vec<usize> = (0..100).map(|_| shuffle.next_row()).collect();
+        rows.sort_unstable();
+        assert_eq!(rows, (0..100).collect::<Vec<_>>());
+
+        // The same draws as a shuffle of the whole permutation, while storing
+        // no more than the rows drawn
+        let mut dense: Vec<usize> = (0..1_000_000).collect();
+        let mut rng = SplitMix64(7);
+        let mut shuffle = Shuffle::new(dense.len(), SplitMix64(7));
+        for i in 0..1000 {
+            let j = i + rng.below(dense.len() - i);
+            dense.swap(i, j);
+            assert_eq!(shuffle.next_row(), dense[i]);
+        }
+        assert!(shuffle.swapped.len() <= 1000);
+    }
+
+    #[test]
+    fn test_profile_gathers_only_sampled_rows() {
+        let gathered = std::cell::Cell::new(0);
+        let profiles = profile_gathered(
+            &[1_000_000],
+            |_, rows| {
+                gathered.set(gathered.get() + rows.len());
+                Ok::<_, Infallible>(
+                    rows.iter()
+                        .map(|_| Cow::Borrowed("a@example.com"))
+                        .collect(),
+                )
+            },
+            &["email"],
+            true,
+            Overlap::All,
+            false,
+            None,
+            Sample {
+                size: Some(100),
+                tolerance: None,
+                seed: 3,
+            },
+        )
+        .unwrap();
+        assert_eq!(gathered.get(), 100);
+        assert_eq!(profiles[0].types[0].rows, 100);
+    }
+}
@@ -0,0 +1,477 @@
+//! PII detection and cleaning on native Polars columns
+
+use crate::allowlist::Allowlist;
+use crate::cache::CleanCache;
+use crate::core::{self, Cleaning, Overlap, RowLimits};
+use polars::prelude::*;
+use std::cell::RefCell;
+use std::num::TryFromIntError;
+
+/// Message of the error for match offsets too large for the `UInt32` start
+/// and end fields
+pub const OFFSET_OVERFLOW: &str = "Match offsets are too large for UInt32";
+
+/// Detect PII in a string column and build the results as a Polars column
+///
+/// Each row becomes a list of `{start: UInt32, end: UInt32, text: String,
+/// type: Categorical}` structs. The match fields are built once as flat
+/// columns for the whole batch and each row's list is a slice of them, so no
+/// per-match objects are created. Null rows give a null list, or an empty list
+/// when `null_as_empty` is set.
+#[allow(clippy::too_many_arguments)]
+pub fn detect_pii_series(
+    name: PlSmallStr,
+    texts: &StringChunked,
+    cleaners: &[&str],
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    null_as_empty: bool,
+) -> PolarsResult<Series> {
+    let rows: Vec<Option<&str>> = texts.iter().collect();
+    let spans = core::detect_spans_batch_core(
+        &rows.iter().map(|row| row.unwrap_or("")).collect::<Vec<_>>(),
+        cleaners,
+        ignore_case,
+        overlap,
+        ascii_only,
+        allowlist,
+    );
+    spans_to_series(name, &rows, &spans, null_as_empty)
+}
+
+/// Clean a string column and build a column of the spans that were cleaned,
+/// scanning each row once
+///
+/// The cleaned column keeps the name and nulls of `texts`. The spans column
+/// is named `detected_name` and built as in `detect_pii_series`, with the
+/// spans resolved as for cleaning (see `core::clean_and_detect_batch_core`).
+/// With `limits`, a row that hits one is cleaned to the fallback and has no
+/// spans.
+#[allow(clippy::too_many_arguments)]
+pub fn clean_and_detect_series(
+    texts: &StringChunked,
+    detected_name: PlSmallStr,
+    cleaners: &[&str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    limits: Option<&RowLimits>,
+    null_as_empty: bool,
+) -> PolarsResult<(Series, Series)> {
+    let rows: Vec<Option<&str>> = texts.iter().collect();
+    let values: Vec<&str> = rows.iter().map(|row| row.unwrap_or("")).collect();
+    let results = match limits {
+        Some(limits) => core::clean_and_detect_limited_batch_core(
+            &values,
+            cleaners,
+            cleaning,
+            ignore_case,
+            replace_string,
+            overlap,
+            ascii_only,
+            allowlist,
+            limits,
+        )
+        .into_iter()
+        .map(|(cleaned, spans, _)| (cleaned, spans))
+        .collect(),
+        None => core::clean_and_detect_batch_core(
+            &values,
+            cleaners,
+            cleaning,
+            ignore_case,
+            replace_string,
+            overlap,
+            ascii_only,
+            allowlist,
+        ),
+    };
+
+    let mut spans = Vec::with_capacity(rows.len());
+    let cleaned: StringChunked = rows
+        .iter()
+        .zip(results)
+        .map(|(row, (cleaned, row_spans))| {
+            spans.push(row_spans);
+            row.map(|_| cleaned)
+        })
+        .collect();
+    let cleaned = cleaned.with_name(texts.name().clone()).into_series();
+    Ok((
+        cleaned,
+        spans_to_series(detected_name, &rows, &spans, null_as_empty)?,
+    ))
+}
+
+/// Build a list-of-struct column from each row's spans, see
+/// `detect_pii_series`
+///
+/// Fails with `OFFSET_OVERFLOW` rather than wrap an offset past `u32::MAX`.
+fn spans_to_series(
+    name: PlSmallStr,
+    rows: &[Option<&str>],
+    spans: &[Vec<core::Span>],
+    null_as_empty: bool,
+) -> PolarsResult<Series> {
+    let n_matches = spans.iter().map(Vec::len).sum();
+    let mut starts = Vec::with_capacity(n_matches);
+    let mut ends = Vec::with_capacity(n_matches);
+    let mut values = Vec::with_capacity(n_matches);
+    let mut types = Vec::with_capacity(n_matches);
+    let overflow = |_: TryFromIntError| PolarsError::ComputeError(OFFSET_OVERFLOW.into());
+    for (row, row_spans) in rows.iter().zip(spans) {
+        let text = row.unwrap_or("");
+        for span in row_spans {
+            starts.push(u32::try_from(span.start).map_err(overflow)?);
+            ends.push(u32::try_from(span.end).map_err(overflow)?);
+            values.push(&text[span.start..span.end]);
+            types.push(span.cleaner);
+        }
+    }
+
+    let fields = [
+        Series::new(PlSmallStr::from_static("start"), starts),
+        Series::new(PlSmallStr::from_static("end"), ends),
+        Series::new(PlSmallStr::from_static("text"), values),
+        Series::new(PlSmallStr::from_static("type"), types)
+            .cast(&DataType::Categorical(None, CategoricalOrdering::Physical))?,
+    ];
+    let matches =
+        StructChunked::from_series(PlSmallStr::EMPTY, n_matches, fields.iter())?.into_series();
+
+    let mut builder =
+        AnonymousOwnedListBuilder::new(name, rows.len(), Some(matches.dtype().clone()));
+    let mut offset = 0;
+    for (row, row_spans) in rows.iter().zip(spans) {
+        if row.is_none() && !null_as_empty {
+            builder.append_null();
+        } else {
+            builder.append_series(&matches.slice(offset as i64, row_spans.len()))?;
+        }
+        offset += row_spans.len();
+    }
+    Ok(builder.finish().into_series())
+}
+
+/// Clean PII in the strings of a column, including strings nested inside
+/// `List` and `Struct` columns
+///
+/// The string leaves of the column are gathered into one batch and cleaned in
+/// a single parallel pass, then the column is rebuilt around the cleaned
+/// strings with its original offsets, field names and validity. Values of
+/// other types, at any depth, are kept as they are. With `limits`, a string
+/// that hits one is cleaned to the fallback, and the cache isn't used.
+#[allow(clippy::too_many_arguments)]
+pub fn clean_pii_series(
+    series: &Series,
+    cleaners: &[&str],
+    cleaning: Cleaning,
+    ignore_case: bool,
+    replace_string: Option<&str>,
+    overlap: Overlap,
+    ascii_only: bool,
+    allowlist: Option<&Allowlist>,
+    cache: Option<&CleanCache>,
+    limits: Option<&RowLimits>,
+) -> PolarsResult<Series> {
+    let mut leaves = Vec::new();
+    collect_string_leaves(series, &mut leaves)?;
+    if leaves.is_empty() {
+        return Ok(series.clone());
+    }
+
+    let texts: Vec<&str> = leaves
+        .iter()
+        .flat_map(|leaf| leaf.iter().flatten())
+        .collect();
+    let cleaned: Vec<_> = match (limits, cache) {
+        (Some(limits), _) => core::clean_pii_limited_batch_core(
+            &texts,
+            cleaners,
+            cleaning,
+            ignore_case,
+            replace_string,
+            overlap,
+            ascii_only,
+            allowlist,
+            limits,
+        )
+        .into_iter()
+        .map(|(cleaned, _)| cleaned)
+        .collect(),
+        (None, Some(cache)) => cache.clean_batch(
+            &texts,
+            cleaners,
+            cleaning,
+            ignore_case,
+            replace_string,
+            overlap,
+            ascii_only,
+            allowlist,
+        ),
+        (None, None) => core::clean_pii_with_cleaners_batch_core(
+            &texts,
+            cleaners,
+            cleaning,
+            ignore_case,
+            replace_string,
+            overlap,
+            ascii_only,
+            allowlist,
+        ),
+    };
+
+    let mut cleaned = cleaned.into_iter();
+    let cleaned_leaves: Vec<Series> = leaves
+        .iter()
+        .map(|leaf| {
+            leaf.iter()
+                .map(|text| text.map(|_| cleaned.next().expect("one result per string")))
+                .collect::<StringChunked>()
+                .with_name(leaf.name().clone())
+                .into_series()
+        })
+        .collect();
+    rebuild_with_leaves(series, &mut cleaned_leaves.into_iter())
+}
+
+/// Collect the string leaves of a column, depth first
+fn collect_string_leaves(series: &Series, leaves: &mut Vec<StringChunked>) -> PolarsResult<()> {
+    match series.dtype() {
+        DataType::String => leaves.push(series.str()?.clone()),
+        DataType::List(_) => collect_string_leaves(&series.list()?.get_inner(), leaves)?,
+        DataType::Struct(_) => {
+            for field in series.struct_()?.fields_as_series() {
+                collect_string_leaves(&field, leaves)?;
+            }
+        }
+        _ => {}
+    }
+    Ok(())
+}
+
+/// Rebuild a column with its string leaves swapped for `leaves`, in the order
+/// `collect_string_leaves` found them
+fn rebuild_with_leaves(
+    series: &Series,
+    leaves: &mut std::vec::IntoIter<Series>,
+) -> PolarsResult<Series> {
+    match series.dtype() {
+        DataType::String => Ok(leaves.next().expect("one series per string leaf")),
+        DataType::List(_) => {
+            let leaves = RefCell::new(leaves);
+            let list = series
+                .list()?
+                .apply_to_inner(&|inner| rebuild_with_leaves(&inner, &mut leaves.borrow_mut()))?;
+            Ok(list.into_series())
+        }
+        DataType::Struct(_) => Ok(series
+            .struct_()?
+            .try_apply_fields(|field| rebuild_with_leaves(field, leaves))?
+            .into_series()),
+        _ => Ok(series.clone()),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn sample_texts() -> Series {
+        Series::new(
+            PlSmallStr::from_static("text"),
+            &[
+                Some("Email test@example.com or AB123456C"),
+                None,
+                Some("No PII here"),
+            ],
+        )
+    }
+
+    #[test]
+    fn test_detect_pii_series() {
+        let texts = sample_texts();
+        let detected = detect_pii_series(
+            PlSmallStr::from_static("detected"),
+            texts.str().unwrap(),
+            &["email", "nino"],
+            true,
+            Overlap::All,
+            false,
+            None,
+            false,
+        )
+        .unwrap();
+
+        assert_eq!(detected.name().as_str(), "detected");
+        assert_eq!(detected.len(), 3);
+        assert_eq!(detected.null_count(), 1);
+
+        let lists = detected.list().unwrap();
+        let first = lists.get_as_series(0).unwrap();
+        let first = first.struct_().unwrap();
+        assert_eq!(first.len(), 2);
+
+        let starts = first.field_by_name("start").unwrap();
+        assert_eq!(starts.dtype(), &DataType::UInt32);
+        assert_eq!(starts.u32().unwrap().get(0), Some(6));
+        let matched = first.field_by_name("text").unwrap();
+        assert_eq!(matched.str().unwrap().get(0), Some("test@example.com"));
+        let types = first.field_by_name("type").unwrap();
+        assert!(matches!(types.dtype(), DataType::Categorical(..)));
+        let types = types.cast(&DataType::String).unwrap();
+        assert_eq!(types.str().unwrap().get(1), Some("nino"));
+
+        assert_eq!(lists.get_as_series(2).unwrap().len(), 0);
+    }
+
+    #[test]
+    fn test_detect_pii_series_null_as_empty() {
+        let texts = sample_texts();
+        let detected = detect_pii_series(
+            PlSmallStr::from_static("detected"),
+            texts.str().unwrap(),
+            &["all"],
+            true,
+            Overlap::All,
+            false,
+            None,
+            true,
+        )
+        .unwrap();
+
+        assert_eq!(detected.null_count(), 0);
+        assert_eq!(detected.list().unwrap().get_as_series(1).unwrap().len(), 0);
+    }
+
+    #[test]
+    fn test_clean_and_detect_series() {
+        let texts = sample_texts();
+        let (cleaned, detected) = clean_and_detect_series(
+            texts.str().unwrap(),
+            PlSmallStr::from_static("detected"),
+            &["email", "nino"],
+            Cleaning::Redact,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+            None,
+            true,
+        )
+        .unwrap();
+
+        assert_eq!(cleaned.name().as_str(), "text");
+        let cleaned = cleaned.str().unwrap();
+        assert_eq!(
+            cleaned.get(0),
+            Some("Email [email-redacted] or [nino-redacted]")
+        );
+        assert_eq!(cleaned.get(1), None);
+        assert_eq!(cleaned.get(2), Some("No PII here"));
+
+        assert_eq!(detected.name().as_str(), "detected");
+        assert_eq!(detected.null_count(), 0);
+        let lists = detected.list().unwrap();
+        assert_eq!(lists.get_as_series(0).unwrap().len(), 2);
+        assert_eq!(lists.get_as_series(2).unwrap().len(), 0);
+
+        // A row that hits a limit is replaced and reports no spans
+        let limits = RowLimits {
+            max_bytes: None,
+            max_matches: Some(1),
+            time_budget: None,
+            fallback: core::Fallback::Replace,
+        };
+        let (cleaned, detected) = clean_and_detect_series(
+            texts.str().unwrap(),
+            PlSmallStr::from_static("detected"),
+            &["email", "nino"],
+            Cleaning::Redact,
+            true,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+            Some(&limits),
+            true,
+        )
+        .unwrap();
+        assert_eq!(
+            cleaned.str().unwrap().get(0),
+            Some("[PII detected, text redacted]")
+        );
+        assert_eq!(detected.list().unwrap().get_as_series(0).unwrap().len(), 0);
+    }
+
+    #[test]
+    fn test_clean_pii_series_nested() {
+        let tags = Series::new(
+            PlSmallStr::from_static("tags"),
+            [
+                Some(Series::new(
+                    PlSmallStr::EMPTY,
+                    &[Some("jane@example.com"), None, Some("urgent")],
+                )),
+                None,
+                Some(Series::new(PlSmallStr::EMPTY, &[Some("AB123456C")])),
+            ],
+        );
+        let ids = Series::new(PlSmallStr::from_static("id"), &[1i64, 2, 3]);
+        let notes = Series::new(
+            PlSmallStr::from_static("note"),
+            &[Some("No PII here"), Some("Call 07700 900123"), None],
+        );
+        let record = StructChunked::from_series(
+            PlSmallStr::from_static("record"),
+            3,
+            [ids.clone(), tags.clone(), notes].iter(),
+        )
+        .unwrap()
+        .into_series();
+
+        let clean = |series: &Series| {
+            clean_pii_series(
+                series,
+                &["all"],
+                Cleaning::Redact,
+                true,
+                None,
+                Overlap::Longest,
+                false,
+                None,
+                None,
+                None,
+            )
+            .unwrap()
+        };
+
+        let cleaned = clean(&tags);
+        assert_eq!(cleaned.dtype(), tags.dtype());
+        assert_eq!(cleaned.null_count(), 1);
+        let first = cleaned.list().unwrap().get_as_series(0).unwrap();
+        let first: Vec<Option<&str>> = first.str().unwrap().iter().collect();
+        assert_eq!(first, vec![Some("[email-redacted]"), None, Some("urgent")]);
+
+        let cleaned = clean(&record);
+        assert_eq!(cleaned.dtype(), record.dtype());
+        let fields = cleaned.struct_().unwrap().fields_as_series();
+        assert!(fields[0].equals(&ids));
+        let note: Vec<Option<&str>> = fields[2].str().unwrap().iter().collect();
+        assert_eq!(
+            note,
+            vec![Some("No PII here"), Some("Call [telephone-redacted]"), None]
+        );
+        let last = fields[1].list().unwrap().get_as_series(2).unwrap();
+        assert_eq!(last.str().unwrap().get(0), Some("[nino-redacted]"));
+
+        // Columns without strings come back unchanged
+        assert!(clean(&ids).equals(&ids));
+    }
+}
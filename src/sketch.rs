@@ -0,0 +1,656 @@
+//! Most frequent PII values of each type, counted in fixed memory
+//!
+//! Every detected value is counted in a Count-Min sketch, a `depth` by
+//! `width` table of counters where each value adds one to a counter in every
+//! row and its count is estimated as the smallest of those counters.
+//! Estimates never undercount, and overcount by at most `e / width` times
+//! the number of matches counted with probability `1 - exp(-depth)`. The `k`
+//! values of each type with the highest estimates are kept as heavy hitters.
+//!
+//! Values are counted by their normalised form, as in `index`, and kept
+//! either as first seen or only as their hash. As in `index`, that hash is
+//! unkeyed, so a hashed value can be recovered by hashing candidate values
+//! until one matches; keeping only hashes hides values from casual view but
+//! doesn't anonymise them. Sketches of the same size can be merged, so
+//! batches counted separately, in other processes or on other machines,
+//! combine into one.
+
+use crate::allowlist::Allowlist;
+use crate::core::{self, Overlap};
+use crate::index::value_hash;
+use siphasher::sip::SipHasher24;
+use std::collections::HashMap;
+use std::hash::Hasher;
+use std::io::{self, Read, Write};
+
+/// First bytes of a serialised sketch, including the format version
+const MAGIC: &[u8; 8] = b"PIIHHSK2";
+/// First bytes of a sketch serialised before allowlists were stored
+const MAGIC_V1: &[u8; 8] = b"PIIHHSK1";
+
+const FLAG_IGNORE_CASE: u8 = 1;
+const FLAG_ASCII_ONLY: u8 = 2;
+const FLAG_HASH_VALUES: u8 = 4;
+const FLAG_ALLOWLIST: u8 = 8;
+const FLAG_NORMALISE_ALLOWLIST: u8 = 16;
+
+/// A heavy hitter candidate, keyed by the hash of its normalised value
+#[derive(Clone, Debug, PartialEq)]
+struct Candidate {
+    /// The value as first seen, unless only hashes are kept
+    value: Option<String>,
+    count: u64,
+}
+
+/// The values of one PII type with the highest estimated counts
+#[derive(Clone, Debug, Default)]
+struct TopK {
+    candidates: HashMap<u64, Candidate>,
+    /// No higher than the lowest candidate count, so values estimated at or
+    /// below it can be skipped without a scan
+    floor: u64,
+}
+
+impl TopK {
+    fn offer(&mut self, k: usize, hash: u64, value: &str, count: u64, keep_value: bool) {
+        if let Some(candidate) = self.candidates.get_mut(&hash) {
+            candidate.count = candidate.count.max(count);
+            return;
+        }
+        if self.candidates.len() >= k {
+            if count <= self.floor {
+                return;
+            }
+            let (&lowest, candidate) = self
+                .candidates
+                .iter()
+                .min_by_key(|(_, candidate)| candidate.count)
+                .expect("k is positive");
+            if count <= candidate.count {
+                self.floor = candidate.count;
+                return;
+            }
+            self.candidates.remove(&lowest);
+        }
+        self.candidates.insert(
+            hash,
+            Candidate {
+                value: keep_value.then(|| value.to_string()),
+                count,
+            },
+        );
+        if self.candidates.len() >= k {
+            self.floor = self
+                .candidates
+                .values()
+                .map(|candidate| candidate.count)
+                .min()
+                .unwrap_or(0);
+        }
+    }
+}
+
+/// A heavy hitter: its PII type, the value or its hash, and its estimated
+/// count
+#[derive(Clone, Debug, PartialEq)]
+pub struct HeavyHitter {
+    pub pii_type: String,
+    pub value: Option<String>,
+    pub hash: u64,
+    pub count: u64,
+}
+
+#[derive(Clone, Debug)]
+pub struct HeavyHitters {
+    cleaners: Vec<String>,
+    ignore_case: bool,
+    ascii_only: bool,
+    /// Values never counted
+    allowlist: Option<Allowlist>,
+    hash_values: bool,
+    k: usize,
+    width: usize,
+    depth: usize,
+    /// `depth` rows of `width` counters
+    counters: Vec<u64>,
+    /// Matches counted so far
+    n_matches: u64,
+    /// Candidates for each PII type, in order of first match
+    types: Vec<(String, TopK)>,
+}
+
+/// Hash identifying a PII type, mixed into value hashes so the same value
+/// found as two types is counted separately
+fn type_hash(pii_type: &str) -> u64 {
+    let mut hasher = SipHasher24::new();
+    hasher.write(pii_type.as_bytes());
+    hasher.finish()
+}
+
+/// Column of the counter for `key` in row `row`, from the SplitMix64
+/// finaliser of the key and row
+fn column(key: u64, row: usize, width: usize) -> usize {
+    let mut z = key.wrapping_add((row as u64 + 1).wrapping_mul(0x9e37_79b9_7f4a_7c15));
+    z = (z ^ (z >> 30)).wrapping_mul(0xbf58_476d_1ce4_e5b9);
+    z = (z ^ (z >> 27)).wrapping_mul(0x94d0_49bb_1331_11eb);
+    z ^= z >> 31;
+    ((z as u128 * width as u128) >> 64) as usize
+}
+
+impl HeavyHitters {
+    /// An empty sketch keeping the top `k` values of each type, with
+    /// estimates within `epsilon` times the matches counted with
+    /// probability `1 - delta`, leaving out values in `allowlist`
+    #[allow(clippy::too_many_arguments)]
+    pub fn new(
+        cleaners: Vec<String>,
+        k: usize,
+        epsilon: f64,
+        delta: f64,
+        hash_values: bool,
+        ignore_case: bool,
+        ascii_only: bool,
+        allowlist: Option<Allowlist>,
+    ) -> Self {
+        let width = (std::f64::consts::E / epsilon).ceil() as usize;
+        let depth = (1.0 / delta).ln().ceil().max(1.0) as usize;
+        HeavyHitters {
+            cleaners,
+            ignore_case,
+            ascii_only,
+            allowlist,
+            hash_values,
+            k,
+            width,
+            depth,
+            counters: vec![0; width * depth],
+            n_matches: 0,
+            types: Vec::new(),
+        }
+    }
+
+    pub fn cleaners(&self) -> &[String] {
+        &self.cleaners
+    }
+
+    pub fn k(&self) -> usize {
+        self.k
+    }
+
+    pub fn width(&self) -> usize {
+        self.width
+    }
+
+    pub fn depth(&self) -> usize {
+        self.depth
+    }
+
+    /// Number of matches counted so far
+    pub fn n_matches(&self) -> u64 {
+        self.n_matches
+    }
+
+    /// Most any estimate overcounts by, with probability `1 - exp(-depth)`
+    pub fn max_error(&self) -> f64 {
+        std::f64::consts::E / self.width as f64 * self.n_matches as f64
+    }
+
+    fn type_index(&mut self, pii_type: &str) -> usize {
+        match self.types.iter().position(|(name, _)| name == pii_type) {
+            Some(index) => index,
+            None => {
+                self.types.push((pii_type.to_string(), TopK::default()));
+                self.types.len() - 1
+            }
+        }
+    }
+
+    /// Add one to the counters of `key` and return its new estimate
+    fn increment(&mut self, key: u64) -> u64 {
+        let mut estimate = u64::MAX;
+        for row in 0..self.depth {
+            let counter = &mut self.counters[row * self.width + column(key, row, self.width)];
+            *counter += 1;
+            estimate = estimate.min(*counter);
+        }
+        estimate
+    }
+
+    fn estimate_key(&self, key: u64) -> u64 {
+        (0..self.depth)
+            .map(|row| self.counters[row * self.width + column(key, row, self.width)])
+            .min()
+            .unwrap_or(0)
+    }
+
+    /// Estimated number of times `value` was found as `pii_type`
+    pub fn estimate(&self, value: &str, pii_type: &str) -> u64 {
+        self.estimate_key(value_hash(value) ^ type_hash(pii_type))
+    }
+
+    /// Detect PII in a batch of texts and count every match
+    ///
+    /// Overlapping matches are resolved with `Overlap::Longest` so each value
+    /// is counted once.
+    pub fn update<T: AsRef<str> + Sync>(&mut self, texts: &[T]) {
+        // Spans borrow the cleaner names, so they can't borrow them from
+        // `self` while the counts are updated
+        let cleaners = self.cleaners.clone();
+        let cleaner_refs: Vec<&str> = cleaners.iter().map(String::as_str).collect();
+        let spans = core::detect_spans_batch_core(
+            texts,
+            &cleaner_refs,
+            self.ignore_case,
+            Overlap::Longest,
+            self.ascii_only,
+            self.allowlist.as_ref(),
+        );
+
+        // Type hashes for each type in `self.types`, looked up by position
+        let mut type_hashes: Vec<u64> =
+            self.types.iter().map(|(name, _)| type_hash(name)).collect();
+        for (text, row_spans) in texts.iter().zip(&spans) {
+            let text = text.as_ref();
+            for span in row_spans {
+                let index = self.type_index(span.cleaner);
+                if index == type_hashes.len() {
+                    type_hashes.push(type_hash(span.cleaner));
+                }
+                let value = &text[span.start..span.end];
+                let hash = value_hash(value);
+                let count = self.increment(hash ^ type_hashes[index]);
+                let (k, keep_value) = (self.k, !self.hash_values);
+                self.types[index].1.offer(k, hash, value, count, keep_value);
+            }
+            self.n_matches += row_spans.len() as u64;
+        }
+    }
+
+    /// Whether `other` was built with the same size, cleaners, allowlist and
+    /// options
+    pub fn is_compatible(&self, other: &HeavyHitters) -> bool {
+        self.width == other.width
+            && self.depth == other.depth
+            && self.cleaners == other.cleaners
+            && self.ignore_case == other.ignore_case
+            && self.ascii_only == other.ascii_only
+            && self.allowlist.as_ref().map(Allowlist::fingerprint)
+                == other.allowlist.as_ref().map(Allowlist::fingerprint)
+    }
+
+    /// Add the counts of `other`, a sketch for which `is_compatible` holds
+    ///
+    /// Candidates from both sketches are re-estimated from the merged
+    /// counters and the top `k` of each type kept.
+    pub fn merge(&mut self, other: &HeavyHitters) {
+        for (counter, other_counter) in self.counters.iter_mut().zip(&other.counters) {
+            *counter += other_counter;
+        }
+        self.n_matches += other.n_matches;
+
+        for (name, other_top) in &other.types {
+            let index = self.type_index(name);
+            let mut candidates = std::mem::take(&mut self.types[index].1.candidates);
+            for (&hash, candidate) in &other_top.candidates {
+                let entry = candidates.entry(hash).or_insert_with(|| candidate.clone());
+                if entry.value.is_none() {
+                    entry.value = candidate.value.clone();
+                }
+            }
+
+            let type_key = type_hash(name);
+            let mut ranked: Vec<(u64, Candidate)> = candidates
+                .into_iter()
+                .map(|(hash, mut candidate)| {
+                    candidate.count = self.estimate_key(hash ^ type_key);
+                    if self.hash_values {
+                        candidate.value = None;
+                    }
+                    (hash, candidate)
+                })
+                .collect();
+            ranked.sort_by(|a, b| b.1.count.cmp(&a.1.count).then(a.0.cmp(&b.0)));
+            ranked.truncate(self.k);
+
+            let top = &mut self.types[index].1;
+            top.floor = if ranked.len() >= self.k {
+                ranked.last().map_or(0, |(_, candidate)| candidate.count)
+            } else {
+                0
+            };
+            top.candidates = ranked.into_iter().collect();
+        }
+    }
+
+    /// The heavy hitters of every type, or only of `pii_type`, highest
+    /// estimate first
+    pub fn top(&self, pii_type: Option<&str>) -> Vec<HeavyHitter> {
+        let mut hitters: Vec<HeavyHitter> = self
+            .types
+            .iter()
+            .filter(|(name, _)| pii_type.is_none_or(|pii_type| pii_type == name))
+            .flat_map(|(name, top)| {
+                top.candidates.iter().map(|(&hash, candidate)| HeavyHitter {
+                    pii_type: name.clone(),
+                    value: candidate.value.clone(),
+                    hash,
+                    count: candidate.count,
+                })
+            })
+            .collect();
+        hitters.sort_by(|a, b| {
+            b.count
+                .cmp(&a.count)
+                .then_with(|| a.pii_type.cmp(&b.pii_type))
+                .then(a.hash.cmp(&b.hash))
+        });
+        hitters
+    }
+
+    /// Serialise the sketch, for `from_bytes`
+    pub fn write_to(&self, writer: &mut impl Write) -> io::Result<()> {
+        let mut flags = 0;
+        if self.ignore_case {
+            flags |= FLAG_IGNORE_CASE;
+        }
+        if self.ascii_only {
+            flags |= FLAG_ASCII_ONLY;
+        }
+        if self.hash_values {
+            flags |= FLAG_HASH_VALUES;
+        }
+        if let Some(allowlist) = &self.allowlist {
+            flags |= FLAG_ALLOWLIST;
+            if allowlist.is_normalised() {
+                flags |= FLAG_NORMALISE_ALLOWLIST;
+            }
+        }
+
+        writer.write_all(MAGIC)?;
+        writer.write_all(&[flags])?;
+        writer.write_all(&(self.cleaners.len() as u32).to_le_bytes())?;
+        for cleaner in &self.cleaners {
+            write_string(writer, cleaner)?;
+        }
+        if let Some(allowlist) = &self.allowlist {
+            let mut values: Vec<&str> = allowlist.values().collect();
+            values.sort_unstable();
+            writer.write_all(&(values.len() as u32).to_le_bytes())?;
+            for value in values {
+                write_string(writer, value)?;
+            }
+        }
+        writer.write_all(&(self.k as u64).to_le_bytes())?;
+        writer.write_all(&(self.width as u64).to_le_bytes())?;
+        writer.write_all(&(self.depth as u64).to_le_bytes())?;
+        writer.write_all(&self.n_matches.to_le_bytes())?;
+        for counter in &self.counters {
+            writer.write_all(&counter.to_le_bytes())?;
+        }
+        writer.write_all(&(self.types.len() as u32).to_le_bytes())?;
+        for (name, top) in &self.types {
+            write_string(writer, name)?;
+            writer.write_all(&(top.candidates.len() as u32).to_le_bytes())?;
+            for (hash, candidate) in &top.candidates {
+                writer.write_all(&hash.to_le_bytes())?;
+                writer.write_all(&candidate.count.to_le_bytes())?;
+                match &candidate.value {
+                    Some(value) => {
+                        writer.write_all(&[1])?;
+                        write_string(writer, value)?;
+                    }
+                    None => writer.write_all(&[0])?,
+                }
+            }
+        }
+        Ok(())
+    }
+
+    pub fn to_bytes(&self) -> Vec<u8> {
+        let mut bytes = Vec::with_capacity(self.counters.len() * 8 + 64);
+        self.write_to(&mut bytes)
+            .expect("Writing to a Vec can't fail");
+        bytes
+    }
+
+    /// Read a sketch written by `write_to`
+    pub fn from_bytes(mut bytes: &[u8]) -> io::Result<Self> {
+        let reader = &mut bytes;
+        let magic = read_array::<8>(reader)?;
+        if &magic != MAGIC && &magic != MAGIC_V1 {
+            return Err(invalid("Not a piicleaner sketch"));
+        }
+        let flags = read_array::<1>(reader)?[0];
+        let n_cleaners = u32::from_le_bytes(read_array(reader)?);
+        let cleaners = (0..n_cleaners)
+            .map(|_| read_string(reader))
+            .collect::<io::Result<Vec<_>>>()?;
+        let allowlist = if &magic == MAGIC && flags & FLAG_ALLOWLIST != 0 {
+            let n_values = u32::from_le_bytes(read_array(reader)?);
+            let values = (0..n_values)
+                .map(|_| read_string(reader))
+                .collect::<io::Result<Vec<_>>>()?;
+            Some(Allowlist::new(
+                values,
+                flags & FLAG_NORMALISE_ALLOWLIST != 0,
+            ))
+        } else {
+            None
+        };
+        let k = u64::from_le_bytes(read_array(reader)?) as usize;
+        let width = u64::from_le_bytes(read_array(reader)?) as usize;
+        let depth = u64::from_le_bytes(read_array(reader)?) as usize;
+        let n_matches = u64::from_le_bytes(read_array(reader)?);
+        let n_counters = width
+            .checked_mul(depth)
+            .filter(|&n| k > 0 && n > 0 && n <= reader.len() / 8)
+            .ok_or_else(|| invalid("Sketch has an invalid size"))?;
+        let counters = (0..n_counters)
+            .map(|_| Ok(u64::from_le_bytes(read_array(reader)?)))
+            .collect::<io::Result<Vec<_>>>()?;
+
+        let n_types = u32::from_le_bytes(read_array(reader)?);
+        let mut types = Vec::new();
+        for _ in 0..n_types {
+            let name = read_string(reader)?;
+            let n_candidates = u32::from_le_bytes(read_array(reader)?);
+            let mut top = TopK::default();
+            for _ in 0..n_candidates {
+                let hash = u64::from_le_bytes(read_array(reader)?);
+                let count = u64::from_le_bytes(read_array(reader)?);
+                let value = match read_array::<1>(reader)?[0] {
+                    0 => None,
+                    _ => Some(read_string(reader)?),
+                };
+                top.candidates.insert(hash, Candidate { value, count });
+            }
+            if top.candidates.len() >= k {
+                top.floor = top.candidates.values().map(|c| c.count).min().unwrap_or(0);
+            }
+            types.push((name, top));
+        }
+
+        Ok(HeavyHitters {
+            cleaners,
+            ignore_case: flags & FLAG_IGNORE_CASE != 0,
+            ascii_only: flags & FLAG_ASCII_ONLY != 0,
+            allowlist,
+            hash_values: flags & FLAG_HASH_VALUES != 0,
+            k,
+            width,
+            depth,
+            counters,
+            n_matches,
+            types,
+        })
+    }
+}
+
+fn invalid(message: &str) -> io::Error {
+    io::Error::new(io::ErrorKind::InvalidData, message)
+}
+
+fn read_array<const N: usize>(reader: &mut impl Read) -> io::Result<[u8; N]> {
+    let mut bytes = [0; N];
+    reader.read_exact(&mut bytes)?;
+    Ok(bytes)
+}
+
+fn write_string(writer: &mut impl Write, string: &str) -> io::Result<()> {
+    writer.write_all(&(string.len() as u32).to_le_bytes())?;
+    writer.write_all(string.as_bytes())
+}
+
+fn read_string(reader: &mut &[u8]) -> io::Result<String> {
+    let len = u32::from_le_bytes(read_array(reader)?) as usize;
+    if len > reader.len() {
+        return Err(invalid("Sketch is truncated"));
+    }
+    let (bytes, rest) = reader.split_at(len);
+    *reader = rest;
+    String::from_utf8(bytes.to_vec()).map_err(|_| invalid("Sketch string is not valid UTF-8"))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn sketch(hash_values: bool) -> HeavyHitters {
+        HeavyHitters::new(
+            vec!["email".to_string(), "nino".to_string()],
+            2,
+            0.01,
+            0.01,
+            hash_values,
+            true,
+            false,
+            None,
+        )
+    }
+
+    fn texts() -> Vec<String> {
+        let mut texts = Vec::new();
+        for i in 0..200 {
+            texts.push(format!("From admin@example.com to user{}@example.com", i));
+            if i % 2 == 0 {
+                texts.push("Test account TEST@example.com, NINO AB123456C".to_string());
+            }
+        }
+        texts
+    }
+
+    #[test]
+    fn test_top_values() {
+        let mut hitters = sketch(false);
+        hitters.update(&texts());
+        assert_eq!(hitters.width(), 272);
+        assert_eq!(hitters.depth(), 5);
+        assert_eq!(hitters.n_matches(), 600);
+
+        let top = hitters.top(Some("email"));
+        assert_eq!(top.len(), 2);
+        assert_eq!(top[0].value.as_deref(), Some("admin@example.com"));
+        assert!(top[0].count >= 200);
+        assert_eq!(top[1].value.as_deref(), Some("TEST@example.com"));
+        assert!(top[1].count >= 100);
+        assert!(top[1].count as f64 <= 100.0 + hitters.max_error());
+
+        assert!(hitters.estimate("test@example.com", "email") >= 100);
+        assert_eq!(
+            hitters.top(Some("nino"))[0].hash,
+            value_hash("AB 12 34 56 C")
+        );
+    }
+
+    #[test]
+    fn test_hash_values() {
+        let mut hitters = sketch(true);
+        hitters.update(&texts());
+        let top = hitters.top(None);
+        assert!(top.iter().all(|hitter| hitter.value.is_none()));
+        assert_eq!(top[0].hash, value_hash("admin@example.com"));
+    }
+
+    #[test]
+    fn test_merge_matches_single_pass() {
+        let texts = texts();
+        let (first, second) = texts.split_at(150);
+        let mut whole = sketch(false);
+        whole.update(&texts);
+        let mut merged = sketch(false);
+        merged.update(first);
+        let mut other = sketch(false);
+        other.update(second);
+        assert!(merged.is_compatible(&other));
+        merged.merge(&other);
+
+        assert_eq!(merged.counters, whole.counters);
+        assert_eq!(merged.n_matches(), whole.n_matches());
+        let values = |hitters: &HeavyHitters| {
+            hitters
+                .top(Some("email"))
+                .into_iter()
+                .map(|hitter| (hitter.value, hitter.count))
+                .collect::<Vec<_>>()
+        };
+        assert_eq!(values(&merged), values(&whole));
+
+        let smaller = HeavyHitters::new(
+            vec!["email".to_string()],
+            2,
+            0.1,
+            0.01,
+            false,
+            true,
+            false,
+            None,
+        );
+        assert!(!merged.is_compatible(&smaller));
+    }
+
+    #[test]
+    fn test_allowlist() {
+        let allowlist = Allowlist::new(["admin@example.com"], true);
+        let allowing = || {
+            HeavyHitters::new(
+                vec!["email".to_string()],
+                2,
+                0.01,
+                0.01,
+                false,
+                true,
+                false,
+                Some(allowlist.clone()),
+            )
+        };
+        let mut hitters = allowing();
+        hitters.update(&texts());
+        let top = hitters.top(None);
+        assert!(top
+            .iter()
+            .all(|hitter| hitter.value.as_deref() != Some("admin@example.com")));
+        assert_eq!(hitters.estimate("admin@example.com", "email"), 0);
+        assert_eq!(hitters.n_matches(), 300);
+
+        // The allowlist is kept when serialised, and must match to merge
+        let loaded = HeavyHitters::from_bytes(&hitters.to_bytes()).unwrap();
+        assert!(loaded.is_compatible(&allowing()));
+        let mut plain = sketch(false);
+        plain.cleaners = vec!["email".to_string()];
+        assert!(!loaded.is_compatible(&plain));
+    }
+
+    #[test]
+    fn test_bytes_round_trip() {
+        let mut hitters = sketch(false);
+        hitters.update(&texts());
+        let loaded = HeavyHitters::from_bytes(&hitters.to_bytes()).unwrap();
+        assert_eq!(loaded.top(None), hitters.top(None));
+        assert_eq!(loaded.counters, hitters.counters);
+        assert!(loaded.is_compatible(&hitters));
+
+        assert!(HeavyHitters::from_bytes(b"not a sketch").is_err());
+        let bytes = hitters.to_bytes();
+        assert!(HeavyHitters::from_bytes(&bytes[..bytes.len() / 2]).is_err());
+    }
+}
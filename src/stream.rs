@@ -0,0 +1,226 @@
+//! Cleaning text that arrives in pieces, such as chat transcripts or log tails
+
+use crate::allowlist::Allowlist;
+use crate::core::{self, Cleaning, Overlap, PseudonymMemo, Span};
+
+/// Default for the longest match, in bytes, that is guaranteed to be found
+/// whole when it is split across chunks
+pub const DEFAULT_MAX_MATCH_LEN: usize = 256;
+
+/// Cleans a stream of text chunk by chunk, finding PII split across chunks
+///
+/// Each `feed` cleans and returns as much of the text seen so far as is safe,
+/// holding back a tail where a match could still be in progress. The tail is
+/// at least `max_match_len` bytes, extended back to the nearest whitespace
+/// and to the start of any match it cuts through, so matches up to
+/// `max_match_len` bytes long are cleaned exactly as they would be in the
+/// whole text. The tail is capped at twice `max_match_len` plus the last
+/// chunk, so memory use doesn't grow with the length of the stream.
+pub struct StreamCleaner {
+    cleaners: Vec<String>,
+    cleaning: Cleaning,
+    ignore_case: bool,
+    overlap: Overlap,
+    ascii_only: bool,
+    max_match_len: usize,
+    /// Text received but not yet returned
+    pending: String,
+}
+
+impl StreamCleaner {
+    /// `cleaning` must be span-based: `Cleaning::Replace` replaces whole texts,
+    /// which has no meaning for a stream, and is treated as redaction.
+    pub fn new(
+        cleaners: Vec<String>,
+        cleaning: Cleaning,
+        ignore_case: bool,
+        overlap: Overlap,
+        ascii_only: bool,
+        max_match_len: usize,
+    ) -> Self {
+        StreamCleaner {
+            cleaners,
+            cleaning,
+            ignore_case,
+            // Cleaning replaces every character at most once
+            overlap: match overlap {
+                Overlap::All => Overlap::Longest,
+                other => other,
+            },
+            ascii_only,
+            max_match_len,
+            pending: String::new(),
+        }
+    }
+
+    /// Bytes received but held back
+    pub fn pending_len(&self) -> usize {
+        self.pending.len()
+    }
+
+    /// Add a chunk and return the cleaned text that is now safe to emit
+    pub fn feed(&mut self, chunk: &str, allowlist: Option<&Allowlist>) -> String {
+        self.pending.push_str(chunk);
+        let limit = self.pending.len().saturating_sub(self.max_match_len);
+        if limit == 0 {
+            return String::new();
+        }
+
+        let cleaners: Vec<&str> = self.cleaners.iter().map(String::as_str).collect();
+        let spans = core::detect_spans(
+            &self.pending,
+            &cleaners,
+            self.ignore_case,
+            self.overlap,
+            self.ascii_only,
+            allowlist,
+        );
+        let mut cut = safe_cut(&self.pending, &spans, limit);
+        if cut == 0 && self.pending.len() > 2 * self.max_match_len {
+            // No whitespace to cut at: give up on exactness to bound memory
+            cut = floor_char_boundary(&self.pending, limit);
+            if let Some(span) = spans.iter().find(|s| s.start < cut && cut < s.end) {
+                cut = span.end;
+            }
+        }
+        if cut == 0 {
+            return String::new();
+        }
+
+        let n_done = spans.partition_point(|span| span.end <= cut);
+        let cleaned = core::clean_spans(
+            &self.pending[..cut],
+            &spans[..n_done],
+            self.cleaning,
+            &mut PseudonymMemo::new(),
+        );
+        self.pending.drain(..cut);
+        cleaned
+    }
+
+    /// Clean and return everything held back, ending the stream
+    ///
+    /// The cleaner can be reused for a new stream afterwards.
+    pub fn finish(&mut self, allowlist: Option<&Allowlist>) -> String {
+        let cleaners: Vec<&str> = self.cleaners.iter().map(String::as_str).collect();
+        let spans = core::detect_spans(
+            &self.pending,
+            &cleaners,
+            self.ignore_case,
+            self.overlap,
+            self.ascii_only,
+            allowlist,
+        );
+        let cleaned = core::clean_spans(
+            &self.pending,
+            &spans,
+            self.cleaning,
+            &mut PseudonymMemo::new(),
+        );
+        self.pending.clear();
+        cleaned
+    }
+}
+
+fn floor_char_boundary(text: &str, mut index: usize) -> usize {
+    while !text.is_char_boundary(index) {
+        index -= 1;
+    }
+    index
+}
+
+/// The latest position at or before `limit` where `text` can be split without
+/// changing what is matched on either side
+///
+/// Splits are made just after whitespace, so `\b` at the start of the
+/// held-back text sees what it would in the whole text, and never inside one
+/// of `spans`. Returns 0 if there is no such position.
+fn safe_cut(text: &str, spans: &[Span], limit: usize) -> usize {
+    let mut cut = floor_char_boundary(text, limit);
+    loop {
+        cut = match text[..cut].char_indices().rfind(|(_, c)| c.is_whitespace()) {
+            Some((i, c)) => i + c.len_utf8(),
+            None => return 0,
+        };
+        match spans.iter().find(|span| span.start < cut && cut < span.end) {
+            Some(span) => cut = span.start,
+            None => return cut,
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::core::clean_pii_with_cleaners_core;
+
+    fn stream(max_match_len: usize) -> StreamCleaner {
+        StreamCleaner::new(
+            vec!["all".to_string()],
+            Cleaning::Redact,
+            false,
+            Overlap::Longest,
+            false,
+            max_match_len,
+        )
+    }
+
+    fn clean_whole(text: &str) -> String {
+        clean_pii_with_cleaners_core(
+            text,
+            &["all"],
+            Cleaning::Redact,
+            false,
+            None,
+            Overlap::Longest,
+            false,
+            None,
+        )
+        .into_owned()
+    }
+
+    #[test]
+    fn test_stream_matches_split_across_chunks() {
+        let text = "Hi, email me at jane.doe@example.com or call 020 7946 0000. \
+                    My NINO is AB123456C and I live at SW1A 1AA. Thanks!";
+        let expected = clean_whole(text);
+
+        for chunk_len in [1, 3, 7, 16, 64] {
+            let mut cleaner = stream(48);
+            let mut output = String::new();
+            for chunk in text.as_bytes().chunks(chunk_len) {
+                output.push_str(&cleaner.feed(std::str::from_utf8(chunk).unwrap(), None));
+                assert!(cleaner.pending_len() <= 2 * 48 + chunk_len);
+            }
+            output.push_str(&cleaner.finish(None));
+            assert_eq!(output, expected, "chunk length {}", chunk_len);
+        }
+    }
+
+    #[test]
+    fn test_stream_emits_early_and_bounds_memory() {
+        let mut cleaner = stream(16);
+        let line = "Contact jane@example.com for details. ";
+        let mut output = String::new();
+        for _ in 0..1000 {
+            output.push_str(&cleaner.feed(line, None));
+            assert!(cleaner.pending_len() <= 2 * 16 + line.len());
+        }
+        assert!(!output.is_empty());
+        output.push_str(&cleaner.finish(None));
+        assert_eq!(output, clean_whole(&line.repeat(1000)));
+        assert_eq!(cleaner.pending_len(), 0);
+    }
+
+    #[test]
+    fn test_stream_without_whitespace() {
+        let mut cleaner = stream(8);
+        let mut output = String::new();
+        for _ in 0..100 {
+            output.push_str(&cleaner.feed("abcdefgh", None));
+        }
+        assert!(cleaner.pending_len() <= 2 * 8 + 8);
+        output.push_str(&cleaner.finish(None));
+        assert_eq!(output, "abcdefgh".repeat(100));
+    }
+}
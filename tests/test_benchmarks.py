@@ -1,5 +1,9 @@
 """Performance benchmarks for PII detection and cleaning operations."""
 
+import sys
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from piicleaner import Cleaner
 
@@ -83,6 +87,12 @@ def large_string_list():
     return generate_large_list(100_000, 0.2)
 
 
+@pytest.fixture
+def low_pii_string_list():
+    """Fixture providing a large list of strings that are mostly PII-free."""
+    return generate_large_list(100_000, 0.01)
+
+
 @pytest.mark.performance
 @pytest.mark.parametrize("ignore_case", [False, True])
 def test_detect_individual(benchmark, cleaner, sample_string, ignore_case):
@@ -102,6 +112,24 @@ def test_detect_large_list(benchmark, cleaner, large_string_list, ignore_case):
     benchmark(detect_batch)
 
 
+@pytest.mark.performance
+@pytest.mark.parametrize("operation", ["detect", "redact"])
+def test_batch_peak_memory(benchmark, cleaner, large_string_list, operation):
+    """Benchmark batch calls fed from a generator and record peak RSS."""
+    resource = pytest.importorskip("resource")
+
+    def run_batch():
+        texts = (text for text in large_string_list)
+        if operation == "detect":
+            return cleaner.detect_pii_list(texts)
+        return cleaner.clean_pii_list(texts, operation)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    benchmark(run_batch)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    benchmark.extra_info["peak_rss_growth"] = rss_after - rss_before
+
+
 @pytest.mark.performance
 @pytest.mark.parametrize("operation", ["redact", "replace"])
 @pytest.mark.parametrize("ignore_case", [False, True])
@@ -120,3 +148,40 @@ def test_clean_large_list(
 ):
     """Benchmark batch cleaning operations on large lists."""
     benchmark(cleaner.clean_pii_list, large_string_list, operation, ignore_case)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("operation", ["redact", "replace"])
+def test_clean_low_pii_list(benchmark, cleaner, low_pii_string_list, operation):
+    """Benchmark batch cleaning throughput and peak memory on low-PII data."""
+    tracemalloc.start()
+    cleaner.clean_pii_list(low_pii_string_list, operation)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    benchmark.extra_info["peak_python_memory_bytes"] = peak
+
+    benchmark(cleaner.clean_pii_list, low_pii_string_list, operation)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("threads", [1, 2, 4, 8])
+def test_detect_individual_threads(benchmark, cleaner, threads):
+    """Benchmark per-row detection split across threads.
+
+    Only scales with `threads` on a free-threaded build; with the GIL the
+    threads take turns.
+    """
+    texts = generate_large_list(20_000, 0.2)
+    chunks = [texts[i::threads] for i in range(threads)]
+
+    def detect_chunk(chunk):
+        for text in chunk:
+            cleaner.detect_pii(text)
+
+    def detect_threaded():
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(detect_chunk, chunks))
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    benchmark.extra_info["gil_enabled"] = is_gil_enabled()
+    benchmark(detect_threaded)
@@ -1,7 +1,36 @@
 """Tests for the Cleaner class core functionality."""
 
+import asyncio
+import json
+import multiprocessing
+import pickle
+import re
+import sys
+import sysconfig
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
 import pytest
-from piicleaner import Cleaner
+from piicleaner import (
+    CancelToken,
+    CleanCache,
+    Cleaner,
+    HeavyHitters,
+    MicroBatcher,
+    PiiIndex,
+    RowLimits,
+    get_available_cleaners,
+    load_dictionary,
+    precompile_patterns,
+    register_dictionary,
+    register_dictionary_file,
+    remove_dictionary,
+    save_dictionary,
+)
+
+
+def _clean_in_worker(cleaner, texts):
+    return cleaner.clean_pii_list(texts, "redact")
 
 
 class TestCleanerInitialisation:
@@ -172,9 +201,31 @@ class TestPIICleaning:
         assert "+44 20 1234 5678" not in cleaned[1]
         assert cleaned[2] == "No PII here"  # Unchanged
 
+    def test_clean_list_returns_unchanged_objects(self, cleaner):
+        """Test rows without PII are returned as the original objects."""
+        text_list = ["Email: john@test.com", "No PII here"]
+
+        for cleaning in ["redact", "replace"]:
+            cleaned = cleaner.clean_pii_list(text_list, cleaning)
+            assert cleaned[0] != text_list[0]
+            assert cleaned[1] is text_list[1]
+
+    def test_clean_list_accepts_iterables(self, cleaner):
+        """Test batch methods accept tuples and generators as well as lists."""
+        text_list = ["Email: john@test.com", "No PII here"]
+        expected = cleaner.clean_pii_list(text_list, "redact")
+
+        assert cleaner.clean_pii_list(tuple(text_list), "redact") == expected
+        assert (
+            cleaner.clean_pii_list((t for t in text_list), "redact") == expected
+        )
+        assert cleaner.detect_pii_list(
+            t for t in text_list
+        ) == cleaner.detect_pii_list(text_list)
+
     def test_clean_list_invalid_input(self, cleaner):
         """Test clean_list with invalid input raises TypeError."""
-        with pytest.raises(TypeError, match="Can't extract `str` to `Vec`"):
+        with pytest.raises(TypeError, match="not a single `str`"):
             cleaner.clean_pii_list("not a list", "redact")
 
     def test_clean_list_invalid_elements(self, cleaner):
@@ -533,3 +584,876 @@ class TestCaseInsensitiveDetection:
 
         assert any("JOHN@EXAMPLE.COM" in text for text in pii_texts)
         assert not any("+44 20 1234 5678" in text for text in pii_texts)
+
+
+class TestStreaming:
+    """Test the lazy, chunked iterator API."""
+
+    @pytest.fixture
+    def cleaner(self):
+        """Default cleaner instance for testing."""
+        return Cleaner()
+
+    @pytest.fixture
+    def text_list(self):
+        """Mixed PII and non-PII strings."""
+        return [
+            f"Email user{i}@example.com" if i % 3 == 0 else f"Row {i}"
+            for i in range(25)
+        ]
+
+    def test_clean_pii_iter_matches_list(self, cleaner, text_list):
+        """Test streamed cleaning gives the same results, in order."""
+        streamed = cleaner.clean_pii_iter(
+            (t for t in text_list), "redact", chunk_size=4
+        )
+        assert list(streamed) == cleaner.clean_pii_list(text_list, "redact")
+
+    def test_detect_pii_iter_matches_list(self, cleaner, text_list):
+        """Test streamed detection gives the same results, in order."""
+        streamed = cleaner.detect_pii_iter(
+            iter(text_list), chunk_size=7, max_in_flight=3
+        )
+        assert list(streamed) == cleaner.detect_pii_list(text_list)
+
+    def test_iter_is_lazy(self, cleaner):
+        """Test input is only consumed as results are requested."""
+        consumed = []
+
+        def source():
+            for i in range(100):
+                consumed.append(i)
+                yield f"Row {i}"
+
+        stream = cleaner.clean_pii_iter(
+            source(), "redact", chunk_size=10, max_in_flight=1
+        )
+        assert next(stream) == "Row 0"
+        assert len(consumed) <= 20
+        stream.close()
+
+    def test_iter_empty_input(self, cleaner):
+        """Test an empty iterable yields nothing."""
+        assert list(cleaner.clean_pii_iter([], "redact")) == []
+        assert list(cleaner.detect_pii_iter([])) == []
+
+    def test_iter_invalid_chunk_size(self, cleaner):
+        """Test non-positive chunk sizes are rejected immediately."""
+        with pytest.raises(ValueError, match="chunk_size"):
+            cleaner.clean_pii_iter(["text"], "redact", chunk_size=0)
+        with pytest.raises(ValueError, match="max_in_flight"):
+            cleaner.detect_pii_iter(["text"], max_in_flight=0)
+
+
+class TestAsciiMode:
+    """Test the ASCII-only engine mode."""
+
+    def test_default_is_unicode(self):
+        """Test the default cleaner keeps Unicode semantics."""
+        assert Cleaner().ascii_only is False
+        matches = Cleaner("address").detect_pii("Lives at 12 Café street")
+        assert len(matches) == 1
+
+    def test_ascii_only_on_non_ascii_text(self):
+        """Test ASCII mode applies ASCII `\\w` to non-ASCII text."""
+        cleaner = Cleaner("address", ascii_only=True)
+        assert cleaner.detect_pii("Lives at 12 Café street") == []
+
+    def test_identical_results_on_ascii_text(self):
+        """Test both modes agree on pure-ASCII input."""
+        texts = [
+            "Email test@example.com, NINO AB123456C",
+            "12 high street, SW1A 1AA, call +44 20 7946 0958",
+            "ref: ab12345678 from 192.168.0.1 <b>bold</b>",
+        ]
+        unicode_cleaner = Cleaner()
+        ascii_cleaner = Cleaner(ascii_only=True)
+
+        for ignore_case in [False, True]:
+            assert unicode_cleaner.detect_pii_list(
+                texts, ignore_case
+            ) == ascii_cleaner.detect_pii_list(texts, ignore_case)
+            assert unicode_cleaner.clean_pii_list(
+                texts, "redact", ignore_case
+            ) == ascii_cleaner.clean_pii_list(texts, "redact", ignore_case)
+
+
+class TestPseudonymise:
+    """Test the keyed-hash pseudonymisation cleaning method."""
+
+    def test_token_format(self):
+        """Test matches become typed tokens and other text is kept."""
+        cleaner = Cleaner("email", pseudonym_key="secret")
+        result = cleaner.clean_pii(
+            "Email alice@example.com now", "pseudonymise"
+        )
+        assert re.fullmatch(r"Email \[email:[0-9a-f]{12}\] now", result)
+
+    def test_same_value_same_token(self):
+        """Test repeated values map to one token and distinct values differ."""
+        cleaner = Cleaner("email", pseudonym_key="secret")
+        texts = [
+            "alice@example.com",
+            "From alice@example.com",
+            "bob@example.com",
+            "No PII here",
+        ]
+        results = cleaner.clean_pii_list(texts, "pseudonymise")
+
+        assert results[1] == f"From {results[0]}"
+        assert results[0] != results[2]
+        assert results[3] == "No PII here"
+        assert results == [cleaner.clean_pii(t, "pseudonymise") for t in texts]
+
+    def test_tokens_depend_on_key(self):
+        """Test different keys give different tokens."""
+        text = "alice@example.com"
+        first = Cleaner(pseudonym_key="secret").clean_pii(text, "pseudonymise")
+        second = Cleaner(pseudonym_key="other").clean_pii(text, "pseudonymise")
+        assert first != second
+
+    def test_key_required(self):
+        """Test pseudonymising without a key raises an error."""
+        with pytest.raises(ValueError, match="pseudonym_key"):
+            Cleaner().clean_pii("alice@example.com", "pseudonymise")
+        with pytest.raises(ValueError, match="pseudonym_key"):
+            Cleaner(pseudonym_key="").clean_pii_list(["x"], "pseudonymise")
+
+
+class TestDictionaryCleaners:
+    """Test dictionary cleaners built from lists of literal values."""
+
+    @pytest.fixture
+    def staff_names(self):
+        register_dictionary("staff", ["Jane Doe", "John Smith", "Ann"])
+        yield "staff"
+        remove_dictionary("staff")
+
+    def test_detect_with_regex_cleaners(self, staff_names):
+        """Test dictionary matches are reported alongside regex matches."""
+        cleaner = Cleaner([staff_names, "email"])
+        matches = cleaner.detect_pii("JANE DOE, jane@example.com, Anne")
+
+        assert [(m["text"], m["type"]) for m in matches] == [
+            ("JANE DOE", "staff"),
+            ("jane@example.com", "email"),
+        ]
+        assert staff_names in get_available_cleaners()
+
+    def test_clean(self, staff_names):
+        """Test dictionary matches are redacted with the dictionary name."""
+        cleaner = Cleaner(staff_names)
+        assert (
+            cleaner.clean_pii("Ask John Smith", "redact")
+            == "Ask [staff-redacted]"
+        )
+        assert cleaner.clean_pii_list(["Ann", "Annabel"], "replace") == [
+            "[PII detected, text redacted]",
+            "Annabel",
+        ]
+
+    def test_options(self):
+        """Test case folding and word boundaries can be switched off."""
+        register_dictionary(
+            "codes", ["ab"], case_insensitive=False, word_boundary=False
+        )
+        try:
+            matches = Cleaner("codes").detect_pii("AB cab")
+            assert [m["start"] for m in matches] == [4]
+        finally:
+            remove_dictionary("codes")
+
+    @pytest.mark.parametrize(
+        "values,text,expected",
+        [
+            (["Lee", "Ann Lee"], "Suzann Lee", "Lee"),
+            (["Jane", "Jane D"], "Jane Doe", "Jane"),
+        ],
+    )
+    def test_word_boundary_before_longest(self, values, text, expected):
+        """Test a longer value off a word boundary keeps a shorter match."""
+        register_dictionary("names", values)
+        try:
+            cleaner = Cleaner("names")
+            assert [m["text"] for m in cleaner.detect_pii(text)] == [expected]
+            assert cleaner.clean_pii(text, "replace") != text
+        finally:
+            remove_dictionary("names")
+
+    def test_file_save_and_load(self, tmp_path):
+        """Test dictionaries load from text files and saved dictionaries."""
+        source = tmp_path / "names.txt"
+        source.write_text("Jane Doe\n\nJohn Smith\n")
+        register_dictionary_file("names", source)
+        saved = tmp_path / "names.dict"
+        save_dictionary("names", saved)
+        assert remove_dictionary("names")
+        assert not remove_dictionary("names")
+
+        load_dictionary("names", saved)
+        try:
+            assert Cleaner("names").detect_pii("Met jane doe")[0]["end"] == 12
+        finally:
+            remove_dictionary("names")
+
+    def test_invalid_names(self, tmp_path):
+        """Test dictionaries can't shadow built-in cleaners or be missing."""
+        with pytest.raises(ValueError, match="Invalid dictionary name"):
+            register_dictionary("email", ["x"])
+        with pytest.raises(ValueError, match="Invalid dictionary name"):
+            register_dictionary("all", ["x"])
+        with pytest.raises(ValueError, match="Unknown dictionary"):
+            save_dictionary("missing", tmp_path / "missing.dict")
+
+
+class TestAllowlist:
+    """Test values on a Cleaner's allowlist are never reported or cleaned."""
+
+    text = "Contact support@example.com or jane@example.com"
+
+    def test_detect(self):
+        """Test allowlisted matches are not reported."""
+        cleaner = Cleaner("email", allowlist=["support@example.com"])
+        assert [m["text"] for m in cleaner.detect_pii(self.text)] == [
+            "jane@example.com"
+        ]
+        assert cleaner.detect_pii_list([self.text]) == [
+            cleaner.detect_pii(self.text)
+        ]
+
+    def test_clean(self):
+        """Test allowlisted matches are kept by every cleaning method."""
+        cleaner = Cleaner(allowlist=["support@example.com"])
+        assert (
+            cleaner.clean_pii(self.text, "redact")
+            == "Contact support@example.com or [email-redacted]"
+        )
+        assert cleaner.clean_pii_list(
+            ["Contact support@example.com", self.text], "replace"
+        ) == ["Contact support@example.com", "[PII detected, text redacted]"]
+
+    def test_normalised(self):
+        """Test normalised matching ignores case and formatting."""
+        text = "Email SUPPORT@example.com"
+        exact = Cleaner("email", allowlist=["support@example.com"])
+        normalised = Cleaner(
+            "email",
+            allowlist=["support@example.com"],
+            normalise_allowlist=True,
+        )
+        assert exact.clean_pii(text, "redact") == "Email [email-redacted]"
+        assert normalised.clean_pii(text, "redact") == text
+
+    def test_large_allowlist(self):
+        """Test an allowlist of many values is accepted from any iterable."""
+        cleaner = Cleaner(
+            "email", allowlist=(f"user{i}@example.com" for i in range(100_000))
+        )
+        assert cleaner.detect_pii("Email user99999@example.com") == []
+        assert len(cleaner.detect_pii("Email user100000@example.com")) > 0
+
+
+class TestPiiIndex:
+    """Test the inverted index of detected PII values."""
+
+    texts = [
+        "Email jane@example.com",
+        "No PII here",
+        "NINO AB123456C, cc JANE@example.com",
+    ]
+
+    def test_build_and_lookup(self):
+        """Test values are found by their normalised form."""
+        index = Cleaner().build_index(self.texts)
+        assert index.n_rows == 3
+        assert index.rows("jane@example.com") == [0, 2]
+        assert index.rows("AB 12 34 56 C") == [2]
+        assert index.rows("bob@example.com") == []
+        assert index.lookup("ab123456c") == [(2, 5, 14, "nino")]
+
+    def test_row_ids_and_append(self):
+        """Test explicit row IDs and appending new batches."""
+        index = Cleaner("email").build_index(self.texts, row_ids=[10, 20, 30])
+        index.append(["Reply to jane@example.com"])
+        index.append(["jane@example.com"], row_ids=[99])
+        assert index.rows("jane@example.com") == [3, 10, 30, 99]
+        assert index.rows("AB123456C") == []
+
+        with pytest.raises(ValueError, match="row_ids"):
+            index.append(["a", "b"], row_ids=[1])
+
+    def test_allowlist(self, tmp_path):
+        """Test allowlisted values are left out, including after reloading."""
+        cleaner = Cleaner(
+            "email", allowlist=["jane@example.com"], normalise_allowlist=True
+        )
+        index = cleaner.build_index(self.texts)
+        assert index.rows("jane@example.com") == []
+
+        path = tmp_path / "pii.index"
+        index.save(path)
+        loaded = PiiIndex.load(path)
+        loaded.append(["jane@example.com, bob@example.com"])
+        assert loaded.rows("jane@example.com") == []
+        assert loaded.rows("bob@example.com") == [3]
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved index loads with the same contents."""
+        index = Cleaner(["email", "nino"]).build_index(self.texts)
+        path = tmp_path / "pii.index"
+        index.save(path)
+        loaded = PiiIndex.load(path)
+
+        assert loaded.cleaners == ["email", "nino"]
+        assert len(loaded) == len(index) == 2
+        assert loaded.lookup("jane@example.com") == index.lookup(
+            "jane@example.com"
+        )
+
+
+class TestHeavyHitters:
+    """Test the sketch of the most frequent PII values."""
+
+    texts = [
+        f"From admin@example.com to user{i}@example.com" for i in range(200)
+    ] + ["Test account TEST@example.com, NINO AB123456C"] * 100
+
+    def test_top_values(self):
+        """Test the most frequent values of each type are reported."""
+        sketch = Cleaner(["email", "nino"]).heavy_hitters(self.texts, k=2)
+        assert sketch.n_matches == 600
+
+        top = sketch.top("email")
+        assert [value for _, value, _ in top] == [
+            "admin@example.com",
+            "TEST@example.com",
+        ]
+        assert top[0][2] >= 200
+        assert top[1][2] <= 100 + sketch.max_error
+        assert sketch.top("nino")[0][:2] == ("nino", "AB123456C")
+        assert sketch.estimate("test@example.com", "email") >= 100
+
+    def test_hash_values(self):
+        """Test only hashes are reported when `hash_values` is set."""
+        sketch = Cleaner("email").heavy_hitters(
+            self.texts, k=1, hash_values=True
+        )
+        [(pii_type, value, count)] = sketch.top()
+        assert pii_type == "email"
+        assert re.fullmatch("[0-9a-f]{16}", value)
+        assert count >= 200
+
+    def test_allowlist(self):
+        """Test allowlisted values aren't counted, and must match to merge."""
+        cleaner = Cleaner("email", allowlist=["admin@example.com"])
+        sketch = cleaner.heavy_hitters(self.texts, k=2)
+        assert "admin@example.com" not in [
+            value for _, value, _ in sketch.top()
+        ]
+        assert sketch.estimate("admin@example.com", "email") == 0
+
+        restored = pickle.loads(pickle.dumps(sketch))
+        restored.merge(cleaner.heavy_hitters(self.texts, k=2))
+        with pytest.raises(ValueError, match="allowlist"):
+            restored.merge(Cleaner("email").heavy_hitters(self.texts, k=2))
+
+    def test_merge_and_pickle(self):
+        """Test sketches merge and survive pickling."""
+        cleaner = Cleaner("email")
+        whole = cleaner.heavy_hitters(self.texts, k=2)
+        merged = cleaner.heavy_hitters(self.texts[:150], k=2)
+        merged.merge(
+            pickle.loads(
+                pickle.dumps(cleaner.heavy_hitters(self.texts[150:], k=2))
+            )
+        )
+        assert merged.n_matches == whole.n_matches
+        assert merged.top() == whole.top()
+        assert HeavyHitters.from_bytes(whole.to_bytes()).top() == whole.top()
+
+        with pytest.raises(ValueError, match="same size"):
+            merged.merge(cleaner.heavy_hitters(self.texts, epsilon=0.1))
+        with pytest.raises(ValueError, match="`epsilon` must be between"):
+            HeavyHitters(epsilon=0)
+
+
+class TestStreamingCleaner:
+    """Test cleaning text that arrives in pieces."""
+
+    text = (
+        "Hi, email me at jane.doe@example.com or call 020 7946 0000. "
+        "My NINO is AB123456C and I live at SW1A 1AA. Thanks!"
+    )
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 32])
+    def test_matches_split_across_chunks(self, chunk_size):
+        """Test the stream is cleaned exactly as the whole text would be."""
+        cleaner = Cleaner()
+        stream = cleaner.stream(max_match_len=48)
+        output = [
+            stream.feed(self.text[i : i + chunk_size])
+            for i in range(0, len(self.text), chunk_size)
+        ]
+        output.append(stream.finish())
+        assert "".join(output) == cleaner.clean_pii(self.text, "redact")
+        assert stream.pending == 0
+
+    def test_bounded_memory(self):
+        """Test output is emitted as it becomes safe and little is held."""
+        stream = Cleaner("email").stream(max_match_len=16)
+        line = "Contact jane@example.com for details. "
+        emitted = 0
+        for _ in range(1000):
+            emitted += len(stream.feed(line))
+            assert stream.pending <= 2 * 16 + len(line)
+        assert emitted > 0
+        assert stream.finish().endswith("details. ")
+
+    def test_pseudonymise_and_allowlist(self):
+        """Test the Cleaner's key and allowlist apply to the stream."""
+        cleaner = Cleaner(
+            "email", pseudonym_key="secret", allowlist=["support@example.com"]
+        )
+        text = "From jane@example.com to support@example.com"
+        stream = cleaner.stream("pseudonymise")
+        result = stream.feed(text[:12]) + stream.feed(text[12:])
+        result += stream.finish()
+        assert result == cleaner.clean_pii(text, "pseudonymise")
+
+    def test_replace_not_supported(self):
+        """Test whole-text replacement can't be streamed."""
+        with pytest.raises(ValueError, match="Streaming"):
+            Cleaner().stream("replace")
+
+
+class TestCleanCache:
+    """Test the persistent cache of cleaned texts."""
+
+    texts = ["Email jane@example.com", "No PII here"]
+
+    def test_hits_and_persistence(self, tmp_path):
+        """Test repeated texts are served from the cache, across reopens."""
+        path = tmp_path / "clean.cache"
+        with CleanCache(path) as cache:
+            cleaner = Cleaner(cache=cache)
+            first = cleaner.clean_pii_list(self.texts, "redact")
+            assert cleaner.clean_pii_list(self.texts, "redact") == first
+            stats = cache.stats()
+            assert (stats["hits"], stats["misses"]) == (2, 2)
+            assert stats["hit_rate"] == 0.5
+
+        reopened = CleanCache(path)
+        assert len(reopened) == 2
+        cleaner = Cleaner(cache=reopened)
+        assert cleaner.clean_pii_list(self.texts, "redact") == first
+        assert reopened.stats()["hits"] == 2
+
+    def test_key_file(self, tmp_path):
+        """Test the cache's secret is saved beside it and needed to read it."""
+        path = tmp_path / "clean.cache"
+        with CleanCache(path) as cache:
+            Cleaner(cache=cache).clean_pii_list(self.texts, "redact")
+        key_path = tmp_path / "clean.cache.key"
+        assert key_path.exists()
+        assert len(CleanCache(path)) == 2
+
+        key_path.unlink()
+        assert len(CleanCache(path)) == 0
+
+    def test_invalidated_by_config(self, tmp_path):
+        """Test changing cleaners or dictionaries doesn't reuse entries."""
+        cache = CleanCache(tmp_path / "clean.cache")
+        Cleaner(cache=cache).clean_pii_list(self.texts, "redact")
+        Cleaner("email", cache=cache).clean_pii_list(self.texts, "redact")
+        assert cache.stats()["misses"] == 4
+
+        text = ["Ask Jane Doe"]
+        cleaner = Cleaner("staff", cache=cache)
+        register_dictionary("staff", ["Jane Doe"])
+        try:
+            assert cleaner.clean_pii_list(text, "redact") == [
+                "Ask [staff-redacted]"
+            ]
+            register_dictionary("staff", ["Ann"])
+            assert cleaner.clean_pii_list(text, "redact") == text
+        finally:
+            remove_dictionary("staff")
+
+    def test_eviction_and_clear(self, tmp_path):
+        """Test the cache stays within its size budget."""
+        cache = CleanCache(tmp_path / "clean.cache", max_bytes=2000)
+        Cleaner(cache=cache).clean_pii_list(
+            [f"row {i}" for i in range(500)], "redact"
+        )
+        assert 0 < cache.stats()["bytes"] <= 2000
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
+
+    def test_invalid_cache(self):
+        """Test only a CleanCache is accepted."""
+        with pytest.raises(TypeError, match="CleanCache"):
+            Cleaner(cache="clean.cache")
+
+
+class TestRowLimits:
+    """Test per-row limits on cleaning work."""
+
+    def test_limits_and_fallbacks(self):
+        """Test rows over a limit are replaced or skipped and reported."""
+        texts = [
+            "Email jane@example.com",
+            "Blob " + "ab12" * 100,
+            "a@example.com b@example.com c@example.com",
+        ]
+        cleaner = Cleaner(
+            ["email", "case-id"],
+            limits=RowLimits(max_bytes=100, max_matches=2),
+        )
+        cleaned, hits = cleaner.clean_pii_list_with_limits(texts, "redact")
+        assert cleaned == [
+            "Email [email-redacted]",
+            "[PII detected, text redacted]",
+            "[PII detected, text redacted]",
+        ]
+        assert hits == {1: "max_bytes", 2: "max_matches"}
+        assert cleaner.clean_pii_list(texts, "redact") == cleaned
+        assert cleaner.clean_pii(texts[1], "redact") == cleaned[1]
+
+        skipping = Cleaner(limits=RowLimits(time_budget_ms=0, fallback="skip"))
+        cleaned, hits = skipping.clean_pii_list_with_limits(
+            ["NINO AB123456C"], "redact"
+        )
+        assert cleaned == ["NINO AB123456C"]
+        assert hits == {0: "time_budget"}
+
+    def test_without_limits(self):
+        """Test an empty RowLimits cleans exactly as without limits."""
+        texts = ["Email jane@example.com", "No PII here"]
+        cleaner = Cleaner(limits=RowLimits())
+        assert cleaner.clean_pii_list_with_limits(texts, "redact") == (
+            Cleaner().clean_pii_list(texts, "redact"),
+            {},
+        )
+
+    def test_pickle(self):
+        """Test limits survive pickling with a Cleaner."""
+        limits = RowLimits(max_bytes=10, time_budget_ms=2.5, fallback="skip")
+        restored = pickle.loads(pickle.dumps(Cleaner(limits=limits))).limits
+        assert restored.max_bytes == 10
+        assert restored.max_matches is None
+        assert restored.time_budget_ms == pytest.approx(2.5)
+        assert restored.fallback == "skip"
+
+    def test_errors(self):
+        """Test invalid limits raise errors."""
+        with pytest.raises(ValueError, match="Invalid fallback"):
+            RowLimits(fallback="truncate")
+        with pytest.raises(ValueError, match="time_budget_ms"):
+            RowLimits(time_budget_ms=-1)
+        with pytest.raises(TypeError, match="`limits` must be a RowLimits"):
+            Cleaner(limits={"max_bytes": 10})
+
+
+class TestCleanAndDetect:
+    """Test cleaning and detection in one pass."""
+
+    def test_matches_separate_calls(self):
+        """Test results equal separate clean and detect calls."""
+        texts = [
+            "Email jane@example.com or call 07700 900123",
+            "No PII here",
+            "NINO AB123456C",
+        ]
+        for cleaners in ["all", ["email", "telephone"]]:
+            cleaner = Cleaner(cleaners, allowlist=["07700 900123"])
+            for cleaning in ["redact", "replace"]:
+                cleaned, detected = cleaner.clean_and_detect_list(
+                    texts, cleaning
+                )
+                assert cleaned == cleaner.clean_pii_list(texts, cleaning)
+                assert detected == cleaner.detect_pii_list(
+                    texts, overlap="longest"
+                )
+
+    def test_spans_refer_to_original(self):
+        """Test reported positions are in the original text."""
+        cleaner = Cleaner("email", pseudonym_key="secret")
+        cleaned, detected = cleaner.clean_and_detect_list(
+            ["To a@example.com, b@example.com"], "pseudonymise"
+        )
+        assert cleaned[0].startswith("To [email:")
+        assert [(m["start"], m["end"]) for m in detected[0]] == [
+            (3, 16),
+            (18, 31),
+        ]
+
+    def test_limits(self):
+        """Test the Cleaner's limits apply, and limited rows are reported."""
+        texts = ["Email jane@example.com", "a@example.com b@example.com"]
+        cleaner = Cleaner("email", limits=RowLimits(max_matches=1))
+        cleaned, detected, hits = cleaner.clean_and_detect_list_with_limits(
+            texts, "redact"
+        )
+        assert cleaned == cleaner.clean_pii_list(texts, "redact")
+        assert cleaned[1] == "[PII detected, text redacted]"
+        assert [m["text"] for m in detected[0]] == ["jane@example.com"]
+        assert detected[1] == []
+        assert hits == {1: "max_matches"}
+        assert cleaner.clean_and_detect_list(texts, "redact") == (
+            cleaned,
+            detected,
+        )
+
+    def test_errors(self):
+        """Test invalid arguments raise errors."""
+        cleaner = Cleaner()
+        with pytest.raises(ValueError, match="Invalid cleaning method"):
+            cleaner.clean_and_detect_list(["text"], "invalid")
+        with pytest.raises(TypeError):
+            cleaner.clean_and_detect_list("text", "redact")
+
+
+class TestCleanJson:
+    """Test cleaning PII inside JSON documents."""
+
+    doc = json.dumps(
+        {
+            "id": 7,
+            "user": {"email": "jane@example.com", "phone": "07700 900123"},
+            "messages": [
+                {"body": "Write to jane@example.com"},
+                {"body": "No PII here"},
+            ],
+        }
+    )
+
+    def test_clean_values(self):
+        """Test every string value is cleaned and the structure kept."""
+        cleaned = json.loads(Cleaner().clean_json(self.doc, "redact"))
+        assert cleaned == {
+            "id": 7,
+            "user": {
+                "email": "[email-redacted]",
+                "phone": "[telephone-redacted]",
+            },
+            "messages": [
+                {"body": "Write to [email-redacted]"},
+                {"body": "No PII here"},
+            ],
+        }
+
+    def test_include_and_exclude(self):
+        """Test key paths limit which subtrees are cleaned."""
+        cleaner = Cleaner()
+        cleaned = json.loads(
+            cleaner.clean_json(self.doc, "redact", include=["messages.*.body"])
+        )
+        assert cleaned["user"]["email"] == "jane@example.com"
+        assert cleaned["messages"][0]["body"] == "Write to [email-redacted]"
+
+        cleaned = json.loads(
+            cleaner.clean_json(self.doc, "redact", exclude=["user.phone"])
+        )
+        assert cleaned["user"] == {
+            "email": "[email-redacted]",
+            "phone": "07700 900123",
+        }
+
+    def test_clean_keys(self):
+        """Test object keys are only cleaned when asked."""
+        doc = '{"jane@example.com": 1}'
+        assert Cleaner().clean_json(doc, "redact") == doc
+        assert (
+            Cleaner().clean_json(doc, "redact", clean_keys=True)
+            == '{"[email-redacted]": 1}'
+        )
+
+    def test_batch(self):
+        """Test the batch method matches cleaning documents one by one."""
+        cleaner = Cleaner("email")
+        docs = [self.doc, '["bob@example.com"]', "null"]
+        assert cleaner.clean_json_list(docs, "redact") == [
+            cleaner.clean_json(doc, "redact") for doc in docs
+        ]
+
+    def test_invalid_json(self):
+        """Test invalid documents and key paths raise ValueError."""
+        cleaner = Cleaner()
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            cleaner.clean_json('{"a": ', "redact")
+        with pytest.raises(ValueError, match="document 1"):
+            cleaner.clean_json_list(["{}", "[1,]"], "redact")
+        with pytest.raises(ValueError, match="Invalid key path"):
+            cleaner.clean_json("{}", "redact", include=["a..b"])
+
+
+class TestMicroBatcher:
+    """Test batching of concurrent single-text calls."""
+
+    def test_threads_get_their_own_results(self):
+        """Test concurrent callers are batched and get the right result."""
+        cleaner = Cleaner()
+        texts = [f"Email user{i}@example.com" for i in range(200)]
+        results = [None] * len(texts)
+
+        with cleaner.batcher(max_batch_size=64, max_delay_us=2000) as batcher:
+
+            def _call(i):
+                results[i] = batcher.clean(texts[i])
+
+            threads = [
+                threading.Thread(target=_call, args=(i,))
+                for i in range(len(texts))
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = batcher.stats()
+
+        assert results == cleaner.clean_pii_list(texts, "redact")
+        assert stats["texts"] == 200
+        assert stats["queue_depth"] == 0
+        assert stats["batches"] < 200
+
+    def test_asyncio(self):
+        """Test asyncio tasks can share a batcher."""
+        cleaner = Cleaner("email")
+
+        async def _main(batcher):
+            return await asyncio.gather(
+                batcher.clean_async("jane@example.com"),
+                batcher.clean_async("No PII"),
+            )
+
+        with cleaner.batcher("replace") as batcher:
+            results = asyncio.run(_main(batcher))
+        assert results == ["[PII detected, text redacted]", "No PII"]
+
+    def test_errors(self):
+        """Test bad arguments fail at the call, not in the batch."""
+        cleaner = Cleaner()
+        with pytest.raises(ValueError, match="Invalid cleaning method"):
+            cleaner.batcher("invalid")
+        with pytest.raises(ValueError, match="max_batch_size"):
+            cleaner.batcher(max_batch_size=0)
+
+        batcher = cleaner.batcher()
+        with pytest.raises(TypeError, match="`text` must be a str, not int"):
+            batcher.submit(123)
+        batcher.close()
+        assert isinstance(batcher, MicroBatcher)
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.clean("text")
+
+
+class TestMultiprocessing:
+    """Test cleaners can be sent to and used in other processes."""
+
+    def test_pickle(self, tmp_path):
+        """Test a pickled Cleaner brings its allowlist and dictionaries."""
+        register_dictionary("pickled", ["Jane Doe"])
+        cache = CleanCache(tmp_path / "cache.bin")
+        cleaner = Cleaner(
+            ["pickled", "email"], allowlist=["help@example.com"], cache=cache
+        )
+        data = pickle.dumps(cleaner)
+        remove_dictionary("pickled")
+
+        try:
+            restored = pickle.loads(data)
+            assert restored.cache is None
+            assert restored.clean_pii(
+                "Jane Doe, help@example.com, jane@example.com", "redact"
+            ) == ("[pickled-redacted], help@example.com, [email-redacted]")
+            assert "pickled" in get_available_cleaners()
+        finally:
+            remove_dictionary("pickled")
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="fork is not available",
+    )
+    def test_fork_after_batch(self):
+        """Test batch calls work in a child forked after a parallel call."""
+        precompile_patterns()
+        cleaner = Cleaner()
+        texts = [f"Email user{i}@example.com" for i in range(1000)]
+        expected = cleaner.clean_pii_list(texts, "redact")
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(2) as pool:
+            result = pool.apply_async(_clean_in_worker, (cleaner, texts))
+            assert result.get(timeout=60) == expected
+
+
+class TestConcurrentCalls:
+    """Test per-row calls from many threads, with or without the GIL."""
+
+    def test_threads_match_sequential(self):
+        """Test concurrent per-row calls give the sequential results."""
+        register_dictionary("threaded", ["Jane Doe"])
+        try:
+            cleaner = Cleaner(["email", "telephone", "threaded"])
+            texts = [
+                f"Jane Doe, user{i}@example.com, 07700 900{i:03d}"
+                for i in range(400)
+            ]
+            expected = [cleaner.detect_pii(text) for text in texts]
+            with ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(cleaner.detect_pii, texts))
+            assert results == expected
+        finally:
+            remove_dictionary("threaded")
+
+    @pytest.mark.skipif(
+        not sysconfig.get_config_var("Py_GIL_DISABLED"),
+        reason="not a free-threaded build",
+    )
+    def test_gil_stays_disabled(self):
+        """Test importing the extension doesn't re-enable the GIL."""
+        assert not sys._is_gil_enabled()
+
+
+class TestProgressAndCancellation:
+    """Test progress callbacks and cancellation of batch calls."""
+
+    def test_progress_reports_completion(self):
+        """Test the last progress call covers every row and byte."""
+        cleaner = Cleaner(["email"])
+        texts = [f"Email user{i}@example.com" for i in range(1000)]
+        calls = []
+        cleaned = cleaner.clean_pii_list(
+            texts, "redact", progress=lambda *args: calls.append(args)
+        )
+        assert cleaned == cleaner.clean_pii_list(texts, "redact")
+        assert calls[-1] == (
+            len(texts),
+            len(texts),
+            sum(len(text.encode()) for text in texts),
+        )
+        assert all(done <= total for done, total, _ in calls)
+
+    def test_cancelled_token_stops_batch(self):
+        """Test a cancelled token raises CancelledError."""
+        cleaner = Cleaner()
+        token = CancelToken()
+        assert not token.cancelled
+        token.cancel()
+        assert token.cancelled
+        with pytest.raises(CancelledError):
+            cleaner.detect_pii_list(["Email test@example.com"], cancel=token)
+        with pytest.raises(CancelledError):
+            cleaner.clean_and_detect_list(
+                ["Email test@example.com"], "redact", cancel=token
+            )
+
+    def test_progress_errors_propagate(self):
+        """Test an exception raised by the progress callback is re-raised."""
+
+        def progress(done, total, nbytes):
+            raise RuntimeError("stop")
+
+        with pytest.raises(RuntimeError, match="stop"):
+            Cleaner().clean_pii_list(["a"], "redact", progress=progress)
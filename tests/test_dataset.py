@@ -0,0 +1,127 @@
+"""Tests for cleaning Parquet datasets"""
+
+import json
+
+import pytest
+from piicleaner import Cleaner, RowLimits
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """A partitioned dataset of two files, one with two row groups."""
+    src = tmp_path / "src"
+    table = pa.table(
+        {
+            "id": [1, 2, 3],
+            "notes": ["Email jane@example.com", None, "No PII here"],
+        }
+    )
+    (src / "year=2024").mkdir(parents=True)
+    (src / "year=2025").mkdir()
+    pq.write_table(table, src / "year=2024" / "part-0.parquet")
+    pq.write_table(
+        table, src / "year=2025" / "part-0.parquet", row_group_size=2
+    )
+    return src
+
+
+class TestCleanDataset:
+    """Test Cleaner.clean_dataset."""
+
+    def test_clean_dataset(self, dataset, tmp_path):
+        """Test files are cleaned into the same layout, keeping row groups."""
+        dst = tmp_path / "dst"
+        result = Cleaner("email").clean_dataset(
+            dataset, dst, columns="notes", cleaning="redact"
+        )
+
+        assert result == {
+            "cleaned": ["year=2024/part-0.parquet", "year=2025/part-0.parquet"],
+            "skipped": [],
+        }
+        cleaned = pq.read_table(dst / "year=2025" / "part-0.parquet")
+        assert cleaned.column("notes").to_pylist() == [
+            "Email [email-redacted]",
+            None,
+            "No PII here",
+        ]
+        assert cleaned.column("id").to_pylist() == [1, 2, 3]
+        assert cleaned.schema == pq.read_schema(
+            dataset / "year=2025" / "part-0.parquet"
+        )
+        assert (
+            pq.ParquetFile(dst / "year=2025" / "part-0.parquet").num_row_groups
+            == 2
+        )
+
+    def test_resume(self, dataset, tmp_path):
+        """Test a second run skips completed files and redoes changed ones."""
+        dst = tmp_path / "dst"
+        cleaner = Cleaner("email")
+        cleaner.clean_dataset(dataset, dst, ["notes"], "redact")
+        manifest = json.loads((dst / "_piicleaner_manifest.json").read_text())
+        assert manifest["files"]["year=2024/part-0.parquet"]["rows"] == 3
+
+        (dst / "year=2025" / "part-0.parquet").unlink()
+        result = cleaner.clean_dataset(dataset, dst, ["notes"], "redact")
+        assert result == {
+            "cleaned": ["year=2025/part-0.parquet"],
+            "skipped": ["year=2024/part-0.parquet"],
+        }
+
+        # Different settings start again
+        result = cleaner.clean_dataset(dataset, dst, ["notes"], "replace")
+        assert len(result["cleaned"]) == 2
+
+    def test_resume_with_cleaner_settings(self, dataset, tmp_path):
+        """Test the Cleaner's own settings are part of the manifest."""
+        dst = tmp_path / "dst"
+        Cleaner("email", pseudonym_key="secret-1").clean_dataset(
+            dataset, dst, ["notes"], "pseudonymise"
+        )
+        manifest = (dst / "_piicleaner_manifest.json").read_text()
+        assert "secret-1" not in manifest
+
+        for cleaner in [
+            Cleaner("email", pseudonym_key="secret-2"),
+            Cleaner("email", pseudonym_key="secret-2", allowlist=["x@y.com"]),
+            Cleaner(
+                "email",
+                pseudonym_key="secret-2",
+                allowlist=["x@y.com"],
+                limits=RowLimits(max_bytes=100),
+            ),
+        ]:
+            result = cleaner.clean_dataset(
+                dataset, dst, ["notes"], "pseudonymise"
+            )
+            assert len(result["cleaned"]) == 2
+
+    def test_large_string_column(self, tmp_path):
+        """Test `large_string` columns are cleaned and keep their type."""
+        src = tmp_path / "src"
+        src.mkdir()
+        table = pa.table(
+            {"notes": pa.array(["a@example.com", None, ""], pa.large_string())}
+        )
+        pq.write_table(table, src / "part-0.parquet")
+
+        Cleaner("email", replace_string="<email>").clean_dataset(
+            src, tmp_path / "dst", "notes", "replace"
+        )
+        cleaned = pq.read_table(tmp_path / "dst" / "part-0.parquet")
+        assert cleaned.schema.field("notes").type == pa.large_string()
+        assert cleaned.column("notes").to_pylist() == ["<email>", None, ""]
+
+    def test_invalid_columns(self, dataset, tmp_path):
+        """Test missing and non-string columns raise errors."""
+        cleaner = Cleaner()
+        with pytest.raises(ValueError, match="not found"):
+            cleaner.clean_dataset(dataset, tmp_path / "a", "missing", "redact")
+        with pytest.raises(TypeError, match="not a string column"):
+            cleaner.clean_dataset(dataset, tmp_path / "b", "id", "redact")
+        with pytest.raises(ValueError, match="different"):
+            cleaner.clean_dataset(dataset, dataset, "notes", "redact")
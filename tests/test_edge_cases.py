@@ -342,6 +342,76 @@ class TestOverlappingPatterns:
         assert any("SW1A 1AA" in text for text in pii_texts)
 
 
+class TestOverlapResolution:
+    """Test non-overlapping, priority-resolved detection."""
+
+    @pytest.fixture
+    def cleaner(self):
+        return Cleaner()
+
+    def test_longest_returns_single_email(self, cleaner):
+        """Test duplicate and nested matches collapse to the longest."""
+        text = "Email deadbeef42@example.com now"
+        all_matches = cleaner.detect_pii(text, ignore_case=False)
+        assert len(all_matches) > 1
+
+        resolved = cleaner.detect_pii(
+            text, ignore_case=False, overlap="longest"
+        )
+        assert [(m["text"], m["type"]) for m in resolved] == [
+            ("deadbeef42@example.com", "email")
+        ]
+
+    def test_priority_follows_cleaner_order(self):
+        """Test cleaners listed first win with priority resolution."""
+        text = "Ref AB1234567890"
+        nino_first = Cleaner(["nino", "case-id"])
+        case_id_first = Cleaner(["case-id", "nino"])
+
+        matches = nino_first.detect_pii(
+            text, ignore_case=False, overlap="priority"
+        )
+        assert matches[0]["type"] == "nino"
+
+        matches = case_id_first.detect_pii(
+            text, ignore_case=False, overlap="priority"
+        )
+        assert all(m["type"] == "case-id" for m in matches)
+
+    def test_resolved_matches_do_not_overlap(self, cleaner):
+        """Test resolved batch results contain no overlapping spans."""
+        texts = [
+            "Contact john@test.com or call +44 20 1234 5678 ref AB123456C",
+            "Send to SW1A 1AA, ref 1234567890",
+        ]
+        for overlap in ["longest", "priority"]:
+            for matches in cleaner.detect_pii_list(texts, overlap=overlap):
+                for first, second in zip(matches, matches[1:], strict=False):
+                    assert first["end"] <= second["start"]
+
+    def test_redact_shares_resolution(self, cleaner):
+        """Test redaction replaces each resolved match exactly once."""
+        text = "Email deadbeef42@example.com now"
+        assert cleaner.clean_pii(text, "redact", ignore_case=False) == (
+            "Email [email-redacted] now"
+        )
+
+    def test_invalid_overlap(self, cleaner):
+        """Test unknown overlap strategies raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid overlap resolution"):
+            cleaner.detect_pii("text", overlap="shortest")
+
+    def test_cleaning_rejects_all(self, cleaner):
+        """Test cleaning refuses "all", as each match must be cleaned once."""
+        text = "Email jane@example.com now"
+        with pytest.raises(ValueError, match="for cleaning"):
+            cleaner.clean_pii(text, "redact", overlap="all")
+        with pytest.raises(ValueError, match="for cleaning"):
+            cleaner.clean_pii_list([text], "redact", overlap="all")
+        with pytest.raises(ValueError, match="for cleaning"):
+            cleaner.clean_and_detect_list([text], "redact", overlap="all")
+
+
 class TestCleaningBehaviourEdgeCases:
     """Test edge cases in cleaning behaviour."""
 
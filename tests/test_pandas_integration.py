@@ -98,6 +98,99 @@ class TestPandasDataFrameMethods:
         assert any("AB123456C" in text for text in pii_texts)
         assert any("+44 20 7946 0958" in text for text in pii_texts)
 
+    def test_detect_dataframe_pyarrow(self, sample_df):
+        """Test detection results as an Arrow-backed list of structs."""
+        pa = pytest.importorskip("pyarrow")
+        df = sample_df.copy()
+        df.loc[1, "text"] = None
+
+        result = Cleaner("email").detect_pandas_dataframe(
+            df, "text", dtype_backend="pyarrow"
+        )
+
+        detected = result["text_pii_detected"]
+        assert isinstance(detected.dtype, pd.ArrowDtype)
+        assert detected.dtype.pyarrow_dtype == pa.list_(
+            pa.struct(
+                [
+                    ("start", pa.uint32()),
+                    ("end", pa.uint32()),
+                    ("text", pa.string()),
+                    ("type", pa.dictionary(pa.int32(), pa.string())),
+                ]
+            )
+        )
+        assert detected.tolist()[0] == [
+            {"start": 8, "end": 24, "text": "john@example.com", "type": "email"}
+        ]
+        assert len(detected.iloc[1]) == 0  # Null text gives no matches
+        assert len(detected.iloc[3]) == 0
+
+    def test_detect_dataframe_invalid_dtype_backend(self, cleaner, sample_df):
+        """Test error with an unsupported dtype_backend."""
+        with pytest.raises(ValueError, match="dtype_backend"):
+            cleaner.detect_pandas_dataframe(
+                sample_df, "text", dtype_backend="numpy"
+            )
+
+    def test_clean_and_detect_dataframe(self, cleaner, sample_df):
+        """Test cleaning and detection columns come from one call."""
+        result = cleaner.clean_and_detect_pandas_dataframe(
+            sample_df, "text", "redact", detected_column_name="audit"
+        )
+
+        assert result["text"].tolist() == (
+            cleaner.clean_pandas_dataframe(sample_df, "text", "redact")[
+                "text"
+            ].tolist()
+        )
+        assert result["audit"].tolist() == cleaner.detect_pii_list(
+            sample_df["text"], overlap="longest"
+        )
+        assert sample_df["text"][0] == "Contact john@example.com for help"
+
+    def test_profile_pandas_dataframe(self, sample_df):
+        """Test the profile counts each PII type in each string column."""
+        profile = Cleaner(["email", "nino"]).profile_pandas_dataframe(sample_df)
+
+        assert list(profile.columns) == [
+            "column",
+            "type",
+            "rows_scanned",
+            "rows_matched",
+            "matches",
+            "hit_rate",
+        ]
+        assert sorted(profile.itertuples(index=False, name=None)) == [
+            ("text", "email", 4, 1, 1, 0.25),
+            ("text", "nino", 4, 1, 1, 0.25),
+        ]
+
+    def test_profile_pandas_dataframe_sampling(self):
+        """Test sampling scans at most `sample_size` rows per column."""
+        df = pd.DataFrame(
+            {"text": [f"user{i}@example.com" for i in range(1000)]}
+        )
+        cleaner = Cleaner("email")
+
+        profile = cleaner.profile_pandas_dataframe(df, sample_size=100, seed=1)
+        assert profile["rows_scanned"].to_list() == [100]
+        assert profile["hit_rate"].to_list() == [1.0]
+
+        with pytest.raises(ValueError, match="`tolerance` must be between"):
+            cleaner.profile_pandas_dataframe(df, tolerance=2.0)
+        with pytest.raises(ValueError, match="Column 'missing' not found"):
+            cleaner.profile_pandas_dataframe(df, ["missing"])
+
+    def test_dataframe_methods_leave_input_unchanged(self, cleaner, sample_df):
+        """Test results don't write through to the input DataFrame."""
+        original = sample_df.copy()
+
+        cleaner.clean_pandas_dataframe(sample_df, "text", "redact")
+        cleaner.detect_pandas_dataframe(sample_df, "text")
+
+        pd.testing.assert_frame_equal(sample_df, original)
+
     def test_clean_dataframe_invalid_column(self, cleaner, sample_df):
         """Test error when column doesn't exist."""
         with pytest.raises(ValueError, match="Column 'nonexistent' not found"):
@@ -297,3 +297,26 @@ class TestPandasNamespace:
         assert result.iloc[0]  # Should contain "REDACTED"
         assert result.iloc[1]  # Should contain "REDACTED"
         assert not result.iloc[2]  # Should not contain "REDACTED"
+
+    def test_namespace_pseudonymise(self):
+        """Test .pii.clean_pii() with pseudonymise mode"""
+        df = pd.DataFrame(
+            {
+                "text": [
+                    "Contact john@example.com",
+                    None,
+                    "Email john@example.com again",
+                    "Clean text",
+                ]
+            }
+        )
+
+        cleaned = df["text"].pii.clean_pii(
+            "pseudonymise", pseudonym_key="secret"
+        )
+
+        token = cleaned.iloc[0].removeprefix("Contact ")
+        assert token.startswith("[email:")
+        assert cleaned.iloc[1] is None
+        assert cleaned.iloc[2] == f"Email {token} again"
+        assert cleaned.iloc[3] == "Clean text"
@@ -1,4 +1,4 @@
-use piicleaner::patterns::{get_all_patterns, get_patterns_by_name, get_registry};
+use piicleaner::patterns::{get_all_patterns, get_patterns, get_patterns_by_name, get_registry};
 
 #[test]
 fn test_pattern_registry_creation() {
@@ -225,3 +225,35 @@ fn test_ip_address_pattern_matching() {
         assert_eq!(matches, should_match, "IP '{}' match result incorrect", ip);
     }
 }
+
+#[test]
+fn test_ascii_patterns_match_unicode_patterns_on_ascii_text() {
+    let texts = [
+        "My email address is person@example.com",
+        "Sophie Taylor at 1 High Street, London, W1 2BC",
+        "Call me at +44 7890 123 456 urgently",
+        "I am owed a refund in the amount of $1,234.56 or 1,234.56 GBP",
+        "My reference number is 1234567890, ref: ab12345678",
+        "I am Ali Mahmood, my National Insurance number is AB123 456A",
+        "Here goes: <some-sort-of-tag> <script>alert(1)</script>",
+        "The request came from 192.168.0.0",
+        "ASM 123456789012345678901 and 550e8400-e29b-41d4-a716-446655440000",
+        "12 KINGS ROAD, sw1a 1aa, JOHN.SMITH@EXAMPLE.CO.UK",
+    ];
+
+    for ignore_case in [false, true] {
+        let (unicode, unicode_set) = get_patterns(ignore_case, false);
+        let (ascii, ascii_set) = get_patterns(ignore_case, true);
+
+        for text in texts {
+            assert_eq!(unicode_set.is_match(text), ascii_set.is_match(text));
+            for (cleaner, regexes) in unicode.iter() {
+                for (u, a) in regexes.iter().zip(&ascii[cleaner]) {
+                    let expected: Vec<_> = u.find_iter(text).map(|m| m.range()).collect();
+                    let actual: Vec<_> = a.find_iter(text).map(|m| m.range()).collect();
+                    assert_eq!(expected, actual, "{} differs on '{}'", cleaner, text);
+                }
+            }
+        }
+    }
+}
@@ -6,7 +6,7 @@ import pytest
 pytest.importorskip("polars")
 
 import polars as pl
-from piicleaner import Cleaner
+from piicleaner import Cleaner, RowLimits
 
 
 class TestPolarsDataFrameMethods:
@@ -104,6 +104,102 @@ class TestPolarsDataFrameMethods:
         assert any("AB123456C" in text for text in pii_texts)
         assert any("+44 20 7946 0958" in text for text in pii_texts)
 
+    def test_clean_and_detect_dataframe(self, cleaner, sample_df):
+        """Test cleaning and detection columns come from one call."""
+        result = cleaner.clean_and_detect_dataframe(
+            sample_df, "text", "redact", new_column_name="cleaned"
+        )
+        expected = cleaner.detect_dataframe(
+            sample_df, "text", overlap="longest"
+        )
+
+        assert result["cleaned"].to_list() == (
+            cleaner.clean_dataframe(sample_df, "text", "redact")[
+                "text"
+            ].to_list()
+        )
+        assert result["text"].to_list() == sample_df["text"].to_list()
+        assert result["text_pii_detected"].to_list() == (
+            expected["text_pii_detected"].to_list()
+        )
+        assert (
+            result.schema["text_pii_detected"]
+            == (expected.schema["text_pii_detected"])
+        )
+
+    def test_clean_and_detect_dataframe_limits(self, sample_df):
+        """Test the Cleaner's limits apply when cleaning and detecting."""
+        cleaner = Cleaner(limits=RowLimits(max_bytes=25))
+        result = cleaner.clean_and_detect_dataframe(sample_df, "text", "redact")
+
+        assert result["text"].to_list() == (
+            cleaner.clean_dataframe(sample_df, "text", "redact")[
+                "text"
+            ].to_list()
+        )
+        assert result["text"][0] == "[PII detected, text redacted]"
+        assert result["text_pii_detected"][0].to_list() == []
+        assert result["text_pii_detected"][1].to_list() != []
+
+    def test_profile_dataframe(self, sample_df):
+        """Test the profile counts each PII type in each string column."""
+        profile = Cleaner(["email", "nino"]).profile_dataframe(sample_df)
+
+        assert list(profile.columns) == [
+            "column",
+            "type",
+            "rows_scanned",
+            "rows_matched",
+            "matches",
+            "hit_rate",
+        ]
+        assert sorted(profile.rows()) == [
+            ("text", "email", 4, 1, 1, 0.25),
+            ("text", "nino", 4, 1, 1, 0.25),
+        ]
+
+    def test_profile_dataframe_sampling(self):
+        """Test sampling scans at most `sample_size` rows per column."""
+        df = pl.DataFrame(
+            {"text": [f"user{i}@example.com" for i in range(1000)]}
+        )
+        cleaner = Cleaner("email")
+
+        profile = cleaner.profile_dataframe(df, sample_size=100, seed=1)
+        assert profile["rows_scanned"].to_list() == [100]
+        assert profile["hit_rate"].to_list() == [1.0]
+
+        with pytest.raises(ValueError, match="`tolerance` must be between"):
+            cleaner.profile_dataframe(df, tolerance=2.0)
+        with pytest.raises(ValueError, match="Column 'missing' not found"):
+            cleaner.profile_dataframe(df, ["missing"])
+
+    def test_detect_dataframe_schema(self, sample_df):
+        """Test detection results are a native list of structs column."""
+        df = sample_df.with_columns(
+            pl.when(pl.col("id") == 2)
+            .then(None)
+            .otherwise(pl.col("text"))
+            .alias("text")
+        )
+        result = Cleaner("email").detect_dataframe(df, "text")
+
+        assert result.schema["text_pii_detected"] == pl.List(
+            pl.Struct(
+                [
+                    pl.Field("start", pl.UInt32),
+                    pl.Field("end", pl.UInt32),
+                    pl.Field("text", pl.String),
+                    pl.Field("type", pl.Categorical),
+                ]
+            )
+        )
+        detected = result["text_pii_detected"].to_list()
+        assert detected[0] == [
+            {"start": 8, "end": 24, "text": "john@example.com", "type": "email"}
+        ]
+        assert detected[1] == []  # Null text gives no matches
+
     def test_clean_dataframe_invalid_column(self, cleaner, sample_df):
         """Test error when column doesn't exist."""
         with pytest.raises(ValueError, match="Column 'nonexistent' not found"):
@@ -356,3 +452,55 @@ class TestPolarsEdgeCases:
         assert len(detection_results[0]) > 0  # Should detect email
         assert detection_results[1] == []  # Null should give empty list
         assert detection_results[2] == []  # Clean text should give empty list
+
+    def test_clean_nested_columns(self):
+        """Test strings inside List and Struct columns are cleaned in place."""
+        cleaner = Cleaner()
+        df = pl.DataFrame(
+            {
+                "tags": [["jane@example.com", None, "urgent"], None, []],
+                "record": [
+                    {
+                        "id": 1,
+                        "note": "NINO AB123456C",
+                        "cc": ["bob@example.com"],
+                    },
+                    None,
+                    {"id": 3, "note": None, "cc": []},
+                ],
+            }
+        )
+
+        cleaned = cleaner.clean_dataframe(df, "tags", "redact")
+        assert cleaned.schema == df.schema
+        assert cleaned["tags"].to_list() == [
+            ["[email-redacted]", None, "urgent"],
+            None,
+            [],
+        ]
+
+        cleaned = cleaner.clean_dataframe(
+            df, "record", "redact", new_column_name="clean"
+        )
+        assert cleaned["clean"].dtype == df["record"].dtype
+        assert cleaned["clean"].to_list() == [
+            {
+                "id": 1,
+                "note": "NINO [nino-redacted]",
+                "cc": ["[email-redacted]"],
+            },
+            None,
+            {"id": 3, "note": None, "cc": []},
+        ]
+
+    def test_clean_nested_columns_limits(self):
+        """Test the Cleaner's limits apply to strings in nested columns."""
+        cleaner = Cleaner(limits=RowLimits(max_bytes=16))
+        df = pl.DataFrame(
+            {"tags": [["jane@example.com", None, "a much longer tag"]]}
+        )
+
+        cleaned = cleaner.clean_dataframe(df, "tags", "redact")
+        assert cleaned["tags"].to_list() == [
+            ["[email-redacted]", None, "[PII detected, text redacted]"]
+        ]
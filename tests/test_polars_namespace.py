@@ -182,3 +182,29 @@ class TestPolarsNamespace:
         # None should also fail if passed somehow
         with pytest.raises((ValueError, TypeError)):
             df.with_columns(pl.col("text").pii.clean_pii(None).alias("cleaned"))
+
+    def test_namespace_pseudonymise(self):
+        """Test .pii.clean_pii() with pseudonymise mode"""
+        df = pl.DataFrame(
+            {
+                "text": [
+                    "Contact john@example.com",
+                    None,
+                    "Email john@example.com again",
+                    "Clean text",
+                ]
+            }
+        )
+
+        result = df.with_columns(
+            pl.col("text")
+            .pii.clean_pii("pseudonymise", pseudonym_key="secret")
+            .alias("cleaned")
+        )
+
+        cleaned = result["cleaned"].to_list()
+        token = cleaned[0].removeprefix("Contact ")
+        assert token.startswith("[email:")
+        assert cleaned[1] is None
+        assert cleaned[2] == f"Email {token} again"
+        assert cleaned[3] == "Clean text"